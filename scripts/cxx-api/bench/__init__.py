@@ -0,0 +1,20 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from .fixtures import extract_fixture, read_manifest, record_fixture
+from .runner import compare_to_baseline, find_regressions, run_benchmark
+from .scaling import run_scaling
+from .synthetic import generate
+
+__all__ = [
+    "compare_to_baseline",
+    "extract_fixture",
+    "find_regressions",
+    "generate",
+    "read_manifest",
+    "record_fixture",
+    "run_benchmark",
+    "run_scaling",
+]
@@ -0,0 +1,195 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmarks of the parser against recorded Doxygen XML.
+
+Usage:
+    # Record the XML of a view, e.g. kept with `parser --view X --xml`:
+    python -m scripts.cxx-api.bench record XML_DIR FIXTURE --view ReactCommonDebug
+
+    # Time the fixture and compare against a baseline:
+    python -m scripts.cxx-api.bench run FIXTURE --baseline baseline.json
+
+    # Measure how the parser scales on synthetic XML of 1x, 10x and 100x
+    # the size of ReactCommon:
+    python -m scripts.cxx-api.bench scale --scales 1 10 100
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from ..parser.config import parse_config_file
+from ..parser.path_utils import get_react_native_dir
+from .fixtures import record_fixture
+from .runner import (
+    BenchmarkResult,
+    compare_to_baseline,
+    DEFAULT_THRESHOLD,
+    find_regressions,
+    run_benchmark,
+)
+from .scaling import DEFAULT_SCALES, format_report, run_scaling, write_report
+
+
+def _exclude_symbols_for_view(view: str) -> list[str]:
+    config_path = os.path.join(
+        get_react_native_dir(), "scripts", "cxx-api", "config.yml"
+    )
+    for config in parse_config_file(config_path, get_react_native_dir()):
+        if config.snapshot_name == view:
+            return config.exclude_symbols
+    raise RuntimeError(f"Unknown API view: {view}")
+
+
+def _record(args: argparse.Namespace) -> int:
+    exclude_symbols = _exclude_symbols_for_view(args.view) if not args.no_config else []
+    manifest = record_fixture(
+        args.xml_dir, args.fixture, view=args.view, exclude_symbols=exclude_symbols
+    )
+    print(
+        f"Recorded {manifest.files} files of {manifest.view} "
+        f"(Doxygen {manifest.doxygen_version}) to {args.fixture}"
+    )
+    return 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    result = run_benchmark(args.fixture, iterations=args.iterations, warmup=args.warmup)
+
+    print(f"{result.view}: {result.iterations} iterations, {result.warmup} warmup")
+    for stage, timing in result.stages.items():
+        print(
+            f"  {stage:<15} median {timing.median_s * 1000:9.1f} ms  "
+            f"p95 {timing.p95_s * 1000:9.1f} ms  min {timing.min_s * 1000:9.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result.to_dict(), f, indent=2)
+            f.write("\n")
+        print(f"Results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = BenchmarkResult.from_dict(json.load(f))
+
+    comparisons = compare_to_baseline(result, baseline)
+    print(f"Compared to {args.baseline}:")
+    for comparison in comparisons:
+        print(f"  {comparison.stage:<15} {comparison.ratio - 1:+7.1%}")
+
+    regressions = find_regressions(comparisons, args.threshold)
+    if regressions:
+        slower = ", ".join(comparison.stage for comparison in regressions)
+        print(f"Slower than the baseline by more than {args.threshold:.0%}: {slower}")
+        return 1
+    return 0
+
+
+def _scale(args: argparse.Namespace) -> int:
+    measurements = run_scaling(
+        tuple(args.scales),
+        work_dir=args.work_dir,
+        depth=args.depth,
+        specializations=args.specializations,
+    )
+    for line in format_report(measurements):
+        print(line)
+
+    if args.output:
+        write_report(measurements, args.output)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the C++ API parser against recorded Doxygen XML"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser(
+        "record", help="Record a view's Doxygen XML as a fixture"
+    )
+    record_parser.add_argument("xml_dir", help="Directory with the Doxygen XML")
+    record_parser.add_argument("fixture", help="Path of the .tar.xz fixture to write")
+    record_parser.add_argument(
+        "--view",
+        required=True,
+        help="Name of the API view the XML was generated for",
+    )
+    record_parser.add_argument(
+        "--no-config",
+        action="store_true",
+        help="Do not read the view's excluded symbols from config.yml",
+    )
+    record_parser.set_defaults(func=_record)
+
+    run_parser = subparsers.add_parser("run", help="Time the parser on a fixture")
+    run_parser.add_argument("fixture", help="Path of the .tar.xz fixture")
+    run_parser.add_argument(
+        "--iterations", type=int, default=10, help="Number of timed iterations"
+    )
+    run_parser.add_argument(
+        "--warmup", type=int, default=1, help="Number of untimed iterations"
+    )
+    run_parser.add_argument("--output", help="Write the results to this JSON file")
+    run_parser.add_argument(
+        "--baseline", help="Compare against results previously written by --output"
+    )
+    run_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when a stage's median is slower than the baseline by more "
+        "than this fraction (default: %(default)s)",
+    )
+    run_parser.set_defaults(func=_run)
+
+    scale_parser = subparsers.add_parser(
+        "scale", help="Measure how the parser scales on synthetic XML"
+    )
+    scale_parser.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_SCALES),
+        help="Sizes to measure, as multiples of ReactCommon (default: %(default)s)",
+    )
+    scale_parser.add_argument(
+        "--work-dir", help="Directory to generate the synthetic XML in"
+    )
+    scale_parser.add_argument(
+        "--depth",
+        type=int,
+        default=3,
+        help=(
+            "Namespace levels below facebook::react to spread the units over; "
+            "0 puts them all in one namespace (default: %(default)s)"
+        ),
+    )
+    scale_parser.add_argument(
+        "--specializations",
+        type=int,
+        default=1,
+        help=(
+            "Partial specializations of the class template of each unit "
+            "(default: %(default)s)"
+        ),
+    )
+    scale_parser.add_argument("--output", help="Write the results to this JSON file")
+    scale_parser.set_defaults(func=_scale)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Recording and loading of Doxygen XML fixtures.
+
+A fixture is an xz-compressed tarball holding the XML output of Doxygen for
+one view, next to a manifest that records the fixture format version, the
+Doxygen version and the symbol exclusions of the view. Replaying a fixture
+only needs the parser, not Doxygen.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+# Bump when the layout of fixtures changes in an incompatible way.
+FIXTURE_FORMAT_VERSION = 1
+
+FIXTURE_SUFFIX = ".tar.xz"
+
+_MANIFEST_NAME = "manifest.json"
+_XML_PREFIX = "xml"
+
+
+@dataclass
+class FixtureManifest:
+    """Describes the XML recorded in a fixture."""
+
+    view: str
+    format_version: int = FIXTURE_FORMAT_VERSION
+    doxygen_version: str | None = None
+    recorded_at: str | None = None
+    exclude_symbols: list[str] = field(default_factory=list)
+    files: int = 0
+    # Digest of the recorded XML, to tell fixtures of the same view apart.
+    xml_sha256: str = ""
+
+
+def _doxygen_version(xml_dir: str) -> str | None:
+    index_path = os.path.join(xml_dir, "index.xml")
+    if not os.path.exists(index_path):
+        raise RuntimeError(f"Doxygen entry point not found at {index_path}")
+    for _, element in ET.iterparse(index_path, events=("start",)):
+        return element.get("version")
+    return None
+
+
+def record_fixture(
+    xml_dir: str,
+    output_path: str,
+    view: str,
+    exclude_symbols: list[str] | None = None,
+) -> FixtureManifest:
+    """
+    Record the Doxygen XML in *xml_dir* as a fixture at *output_path*.
+    """
+    file_names = sorted(
+        name for name in os.listdir(xml_dir) if name.endswith((".xml", ".xsd"))
+    )
+
+    digest = hashlib.sha256()
+    for name in file_names:
+        digest.update(name.encode())
+        with open(os.path.join(xml_dir, name), "rb") as f:
+            digest.update(f.read())
+
+    manifest = FixtureManifest(
+        view=view,
+        doxygen_version=_doxygen_version(xml_dir),
+        recorded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        exclude_symbols=list(exclude_symbols or []),
+        files=len(file_names),
+        xml_sha256=digest.hexdigest(),
+    )
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with tarfile.open(output_path, "w:xz") as tar:
+        manifest_bytes = json.dumps(asdict(manifest), indent=2).encode()
+        manifest_info = tarfile.TarInfo(_MANIFEST_NAME)
+        manifest_info.size = len(manifest_bytes)
+        tar.addfile(manifest_info, io.BytesIO(manifest_bytes))
+        for name in file_names:
+            tar.add(
+                os.path.join(xml_dir, name),
+                arcname=f"{_XML_PREFIX}/{name}",
+                recursive=False,
+            )
+
+    return manifest
+
+
+def read_manifest(fixture_path: str) -> FixtureManifest:
+    """
+    Read the manifest of a fixture without extracting its XML.
+    """
+    with tarfile.open(fixture_path, "r:xz") as tar:
+        return _read_manifest(tar, fixture_path)
+
+
+def _read_manifest(tar: tarfile.TarFile, fixture_path: str) -> FixtureManifest:
+    member = tar.extractfile(_MANIFEST_NAME)
+    if member is None:
+        raise RuntimeError(f"Fixture {fixture_path} has no manifest")
+    manifest = FixtureManifest(**json.load(member))
+    if manifest.format_version != FIXTURE_FORMAT_VERSION:
+        raise RuntimeError(
+            f"Fixture {fixture_path} has format version "
+            f"{manifest.format_version}, expected {FIXTURE_FORMAT_VERSION}. "
+            "Record it again."
+        )
+    return manifest
+
+
+def extract_fixture(fixture_path: str, target_dir: str) -> tuple[FixtureManifest, str]:
+    """
+    Extract a fixture into *target_dir*, returning its manifest and the
+    path of the extracted XML directory.
+    """
+    with tarfile.open(fixture_path, "r:xz") as tar:
+        manifest = _read_manifest(tar, fixture_path)
+        members = [
+            member
+            for member in tar.getmembers()
+            if member.isfile() and member.name.startswith(f"{_XML_PREFIX}/")
+        ]
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(target_dir, members=members, filter="data")
+        else:
+            tar.extractall(target_dir, members=members)
+    return manifest, os.path.join(target_dir, _XML_PREFIX)
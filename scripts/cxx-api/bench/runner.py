@@ -0,0 +1,190 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Timed replays of the parser against recorded fixtures.
+"""
+
+from __future__ import annotations
+
+import gc
+import math
+import os
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+
+from ..parser.main import build_snapshot
+from ..parser.profiling import profile_phase, Profiler
+from ..parser.utils import clear_caches
+from .fixtures import extract_fixture
+
+# Bump when the layout of results changes in an incompatible way.
+RESULTS_FORMAT_VERSION = 1
+
+# Stages timed in every iteration, in pipeline order. The first three are
+# the phases recorded by build_snapshot.
+STAGES = ("parse_xml", "finish", "exclusion_scan", "to_string", "total")
+
+DEFAULT_THRESHOLD = 0.10
+
+# Stages that take next to no time, such as the exclusion scan of a view
+# without excluded symbols, vary by large ratios from run to run. A stage
+# only counts as slower when it also lost at least this much time.
+DEFAULT_MIN_DELTA_S = 0.001
+
+
+@dataclass
+class StageTiming:
+    median_s: float
+    p95_s: float
+    min_s: float
+
+
+@dataclass
+class BenchmarkResult:
+    fixture: str
+    view: str
+    xml_sha256: str
+    iterations: int
+    warmup: int
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    format_version: int = RESULTS_FORMAT_VERSION
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(data: dict) -> BenchmarkResult:
+        if data.get("format_version") != RESULTS_FORMAT_VERSION:
+            raise RuntimeError(
+                f"Baseline has format version {data.get('format_version')}, "
+                f"expected {RESULTS_FORMAT_VERSION}"
+            )
+        stages = {
+            name: StageTiming(**timing) for name, timing in data["stages"].items()
+        }
+        return BenchmarkResult(**{**data, "stages": stages})
+
+
+@dataclass
+class StageComparison:
+    stage: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s else 1.0
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    """Nearest-rank percentile of *samples*."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _replay(xml_dir: str, exclude_symbols: list[str]) -> dict[str, float]:
+    """Build and render the snapshot once, returning the time of each stage."""
+    # The parsing caches would otherwise be warm after the first iteration,
+    # while a real run starts with them empty.
+    clear_caches()
+
+    profiler = Profiler()
+    profile = profiler.view("bench")
+    start = time.perf_counter()
+    snapshot = build_snapshot(xml_dir, exclude_symbols=exclude_symbols, profile=profile)
+    with profile_phase(profile, "to_string"):
+        snapshot.to_string()
+    total = time.perf_counter() - start
+
+    timings = {record.name: record.wall_s for record in profiler.records}
+    timings["total"] = total
+    return timings
+
+
+def run_benchmark(
+    fixture_path: str,
+    iterations: int = 10,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """
+    Replay the fixture *warmup* times untimed, then *iterations* times
+    timed, and summarize the timing of each stage.
+    """
+    if iterations < 1:
+        raise ValueError("At least one iteration is required")
+
+    with tempfile.TemporaryDirectory(prefix="cxx-api-bench-") as tmp_dir:
+        manifest, xml_dir = extract_fixture(fixture_path, tmp_dir)
+
+        for _ in range(warmup):
+            _replay(xml_dir, manifest.exclude_symbols)
+
+        samples: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        for _ in range(iterations):
+            # Collect garbage from the previous iteration up front so that
+            # it is not attributed to a stage of this one.
+            gc.collect()
+            for stage, seconds in _replay(xml_dir, manifest.exclude_symbols).items():
+                samples[stage].append(seconds)
+
+    return BenchmarkResult(
+        fixture=os.path.basename(fixture_path),
+        view=manifest.view,
+        xml_sha256=manifest.xml_sha256,
+        iterations=iterations,
+        warmup=warmup,
+        stages={
+            stage: StageTiming(
+                median_s=statistics.median(times),
+                p95_s=_percentile(times, 95),
+                min_s=min(times),
+            )
+            for stage, times in samples.items()
+        },
+    )
+
+
+def compare_to_baseline(
+    result: BenchmarkResult, baseline: BenchmarkResult
+) -> list[StageComparison]:
+    """
+    Compare the median time of every stage measured in both results.
+    """
+    if result.xml_sha256 != baseline.xml_sha256:
+        raise RuntimeError(
+            f"Baseline was measured on different XML ({baseline.fixture}) "
+            f"than {result.fixture}"
+        )
+    return [
+        StageComparison(
+            stage=stage,
+            baseline_s=baseline.stages[stage].median_s,
+            current_s=timing.median_s,
+        )
+        for stage, timing in result.stages.items()
+        if stage in baseline.stages
+    ]
+
+
+def find_regressions(
+    comparisons: list[StageComparison],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_s: float = DEFAULT_MIN_DELTA_S,
+) -> list[StageComparison]:
+    """
+    Return the stages whose median got slower than the baseline by more
+    than *threshold* (a fraction of the baseline time) and by at least
+    *min_delta_s* seconds.
+    """
+    return [
+        comparison
+        for comparison in comparisons
+        if comparison.ratio > 1 + threshold
+        and comparison.current_s - comparison.baseline_s >= min_delta_s
+    ]
@@ -0,0 +1,225 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Scaling benchmark of the snapshot builder over synthetic XML.
+
+Each scale is generated as a multiple of the size of the ReactCommon view
+and measured in a fresh process, so that its peak RSS is not hidden by the
+high-water mark of a previous scale. Comparing consecutive scales gives the
+growth exponent of each stage: 1 for linear growth, 2 for quadratic.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict, dataclass, field
+
+from ..parser.main import build_snapshot
+from ..parser.profiling import profile_phase, Profiler
+from .synthetic import generate, REACT_COMMON_UNITS
+
+DEFAULT_SCALES = (1, 10, 100)
+
+# Stages of build_snapshot, plus rendering.
+STAGES = ("parse_xml", "finish", "exclusion_scan", "to_string")
+
+# Growth exponents above this are reported as superlinear.
+SUPERLINEAR_EXPONENT = 1.2
+
+# Stages faster than this, such as the exclusion scan of synthetic XML that
+# excludes nothing, are mostly noise and get no growth exponent.
+MIN_STAGE_S = 0.01
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes on Linux.
+_MAXRSS_BYTES = 1 if sys.platform == "darwin" else 1024
+_MIB = 1024 * 1024
+
+
+@dataclass
+class ScaleMeasurement:
+    scale: float
+    units: int
+    compounds: int
+    members: int
+    api_bytes: int
+    max_rss_mib: float
+    stages: dict[str, float] = field(default_factory=dict)
+
+
+def measure_xml(xml_dir: str) -> dict:
+    """
+    Build and render the snapshot of *xml_dir* once, returning the wall
+    time of each stage, the size of the output and the peak RSS.
+    """
+    profiler = Profiler()
+    profile = profiler.view("scaling")
+    snapshot = build_snapshot(xml_dir, profile=profile)
+    with profile_phase(profile, "to_string"):
+        api = snapshot.to_string()
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "api_bytes": len(api.encode()),
+        "max_rss_mib": usage.ru_maxrss * _MAXRSS_BYTES / _MIB,
+        "stages": {record.name: record.wall_s for record in profiler.records},
+    }
+
+
+def _measure_in_subprocess(xml_dir: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", __name__, xml_dir],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Measuring {xml_dir} failed:\n{result.stderr}")
+    return json.loads(result.stdout)
+
+
+def run_scaling(
+    scales: tuple[float, ...] = DEFAULT_SCALES,
+    work_dir: str | None = None,
+    verbose: bool = True,
+    depth: int = 3,
+    specializations: int = 1,
+) -> list[ScaleMeasurement]:
+    """
+    Generate and measure synthetic XML at each of *scales* times the size
+    of the ReactCommon view. *depth* and *specializations* are passed to
+    the generator: a depth of 0 puts every unit in the same namespace.
+    """
+    measurements = []
+    with tempfile.TemporaryDirectory(prefix="cxx-api-scaling-", dir=work_dir) as tmp:
+        for scale in scales:
+            units = max(1, round(scale * REACT_COMMON_UNITS))
+            xml_dir = os.path.join(tmp, f"scale-{scale:g}")
+            if verbose:
+                print(f"Generating {scale:g}x ({units} units)")
+            stats = generate(
+                xml_dir, units=units, depth=depth, specializations=specializations
+            )
+
+            if verbose:
+                print(f"Measuring {scale:g}x ({stats.compounds} compounds)")
+            result = _measure_in_subprocess(xml_dir)
+            measurements.append(
+                ScaleMeasurement(
+                    scale=scale,
+                    units=units,
+                    compounds=stats.compounds,
+                    members=stats.members,
+                    api_bytes=result["api_bytes"],
+                    max_rss_mib=result["max_rss_mib"],
+                    stages=result["stages"],
+                )
+            )
+            # Later scales dwarf earlier ones, so free the disk space early.
+            shutil.rmtree(xml_dir)
+    return measurements
+
+
+def growth_exponent(
+    smaller_size: float, smaller_cost: float, larger_size: float, larger_cost: float
+) -> float | None:
+    """
+    Exponent k such that cost grows as size**k between two measurements.
+    """
+    if smaller_cost <= 0 or larger_cost <= 0 or larger_size == smaller_size:
+        return None
+    return math.log(larger_cost / smaller_cost) / math.log(larger_size / smaller_size)
+
+
+def growth_exponents(
+    measurements: list[ScaleMeasurement],
+) -> list[dict[str, float | None]]:
+    """
+    Growth exponent of every stage, of the total and of the peak RSS between
+    each pair of consecutive measurements, with respect to the member count.
+    """
+    exponents = []
+    for smaller, larger in zip(measurements, measurements[1:]):
+        row: dict[str, float | None] = {}
+        for stage in STAGES:
+            if smaller.stages.get(stage, 0.0) < MIN_STAGE_S:
+                row[stage] = None
+                continue
+            row[stage] = growth_exponent(
+                smaller.members,
+                smaller.stages.get(stage, 0.0),
+                larger.members,
+                larger.stages.get(stage, 0.0),
+            )
+        row["total"] = growth_exponent(
+            smaller.members,
+            sum(smaller.stages.values()),
+            larger.members,
+            sum(larger.stages.values()),
+        )
+        row["max_rss"] = growth_exponent(
+            smaller.members, smaller.max_rss_mib, larger.members, larger.max_rss_mib
+        )
+        exponents.append(row)
+    return exponents
+
+
+def format_report(measurements: list[ScaleMeasurement]) -> list[str]:
+    lines = [
+        f"{'scale':>6} {'members':>9} {'api MiB':>8} {'RSS MiB':>8} "
+        + " ".join(f"{stage:>15}" for stage in (*STAGES, "total"))
+    ]
+    for m in measurements:
+        timings = [m.stages.get(stage, 0.0) for stage in STAGES]
+        timings.append(sum(m.stages.values()))
+        lines.append(
+            f"{m.scale:>5g}x {m.members:>9} {m.api_bytes / _MIB:>8.1f} "
+            f"{m.max_rss_mib:>8.1f} "
+            + " ".join(f"{seconds:>14.3f}s" for seconds in timings)
+        )
+
+    for (smaller, larger), row in zip(
+        zip(measurements, measurements[1:]), growth_exponents(measurements)
+    ):
+        superlinear = [
+            name
+            for name, exponent in row.items()
+            if exponent is not None and exponent > SUPERLINEAR_EXPONENT
+        ]
+        exponents = ", ".join(
+            f"{name} {exponent:.2f}"
+            for name, exponent in row.items()
+            if exponent is not None
+        )
+        line = f"Growth {smaller.scale:g}x -> {larger.scale:g}x: {exponents}"
+        if superlinear:
+            line += f" (superlinear: {', '.join(superlinear)})"
+        lines.append(line)
+    return lines
+
+
+def write_report(measurements: list[ScaleMeasurement], output_path: str) -> None:
+    with open(output_path, "w") as f:
+        json.dump(
+            {
+                "measurements": [asdict(m) for m in measurements],
+                "growth_exponents": growth_exponents(measurements),
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    # Measures a single scale in a fresh process, see _measure_in_subprocess.
+    print(json.dumps(measure_xml(sys.argv[1])))
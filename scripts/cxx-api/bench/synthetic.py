@@ -0,0 +1,584 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Synthetic Doxygen-shaped XML for stress-testing the snapshot builder.
+
+The XML is generated in units, each of which stands for one C++ header and
+one Objective-C header: a namespace with an enum, functions, typedefs and
+variables, a class hierarchy with overloads, a class template with
+partial specializations and a nested member template, and an Objective-C
+protocol, interface and category. Refids, index.xml and the compound files
+follow the layout Doxygen produces, so the output can be fed to
+build_snapshot directly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from xml.sax.saxutils import escape
+
+# Number of units whose snapshot is about as large as ReactCommonDebugCxx.api.
+REACT_COMMON_UNITS = 283
+
+_XML_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n"
+_DOXYGEN_VERSION = "1.16.1"
+
+# Doxygen's encoding of characters in refids, see
+# parser/utils/text_resolution.py.
+_REFID_ENCODINGS = (
+    ("...", "_8_8_8"),
+    (", ", "_00"),
+    (" ", "_01"),
+    ("*", "_02"),
+    ("=", "_05"),
+    ("&", "_06"),
+    ("(", "_07"),
+    (")", "_08"),
+    ("<", "_3"),
+    (">", "_4"),
+)
+
+# A linked text is a sequence of plain strings and (text, refid) references.
+LinkedText = Sequence["str | tuple[str, str]"]
+
+
+def _compound_refid(kind: str, name: str) -> str:
+    encoded = name.replace("_", "__").replace("::", "_1_1")
+    for raw, code in _REFID_ENCODINGS:
+        encoded = encoded.replace(raw, code)
+    return f"{kind}{encoded}"
+
+
+def _member_refid(compound_id: str, signature: str) -> str:
+    digest = hashlib.md5(signature.encode()).hexdigest()
+    return f"{compound_id}_1a{digest}"
+
+
+def _linked_text_xml(parts: LinkedText) -> str:
+    out = []
+    for part in parts:
+        if isinstance(part, tuple):
+            text, refid = part
+            out.append(f'<ref refid="{refid}" kindref="compound">{escape(text)}</ref>')
+        else:
+            out.append(escape(part))
+    return "".join(out)
+
+
+def _plain_text(parts: LinkedText) -> str:
+    return "".join(part[0] if isinstance(part, tuple) else part for part in parts)
+
+
+def _template_params_xml(
+    template_params: Sequence[tuple[str, LinkedText | None]],
+) -> str:
+    out = ["<templateparamlist>"]
+    for param_type, default in template_params:
+        out.append(f"<param><type>{escape(param_type)}</type>")
+        if default is not None:
+            out.append(f"<defval>{_linked_text_xml(default)}</defval>")
+        out.append("</param>")
+    out.append("</templateparamlist>")
+    return "".join(out)
+
+
+def _location_xml(file: str) -> str:
+    return f'<location file="{escape(file)}" line="1" column="1"/>'
+
+
+_EMPTY_DESCRIPTIONS = (
+    "<briefdescription></briefdescription><detaileddescription></detaileddescription>"
+)
+
+
+@dataclass
+class _Member:
+    kind: str
+    name: str
+    file: str
+    type: LinkedText = ()
+    argsstring: str | None = None
+    params: Sequence[tuple[LinkedText, str | None]] = ()
+    virt: str = "non-virtual"
+    const: bool = False
+    definition: str | None = None
+    initializer: LinkedText | None = None
+    enumvalues: Sequence[tuple[str, str | None]] = ()
+    template_params: Sequence[tuple[str, LinkedText | None]] | None = None
+    attrs: dict[str, str] = field(default_factory=dict)
+    id: str = ""
+    qualified_name: str = ""
+
+    def to_xml(self) -> str:
+        attrs = f'kind="{self.kind}" id="{self.id}" prot="public" static="no"'
+        if self.kind == "function":
+            attrs += (
+                f' const="{"yes" if self.const else "no"}" explicit="no"'
+                f' inline="no" virt="{self.virt}"'
+            )
+        elif self.kind == "variable":
+            attrs += ' mutable="no"'
+        for key, value in self.attrs.items():
+            attrs += f' {key}="{value}"'
+
+        definition = self.definition
+        if definition is None:
+            definition = f"{_plain_text(self.type)} {self.qualified_name}".strip()
+
+        body = []
+        if self.template_params is not None:
+            body.append(_template_params_xml(self.template_params))
+        body.append(f"<type>{_linked_text_xml(self.type)}</type>")
+        body.append(f"<definition>{escape(definition)}</definition>")
+        body.append(f"<argsstring>{escape(self.argsstring or '')}</argsstring>")
+        body.append(f"<name>{escape(self.name)}</name>")
+        body.append(f"<qualifiedname>{escape(self.qualified_name)}</qualifiedname>")
+        for param_type, param_name in self.params:
+            body.append(f"<param><type>{_linked_text_xml(param_type)}</type>")
+            if param_name:
+                body.append(f"<declname>{escape(param_name)}</declname>")
+            body.append("</param>")
+        for value_name, value_initializer in self.enumvalues:
+            value_id = _member_refid(self.id, value_name)
+            body.append(
+                f'<enumvalue id="{value_id}" prot="public">'
+                f"<name>{escape(value_name)}</name>"
+            )
+            if value_initializer is not None:
+                body.append(f"<initializer>{escape(value_initializer)}</initializer>")
+            body.append(f"{_EMPTY_DESCRIPTIONS}</enumvalue>")
+        if self.initializer is not None:
+            body.append(
+                f"<initializer>{_linked_text_xml(self.initializer)}</initializer>"
+            )
+        body.append(_EMPTY_DESCRIPTIONS)
+        body.append("<inbodydescription></inbodydescription>")
+        body.append(_location_xml(self.file))
+        return f"<memberdef {attrs}>{''.join(body)}</memberdef>"
+
+
+@dataclass
+class _Compound:
+    kind: str
+    name: str
+    file: str
+    refid_kind: str | None = None
+    language: str = "C++"
+    template_params: Sequence[tuple[str, LinkedText | None]] | None = None
+    bases: list[tuple[str, str | None]] = field(default_factory=list)
+    sections: dict[str, list[_Member]] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.id = _compound_refid(self.refid_kind or self.kind, self.name)
+
+    def add(self, section: str, member: _Member) -> None:
+        member.id = _member_refid(
+            self.id, f"{member.kind}:{member.name}:{member.argsstring}"
+        )
+        member.qualified_name = (
+            f"{self.name}::{member.name}" if self.language == "C++" else member.name
+        )
+        self.sections.setdefault(section, []).append(member)
+
+    @property
+    def member_count(self) -> int:
+        return sum(len(members) for members in self.sections.values())
+
+    def to_xml(self) -> str:
+        out = [
+            _XML_HEADER,
+            f'<doxygen version="{_DOXYGEN_VERSION}" xml:lang="en-US">',
+            f'<compounddef id="{self.id}" kind="{self.kind}" '
+            f'language="{self.language}" prot="public">',
+            f"<compoundname>{escape(self.name)}</compoundname>",
+        ]
+        for base_name, base_refid in self.bases:
+            refid = f' refid="{base_refid}"' if base_refid else ""
+            out.append(
+                f'<basecompoundref{refid} prot="public" virt="non-virtual">'
+                f"{escape(base_name)}</basecompoundref>"
+            )
+        if self.template_params is not None:
+            out.append(_template_params_xml(self.template_params))
+        for section, members in self.sections.items():
+            out.append(f'<sectiondef kind="{section}">')
+            out.extend(member.to_xml() for member in members)
+            out.append("</sectiondef>")
+        out.append(_EMPTY_DESCRIPTIONS)
+        out.append(_location_xml(self.file))
+        out.append("</compounddef></doxygen>\n")
+        return "".join(out)
+
+    def index_xml(self) -> str:
+        out = [
+            f'<compound refid="{self.id}" kind="{self.kind}">'
+            f"<name>{escape(self.name)}</name>"
+        ]
+        for members in self.sections.values():
+            for member in members:
+                out.append(
+                    f'<member refid="{member.id}" kind="{member.kind}">'
+                    f"<name>{escape(member.name)}</name></member>"
+                )
+        out.append("</compound>")
+        return "".join(out)
+
+
+@dataclass
+class SyntheticStats:
+    units: int
+    compounds: int
+    members: int
+    files: int
+
+
+class _Generator:
+    def __init__(self, depth: int, overloads: int, specializations: int) -> None:
+        self.depth = depth
+        self.overloads = overloads
+        self.specializations = specializations
+        self.compounds: list[_Compound] = []
+        self.namespaces: dict[str, _Compound] = {}
+        for name in ("facebook", "facebook::react"):
+            self._namespace(name, "/synthetic/ReactCommon/react/Base.h")
+
+    def _namespace(self, name: str, file: str) -> _Compound:
+        namespace = self.namespaces.get(name)
+        if namespace is None:
+            namespace = _Compound("namespace", name, file)
+            self.namespaces[name] = namespace
+            self.compounds.append(namespace)
+        return namespace
+
+    def add_unit(self, unit: int) -> None:
+        # Spread the units over namespaces of varying depth, up to self.depth
+        # levels below facebook::react.
+        namespace_name = "facebook::react"
+        for level in range(unit % (self.depth + 1)):
+            namespace_name += f"::detail{level}"
+        directory = f"unit{unit // 16}"
+        file = f"/synthetic/ReactCommon/react/{directory}/Unit{unit}.h"
+        namespace = self._namespace(namespace_name, file)
+
+        self._add_cxx_unit(unit, namespace, file)
+        self._add_objc_unit(
+            unit, f"/synthetic/React/Views/{directory}/RCTWidget{unit}.h"
+        )
+
+    def _add_cxx_unit(self, unit: int, namespace: _Compound, file: str) -> None:
+        ns = namespace.name
+
+        base = _Compound("struct", f"{ns}::WidgetBase{unit}", file)
+        base.add(
+            "public-func",
+            _Member(
+                "function", f"~WidgetBase{unit}", file, argsstring="()", virt="virtual"
+            ),
+        )
+        base_ref = (f"WidgetBase{unit}", base.id)
+        self.compounds.append(base)
+
+        widget = _Compound("class", f"{ns}::Widget{unit}", file)
+        widget.bases.append(base_ref)
+        widget_ref = (f"Widget{unit}", widget.id)
+        for i in range(self.overloads):
+            widget.add(
+                "public-func",
+                _Member(
+                    "function",
+                    "convert",
+                    file,
+                    type=["std::shared_ptr< const ", base_ref, " >"],
+                    argsstring=f"(jsi::Runtime &rt, int value{i}) const",
+                    params=[(["jsi::Runtime &"], "rt"), (["int"], f"value{i}")],
+                    const=True,
+                ),
+            )
+        widget.add(
+            "public-func",
+            _Member(
+                "function",
+                "getDelegate",
+                file,
+                type=["id< RCTWidgetDelegate > _Nullable"],
+                argsstring="() const override",
+                const=True,
+                virt="virtual",
+            ),
+        )
+        widget.add(
+            "public-attrib",
+            _Member(
+                "variable",
+                "children",
+                file,
+                type=[
+                    "std::map< std::string, std::vector< std::shared_ptr< ",
+                    base_ref,
+                    " > > >",
+                ],
+            ),
+        )
+        widget.add(
+            "public-type",
+            _Member(
+                "typedef",
+                "Shared",
+                file,
+                type=["std::shared_ptr< ", widget_ref, " >"],
+                definition=(
+                    f"using {ns}::Widget{unit}::Shared = std::shared_ptr<Widget{unit}>"
+                ),
+            ),
+        )
+        self.compounds.append(widget)
+
+        # A member template nested in the class, with nested template
+        # arguments referring back to the enclosing scopes.
+        node = _Compound(
+            "struct",
+            f"{ns}::Widget{unit}::Node",
+            file,
+            template_params=[("typename T", None), ("int Depth", ["0"])],
+        )
+        node.add(
+            "public-attrib",
+            _Member(
+                "variable",
+                "next",
+                file,
+                type=[
+                    "std::optional< std::unique_ptr< Node< std::vector< T >, Depth+1 > > >"
+                ],
+            ),
+        )
+        node.add(
+            "public-func",
+            _Member(
+                "function",
+                "visit",
+                file,
+                type=["void"],
+                argsstring="(const std::function< void(const T &, Shared) > &fn) const",
+                params=[
+                    (
+                        [
+                            "const std::function< void(const T &, ",
+                            widget_ref,
+                            "::Shared) > &",
+                        ],
+                        "fn",
+                    )
+                ],
+                const=True,
+            ),
+        )
+        self.compounds.append(node)
+
+        box = _Compound(
+            "class",
+            f"{ns}::Box{unit}",
+            file,
+            template_params=[
+                ("typename T", None),
+                ("typename Alloc", ["std::allocator< T >"]),
+            ],
+        )
+        box.bases.append(base_ref)
+        box.add(
+            "public-func",
+            _Member("function", "get", file, type=["T &"], argsstring="() noexcept"),
+        )
+        self.compounds.append(box)
+
+        for i in range(self.specializations):
+            arg = "T *" if i == 0 else f"std::array< T, {i} >"
+            specialization = _Compound(
+                "class",
+                f"{ns}::Box{unit}< {arg} >",
+                file,
+                template_params=[("typename T", None)],
+            )
+            specialization.bases.append(base_ref)
+            specialization.add(
+                "public-func",
+                _Member(
+                    "function",
+                    "get",
+                    file,
+                    type=[f"{arg} &"],
+                    argsstring="() const noexcept",
+                    const=True,
+                ),
+            )
+            self.compounds.append(specialization)
+
+        namespace.add(
+            "enum",
+            _Member(
+                "enum",
+                f"Mode{unit}",
+                file,
+                definition=f"enum class {ns}::Mode{unit}",
+                enumvalues=[("Off", None), ("On", "= 1"), ("Auto", "= 2")],
+                attrs={"strong": "yes"},
+            ),
+        )
+        namespace.add(
+            "func",
+            _Member(
+                "function",
+                f"makeWidget{unit}",
+                file,
+                type=["std::unique_ptr< ", widget_ref, " >"],
+                argsstring=(
+                    f"(const Widget{unit} &other, Mode{unit} mode=Mode{unit}::Off)"
+                ),
+                params=[
+                    (["const ", widget_ref, " &"], "other"),
+                    ([(f"Mode{unit}", namespace.id)], "mode"),
+                ],
+            ),
+        )
+        namespace.add(
+            "typedef",
+            _Member(
+                "typedef",
+                f"WidgetCallback{unit}",
+                file,
+                type=["std::function< void(", widget_ref, " *widget, int tag)>"],
+                definition=(
+                    f"using {ns}::WidgetCallback{unit} = "
+                    f"std::function<void(Widget{unit} *widget, int tag)>"
+                ),
+            ),
+        )
+        namespace.add(
+            "var",
+            _Member(
+                "variable",
+                f"kDefaultTag{unit}",
+                file,
+                type=["constexpr int"],
+                initializer=["= 42"],
+                attrs={"constexpr": "yes"},
+            ),
+        )
+
+    def _add_objc_unit(self, unit: int, file: str) -> None:
+        protocol = _Compound(
+            "protocol", f"RCTWidget{unit}Delegate-p", file, language="Objective-C"
+        )
+        protocol.add(
+            "public-func",
+            _Member(
+                "function",
+                "widgetDidChange:",
+                file,
+                type=["void"],
+                argsstring=f"(RCTWidget{unit} *widget)",
+                params=[([f"RCTWidget{unit} *"], "widget")],
+            ),
+        )
+        self.compounds.append(protocol)
+
+        # Doxygen reports interfaces as classes with an "interface" refid.
+        interface = _Compound(
+            "class",
+            f"RCTWidget{unit}",
+            file,
+            refid_kind="interface",
+            language="Objective-C",
+        )
+        interface.bases.append(("UIView", None))
+        interface.bases.append((f"<RCTWidget{unit}Delegate>", protocol.id))
+        interface.add(
+            "property",
+            _Member(
+                "property",
+                "title",
+                file,
+                type=["NSString *"],
+                attrs={"readable": "yes", "writable": "no", "accessor": "copy"},
+            ),
+        )
+        interface.add(
+            "public-func",
+            _Member(
+                "function",
+                "initWithFrame:",
+                file,
+                type=["instancetype"],
+                argsstring="(CGRect frame)",
+                params=[(["CGRect"], "frame")],
+            ),
+        )
+        self.compounds.append(interface)
+
+        category = _Compound(
+            "category", f"RCTWidget{unit}(Extras)", file, language="Objective-C"
+        )
+        category.add(
+            "public-func",
+            _Member("function", "reset", file, type=["void"], argsstring="()"),
+        )
+        self.compounds.append(category)
+
+    def write(self, output_dir: str) -> tuple[int, int]:
+        index = [
+            _XML_HEADER,
+            f'<doxygenindex version="{_DOXYGEN_VERSION}" xml:lang="en-US">',
+        ]
+        members = 0
+        for compound in self.compounds:
+            with open(os.path.join(output_dir, f"{compound.id}.xml"), "w") as f:
+                f.write(compound.to_xml())
+            index.append(compound.index_xml())
+            members += compound.member_count
+        index.append("</doxygenindex>\n")
+        with open(os.path.join(output_dir, "index.xml"), "w") as f:
+            f.write("".join(index))
+        return len(self.compounds), members
+
+
+def generate(
+    output_dir: str,
+    units: int = REACT_COMMON_UNITS,
+    depth: int = 3,
+    overloads: int = 4,
+    specializations: int = 1,
+) -> SyntheticStats:
+    """
+    Write a synthetic Doxygen XML tree of *units* units to *output_dir*.
+
+    Args:
+        output_dir: Directory to write index.xml and the compound files to.
+        units: Number of units. REACT_COMMON_UNITS units produce a snapshot
+            about as large as the ReactCommon view.
+        depth: Maximum number of namespace levels below facebook::react.
+        overloads: Number of overloads of the overloaded method of each class.
+        specializations: Number of partial specializations of the class
+            template of each unit.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    generator = _Generator(
+        depth=depth, overloads=overloads, specializations=specializations
+    )
+    for unit in range(units):
+        generator.add_unit(unit)
+    compounds, members = generator.write(output_dir)
+
+    return SyntheticStats(
+        units=units,
+        compounds=compounds,
+        members=members,
+        # index.xml and one file per compound
+        files=compounds + 1,
+    )
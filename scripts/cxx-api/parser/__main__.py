@@ -12,35 +12,93 @@ Usage:
 """
 
 import argparse
-import concurrent.futures
+import functools
+import importlib.metadata
 import os
+import resource
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import traceback
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 
+from .block_store import BlockStore
+from .codegen_cache import (
+    cached_codegen_output,
+    codegen_cache_key,
+    get_default_codegen_cache_dir,
+)
 from .config import ApiViewSnapshotConfig, parse_config_file
 from .doxygen import get_doxygen_bin, run_doxygen
+from .doxygen_shards import (
+    check_shard_equivalence,
+    list_input_files,
+    run_sharded_doxygen,
+)
+from .fingerprints import (
+    FingerprintCache,
+    get_default_fingerprint_cache_path,
+    get_frontend_sources,
+    hash_files,
+    load_fingerprints,
+    view_fingerprints,
+    with_snapshot_hashes,
+    write_fingerprints,
+)
 from .main import build_snapshot
+from .member_pool import MemberPool
 from .path_utils import get_react_native_dir
-from .snapshot_diff import validate_snapshots
+from .preview import find_views_of_header, preview_header
+from .processes import ProcessCancelledError, ProcessGroup
+from .profiling import max_rss_mib, PhaseRecord, profile_phase, Profiler, ViewProfile
+from .run_history import get_default_history_path, RunHistory
+from .run_observers import RunObservers
+from .scheduler import Scheduler, TaskCancelledError
+from .snapshot import Snapshot
+from .snapshot_diff import SnapshotValidator
+from .snapshot_file import snapshot_file_content, write_snapshot
+from .symbol_db import SymbolDatabase
+from .utils import format_cache_stats, get_cache_stats
+from .variant_matrix import VariantMatrix
+from .watch import watch, WatchedView
+
+# tracemalloc is process-wide, so views are measured one at a time.
+_MEMORY_REPORT_LOCK = threading.Lock()
+_MIB = 1024 * 1024
+# Peak memory assumed for tasks when no task has been measured yet.
+_DEFAULT_TASK_MEMORY_MIB = 1024.0
+# Views the tree-sitter frontend can build. The other views declare
+# Objective-C types, which tree-sitter does not parse.
+_TREE_SITTER_VIEWS = ("ReactCommon",)
 
 
 def run_command(
     cmd: list[str],
     label: str,
     verbose: bool = False,
+    phase: PhaseRecord | None = None,
+    processes: ProcessGroup | None = None,
     **kwargs,
 ) -> subprocess.CompletedProcess:
     """Run a subprocess command with consistent error handling."""
-    result = subprocess.run(cmd, **kwargs)
+    if processes is not None:
+        result = processes.run(
+            cmd, prefix=f"{label}: ", phase=phase, cwd=kwargs.get("cwd")
+        )
+    else:
+        run = phase.run if phase is not None else subprocess.run
+        result = run(cmd, **kwargs)
     if result.returncode != 0:
         stderr_output = result.stderr or ""
         if isinstance(stderr_output, bytes):
             stderr_output = stderr_output.decode("utf-8", errors="replace")
         print(f"{label} failed (exit code {result.returncode})", file=sys.stderr)
-        if stderr_output:
+        # Streamed stderr has already been printed.
+        if stderr_output and not (processes is not None and processes.stream_stderr):
             print(stderr_output, file=sys.stderr)
         raise RuntimeError(
             f"{label} finished with error (exit code {result.returncode})"
@@ -55,6 +113,8 @@ def build_codegen(
     verbose: bool = False,
     output_path: str = "./api/codegen",
     label: str = "",
+    phase: PhaseRecord | None = None,
+    processes: ProcessGroup | None = None,
 ) -> str:
     react_native_dir = os.path.join(get_react_native_dir(), "packages", "react-native")
 
@@ -74,6 +134,8 @@ def build_codegen(
         ],
         label=f"[{label}] Codegen" if label else "Codegen",
         verbose=verbose,
+        phase=phase,
+        processes=processes,
         cwd=react_native_dir,
         capture_output=True,
         text=True,
@@ -90,16 +152,28 @@ def build_snapshot_for_view(
     include_directories: list[str],
     exclude_patterns: list[str],
     definitions: dict[str, str | int],
-    output_dir: str,
+    output_dir: str | None,
     codegen_dir: str | None = None,
     verbose: bool = True,
     input_filter: str = None,
     work_dir: str | None = None,
     exclude_symbols: list[str] | None = None,
+    memory_report: bool = False,
+    member_pool: MemberPool | None = None,
+    keep_xml: bool = False,
+    processes: ProcessGroup | None = None,
+    doxygen_shards: int = 1,
+    verify_shards: bool = False,
+    frontend: str = "doxygen",
+    observers: RunObservers | None = None,
 ) -> str:
     if verbose:
         print(f"[{api_view}] Generating API view")
 
+    if observers is None:
+        observers = RunObservers()
+    profile = observers.view_profile(api_view)
+
     include_directories = list(include_directories)
 
     if work_dir is None:
@@ -110,48 +184,426 @@ def build_snapshot_for_view(
     elif verbose:
         print(f"[{api_view}] Skipping codegen")
 
-    config_file = f".doxygen.config.{api_view}.generated"
+    if frontend == "tree-sitter":
+        return _build_snapshot_for_view_with_tree_sitter(
+            api_view,
+            react_native_dir,
+            include_directories,
+            exclude_patterns,
+            definitions,
+            output_dir,
+            verbose=verbose,
+            exclude_symbols=exclude_symbols,
+            memory_report=memory_report,
+            member_pool=member_pool,
+            observers=observers,
+        )
 
-    run_doxygen(
+    config_file = f".doxygen.config.{api_view}.generated"
+    run_unsharded = functools.partial(
+        run_doxygen,
         working_dir=react_native_dir,
         include_directories=include_directories,
         exclude_patterns=exclude_patterns,
         definitions=definitions,
         input_filter=input_filter,
         verbose=verbose,
-        output_dir=work_dir,
         config_file=config_file,
         label=api_view,
+        processes=processes,
     )
 
+    with profile_phase(profile, "doxygen") as phase:
+        if doxygen_shards > 1:
+            xml_dir = run_sharded_doxygen(
+                working_dir=react_native_dir,
+                include_directories=include_directories,
+                exclude_patterns=exclude_patterns,
+                definitions=definitions,
+                shards=doxygen_shards,
+                input_filter=input_filter,
+                verbose=verbose,
+                output_dir=work_dir,
+                label=api_view,
+                phase=phase,
+                processes=processes,
+            )
+        else:
+            run_unsharded(output_dir=work_dir, phase=phase)
+            xml_dir = os.path.join(work_dir, "xml")
+
     if verbose:
         print(f"[{api_view}] Building snapshot")
 
-    snapshot = build_snapshot(
-        os.path.join(work_dir, "xml"), exclude_symbols=exclude_symbols
+    snapshot_string = _build_snapshot_string(
+        api_view,
+        functools.partial(
+            build_snapshot,
+            xml_dir,
+            exclude_symbols=exclude_symbols,
+            member_pool=member_pool,
+            profile=profile,
+        ),
+        memory_report,
+        observers,
+    )
+
+    if doxygen_shards > 1 and verify_shards:
+        if verbose:
+            print(f"[{api_view}] Comparing with an unsharded Doxygen run")
+        unsharded_dir = os.path.join(work_dir, "unsharded")
+        with profile_phase(profile, "verify_shards") as phase:
+            run_unsharded(output_dir=unsharded_dir, phase=phase)
+            check_shard_equivalence(
+                build_snapshot(
+                    os.path.join(unsharded_dir, "xml"),
+                    exclude_symbols=exclude_symbols,
+                ).to_string(),
+                snapshot_string,
+                api_view,
+            )
+
+    _publish_snapshot(api_view, snapshot_string, output_dir, observers)
+
+    if keep_xml and output_dir is not None:
+        xml_dst = os.path.join(output_dir, "xml", api_view)
+        if isinstance(xml_dir, str):
+            _keep_xml(xml_dir, xml_dst, verbose)
+        else:
+            shutil.rmtree(xml_dst, ignore_errors=True)
+            for i, shard_xml_dir in enumerate(xml_dir):
+                _keep_xml(shard_xml_dir, os.path.join(xml_dst, f"shard{i}"), verbose)
+
+    return snapshot_string
+
+
+def _build_snapshot_for_view_with_tree_sitter(
+    api_view: str,
+    react_native_dir: str,
+    include_directories: list[str],
+    exclude_patterns: list[str],
+    definitions: dict[str, str | int],
+    output_dir: str | None,
+    verbose: bool = True,
+    exclude_symbols: list[str] | None = None,
+    memory_report: bool = False,
+    member_pool: MemberPool | None = None,
+    observers: RunObservers | None = None,
+) -> str:
+    """
+    Build the snapshot of a view from its headers parsed with tree-sitter,
+    without running Doxygen.
+    """
+    if observers is None:
+        observers = RunObservers()
+    from .tree_sitter_frontend import build_snapshot_from_headers, get_view_macros
+
+    template = os.path.join(react_native_dir, ".doxygen.config.template")
+    files = list_input_files(include_directories, exclude_patterns, template)
+    if not files:
+        raise RuntimeError(f"No input files found for {api_view}")
+    macros = get_view_macros(
+        definitions, os.path.join(react_native_dir, ".doxygen.config.template")
+    )
+    if verbose:
+        print(f"[{api_view}] Parsing {len(files)} headers with tree-sitter")
+
+    snapshot_string = _build_snapshot_string(
+        api_view,
+        functools.partial(
+            build_snapshot_from_headers,
+            files,
+            macros,
+            exclude_symbols=exclude_symbols,
+            member_pool=member_pool,
+            profile=observers.view_profile(api_view),
+        ),
+        memory_report,
+        observers,
+    )
+    _publish_snapshot(api_view, snapshot_string, output_dir, observers)
+    return snapshot_string
+
+
+def _publish_snapshot(
+    api_view: str,
+    snapshot_string: str,
+    output_dir: str | None,
+    observers: RunObservers,
+) -> None:
+    write_snapshot(
+        api_view,
+        snapshot_string,
+        output_dir,
+        observers.view_profile(api_view),
+        observers.block_store,
     )
-    snapshot_string = snapshot.to_string()
+    if observers.on_snapshot is not None:
+        observers.on_snapshot(api_view, snapshot_string)
+
+
+def _build_snapshot_string(
+    api_view: str,
+    build: Callable[[], Snapshot],
+    memory_report: bool,
+    observers: RunObservers,
+) -> str:
+    profile = observers.view_profile(api_view)
+    if observers.symbol_db is not None:
+        build = functools.partial(
+            _build_and_record,
+            api_view,
+            build,
+            observers.symbol_db.add_view,
+            "symbol_db",
+            profile,
+        )
+    if observers.variant_matrix is not None:
+        build = functools.partial(
+            _build_and_record,
+            api_view,
+            build,
+            observers.variant_matrix.add_view,
+            "variant_matrix",
+            profile,
+        )
+    if memory_report:
+        return _build_snapshot_string_with_memory_report(api_view, build, profile)
+    snapshot = build()
+    with profile_phase(profile, "to_string"):
+        return snapshot.to_string()
+
 
-    output_file = os.path.join(output_dir, f"{api_view}Cxx.api")
-    os.makedirs(output_dir, exist_ok=True)
+def _build_and_record(
+    api_view: str,
+    build: Callable[[], Snapshot],
+    record: Callable[[str, Snapshot], None],
+    phase: str,
+    profile: ViewProfile | None,
+) -> Snapshot:
+    snapshot = build()
+    with profile_phase(profile, phase):
+        record(api_view, snapshot)
+    return snapshot
+
+
+def _build_snapshot_string_with_memory_report(
+    api_view: str,
+    build: Callable[[], Snapshot],
+    profile: ViewProfile | None = None,
+) -> str:
+    """Build and render a snapshot while tracing Python heap usage.
 
-    with open(output_file, "w") as f:
-        f.write("// @" + "generated by scripts/cxx-api\n\n")
-        f.write(snapshot_string)
+    Reports the peak traced memory of the whole build and the memory still
+    retained by the finished scope tree before rendering.
+    """
+    with _MEMORY_REPORT_LOCK:
+        tracemalloc.start()
+        try:
+            snapshot = build()
+            retained, _ = tracemalloc.get_traced_memory()
+            with profile_phase(profile, "to_string"):
+                snapshot_string = snapshot.to_string()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
 
+    print(
+        f"[{api_view}] Memory: peak {peak / _MIB:.1f} MiB, "
+        f"retained by scope tree {retained / _MIB:.1f} MiB"
+    )
     return snapshot_string
 
 
+def _keep_xml(xml_src: str, xml_dst: str, verbose: bool) -> None:
+    if os.path.exists(xml_dst):
+        shutil.rmtree(xml_dst)
+    shutil.copytree(xml_src, xml_dst)
+    if verbose:
+        print(f"XML files saved to {xml_dst}")
+
+
+def _build_codegen_cached(
+    platform: str,
+    react_native_dir: str,
+    output_path: str,
+    cache_dir: str | None,
+    verbose: bool,
+    phase: PhaseRecord,
+    processes: ProcessGroup | None = None,
+) -> str:
+    """Run codegen for *platform*, or reuse its output from *cache_dir*."""
+    if cache_dir is None:
+        return build_codegen(
+            platform,
+            verbose=verbose,
+            output_path=output_path,
+            label=platform,
+            phase=phase,
+            processes=processes,
+        )
+
+    key = codegen_cache_key(react_native_dir, platform)
+    codegen_dir, cached = cached_codegen_output(
+        cache_dir,
+        key,
+        lambda output: build_codegen(
+            platform,
+            verbose=verbose,
+            output_path=output,
+            label=platform,
+            phase=phase,
+            processes=processes,
+        ),
+    )
+    phase.count("cache_hit", int(cached))
+    if verbose and cached:
+        print(f"[{platform}] Reusing cached codegen output {codegen_dir}")
+    return codegen_dir
+
+
+def _codegen_task(platform: str) -> str:
+    return f"Codegen {platform}"
+
+
+def _estimate_from_history(
+    history: RunHistory | None,
+    tasks: list[str],
+    measurement: str,
+    default: float,
+) -> dict[str, float]:
+    """
+    Estimate a measurement of each task from previous runs. Tasks that never
+    ran are assumed to measure the average of the other tasks, or *default*
+    when no task ran before.
+    """
+    known = {}
+    if history is not None:
+        for task in tasks:
+            value = history.get(task, measurement)
+            if value is not None:
+                known[task] = value
+    if known:
+        default = sum(known.values()) / len(known)
+    return {task: known.get(task, default) for task in tasks}
+
+
+def get_default_memory_budget_mib() -> float | None:
+    """
+    Three quarters of the physical memory of the host, if it is known.
+    """
+    try:
+        total = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+    return total * 0.75 / _MIB if total > 0 else None
+
+
+@contextmanager
+def _measure_peak_memory(
+    task: str, processes: ProcessGroup, peaks: dict[str, float]
+) -> Iterator[None]:
+    """
+    Record in *peaks* the peak memory of *task*: the peak RSS of the
+    Doxygen or node processes it ran, or the growth of the peak RSS of the
+    parser process while it ran, whichever is larger. The growth is a lower
+    bound when other tasks raise the peak at the same time.
+    """
+    processes.take_max_rss_mib()
+    start_mib = max_rss_mib(resource.getrusage(resource.RUSAGE_SELF))
+    yield
+    peaks[task] = max(
+        processes.take_max_rss_mib(),
+        max_rss_mib(resource.getrusage(resource.RUSAGE_SELF)) - start_mib,
+    )
+
+
+def _run_measured_task(
+    results: dict[str, object],
+    run: Callable[[dict[str, object]], object],
+    task: str,
+    processes: ProcessGroup,
+    peaks: dict[str, float],
+) -> object:
+    with _measure_peak_memory(task, processes, peaks):
+        return run(results)
+
+
+def _run_codegen_task(
+    results: dict[str, object],
+    platform: str,
+    react_native_dir: str,
+    output_path: str,
+    cache_dir: str | None,
+    verbose: bool,
+    profiler: Profiler | None,
+    processes: ProcessGroup,
+) -> str:
+    os.makedirs(output_path, exist_ok=True)
+    codegen_profile = (
+        profiler.view(_codegen_task(platform)) if profiler is not None else None
+    )
+    with profile_phase(codegen_profile, "codegen") as phase:
+        return _build_codegen_cached(
+            platform,
+            react_native_dir=react_native_dir,
+            output_path=output_path,
+            cache_dir=cache_dir,
+            verbose=verbose,
+            phase=phase,
+            processes=processes,
+        )
+
+
+def _run_view_task(
+    results: dict[str, object],
+    build_view: Callable[..., str],
+    codegen_task: str | None,
+    work_dir: str,
+) -> str:
+    # The Doxygen XML of a view is removed as soon as the view is done, so
+    # that failed or cancelled views don't leave it behind until the end of
+    # the run.
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        snapshot_string = build_view(
+            codegen_dir=results.get(codegen_task), work_dir=work_dir
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return snapshot_string
+
+
+def _print_cache_stats() -> None:
+    print("Parsing caches:")
+    for line in format_cache_stats():
+        print(f"  {line}")
+
+
 def build_snapshots(
     snapshot_configs: list[ApiViewSnapshotConfig],
     react_native_dir: str,
-    output_dir: str,
+    output_dir: str | None,
     input_filter: str | None,
     verbose: bool,
     view_filter: str | None = None,
     is_test: bool = False,
     keep_xml: bool = False,
+    memory_report: bool = False,
+    share_variants: bool = False,
+    codegen_cache_dir: str | None = None,
+    history: RunHistory | None = None,
+    fail_fast: bool = False,
+    memory_budget_mib: float | None = None,
+    doxygen_shards: int = 1,
+    verify_shards: bool = False,
+    frontend: str = "doxygen",
+    observers: RunObservers | None = None,
 ) -> None:
+    # Snapshots are written to *output_dir*, if any, and passed to the
+    # observers of the run as soon as they are built.
+    if observers is None:
+        observers = RunObservers()
     if not is_test:
         configs_to_build = [
             config
@@ -160,60 +612,151 @@ def build_snapshots(
         ]
 
         with tempfile.TemporaryDirectory(prefix="cxx-api-") as parent_tmp:
-            # Run codegen once per unique platform before parallel snapshot generation.
-            # Debug/release variants share the same codegen output, and running
-            # multiple codegen processes in parallel causes race conditions
-            # (e.g. concurrent yarn install in buildCodegenIfNeeded).
-            codegen_dirs: dict[str, str] = {}
-            for config in configs_to_build:
-                platform = config.codegen_platform
-                if platform is not None and platform not in codegen_dirs:
-                    codegen_output = os.path.join(parent_tmp, f"codegen-{platform}")
-                    os.makedirs(codegen_output, exist_ok=True)
-                    codegen_dirs[platform] = build_codegen(
-                        platform,
-                        verbose=verbose,
-                        output_path=codegen_output,
-                        label=platform,
-                    )
-
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = {}
+            # Variants of the same platform share one pool so that identical
+            # members are stored and rendered once.
+            member_pools: dict[str | None, MemberPool] = {}
+            if share_variants:
                 for config in configs_to_build:
-                    work_dir = os.path.join(parent_tmp, config.snapshot_name)
-                    os.makedirs(work_dir, exist_ok=True)
-                    future = executor.submit(
-                        build_snapshot_for_view,
-                        api_view=config.snapshot_name,
+                    member_pools.setdefault(config.view_name, MemberPool())
+
+            # Codegen runs once per unique platform, and only ever one at a
+            # time: running multiple codegen processes in parallel causes
+            # race conditions (e.g. concurrent yarn install in
+            # buildCodegenIfNeeded). Debug/release variants share the same
+            # codegen output, and views without codegen don't wait for it.
+            platforms = dict.fromkeys(
+                config.codegen_platform
+                for config in configs_to_build
+                if config.codegen_platform is not None
+            )
+            tasks = [_codegen_task(platform) for platform in platforms] + [
+                config.snapshot_name for config in configs_to_build
+            ]
+            costs = _estimate_from_history(history, tasks, "wall_s", 1.0)
+            # Doxygen processes and parsed XML trees of parallel views can
+            # exceed the memory of the host, so views only start while their
+            # peak memory in previous runs fits in the budget.
+            memory = _estimate_from_history(
+                history, tasks, "max_rss_mib", _DEFAULT_TASK_MEMORY_MIB
+            )
+            peak_memory: dict[str, float] = {}
+
+            # Doxygen and codegen warnings are streamed with the name of
+            # their view. In fail-fast mode, the first failure kills the
+            # processes of the other views.
+            processes = ProcessGroup(stream_stderr=verbose)
+            scheduler = Scheduler(memory_budget_mib=memory_budget_mib)
+
+            def add_task(task: str, run: Callable[..., object], **kwargs) -> None:
+                scheduler.add(
+                    task,
+                    functools.partial(
+                        _run_measured_task,
+                        run=run,
+                        task=task,
+                        processes=processes,
+                        peaks=peak_memory,
+                    ),
+                    cost=costs[task],
+                    memory_mib=memory[task],
+                    **kwargs,
+                )
+
+            for platform in platforms:
+                codegen_output = os.path.join(parent_tmp, f"codegen-{platform}")
+                add_task(
+                    _codegen_task(platform),
+                    functools.partial(
+                        _run_codegen_task,
+                        platform=platform,
                         react_native_dir=react_native_dir,
-                        include_directories=config.inputs,
-                        exclude_patterns=config.exclude_patterns,
-                        definitions=config.definitions,
-                        output_dir=output_dir,
-                        codegen_dir=codegen_dirs.get(config.codegen_platform),
+                        output_path=codegen_output,
+                        cache_dir=codegen_cache_dir,
                         verbose=verbose,
-                        input_filter=input_filter if config.input_filter else None,
-                        work_dir=work_dir,
-                        exclude_symbols=config.exclude_symbols,
+                        profiler=observers.profiler,
+                        processes=processes,
+                    ),
+                    serial_group="codegen",
+                )
+
+            for config in configs_to_build:
+                codegen_task = (
+                    _codegen_task(config.codegen_platform)
+                    if config.codegen_platform is not None
+                    else None
+                )
+                build_view = functools.partial(
+                    build_snapshot_for_view,
+                    api_view=config.snapshot_name,
+                    react_native_dir=react_native_dir,
+                    include_directories=config.inputs,
+                    exclude_patterns=config.exclude_patterns,
+                    definitions=config.definitions,
+                    output_dir=output_dir,
+                    verbose=verbose,
+                    input_filter=input_filter if config.input_filter else None,
+                    exclude_symbols=config.exclude_symbols,
+                    memory_report=memory_report,
+                    member_pool=member_pools.get(config.view_name),
+                    keep_xml=keep_xml,
+                    processes=processes,
+                    doxygen_shards=doxygen_shards,
+                    verify_shards=verify_shards,
+                    frontend=_view_frontend(config, frontend, verbose),
+                    observers=observers,
+                )
+                add_task(
+                    config.snapshot_name,
+                    functools.partial(
+                        _run_view_task,
+                        build_view=build_view,
+                        codegen_task=codegen_task,
+                        work_dir=os.path.join(parent_tmp, config.snapshot_name),
+                    ),
+                    dependencies=(codegen_task,) if codegen_task else (),
+                )
+
+            outcomes = scheduler.run(fail_fast=fail_fast, cancel=processes.cancel)
+
+            errors = []
+            cancelled = []
+            for task, outcome in outcomes.items():
+                if outcome.error is None:
+                    if history is not None:
+                        history.record(task, "wall_s", outcome.wall_s)
+                        history.record(task, "max_rss_mib", peak_memory[task])
+                    continue
+                if isinstance(
+                    outcome.error, (TaskCancelledError, ProcessCancelledError)
+                ):
+                    cancelled.append(task)
+                    if verbose:
+                        print(f"[{task}] Cancelled")
+                    continue
+                errors.append((task, outcome.error))
+                if verbose:
+                    print(
+                        f"[{task}] Error generating:\n"
+                        f"{''.join(traceback.format_exception(outcome.error))}"
+                    )
+
+            if errors:
+                failed_views = ", ".join(name for name, _ in errors)
+                if cancelled:
+                    failed_views += f" (cancelled: {', '.join(cancelled)})"
+                raise RuntimeError(f"Failed to generate snapshots: {failed_views}")
+
+            if memory_report:
+                _print_cache_stats()
+
+            if verbose:
+                for view_name, pool in member_pools.items():
+                    stats = pool.stats
+                    print(
+                        f"[{view_name}] Shared {stats.shared_members} of "
+                        f"{stats.members} members and {stats.shared_arguments} "
+                        f"of {stats.arguments} arguments across variants"
                     )
-                    futures[future] = config.snapshot_name
-
-                errors = []
-                for future in concurrent.futures.as_completed(futures):
-                    view_name = futures[future]
-                    try:
-                        future.result()
-                    except Exception as e:
-                        errors.append((view_name, e))
-                        if verbose:
-                            print(
-                                f"[{view_name}] Error generating:\n"
-                                f"{traceback.format_exc()}"
-                            )
-
-                if errors:
-                    failed_views = ", ".join(name for name, _ in errors)
-                    raise RuntimeError(f"Failed to generate snapshots: {failed_views}")
     else:
         work_dir = os.path.join(react_native_dir, "api")
         snapshot = build_snapshot_for_view(
@@ -227,21 +770,198 @@ def build_snapshots(
             verbose=verbose,
             input_filter=input_filter,
             work_dir=work_dir,
+            memory_report=memory_report,
+            observers=observers,
         )
 
-        if keep_xml:
-            xml_src = os.path.join(work_dir, "xml")
-            xml_dst = os.path.join(output_dir, "xml")
-            if os.path.exists(xml_dst):
-                shutil.rmtree(xml_dst)
-            shutil.copytree(xml_src, xml_dst)
-            if verbose:
-                print(f"XML files saved to {xml_dst}")
+        if memory_report:
+            _print_cache_stats()
+
+        if keep_xml and output_dir is not None:
+            _keep_xml(
+                os.path.join(work_dir, "xml"),
+                os.path.join(output_dir, "xml"),
+                verbose,
+            )
 
         if verbose:
             print(snapshot)
 
 
+def _view_frontend(config: ApiViewSnapshotConfig, frontend: str, verbose: bool) -> str:
+    if frontend == "tree-sitter" and config.view_name not in _TREE_SITTER_VIEWS:
+        if verbose:
+            print(
+                f"[{config.snapshot_name}] The tree-sitter frontend only "
+                f"supports {', '.join(_TREE_SITTER_VIEWS)}, using Doxygen"
+            )
+        return "doxygen"
+    return frontend
+
+
+def _get_environment_fingerprint(
+    react_native_package_dir: str, config_path: str, doxygen_version: str, frontend: str
+) -> str:
+    """
+    Hash what the snapshots of all views depend on besides their headers: the
+    config, the parser and the sources and version of the frontend (the
+    Doxygen template and version, or the tree-sitter packages).
+    """
+    parser_dir = os.path.dirname(os.path.abspath(__file__))
+    paths = [config_path, *get_frontend_sources(parser_dir, frontend)]
+    if frontend == "tree-sitter":
+        versions = [
+            f"{package} {importlib.metadata.version(package)}"
+            for package in ("tree-sitter", "tree-sitter-cpp")
+        ]
+    else:
+        template_path = os.path.join(
+            react_native_package_dir, ".doxygen.config.template"
+        )
+        if os.path.exists(template_path):
+            paths.append(template_path)
+        versions = [doxygen_version]
+    return "\n".join([hash_files(paths, get_react_native_dir()), frontend, *versions])
+
+
+def _validate_view(
+    validator: SnapshotValidator,
+    profiler: Profiler | None,
+    api_view: str,
+    snapshot_string: str,
+) -> None:
+    with profile_phase(
+        profiler.view(api_view) if profiler is not None else None, "validate"
+    ):
+        validator.check(f"{api_view}Cxx.api", snapshot_file_content(snapshot_string))
+
+
+def _skip_unchanged_views(
+    configs: list[ApiViewSnapshotConfig],
+    fingerprints: dict[str, dict],
+    snapshot_dir: str,
+    output_dir: str | None,
+) -> list[ApiViewSnapshotConfig]:
+    """
+    Get the views whose fingerprints, or committed snapshot, don't match the
+    stored ones. The committed snapshots of the other views are copied to
+    *output_dir*, if any.
+    """
+    stored = load_fingerprints(snapshot_dir)
+    current = with_snapshot_hashes(fingerprints, snapshot_dir)
+    changed = []
+    for config in configs:
+        name = config.snapshot_name
+        committed_path = os.path.join(snapshot_dir, f"{name}Cxx.api")
+        if current[name]["snapshot"] is None or stored.get(name) != current[name]:
+            changed.append(config)
+            continue
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            shutil.copyfile(committed_path, os.path.join(output_dir, f"{name}Cxx.api"))
+    return changed
+
+
+def _preview_header(
+    header: str,
+    snapshot_configs: list[ApiViewSnapshotConfig],
+    react_native_dir: str,
+    input_filter: str | None,
+    view_filter: str | None,
+    codegen_cache_dir: str | None,
+) -> None:
+    configs = find_views_of_header(
+        header,
+        [
+            config
+            for config in snapshot_configs
+            if not view_filter or config.snapshot_name == view_filter
+        ],
+        os.path.join(react_native_dir, ".doxygen.config.template"),
+    )
+    if not configs:
+        views = view_filter or "any view"
+        print(f"{header} is not an input of {views}", file=sys.stderr)
+        sys.exit(1)
+    config = configs[0]
+    if not view_filter:
+        print(f"Using the config of {config.snapshot_name}", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="cxx-api-preview-") as work_dir:
+        codegen_dir = None
+        if config.codegen_platform is not None:
+            with profile_phase(None, "codegen") as phase:
+                codegen_dir = _build_codegen_cached(
+                    config.codegen_platform,
+                    react_native_dir=react_native_dir,
+                    output_path=os.path.join(work_dir, "codegen"),
+                    cache_dir=codegen_cache_dir,
+                    verbose=False,
+                    phase=phase,
+                )
+        print(
+            preview_header(
+                header,
+                config,
+                react_native_dir=react_native_dir,
+                work_dir=work_dir,
+                codegen_dir=codegen_dir,
+                input_filter=input_filter if config.input_filter else None,
+            )
+        )
+
+
+def _watch_views(
+    snapshot_configs: list[ApiViewSnapshotConfig],
+    react_native_dir: str,
+    output_dir: str,
+    input_filter: str | None,
+    view_filter: str | None,
+    shards: int,
+    interval: float,
+    codegen_cache_dir: str | None,
+) -> None:
+    configs = [
+        config
+        for config in snapshot_configs
+        if not view_filter or config.snapshot_name == view_filter
+    ]
+    with tempfile.TemporaryDirectory(prefix="cxx-api-watch-") as parent_tmp:
+        # Codegen output only depends on the specs, so it is not watched.
+        codegen_dirs = {}
+        for platform in dict.fromkeys(
+            config.codegen_platform
+            for config in configs
+            if config.codegen_platform is not None
+        ):
+            with profile_phase(None, "codegen") as phase:
+                codegen_dirs[platform] = _build_codegen_cached(
+                    platform,
+                    react_native_dir=react_native_dir,
+                    output_path=os.path.join(parent_tmp, f"codegen-{platform}"),
+                    cache_dir=codegen_cache_dir,
+                    verbose=True,
+                    phase=phase,
+                )
+
+        views = [
+            WatchedView(
+                config,
+                react_native_dir=react_native_dir,
+                output_dir=output_dir,
+                work_dir=os.path.join(parent_tmp, config.snapshot_name),
+                shards=shards,
+                codegen_dir=codegen_dirs.get(config.codegen_platform),
+                input_filter=input_filter if config.input_filter else None,
+            )
+            for config in configs
+        ]
+        try:
+            watch(views, interval=interval, stdin=sys.stdin)
+        except KeyboardInterrupt:
+            pass
+
+
 def get_default_snapshot_dir() -> str:
     return os.path.join(get_react_native_dir(), "scripts", "cxx-api", "api-snapshots")
 
@@ -258,7 +978,12 @@ def main():
     parser.add_argument(
         "--validate",
         action="store_true",
-        help="Generate snapshots to a temp directory and compare against committed ones",
+        help=(
+            "Compare the snapshots of the views in memory with the committed ones "
+            "as each view is built, writing them only with --output-dir. With "
+            "--fingerprints, views whose API fingerprints match the committed "
+            "ones are reported unchanged without being built"
+        ),
     )
     parser.add_argument(
         "--validate-output",
@@ -283,11 +1008,181 @@ def main():
     parser.add_argument(
         "--xml",
         action="store_true",
-        help="Keep the generated Doxygen XML files next to the .api output in a xml/ directory",
+        help=(
+            "Keep the generated Doxygen XML files next to the .api output in a "
+            "xml/ directory (xml/<view>/ for each view outside --test)"
+        ),
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help=(
+            "Report the peak traced Python memory used to build each view "
+            "and the hit rates of the parsing caches"
+        ),
+    )
+    parser.add_argument(
+        "--share-variants",
+        action="store_true",
+        help="Share identical members between the variants of each platform",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        metavar="DIR",
+        help=(
+            "Write a per-phase profile of each view to DIR, as a JSON summary "
+            "(profile.json) and a Chrome trace (trace.json)"
+        ),
+    )
+    parser.add_argument(
+        "--codegen-cache-dir",
+        type=str,
+        default=get_default_codegen_cache_dir(),
+        help=(
+            "Directory caching codegen output by a hash of its inputs "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--no-codegen-cache",
+        action="store_true",
+        help="Always run codegen instead of reusing cached output",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MIB",
+        default=get_default_memory_budget_mib(),
+        help=(
+            "Only start views while the peak memory they used in previous "
+            "runs fits in MIB (default: 3/4 of the physical memory)"
+        ),
+    )
+    parser.add_argument(
+        "--run-history",
+        type=str,
+        default=get_default_history_path(),
+        help=(
+            "File recording the duration and peak memory of each view, used "
+            "to schedule the next runs (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--doxygen-shards",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "Split the headers of each view by directory into N shards, each "
+            "processed by its own Doxygen process, and merge their XML"
+        ),
+    )
+    parser.add_argument(
+        "--verify-shards",
+        action="store_true",
+        help=(
+            "Also run Doxygen over each view unsharded and fail if the "
+            "snapshots differ (used with --doxygen-shards)"
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help=(
+            "Stop at the first view that fails, killing the Doxygen and "
+            "codegen processes of the other views"
+        ),
+    )
+    parser.add_argument(
+        "--frontend",
+        choices=("doxygen", "tree-sitter"),
+        default="doxygen",
+        help=(
+            "Parse the headers with Doxygen, or with tree-sitter without "
+            "running Doxygen (ReactCommon views only, experimental)"
+        ),
+    )
+    parser.add_argument(
+        "--fingerprints",
+        action="store_true",
+        help=(
+            "Write the API fingerprints of the headers of each view next to the "
+            "snapshots, or in --validate, report the views whose fingerprints "
+            "match the committed ones unchanged without building them"
+        ),
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running and rewrite the snapshots as headers change, skipping "
+            "edits outside the API. With --doxygen-shards, Doxygen only runs "
+            "on the shards of the changed headers and of the headers that "
+            "include them"
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="How often to check headers for changes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--symbol-db",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Write the scopes and members of the generated views to a SQLite "
+            "database, replacing the rows of these views"
+        ),
+    )
+    parser.add_argument(
+        "--variant-matrix",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Write a report of the classes, enums, namespaces, ... that differ "
+            "between the generated views, and of their lines that differ"
+        ),
+    )
+    parser.add_argument(
+        "--block-store",
+        type=str,
+        metavar="DIR",
+        help=(
+            "Also write the snapshots as blocks stored once by hash and a "
+            "manifest per view. With --validate, DIR is not used: the "
+            "committed and generated snapshots that differ are split into "
+            "blocks in memory, and only the blocks that differ are diffed"
+        ),
+    )
+    parser.add_argument(
+        "--header",
+        type=str,
+        metavar="PATH",
+        help=(
+            "Print the API declared by a single header, running Doxygen with "
+            "the config of its view (--view, or the first view including it) "
+            "over the header and the headers it includes"
+        ),
     )
     args = parser.parse_args()
 
-    verbose = not args.validate
+    if args.header and (
+        args.validate or args.test or args.watch or args.frontend != "doxygen"
+    ):
+        parser.error(
+            "--header cannot be used with --validate, --test, --watch or "
+            "--frontend tree-sitter"
+        )
+    if args.watch and (args.validate or args.test or args.frontend != "doxygen"):
+        parser.error(
+            "--watch cannot be used with --validate, --test or --frontend tree-sitter"
+        )
+
+    verbose = not args.validate and not args.header
 
     doxygen_bin = get_doxygen_bin()
     version_result = subprocess.run(
@@ -327,35 +1222,179 @@ def main():
         get_react_native_dir(),
     )
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        snapshot_output_dir = (
-            args.output_dir or tmpdir
-            if args.validate
-            else args.output_dir or get_default_snapshot_dir()
+    if args.header:
+        _preview_header(
+            args.header,
+            snapshot_configs,
+            react_native_dir=react_native_package_dir,
+            input_filter=input_filter,
+            view_filter=args.view,
+            codegen_cache_dir=(
+                None if args.no_codegen_cache else args.codegen_cache_dir
+            ),
+        )
+        return
+
+    if args.watch:
+        _watch_views(
+            snapshot_configs,
+            react_native_dir=react_native_package_dir,
+            output_dir=args.output_dir or get_default_snapshot_dir(),
+            input_filter=input_filter,
+            view_filter=args.view,
+            shards=args.doxygen_shards,
+            interval=args.watch_interval,
+            codegen_cache_dir=(
+                None if args.no_codegen_cache else args.codegen_cache_dir
+            ),
         )
+        return
+
+    # The fingerprints of the headers of each view, to skip the views whose
+    # API cannot have changed.
+    fingerprints: dict[str, dict] = {}
+    if args.fingerprints and not args.test:
+        fingerprint_cache = FingerprintCache(get_default_fingerprint_cache_path())
+        environment = _get_environment_fingerprint(
+            react_native_package_dir,
+            config_path,
+            version_result.stdout.strip(),
+            args.frontend,
+        )
+        codegen_key = functools.cache(
+            functools.partial(codegen_cache_key, react_native_package_dir)
+        )
+        fingerprints = {
+            config.snapshot_name: view_fingerprints(
+                config,
+                get_react_native_dir(),
+                environment,
+                fingerprint_cache,
+                codegen_key=codegen_key,
+            )
+            for config in snapshot_configs
+            if not args.view or config.snapshot_name == args.view
+        }
+        fingerprint_cache.save()
+
+    snapshot_output_dir = (
+        args.output_dir
+        if args.validate
+        else args.output_dir or get_default_snapshot_dir()
+    )
+    snapshot_dir = args.snapshot_dir or get_default_snapshot_dir()
+
+    profiler = Profiler() if args.profile else None
+    symbol_db = SymbolDatabase() if args.symbol_db else None
+    variant_matrix = VariantMatrix() if args.variant_matrix else None
+    # The blocks of a validation run are only used to diff the committed
+    # snapshots, and kept in memory.
+    block_store = (
+        BlockStore(None if args.validate else args.block_store)
+        if args.block_store
+        else None
+    )
+
+    # Generated snapshots are compared in memory as soon as each view is
+    # built, and only written if --output-dir is given.
+    validate_out = None
+    validator = None
+    if args.validate:
+        validate_out = (
+            open(args.validate_output, "w") if args.validate_output else sys.stdout
+        )
+        validator = SnapshotValidator(snapshot_dir, validate_out, block_store)
+
+    history = RunHistory.load(args.run_history)
+    try:
+        configs_to_build = snapshot_configs
+        if validator is not None and fingerprints:
+            configs_to_build = _skip_unchanged_views(
+                [
+                    config
+                    for config in snapshot_configs
+                    if config.snapshot_name in fingerprints
+                ],
+                fingerprints,
+                snapshot_dir,
+                snapshot_output_dir,
+            )
+            to_build = {config.snapshot_name for config in configs_to_build}
+            for name in fingerprints:
+                if name not in to_build:
+                    validator.unchanged(f"{name}Cxx.api")
 
         build_snapshots(
             output_dir=snapshot_output_dir,
             verbose=not args.validate,
-            snapshot_configs=snapshot_configs,
+            snapshot_configs=configs_to_build,
             react_native_dir=react_native_package_dir,
             input_filter=input_filter,
             view_filter=args.view,
             is_test=args.test,
             keep_xml=args.xml,
+            memory_report=args.memory_report,
+            share_variants=args.share_variants,
+            codegen_cache_dir=(
+                None if args.no_codegen_cache else args.codegen_cache_dir
+            ),
+            history=history,
+            fail_fast=args.fail_fast,
+            memory_budget_mib=args.memory_budget,
+            doxygen_shards=args.doxygen_shards,
+            verify_shards=args.verify_shards,
+            frontend=args.frontend,
+            observers=RunObservers(
+                profiler=profiler,
+                symbol_db=symbol_db,
+                variant_matrix=variant_matrix,
+                block_store=block_store,
+                on_snapshot=(
+                    functools.partial(_validate_view, validator, profiler)
+                    if validator is not None
+                    else None
+                ),
+            ),
         )
 
-        if args.validate:
-            snapshot_dir = args.snapshot_dir or get_default_snapshot_dir()
+        if symbol_db is not None:
+            symbol_db.write(args.symbol_db)
+            if verbose:
+                print(f"Symbols written to {args.symbol_db}")
+
+        if variant_matrix is not None:
+            variant_matrix.write(args.variant_matrix)
+            if verbose:
+                print(f"Variant matrix written to {args.variant_matrix}")
+
+        if block_store is not None and not args.validate:
+            block_store.write()
+            if verbose:
+                print(f"Blocks written to {args.block_store}")
 
-            if not validate_snapshots(
+        if not args.validate and fingerprints:
+            write_fingerprints(
                 snapshot_output_dir,
-                snapshot_dir,
-                output_file=args.validate_output,
-            ):
+                with_snapshot_hashes(fingerprints, snapshot_output_dir),
+            )
+            if verbose:
+                print(f"Fingerprints written to {snapshot_output_dir}")
+
+        if validator is not None:
+            if not validator.finish():
                 sys.exit(1)
 
             print("All snapshot validations passed")
+    finally:
+        if args.validate_output and validate_out is not None:
+            validate_out.close()
+        history.save()
+        # Failed runs are profiled too, to see how far they got.
+        if profiler is not None:
+            summary_path, trace_path = profiler.write(
+                args.profile, cache_stats=get_cache_stats()
+            )
+            print(f"Profile written to {summary_path} and {trace_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Content-addressed store of the blocks of the snapshots of all views.
+
+The variants and platforms of a view render mostly the same scopes. The
+store splits each snapshot file into blocks at its blank lines, which is
+one block per class, enum, protocol, ... and one per group of namespace
+members, and stores every distinct block once under its hash. The manifest
+of a view lists the hashes of its blocks, and joining them gives the
+snapshot file back byte for byte.
+
+Blocks are hashed once per run however many views render them. Validation
+splits the committed snapshot files into blocks too, and only diffs the
+blocks that differ, once for all the views with the same change. The
+snapshot files stay the reviewed artifact.
+"""
+
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+
+_BLOCK_SEPARATOR = "\n\n"
+
+
+def split_blocks(content: str) -> list[str]:
+    return content.split(_BLOCK_SEPARATOR)
+
+
+def join_blocks(blocks: list[str]) -> str:
+    return _BLOCK_SEPARATOR.join(blocks)
+
+
+class BlockStore:
+    """
+    The blocks and manifests of the views of a run, stored in *directory*,
+    or only kept in memory if it is None.
+    """
+
+    def __init__(self, directory: str | None) -> None:
+        self.directory = directory
+        self.manifests: dict[str, list[str]] = {}
+        self._blocks: dict[str, str] = {}
+        self._hashes: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _block_path(self, block_hash: str) -> str:
+        return os.path.join(self.directory, "blocks", block_hash[:2], block_hash[2:])
+
+    def _manifest_path(self, view: str) -> str:
+        return os.path.join(self.directory, "manifests", f"{view}.json")
+
+    def add_view(self, view: str, content: str) -> list[str]:
+        """Split the snapshot file of *view* into blocks and add them."""
+        manifest = self.add_blocks(content)
+        with self._lock:
+            self.manifests[view] = manifest
+        return manifest
+
+    def add_blocks(self, content: str) -> list[str]:
+        """
+        Split a snapshot file into blocks and add them, without a manifest,
+        and return their hashes.
+        """
+        hashes = []
+        for block in split_blocks(content):
+            with self._lock:
+                block_hash = self._hashes.get(block)
+                if block_hash is None:
+                    block_hash = hashlib.sha256(block.encode()).hexdigest()
+                    self._hashes[block] = block_hash
+                    self._blocks[block_hash] = block
+            hashes.append(block_hash)
+        return hashes
+
+    def load_manifest(self, view: str) -> list[str] | None:
+        if view in self.manifests or self.directory is None:
+            return self.manifests.get(view)
+        try:
+            with open(self._manifest_path(view)) as f:
+                return json.load(f)["blocks"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def read_block(self, block_hash: str) -> str:
+        if block_hash in self._blocks or self.directory is None:
+            return self._blocks[block_hash]
+        with open(self._block_path(block_hash)) as f:
+            return f.read()
+
+    def read_view(self, view: str) -> str | None:
+        """Get the snapshot file of *view* back from its blocks."""
+        manifest = self.load_manifest(view)
+        if manifest is None:
+            return None
+        return join_blocks([self.read_block(block_hash) for block_hash in manifest])
+
+    def write(self) -> None:
+        """
+        Write the new blocks and the manifests of the views of the run, and
+        remove the blocks that no manifest refers to anymore.
+        """
+        if self.directory is None:
+            raise RuntimeError("Cannot write a block store kept in memory")
+        for block_hash, block in self._blocks.items():
+            path = self._block_path(block_hash)
+            if os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(block)
+
+        manifests_dir = os.path.join(self.directory, "manifests")
+        os.makedirs(manifests_dir, exist_ok=True)
+        for view, manifest in sorted(self.manifests.items()):
+            with open(self._manifest_path(view), "w") as f:
+                json.dump({"blocks": manifest}, f, indent=2)
+                f.write("\n")
+
+        referenced = set()
+        for filename in os.listdir(manifests_dir):
+            if filename.endswith(".json"):
+                referenced.update(self.load_manifest(filename[: -len(".json")]) or ())
+        blocks_dir = os.path.join(self.directory, "blocks")
+        for prefix in os.listdir(blocks_dir):
+            for name in os.listdir(os.path.join(blocks_dir, prefix)):
+                if prefix + name not in referenced:
+                    os.remove(os.path.join(blocks_dir, prefix, name))
+
+
+def _blocks(start: int, end: int) -> str:
+    if end - start == 1:
+        return f"block {end}"
+    if end == start:
+        return f"no blocks before {end + 1}"
+    return f"blocks {start + 1}-{end}"
+
+
+class ManifestDiffer:
+    """
+    Diffs of the blocks that differ between two manifests. The diff of the
+    same blocks is computed once, whichever views share it.
+    """
+
+    def __init__(
+        self,
+        read_old: Callable[[str], str],
+        read_new: Callable[[str], str],
+    ) -> None:
+        self._read_old = read_old
+        self._read_new = read_new
+        self._diffs: dict[tuple[tuple[str, ...], tuple[str, ...]], list[str]] = {}
+
+    def diff(
+        self, old: list[str], new: list[str], fromfile: str, tofile: str
+    ) -> list[str]:
+        """Get a unified diff of the blocks that differ from *old* to *new*."""
+        lines = [f"--- {fromfile}", f"+++ {tofile}"]
+        matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            key = (tuple(old[i1:i2]), tuple(new[j1:j2]))
+            if key not in self._diffs:
+                old_text = join_blocks([self._read_old(h) for h in old[i1:i2]])
+                new_text = join_blocks([self._read_new(h) for h in new[j1:j2]])
+                self._diffs[key] = list(
+                    difflib.unified_diff(
+                        old_text.splitlines(), new_text.splitlines(), lineterm=""
+                    )
+                )[2:]
+            lines.append(f"@@@ {_blocks(i1, i2)} -> {_blocks(j1, j2)} @@@")
+            lines.extend(self._diffs[key])
+        return lines
@@ -14,6 +14,7 @@ This module contains:
 from __future__ import annotations
 
 import re
+import sys
 from dataclasses import dataclass
 
 from doxmlparser import compound
@@ -35,6 +36,7 @@ from .utils import (
     Argument,
     extract_qualifiers,
     InitializerType,
+    intern_argument,
     normalize_angle_brackets,
     normalize_pointer_spacing,
     parse_qualified_path,
@@ -243,6 +245,16 @@ def get_template_params(
     return template_params
 
 
+def get_location(definition) -> str | None:
+    """
+    Get the file a member or compound definition is located in.
+    """
+    location = definition.location
+    if location is None or not location.file:
+        return None
+    return sys.intern(location.file)
+
+
 def get_variable_member(
     member_def: compound.MemberdefType,
     visibility: str,
@@ -294,6 +306,7 @@ def get_variable_member(
         variable_argstring,
         is_brace_initializer,
     )
+    member.location = get_location(member_def)
 
     member.add_template(get_template_params(member_def))
 
@@ -320,89 +333,100 @@ def get_doxygen_params(
             if param.get_type()
             else ""
         )
-
-        # Doxygen may incorrectly cross-reference parameter names inside
-        # inline function pointer types to member variables of the enclosing
-        # class, producing qualified paths like "const void*
-        # ns::Class::data" instead of "const void* data".  Re-parse the
-        # type through parse_type_with_argstrings which delegates to
-        # _parse_single_argument — that already strips "::" from names.
-        segments = parse_type_with_argstrings(param_type)
-        if len(segments) > 1:
-            param_type = format_parsed_type(segments)
         param_name = param.declname or param.defname or None
         param_default = (
             resolve_linked_text_name(param.defval)[0].strip() if param.defval else None
         )
+        arguments.append(
+            make_doxygen_argument(param_type, param_name, param_default, param.array)
+        )
 
-        # Doxygen splits array dimensions into a separate <array> element.
-        # For complex declarators like "PropNameID (&&propertyNames)[N]",
-        # doxygen gives type="PropNameID(&&)", name="propertyNames",
-        # array="[N]".  We must reconstruct the full declarator with the
-        # name embedded inside the grouping parentheses:
-        #   PropNameID(&&propertyNames)[N]
-        param_array = param.array
-        if param_array:
-            # Match type ending with a pointer/reference declarator group:
-            # e.g. "PropNameID(&&)", "int(&)", "void(*)"
-            m = re.search(r"\([*&]+\)\s*$", param_type)
-            if m and param_name:
-                # Insert name before the closing ')' and append array
-                insert_pos = m.end() - 1  # position of trailing ')'
-                param_type = (
-                    param_type[:insert_pos]
-                    + param_name
-                    + param_type[insert_pos:]
-                    + param_array
-                )
-                param_name = None
-            elif param_name:
-                param_name += param_array
-            else:
-                param_type += param_array
-
-        # Handle pointer-to-member-function types where the name must be
-        # embedded inside the declarator group.  Doxygen gives:
-        #   type = "void(ns::*)() const", name = "asFoo"
-        # We need to produce:
-        #   "void(ns::*asFoo)() const"
-        if param_name:
-            m = re.search(r"\([^)]*::\*\)", param_type)
-            if m:
-                # Insert name before the closing ')' of the ptr-to-member group
-                insert_pos = m.end() - 1
-                param_type = (
-                    param_type[:insert_pos] + param_name + param_type[insert_pos:]
-                )
-                param_name = None
+    return arguments
+
+
+def make_doxygen_argument(
+    param_type: str,
+    param_name: str | None,
+    param_default: str | None,
+    param_array: str | None,
+) -> Argument:
+    """
+    Build an Argument from the parts of a parameter as Doxygen reports them:
+    its type, name, default value and array dimensions.
+    """
+    # Doxygen may incorrectly cross-reference parameter names inside
+    # inline function pointer types to member variables of the enclosing
+    # class, producing qualified paths like "const void*
+    # ns::Class::data" instead of "const void* data".  Re-parse the
+    # type through parse_type_with_argstrings which delegates to
+    # _parse_single_argument — that already strips "::" from names.
+    segments = parse_type_with_argstrings(param_type)
+    if len(segments) > 1:
+        param_type = format_parsed_type(segments)
+
+    # Doxygen splits array dimensions into a separate <array> element.
+    # For complex declarators like "PropNameID (&&propertyNames)[N]",
+    # doxygen gives type="PropNameID(&&)", name="propertyNames",
+    # array="[N]".  We must reconstruct the full declarator with the
+    # name embedded inside the grouping parentheses:
+    #   PropNameID(&&propertyNames)[N]
+    if param_array:
+        # Match type ending with a pointer/reference declarator group:
+        # e.g. "PropNameID(&&)", "int(&)", "void(*)"
+        m = re.search(r"\([*&]+\)\s*$", param_type)
+        if m and param_name:
+            # Insert name before the closing ')' and append array
+            insert_pos = m.end() - 1  # position of trailing ')'
+            param_type = (
+                param_type[:insert_pos]
+                + param_name
+                + param_type[insert_pos:]
+                + param_array
+            )
+            param_name = None
+        elif param_name:
+            param_name += param_array
         else:
-            # Doxygen bug: for pointer-to-member-function params with
-            # ref-qualifiers (& or &&), Doxygen incorrectly embeds the
-            # parameter name in the type string between cv-qualifiers
-            # and the ref-qualifier, and omits <declname> entirely:
-            #   <type>R(ns::*)() const asFoo &amp;</type>
-            # Detect this pattern and reconstruct the correct type:
-            #   R(ns::*asFoo)() const &
-            m = re.search(
-                r"(\([^)]*::\*\))"  # group 1: ptr-to-member declarator
-                r"(.+?)"  # group 2: param list + cv-qualifiers
-                r"\s+([a-zA-Z_]\w*)"  # group 3: misplaced identifier
-                r"\s*(&{1,2})\s*$",  # group 4: ref-qualifier
-                param_type,
+            param_type += param_array
+
+    # Handle pointer-to-member-function types where the name must be
+    # embedded inside the declarator group.  Doxygen gives:
+    #   type = "void(ns::*)() const", name = "asFoo"
+    # We need to produce:
+    #   "void(ns::*asFoo)() const"
+    if param_name:
+        m = re.search(r"\([^)]*::\*\)", param_type)
+        if m:
+            # Insert name before the closing ')' of the ptr-to-member group
+            insert_pos = m.end() - 1
+            param_type = param_type[:insert_pos] + param_name + param_type[insert_pos:]
+            param_name = None
+    else:
+        # Doxygen bug: for pointer-to-member-function params with
+        # ref-qualifiers (& or &&), Doxygen incorrectly embeds the
+        # parameter name in the type string between cv-qualifiers
+        # and the ref-qualifier, and omits <declname> entirely:
+        #   <type>R(ns::*)() const asFoo &amp;</type>
+        # Detect this pattern and reconstruct the correct type:
+        #   R(ns::*asFoo)() const &
+        m = re.search(
+            r"(\([^)]*::\*\))"  # group 1: ptr-to-member declarator
+            r"(.+?)"  # group 2: param list + cv-qualifiers
+            r"\s+([a-zA-Z_]\w*)"  # group 3: misplaced identifier
+            r"\s*(&{1,2})\s*$",  # group 4: ref-qualifier
+            param_type,
+        )
+        if m:
+            param_type = (
+                param_type[: m.end(1) - 1]  # up to ')' of (ns::*)
+                + m.group(3)  # insert extracted name
+                + param_type[m.end(1) - 1 : m.end(2)]  # ')' + params + cv-quals
+                + " "
+                + m.group(4)  # ref-qualifier
             )
-            if m:
-                param_type = (
-                    param_type[: m.end(1) - 1]  # up to ')' of (ns::*)
-                    + m.group(3)  # insert extracted name
-                    + param_type[m.end(1) - 1 : m.end(2)]  # ')' + params + cv-quals
-                    + " "
-                    + m.group(4)  # ref-qualifier
-                )
-
-        qualifiers, core_type = extract_qualifiers(param_type)
-        arguments.append((qualifiers, core_type, param_name, param_default))
 
-    return arguments
+    qualifiers, core_type = extract_qualifiers(param_type)
+    return intern_argument((qualifiers, core_type, param_name, param_default))
 
 
 def get_function_member(
@@ -444,6 +468,7 @@ def get_function_member(
         doxygen_params,
         is_constexpr,
     )
+    function.location = get_location(function_def)
 
     function.add_template(get_template_params(function_def))
 
@@ -469,6 +494,7 @@ def get_typedef_member(
         visibility,
         typedef_keyword,
     )
+    typedef.location = get_location(typedef_def)
 
     typedef.add_template(get_template_params(typedef_def))
 
@@ -497,6 +523,7 @@ def get_concept_member(
             constraint = initializer_text[eq_pos + 1 :].strip()
 
     concept = ConceptMember(unqualified_name, constraint)
+    concept.location = get_location(concept_def)
     concept.add_template(get_template_params(concept_def))
 
     return concept
@@ -528,7 +555,7 @@ def get_property_member(
             property_type = f"{property_type}{property_name}{normalized_argsstring}"
             property_name = ""
 
-    return PropertyMember(
+    member = PropertyMember(
         property_name,
         property_type,
         visibility,
@@ -537,6 +564,8 @@ def get_property_member(
         is_readable,
         is_writable,
     )
+    member.location = get_location(member_def)
+    return member
 
 
 # endregion
@@ -879,16 +908,16 @@ def create_class_scope(
             if member_type == "attrib":
                 for member_def in section_def.memberdef:
                     if member_def.kind == "variable":
-                        (var_type, _) = resolve_linked_text_name(member_def.get_type())
+                        var_type, _ = resolve_linked_text_name(member_def.get_type())
 
                         # Skip anonymous variables
                         if "@" in var_type:
                             continue
 
                         if var_type == "friend":
-                            class_scope.add_member(
-                                FriendMember(member_def.get_name(), visibility)
-                            )
+                            friend = FriendMember(member_def.get_name(), visibility)
+                            friend.location = get_location(member_def)
+                            class_scope.add_member(friend)
                         else:
                             if exclude_symbols and _should_exclude_symbol(
                                 member_def.get_name(), exclude_symbols
@@ -0,0 +1,146 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Cache of codegen output across runs.
+
+Codegen output only depends on the JS/TS specs, on the codegen scripts and
+on the target platform. Outputs are cached under a hash of these inputs, so
+that runs where none of them changed don't start node at all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator
+
+CODEGEN_SCRIPT = os.path.join("scripts", "generate-codegen-artifacts.js")
+
+# Number of cached outputs to keep. Every platform of a run is one entry.
+MAX_CACHE_ENTRIES = 8
+
+# Spec files, as selected by filterJSFile in react-native-codegen.
+_SPEC_FILE_PATTERN = re.compile(r"^(Native.+|.+NativeComponent)")
+_SPEC_FILE_EXTENSIONS = (".js", ".ts", ".tsx")
+
+_IGNORED_DIRS = frozenset(
+    {"__tests__", "__fixtures__", "__test_fixtures__", "__mocks__", "node_modules"}
+)
+
+
+def get_default_codegen_cache_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "cxx-api-codegen-cache")
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in _IGNORED_DIRS)
+        for filename in sorted(filenames):
+            yield os.path.join(dirpath, filename)
+
+
+def _spec_dirs(react_native_package_dir: str) -> list[str]:
+    with open(os.path.join(react_native_package_dir, "package.json")) as f:
+        codegen_config = json.load(f).get("codegenConfig") or {}
+    libraries = codegen_config.get("libraries") or [codegen_config]
+    return sorted(
+        {
+            os.path.join(react_native_package_dir, library["jsSrcsDir"])
+            for library in libraries
+            if library.get("jsSrcsDir")
+        }
+    )
+
+
+def codegen_input_files(react_native_package_dir: str) -> list[str]:
+    """
+    List the files codegen output depends on: the package.json with the
+    codegen config, the spec files and the sources of the codegen scripts.
+    """
+    files = [os.path.join(react_native_package_dir, "package.json")]
+    for spec_dir in _spec_dirs(react_native_package_dir):
+        files.extend(
+            path
+            for path in _walk_files(spec_dir)
+            if _SPEC_FILE_PATTERN.match(os.path.basename(path))
+            and path.endswith(_SPEC_FILE_EXTENSIONS)
+            and not path.endswith(".d.ts")
+        )
+
+    files.append(os.path.join(react_native_package_dir, CODEGEN_SCRIPT))
+    files.extend(
+        _walk_files(os.path.join(react_native_package_dir, "scripts", "codegen"))
+    )
+
+    codegen_package_dir = os.path.join(
+        os.path.dirname(react_native_package_dir), "react-native-codegen"
+    )
+    if os.path.isdir(codegen_package_dir):
+        files.append(os.path.join(codegen_package_dir, "package.json"))
+        files.extend(_walk_files(os.path.join(codegen_package_dir, "src")))
+    return files
+
+
+def codegen_cache_key(react_native_package_dir: str, platform: str) -> str:
+    """
+    Hash the inputs of codegen for *platform*.
+    """
+    digest = hashlib.sha256(platform.encode())
+    for path in codegen_input_files(react_native_package_dir):
+        digest.update(os.path.relpath(path, react_native_package_dir).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _prune(cache_dir: str, keep: str) -> None:
+    entries = [
+        os.path.join(cache_dir, name)
+        for name in os.listdir(cache_dir)
+        if not name.startswith(".") and name != keep
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for entry in entries[MAX_CACHE_ENTRIES - 1 :]:
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def cached_codegen_output(
+    cache_dir: str, key: str, generate: Callable[[str], object]
+) -> tuple[str, bool]:
+    """
+    Return the cached codegen output for *key* and whether it was cached.
+    On a miss, *generate* is called with an empty directory to write the
+    output to, which is then added to the cache.
+    """
+    cached = os.path.join(cache_dir, key)
+    if os.path.isdir(cached):
+        # Pruning drops the least recently used entries.
+        os.utime(cached)
+        return cached, True
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Generate into a scratch directory and rename it into place, so that a
+    # concurrent or failed run never leaves a partial entry behind.
+    scratch = tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir)
+    try:
+        output = os.path.join(scratch, "output")
+        os.makedirs(output)
+        generate(output)
+        try:
+            os.rename(output, cached)
+        except OSError:
+            # Another run cached the same output first.
+            if not os.path.isdir(cached):
+                raise
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    _prune(cache_dir, keep=key)
+    return cached, False
@@ -39,6 +39,7 @@ class ApiViewSnapshotConfig:
     codegen_platform: str | None = None
     input_filter: bool = False
     exclude_symbols: list[str] = field(default_factory=list)
+    view_name: str | None = None
 
 
 def parse_config(
@@ -115,6 +116,7 @@ def parse_config(
                     codegen_platform=codegen_platform,
                     input_filter=input_filter,
                     exclude_symbols=exclude_symbols,
+                    view_name=view_name,
                 )
             )
         else:
@@ -130,6 +132,7 @@ def parse_config(
                         codegen_platform=codegen_platform,
                         input_filter=input_filter,
                         exclude_symbols=exclude_symbols,
+                        view_name=view_name,
                     )
                 )
 
@@ -7,8 +7,16 @@
 Doxygen configuration and execution utilities.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import subprocess
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .processes import ProcessGroup
+    from .profiling import PhaseRecord
 
 _DOXYGEN_CONFIG_FILE = ".doxygen.config.generated"
 
@@ -17,6 +25,21 @@ def get_doxygen_bin() -> str:
     return os.environ.get("DOXYGEN_BIN", "doxygen")
 
 
+def get_template_tag(template: str, tag: str) -> list[str]:
+    """
+    Get the values of the tag *tag* of a Doxygen config template, without
+    the placeholders that build_doxygen_config fills in.
+    """
+    match = re.search(rf"^{tag}\s*=(.*?)(?<!\\)\n", template, re.M | re.S)
+    if match is None:
+        return []
+    return [
+        value
+        for value in match.group(1).split()
+        if value != "\\" and not value.startswith("${")
+    ]
+
+
 def build_doxygen_config(
     directory: str,
     include_directories: list[str] = None,
@@ -25,7 +48,13 @@ def build_doxygen_config(
     input_filter: str = None,
     output_dir: str = "api",
     config_file: str = _DOXYGEN_CONFIG_FILE,
+    extra_settings: dict[str, str] | None = None,
 ) -> None:
+    """
+    Write a Doxygen config built from the template in *directory*. The
+    inputs may be directories or files. *extra_settings* override the
+    settings of the template.
+    """
     if include_directories is None:
         include_directories = []
     if exclude_patterns is None:
@@ -57,6 +86,9 @@ def build_doxygen_config(
         .replace("${DOXYGEN_INPUT_FILTER}", input_filter_str)
         .replace("${OUTPUT_DIR}", output_dir)
     )
+    # Later assignments of a tag override earlier ones.
+    for key, value in (extra_settings or {}).items():
+        config += f"\n{key} = {value}\n"
 
     with open(os.path.join(directory, config_file), "w") as f:
         f.write(config)
@@ -72,8 +104,16 @@ def run_doxygen(
     output_dir: str = "api",
     config_file: str = _DOXYGEN_CONFIG_FILE,
     label: str = "",
+    phase: PhaseRecord | None = None,
+    processes: ProcessGroup | None = None,
+    extra_settings: dict[str, str] | None = None,
 ) -> None:
-    """Generate Doxygen config, run Doxygen, and clean up the config file."""
+    """Generate Doxygen config, run Doxygen, and clean up the config file.
+
+    When a profiling phase is given, the resource usage of the Doxygen
+    process is recorded in it. When a process group is given, Doxygen runs
+    in it, so that it can be cancelled.
+    """
     prefix = f"[{label}] " if label else ""
     if verbose:
         print(f"{prefix}Generating Doxygen config file")
@@ -86,6 +126,7 @@ def run_doxygen(
         input_filter=input_filter,
         output_dir=output_dir,
         config_file=config_file,
+        extra_settings=extra_settings,
     )
 
     if verbose:
@@ -95,20 +136,36 @@ def run_doxygen(
 
     doxygen_bin = get_doxygen_bin()
 
-    result = subprocess.run(
-        [doxygen_bin, config_file],
-        cwd=working_dir,
-        capture_output=True,
-        text=True,
-    )
+    try:
+        if processes is not None:
+            result = processes.run(
+                [doxygen_bin, config_file],
+                prefix=prefix,
+                phase=phase,
+                cwd=working_dir,
+            )
+        else:
+            run = phase.run if phase is not None else subprocess.run
+            result = run(
+                [doxygen_bin, config_file],
+                cwd=working_dir,
+                capture_output=True,
+                text=True,
+            )
+    finally:
+        if verbose:
+            print(f"{prefix}Deleting Doxygen config file")
+        os.remove(os.path.join(working_dir, config_file))
 
     if result.returncode != 0:
+        # Streamed stderr has already been printed.
+        stderr = (
+            "see its output above"
+            if processes is not None and processes.stream_stderr
+            else result.stderr
+        )
         if verbose:
-            print(f"{prefix}Doxygen finished with error: {result.stderr}")
-        raise RuntimeError(f"Doxygen finished with error: {result.stderr}")
+            print(f"{prefix}Doxygen finished with error: {stderr}")
+        raise RuntimeError(f"Doxygen finished with error: {stderr}")
     elif verbose:
         print(f"{prefix}Doxygen finished successfully")
-
-    if verbose:
-        print(f"{prefix}Deleting Doxygen config file")
-    os.remove(os.path.join(working_dir, config_file))
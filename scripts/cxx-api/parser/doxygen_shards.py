@@ -0,0 +1,343 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Sharded Doxygen runs over the inputs of a single view.
+
+The headers of a view are listed here instead of by Doxygen, split into
+shards by directory, and each shard is processed by its own Doxygen
+process. Doxygen only links references to symbols of its own inputs, so
+every shard first writes a tag file of its symbols, and then generates its
+XML with the tag files of the other shards. Doxygen also only preprocesses
+the includes it finds, so the directories that the includes of a shard
+resolve from in the other shards are on its include path: the macros and
+typedefs of the other shards are then expanded like in a single run.
+build_snapshot merges the XML of the shards.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import difflib
+import fnmatch
+import functools
+import heapq
+import os
+import shutil
+from collections.abc import Callable, Collection
+from typing import TYPE_CHECKING
+
+from .doxygen import get_template_tag, run_doxygen
+from .includes import IncludeGraph
+from .path_utils import get_react_native_dir
+
+if TYPE_CHECKING:
+    from .processes import ProcessGroup
+    from .profiling import PhaseRecord
+
+
+# Lines of the snapshot diff included in the error of a failed equivalence
+# check.
+_MAX_DIFF_LINES = 200
+
+
+class ShardMismatchError(RuntimeError):
+    """Raised when the sharded snapshot of a view differs from the unsharded one."""
+
+
+def get_default_doxygen_config_template() -> str:
+    return os.path.join(
+        get_react_native_dir(), "packages", "react-native", ".doxygen.config.template"
+    )
+
+
+@functools.cache
+def _read_template_patterns(
+    doxygen_config_template: str, mtime_ns: int
+) -> tuple[list[str], list[str]]:
+    with open(doxygen_config_template) as f:
+        template = f.read()
+    return (
+        get_template_tag(template, "FILE_PATTERNS"),
+        get_template_tag(template, "EXCLUDE_PATTERNS"),
+    )
+
+
+def get_template_patterns(
+    doxygen_config_template: str | None = None,
+) -> tuple[list[str], list[str]]:
+    """
+    Get the FILE_PATTERNS and EXCLUDE_PATTERNS of a Doxygen config template,
+    by default the one of the react-native package.
+    """
+    if doxygen_config_template is None:
+        doxygen_config_template = get_default_doxygen_config_template()
+    return _read_template_patterns(
+        doxygen_config_template, os.stat(doxygen_config_template).st_mtime_ns
+    )
+
+
+def list_input_files(
+    inputs: list[str],
+    exclude_patterns: list[str],
+    doxygen_config_template: str | None = None,
+) -> list[str]:
+    """
+    List the headers Doxygen reads from *inputs*: the files matching the
+    file patterns of the Doxygen config template in the input directories,
+    recursively, except the ones matching the exclude patterns of the
+    template and of the view. Like Doxygen, the patterns are matched
+    against the absolute path of each file.
+    """
+    file_patterns, template_exclude_patterns = get_template_patterns(
+        doxygen_config_template
+    )
+    patterns = [*template_exclude_patterns, *exclude_patterns]
+    files = []
+    seen: set[str] = set()
+
+    def add(path: str) -> None:
+        path = os.path.abspath(path)
+        if path in seen:
+            return
+        seen.add(path)
+        if not any(
+            fnmatch.fnmatchcase(os.path.basename(path), pattern)
+            for pattern in file_patterns
+        ):
+            return
+        if any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns):
+            return
+        files.append(path)
+
+    for input_path in inputs:
+        if os.path.isfile(input_path):
+            add(input_path)
+            continue
+        # Doxygen follows symlinked directories, but reads each one once.
+        visited: set[str] = set()
+        for root, dirs, filenames in os.walk(input_path, followlinks=True):
+            real_root = os.path.realpath(root)
+            if real_root in visited:
+                dirs[:] = []
+                continue
+            visited.add(real_root)
+            dirs.sort()
+            for filename in sorted(filenames):
+                add(os.path.join(root, filename))
+    return files
+
+
+def split_into_shards(files: list[str], shards: int) -> list[list[str]]:
+    """
+    Split *files* into at most *shards* shards of similar total size. The
+    files of a directory stay in the same shard, since they refer to each
+    other the most.
+    """
+    directories: dict[str, list[str]] = {}
+    for path in files:
+        directories.setdefault(os.path.dirname(path), []).append(path)
+
+    def size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    weighted = sorted(
+        (
+            (sum(size(path) for path in paths), directory)
+            for directory, paths in directories.items()
+        ),
+        key=lambda item: (-item[0], item[1]),
+    )
+
+    # Largest directories first, each to the lightest shard.
+    heap = [(0, i) for i in range(min(shards, len(weighted)))]
+    result: list[list[str]] = [[] for _ in heap]
+    for weight, directory in weighted:
+        total, i = heapq.heappop(heap)
+        result[i].extend(directories[directory])
+        heapq.heappush(heap, (total + weight, i))
+    return [sorted(shard) for shard in result]
+
+
+def _read_header(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def get_shard_include_paths(shard_files: list[list[str]]) -> list[list[str]]:
+    """
+    Get the include path of each shard: the directories that the includes
+    of its headers, and of the headers of other shards they include,
+    resolve from.
+    """
+    includes = IncludeGraph(
+        {path: _read_header(path) for files in shard_files for path in files}
+    )
+    return [sorted(includes.include_path(files)) for files in shard_files]
+
+
+def run_sharded_doxygen(
+    working_dir: str,
+    include_directories: list[str],
+    exclude_patterns: list[str],
+    definitions: dict[str, str | int],
+    shards: int,
+    input_filter: str = None,
+    verbose: bool = True,
+    output_dir: str = "api",
+    label: str = "",
+    phase: PhaseRecord | None = None,
+    processes: ProcessGroup | None = None,
+) -> list[str]:
+    """
+    Run Doxygen over the inputs of a view in up to *shards* parallel
+    processes and return the XML directories of the shards.
+    """
+    shard_files = split_into_shards(
+        list_input_files(
+            include_directories,
+            exclude_patterns,
+            os.path.join(working_dir, ".doxygen.config.template"),
+        ),
+        shards,
+    )
+    if not shard_files:
+        raise RuntimeError(f"No input files found for {label}")
+    if verbose:
+        print(
+            f"[{label}] Running Doxygen in {len(shard_files)} shards of "
+            f"{', '.join(str(len(files)) for files in shard_files)} files"
+        )
+    return run_doxygen_shards(
+        working_dir,
+        shard_files,
+        exclude_patterns,
+        definitions,
+        input_filter=input_filter,
+        verbose=verbose,
+        output_dir=output_dir,
+        label=label,
+        phase=phase,
+        processes=processes,
+    )
+
+
+def run_doxygen_shards(
+    working_dir: str,
+    shard_files: list[list[str]],
+    exclude_patterns: list[str],
+    definitions: dict[str, str | int],
+    input_filter: str = None,
+    verbose: bool = True,
+    output_dir: str = "api",
+    label: str = "",
+    phase: PhaseRecord | None = None,
+    processes: ProcessGroup | None = None,
+    shards_to_run: Collection[int] | None = None,
+    run: Callable[..., None] = run_doxygen,
+) -> list[str]:
+    """
+    Run Doxygen over the given shards of headers in parallel processes and
+    return the XML directories of all of the shards.
+
+    With *shards_to_run*, only these shards are run again, with the tag
+    files that the other shards wrote in *output_dir* in a previous run.
+    """
+    shard_dirs = [
+        os.path.join(output_dir, f"shard{i}") for i in range(len(shard_files))
+    ]
+    # Tag files are identified by their name, so each shard gets its own.
+    tag_files = [
+        os.path.join(shard_dir, f"shard{i}.tag")
+        for i, shard_dir in enumerate(shard_dirs)
+    ]
+    if shards_to_run is None:
+        shards_to_run = range(len(shard_files))
+    shards_to_run = sorted(shards_to_run)
+    if len(shard_files) > 1:
+        include_paths = get_shard_include_paths(shard_files)
+    else:
+        include_paths = [[]]
+
+    def run_shard(i: int, extra_settings: dict[str, str]) -> float:
+        os.makedirs(shard_dirs[i], exist_ok=True)
+        if include_paths[i]:
+            extra_settings = {
+                **extra_settings,
+                "INCLUDE_PATH": " ".join(f'"{path}"' for path in include_paths[i]),
+            }
+        run(
+            working_dir=working_dir,
+            include_directories=shard_files[i],
+            exclude_patterns=exclude_patterns,
+            definitions=definitions,
+            input_filter=input_filter,
+            verbose=verbose,
+            output_dir=shard_dirs[i],
+            config_file=f".doxygen.config.{label}.shard{i}.generated",
+            label=f"{label}/shard{i}",
+            phase=phase,
+            processes=processes,
+            extra_settings=extra_settings,
+        )
+        return processes.take_max_rss_mib() if processes is not None else 0.0
+
+    def tag_settings(i: int) -> dict[str, str]:
+        return {"GENERATE_XML": "NO", "GENERATE_TAGFILE": tag_files[i]}
+
+    def xml_settings(i: int) -> dict[str, str]:
+        # The XML of a previous run may list compounds that are gone.
+        shutil.rmtree(os.path.join(shard_dirs[i], "xml"), ignore_errors=True)
+        other_tag_files = [tag for j, tag in enumerate(tag_files) if j != i]
+        return {
+            "TAGFILES": " ".join(
+                f'"{tag}={os.path.dirname(tag)}"' for tag in other_tag_files
+            )
+        }
+
+    with concurrent.futures.ThreadPoolExecutor(max(len(shards_to_run), 1)) as executor:
+
+        def run_pass(settings: Callable[[int], dict[str, str]]) -> None:
+            futures = [
+                executor.submit(run_shard, i, settings(i)) for i in shards_to_run
+            ]
+            # The shards run in other threads, so their processes are
+            # counted in the peak memory of this one.
+            peak_mib = sum(future.result() for future in futures)
+            if processes is not None:
+                processes.record_max_rss_mib(peak_mib)
+
+        if len(shard_files) > 1:
+            run_pass(tag_settings)
+        run_pass(xml_settings)
+
+    return [os.path.join(shard_dir, "xml") for shard_dir in shard_dirs]
+
+
+def check_shard_equivalence(unsharded: str, sharded: str, view: str) -> None:
+    """
+    Raise ShardMismatchError if the snapshot of *view* built from sharded
+    Doxygen runs differs from the one built from a single run.
+    """
+    if unsharded == sharded:
+        return
+    diff = list(
+        difflib.unified_diff(
+            unsharded.splitlines(),
+            sharded.splitlines(),
+            fromfile=f"{view} (unsharded)",
+            tofile=f"{view} (sharded)",
+            lineterm="",
+        )
+    )
+    if len(diff) > _MAX_DIFF_LINES:
+        diff = diff[:_MAX_DIFF_LINES] + [f"... {len(diff) - _MAX_DIFF_LINES} more"]
+    raise ShardMismatchError(
+        f"Sharded snapshot of {view} differs from the unsharded one:\n"
+        + "\n".join(diff)
+    )
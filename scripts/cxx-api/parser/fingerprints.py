@@ -0,0 +1,434 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Declaration-only fingerprints of headers, to skip views whose API cannot
+have changed.
+
+Most edits of headers change comments, inline function bodies or private
+members, none of which are part of the snapshots. The fingerprint of a
+header hashes its tokens without comments, with function bodies elided and
+with the plain data members and functions of private sections dropped.
+Generating snapshots with --fingerprints stores the fingerprints of the
+headers of every view next to the snapshots, with a hash of everything else
+the snapshot of the view depends on (its config, the parser, the sources and
+version of the frontend and codegen) and a hash of the snapshot generated.
+The file is committed and regenerated with the snapshots. A view whose
+fingerprints all match, and whose committed snapshot is the one generated
+with them, cannot have a different snapshot.
+
+Fingerprints err on the side of changing: anything they cannot classify is
+kept, and headers whose braces do not balance are hashed whole.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import tempfile
+from collections.abc import Callable
+
+from .config import ApiViewSnapshotConfig
+from .doxygen_shards import list_input_files
+
+FINGERPRINTS_FILE = ".fingerprints.json"
+
+# The package of the sources only the tree-sitter frontend runs.
+_TREE_SITTER_FRONTEND_DIR = "tree_sitter_frontend"
+
+_TOKEN = re.compile(
+    r"""
+    (?P<directive>^[ \t]*\#(?:\\\n|[^\n])*)
+    |(?P<comment>//[^\n]*|/\*.*?\*/)
+    |(?P<string>(?:u8|[uUL])?R"(?P<delimiter>[^(\s]*)\(.*?\)(?P=delimiter)"
+        |(?:u8|[uUL])?"(?:\\.|[^"\\\n])*"
+        |'(?:\\.|[^'\\\n])*')
+    |(?P<word>[A-Za-z_]\w*)
+    |(?P<number>\.?\d(?:[eEpP][+-]|[\w.'])*)
+    |(?P<punctuation>::|->|\.\.\.|<=>|&&|\|\||\+\+|--|[<>=!+\-*/%&|^]=|\S)
+    """,
+    re.M | re.S | re.X,
+)
+
+# Doxygen commands in comments that change what Doxygen extracts.
+_DOXYGEN_COMMAND = re.compile(
+    r"[\\@](cond|endcond|internal|endinternal|private|privatesection|protected"
+    r"|protectedsection|public|publicsection|hideinitializer|showinitializer"
+    r"|deprecated|relates|relatesalso|memberof|overload)\b"
+)
+
+_CLASS_KEYS = frozenset({"class", "struct", "union"})
+_ACCESS_SPECIFIERS = frozenset({"public", "protected", "private"})
+# Statements of private sections with these keywords are kept, as Doxygen
+# reports private typedefs and may resolve names to private types.
+_PRIVATE_KEPT_KEYWORDS = frozenset(
+    {"typedef", "using", "class", "struct", "union", "enum", "friend", "template"}
+)
+
+
+def tokenize(source: str) -> list[str]:
+    """
+    Split a header into tokens without comments, except for the comments with
+    Doxygen commands. Directives are single tokens.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(source):
+        kind = match.lastgroup
+        if kind == "comment":
+            text = match.group()
+            if _DOXYGEN_COMMAND.search(text):
+                tokens.append(" ".join(text.split()))
+        elif kind == "directive":
+            directive = re.sub(r"//[^\n]*|/\*.*?\*/", " ", match.group(), flags=re.S)
+            tokens.append(" ".join(directive.replace("\\\n", " ").split()))
+        else:
+            tokens.append(match.group())
+    return tokens
+
+
+@dataclasses.dataclass
+class _Context:
+    kind: str
+    access: str = "public"
+    name: str | None = None
+
+
+class _UnbalancedError(Exception):
+    pass
+
+
+def _skip_template_prefix(statement: list[str]) -> list[str]:
+    if len(statement) < 2 or statement[0] != "template" or statement[1] != "<":
+        return statement
+    depth = 0
+    for i, token in enumerate(statement[1:], 1):
+        if token == "<":
+            depth += 1
+        elif token == ">":
+            depth -= 1
+            if depth == 0:
+                return statement[i + 1 :]
+    return statement
+
+
+def _matching(tokens: list[str], start: int) -> int:
+    """Get the index of the brace closing the one at *start*."""
+    depth = 0
+    for i in range(start, len(tokens)):
+        if tokens[i] == "{":
+            depth += 1
+        elif tokens[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    raise _UnbalancedError()
+
+
+def _is_function_body(statement: list[str], context: _Context) -> bool:
+    """
+    Whether a brace after *statement* opens the body of a function, as
+    opposed to the body of a macro invocation or an initializer.
+    """
+    if "requires" in statement:
+        return False
+    tokens = [token for token in statement if not token.startswith(("#", "/"))]
+    depth = 0
+    first_parameter = None
+    for i, token in enumerate(tokens):
+        if token == "(":
+            if depth == 0 and first_parameter is None:
+                first_parameter = i
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif token == "=" and depth == 0 and tokens[i - 1 : i] != ["operator"]:
+            # A variable initialized with a lambda or a braced list.
+            return False
+    if not first_parameter:
+        return False
+    # A single name before the parameters is a macro invocation, unless it
+    # is a constructor.
+    if first_parameter == 1:
+        return tokens[0] == context.name
+    return True
+
+
+def _classify(statement: list[str], context: _Context) -> str:
+    head = [t for t in _skip_template_prefix(statement) if not t.startswith("#")]
+    if head[:1] == ["typedef"]:
+        head = head[1:]
+    if head[:1] == ["namespace"] or head[:2] == ["inline", "namespace"]:
+        return "namespace"
+    if len(head) == 2 and head[0] == "extern" and head[1].startswith('"'):
+        return "namespace"
+    if head[:1] and head[0] in _CLASS_KEYS:
+        return "class"
+    if _is_function_body(statement, context):
+        return "body"
+    return "other"
+
+
+def _class_name(statement: list[str]) -> str | None:
+    head = _skip_template_prefix(statement)
+    name = None
+    for token in head[1:]:
+        if token in (":", "final", "<"):
+            break
+        if re.match(r"[A-Za-z_]", token):
+            name = token
+    return name
+
+
+def _declaration_tokens(tokens: list[str]) -> list[str]:
+    output: list[str] = []
+    contexts = [_Context("namespace")]
+    statements: list[list[str]] = [[]]
+
+    def flush(end: list[str]) -> None:
+        statement = statements[-1]
+        statement.extend(end)
+        context = contexts[-1]
+        if (
+            context.kind != "class"
+            or context.access != "private"
+            or _PRIVATE_KEPT_KEYWORDS.intersection(statement)
+            # Directives, and comments with Doxygen commands.
+            or any(token.startswith(("#", "/")) for token in statement)
+        ):
+            output.extend(statement)
+        statements[-1] = []
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        context = contexts[-1]
+        statement = statements[-1]
+        if token.startswith(("#", "/")) and not statement:
+            # Directives, and comments with Doxygen commands, between
+            # statements are statements of their own, so that they don't
+            # hide the access specifier after them.
+            output.append(token)
+            i += 1
+        elif (
+            context.kind == "class"
+            and token in _ACCESS_SPECIFIERS
+            and tokens[i + 1 : i + 2] == [":"]
+        ):
+            # The statement before may lack its ";", e.g. a macro.
+            flush([])
+            context.access = token
+            output.extend((token, ":"))
+            i += 2
+        elif token == ";":
+            flush([token])
+            i += 1
+        elif token == "{":
+            if statement.count("(") > statement.count(")"):
+                # A lambda or braced initializer in parentheses.
+                end = _matching(tokens, i)
+                statement.extend(tokens[i : end + 1])
+                i = end + 1
+                continue
+            kind = _classify(statement, context)
+            if kind == "body":
+                i = _matching(tokens, i) + 1
+                flush(["{", "}"])
+            elif kind == "other":
+                end = _matching(tokens, i)
+                statement.extend(tokens[i : end + 1])
+                i = end + 1
+            else:
+                name = _class_name(statement) if kind == "class" else None
+                head = _skip_template_prefix(statement)
+                key = next((t for t in head if t in _CLASS_KEYS), None)
+                flush(["{"])
+                contexts.append(
+                    _Context(kind, "private" if key == "class" else "public", name)
+                )
+                statements.append([])
+                i += 1
+        elif token == "}":
+            if len(contexts) == 1:
+                raise _UnbalancedError()
+            flush([])
+            contexts.pop()
+            statements.pop()
+            output.append(token)
+            i += 1
+        else:
+            statement.append(token)
+            i += 1
+
+    if len(contexts) != 1:
+        raise _UnbalancedError()
+    flush([])
+    return output
+
+
+def api_fingerprint(source: str) -> str:
+    """
+    Hash the declarations of a header: its tokens without comments, function
+    bodies and the plain members of private sections.
+    """
+    tokens = tokenize(source)
+    try:
+        tokens = _declaration_tokens(tokens)
+    except _UnbalancedError:
+        # E.g. braces opened in both branches of a condition. Hash all of
+        # the tokens rather than risk dropping declarations.
+        pass
+    return hashlib.sha256("\n".join(tokens).encode()).hexdigest()
+
+
+def get_default_fingerprint_cache_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "cxx-api-fingerprints.json")
+
+
+def get_frontend_sources(parser_dir: str, frontend: str) -> list[str]:
+    """
+    Get the sources of the parser in *parser_dir* that snapshots built with
+    *frontend* depend on: all of them, except the tree-sitter frontend for
+    Doxygen.
+    """
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(parser_dir):
+        dirnames.sort()
+        if frontend != "tree-sitter" and _TREE_SITTER_FRONTEND_DIR in dirnames:
+            dirnames.remove(_TREE_SITTER_FRONTEND_DIR)
+        paths.extend(
+            os.path.join(dirpath, name)
+            for name in sorted(filenames)
+            if name.endswith(".py")
+        )
+    return paths
+
+
+class FingerprintCache:
+    """
+    Fingerprints of headers by path, reused while the size and modification
+    time of the header are the same.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.entries: dict[str, list] = {}
+        self.changed = False
+        if path is not None and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def fingerprint(self, path: str) -> str:
+        stat = os.stat(path)
+        entry = self.entries.get(path)
+        if entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return entry[2]
+        with open(path, encoding="utf-8", errors="replace") as f:
+            fingerprint = api_fingerprint(f.read())
+        self.entries[path] = [stat.st_mtime_ns, stat.st_size, fingerprint]
+        self.changed = True
+        return fingerprint
+
+    def save(self) -> None:
+        if self.path is None or not self.changed:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+
+def hash_files(paths: list[str], root: str) -> str:
+    """Hash the relative paths and contents of *paths*."""
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def view_fingerprints(
+    config: ApiViewSnapshotConfig,
+    root: str,
+    environment: str,
+    cache: FingerprintCache,
+    codegen_key: Callable[[str], str] | None = None,
+) -> dict[str, object]:
+    """
+    Get the fingerprints of a view: one per header, by path relative to
+    *root*, and one of everything else its snapshot depends on.
+
+    Args:
+        config: The config of the view.
+        root: The directory paths are relative to.
+        environment: A hash of what all views depend on, e.g. the parser.
+        cache: The cache of the fingerprints of headers.
+        codegen_key: Gets the hash of the inputs of codegen for a platform,
+            for views including codegen output.
+    """
+    view_config = dataclasses.asdict(config)
+    view_config["inputs"] = [os.path.relpath(path, root) for path in config.inputs]
+    digest = hashlib.sha256(environment.encode())
+    digest.update(json.dumps(view_config, sort_keys=True).encode())
+    if config.codegen_platform is not None and codegen_key is not None:
+        digest.update(codegen_key(config.codegen_platform).encode())
+
+    headers = {
+        os.path.relpath(path, root): cache.fingerprint(path)
+        for path in list_input_files(config.inputs, config.exclude_patterns)
+    }
+    return {"environment": digest.hexdigest(), "headers": headers}
+
+
+def with_snapshot_hashes(
+    fingerprints: dict[str, dict], snapshot_dir: str
+) -> dict[str, dict]:
+    """
+    Add the hash of the snapshot of each view in *snapshot_dir*, or None if
+    it has none, to the fingerprints of the views.
+    """
+    result = {}
+    for view, entry in fingerprints.items():
+        path = os.path.join(snapshot_dir, f"{view}Cxx.api")
+        snapshot = None
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                snapshot = hashlib.sha256(f.read()).hexdigest()
+        result[view] = {**entry, "snapshot": snapshot}
+    return result
+
+
+def load_fingerprints(snapshot_dir: str) -> dict[str, dict]:
+    path = os.path.join(snapshot_dir, FINGERPRINTS_FILE)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return {}
+
+
+def write_fingerprints(snapshot_dir: str, fingerprints: dict[str, dict]) -> None:
+    """
+    Store the fingerprints of views next to their snapshots, keeping the
+    fingerprints of the other views.
+    """
+    stored = load_fingerprints(snapshot_dir)
+    stored.update(fingerprints)
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, FINGERPRINTS_FILE)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(dict(sorted(stored.items())), f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temp_path, path)
@@ -0,0 +1,88 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Includes between the headers of a view.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Iterable
+
+_INCLUDE = re.compile(r'^[ \t]*#[ \t]*(?:include|import)[ \t]*[<"]([^>"]+)[>"]', re.M)
+
+
+def _closure(paths: Iterable[str], edges: dict[str, set[str]]) -> set[str]:
+    result = set(paths)
+    pending = list(result)
+    while pending:
+        for path in edges.get(pending.pop(), ()):
+            if path not in result:
+                result.add(path)
+                pending.append(path)
+    return result
+
+
+class IncludeGraph:
+    """
+    The includes between the headers of a view. Includes are resolved by
+    path suffix, as include directories are not known: "a/b.h" resolves to
+    every header whose path ends with "/a/b.h".
+    """
+
+    def __init__(self, sources: dict[str, str]) -> None:
+        self._by_name: dict[str, list[str]] = {}
+        for path in sources:
+            self._by_name.setdefault(os.path.basename(path), []).append(path)
+        self._includes: dict[str, set[str]] = {}
+        self._includers: dict[str, set[str]] = {}
+        # The directory each include of a header resolves from, by the
+        # header it resolves to.
+        self._roots: dict[str, dict[str, str]] = {}
+        for path, source in sources.items():
+            self._add(path, source)
+
+    def _add(self, path: str, source: str) -> None:
+        self._roots[path] = dict(self._resolve(source))
+        self._includes[path] = set(self._roots[path])
+        for included in self._includes[path]:
+            self._includers.setdefault(included, set()).add(path)
+
+    def _resolve(self, source: str) -> Iterable[tuple[str, str]]:
+        for include in _INCLUDE.findall(source):
+            suffix = "/" + include.lstrip("./")
+            for path in self._by_name.get(os.path.basename(include), ()):
+                if path.endswith(suffix):
+                    yield path, path[: -len(suffix)] or "/"
+
+    def update(self, path: str, source: str) -> None:
+        """Update the includes of *path* after its source changed."""
+        for included in self._includes.pop(path, ()):
+            self._includers[included].discard(path)
+        self._add(path, source)
+
+    def include_path(self, paths: Iterable[str]) -> set[str]:
+        """
+        Get the directories that the includes of *paths*, and of the headers
+        they include, directly or not, of headers not in *paths* resolve
+        from: "/src" for '#include "a/b.h"' resolving to "/src/a/b.h".
+        """
+        paths = set(paths)
+        return {
+            root
+            for path in self.dependencies(paths)
+            for included, root in self._roots.get(path, {}).items()
+            if included not in paths
+        }
+
+    def dependents(self, paths: Iterable[str]) -> set[str]:
+        """Get *paths* and the headers including any of them, directly or not."""
+        return _closure(paths, self._includers)
+
+    def dependencies(self, paths: Iterable[str]) -> set[str]:
+        """Get *paths* and the headers any of them include, directly or not."""
+        return _closure(paths, self._includes)
@@ -9,6 +9,8 @@ Main entry point for building API snapshots from Doxygen XML output.
 
 from __future__ import annotations
 
+import copy
+import functools
 import os
 import re
 from dataclasses import dataclass
@@ -36,13 +38,17 @@ from .member import (
     TypedefMember,
     VariableMember,
 )
+from .member_pool import MemberPool
+from .profiling import profile_phase, ViewProfile
 from .scope import Scope, StructLikeScopeKind
 from .scope.extendable import Extendable
 from .snapshot import Snapshot
 from .utils import (
+    build_refid_index,
     format_parsed_type,
     has_scope_resolution_outside_angles,
     parse_qualified_path,
+    use_refid_index,
 )
 
 
@@ -388,39 +394,64 @@ def find_excluded_symbol_references(
     return results
 
 
-def build_snapshot(xml_dir: str, exclude_symbols: list[str] | None = None) -> Snapshot:
+def _build_compound_scopes(
+    snapshot: Snapshot,
+    xml_dir: str,
+    root: index.DoxygenType,
+    compiled_patterns: list[re.Pattern],
+    seen_refids: set[str] | None = None,
+    xml_cache: ParsedXmlCache | None = None,
+) -> None:
     """
-    Reads the Doxygen XML output and builds a snapshot of the C++ API.
+    Parse the detail file of every compound listed in index.xml and add
+    its scopes and members to the snapshot.
 
-    Args:
-        xml_dir: Path to the Doxygen XML output directory.
-        exclude_symbols: Optional list of regex patterns. Compounds whose
-            qualified name matches any of these patterns will be excluded.
+    When the XML of several Doxygen runs is merged, *seen_refids* holds the
+    refids of the compounds and namespace members added by the previous
+    ones. Namespaces are split between the runs, so only their members
+    that were not added yet are added. Other compounds are added once.
     """
-    if exclude_symbols is None:
-        exclude_symbols = []
-
-    compiled_patterns = compile_exclude_patterns(exclude_symbols)
-
-    index_path = os.path.join(xml_dir, "index.xml")
-    if not os.path.exists(index_path):
-        raise RuntimeError(f"Doxygen entry point not found at {index_path}")
-
-    root = index.parse(index_path, silence=True)
-    snapshot = Snapshot()
+    if seen_refids is None:
+        seen_refids = set()
+    parse = (
+        xml_cache.parse_compound
+        if xml_cache is not None
+        else functools.partial(compound.parse, silence=True)
+    )
 
     for entry in root.compound:
+        if entry.kind != "namespace" and entry.refid in seen_refids:
+            continue
+        seen_refids.add(entry.refid)
+
         detail_file = os.path.join(xml_dir, f"{entry.refid}.xml")
         if not os.path.exists(detail_file):
             print(f"Detail file not found at {detail_file}")
             continue
 
-        doxygen_object = compound.parse(detail_file, silence=True)
+        doxygen_object = parse(detail_file)
 
         for compound_object in doxygen_object.compounddef:
             if compound_object.prot == "private":
                 continue
 
+            if compound_object.kind == "namespace":
+                # The parsed XML may be cached, so it is copied rather than
+                # filtered in place.
+                compound_object = copy.copy(compound_object)
+                compound_object.sectiondef = [
+                    copy.copy(section_def) for section_def in compound_object.sectiondef
+                ]
+                for section_def in compound_object.sectiondef:
+                    section_def.memberdef = [
+                        member_def
+                        for member_def in section_def.memberdef
+                        if member_def.id not in seen_refids
+                    ]
+                    seen_refids.update(
+                        member_def.id for member_def in section_def.memberdef
+                    )
+
             if _should_exclude_symbol(compound_object.compoundname, compiled_patterns):
                 continue
 
@@ -445,10 +476,135 @@ def build_snapshot(xml_dir: str, exclude_symbols: list[str] | None = None) -> Sn
             else:
                 print(f"Unknown compound kind: {kind}")
 
-    snapshot.finish()
 
-    snapshot.excluded_symbol_references = find_excluded_symbol_references(
-        snapshot, compiled_patterns
-    )
+class ParsedXmlCache:
+    """
+    Parsed Doxygen XML files by path, reused by the builds of a view while
+    its XML does not change. The files of a directory must be dropped with
+    invalidate() when Doxygen writes it again.
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[str, object] = {}
 
+    def parse_index(self, path: str) -> index.DoxygenType:
+        if path not in self._files:
+            self._files[path] = index.parse(path, silence=True)
+        return self._files[path]
+
+    def parse_compound(self, path: str) -> compound.DoxygenType:
+        if path not in self._files:
+            self._files[path] = compound.parse(path, silence=True)
+        return self._files[path]
+
+    def invalidate(self, xml_dir: str) -> None:
+        prefix = os.path.join(xml_dir, "")
+        for path in [path for path in self._files if path.startswith(prefix)]:
+            del self._files[path]
+
+
+def _count_scope_tree(scope: Scope) -> tuple[int, int]:
+    """Return the number of scopes and members in the tree under *scope*."""
+    scopes = 1
+    members = len(scope.get_members())
+    for inner in scope.inner_scopes.values():
+        inner_scopes, inner_members = _count_scope_tree(inner)
+        scopes += inner_scopes
+        members += inner_members
+    return scopes, members
+
+
+def build_snapshot(
+    xml_dir: str | list[str],
+    exclude_symbols: list[str] | None = None,
+    member_pool: MemberPool | None = None,
+    profile: ViewProfile | None = None,
+    xml_cache: ParsedXmlCache | None = None,
+) -> Snapshot:
+    """
+    Reads the Doxygen XML output and builds a snapshot of the C++ API.
+
+    Args:
+        xml_dir: Path to the Doxygen XML output directory, or the output
+            directories of the shards of a sharded Doxygen run, which are
+            merged.
+        exclude_symbols: Optional list of regex patterns. Compounds whose
+            qualified name matches any of these patterns will be excluded.
+        member_pool: Optional pool shared with the snapshots of other
+            variants. Members of the finished snapshot are replaced with
+            their pooled instances so identical declarations are stored once.
+        profile: Optional profile of the view, which records the time spent
+            in each phase of the build.
+        xml_cache: Optional cache of the parsed XML, which is reused by the
+            next builds instead of parsing the XML again.
+    """
+    if exclude_symbols is None:
+        exclude_symbols = []
+
+    compiled_patterns = compile_exclude_patterns(exclude_symbols)
+
+    xml_dirs = [xml_dir] if isinstance(xml_dir, str) else xml_dir
+    index_paths = [os.path.join(path, "index.xml") for path in xml_dirs]
+    for index_path in index_paths:
+        if not os.path.exists(index_path):
+            raise RuntimeError(f"Doxygen entry point not found at {index_path}")
+
+    with profile_phase(profile, "parse_xml") as phase:
+        parse_index = (
+            xml_cache.parse_index
+            if xml_cache is not None
+            else functools.partial(index.parse, silence=True)
+        )
+        roots = [parse_index(index_path) for index_path in index_paths]
+        snapshot = Snapshot()
+
+        # Refs are resolved against the names index.xml lists for each refid,
+        # rather than by decoding the refids. The refs of a shard may point
+        # to the symbols of another one.
+        refid_index = {}
+        for root in reversed(roots):
+            refid_index.update(build_refid_index(root))
+
+        seen_refids: set[str] = set()
+        with use_refid_index(refid_index):
+            for path, root in zip(xml_dirs, roots):
+                _build_compound_scopes(
+                    snapshot, path, root, compiled_patterns, seen_refids, xml_cache
+                )
+
+        if profile is not None:
+            for root in roots:
+                files = sum(1 for entry in root.compound if entry.kind == "file")
+                phase.count("files", files)
+                phase.count("compounds", len(root.compound) - files)
+
+    finish_snapshot(snapshot, compiled_patterns, member_pool, profile)
     return snapshot
+
+
+def finish_snapshot(
+    snapshot: Snapshot,
+    compiled_patterns: list[re.Pattern],
+    member_pool: MemberPool | None = None,
+    profile: ViewProfile | None = None,
+) -> None:
+    """
+    Finish a snapshot whose scopes and members were all added, find its
+    references to excluded symbols, and share its members with the pool.
+    """
+    with profile_phase(profile, "finish") as phase:
+        snapshot.finish()
+
+        if profile is not None:
+            scopes, members = _count_scope_tree(snapshot.root_scope)
+            phase.count("scopes", scopes)
+            phase.count("members", members)
+
+    with profile_phase(profile, "exclusion_scan"):
+        snapshot.excluded_symbol_references = find_excluded_symbol_references(
+            snapshot, compiled_patterns
+        )
+
+    if member_pool is not None:
+        with profile_phase(profile, "share_members"):
+            member_pool.share(snapshot)
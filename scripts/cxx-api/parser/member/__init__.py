@@ -3,7 +3,7 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
-from .base import Member, MemberKind, STORE_INITIALIZERS_IN_SNAPSHOT
+from .base import FrozenMemberError, Member, MemberKind, STORE_INITIALIZERS_IN_SNAPSHOT
 from .concept_member import ConceptMember
 from .enum_member import EnumMember
 from .friend_member import FriendMember
@@ -16,6 +16,7 @@ __all__ = [
     "ConceptMember",
     "EnumMember",
     "FriendMember",
+    "FrozenMemberError",
     "FunctionMember",
     "Member",
     "MemberKind",
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import dataclasses
+import sys
 from abc import ABC, abstractmethod
 from enum import IntEnum
 from typing import TYPE_CHECKING
@@ -37,12 +39,50 @@ def is_function_pointer_argstring(argstring: str | None) -> bool:
     return argstring is not None and argstring.startswith(")(")
 
 
+def intern_optional(value: str | None) -> str | None:
+    """Intern a string that may be None so repeated names share storage."""
+    return sys.intern(value) if value is not None else None
+
+
+def _freeze(value):
+    """Convert a member field into a hashable value for structural comparison."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (Template, TemplateList)):
+        return value.structural_key()
+    if dataclasses.is_dataclass(value):
+        return dataclasses.astuple(value)
+    return value
+
+
+class FrozenMemberError(AttributeError):
+    """Raised when a member frozen by a MemberPool is modified."""
+
+
 class Member(ABC):
+    __slots__ = (
+        "name",
+        "visibility",
+        "location",
+        "template_list",
+        "specialization_args",
+        "_render_cache",
+    )
+
     def __init__(self, name: str, visibility: str) -> None:
-        self.name: str = name
-        self.visibility: str = visibility
+        self.name: str = sys.intern(name)
+        self.visibility: str = sys.intern(visibility)
+        # The file the member is declared in, if known.
+        self.location: str | None = None
         self.template_list: TemplateList | None = None
         self.specialization_args: list[str] | None = None
+        self._render_cache: dict[tuple, str] | None = None
+
+    def __setattr__(self, name: str, value: object) -> None:
+        # Frozen members may be shared by several snapshots.
+        if getattr(self, "_render_cache", None) is not None:
+            raise FrozenMemberError(f"Cannot set {name} of frozen member {self.name}")
+        object.__setattr__(self, name, value)
 
     @property
     @abstractmethod
@@ -61,6 +101,47 @@ class Member(ABC):
     def close(self, scope: Scope):
         pass
 
+    def render(
+        self,
+        indent: int = 0,
+        qualification: str | None = None,
+        hide_visibility: bool = False,
+    ) -> str:
+        """
+        Return the string representation of the member.
+
+        Members that have been frozen by a MemberPool are immutable and may be
+        shared by several snapshots, so their rendering is cached.
+        """
+        cache = self._render_cache
+        if cache is None:
+            return self.to_string(indent, qualification, hide_visibility)
+        key = (indent, qualification, hide_visibility)
+        rendered = cache.get(key)
+        if rendered is None:
+            rendered = cache[key] = self.to_string(
+                indent, qualification, hide_visibility
+            )
+        return rendered
+
+    def freeze(self) -> None:
+        """
+        Make the member immutable, so that setting any of its fields raises
+        FrozenMemberError, and enable render caching.
+        """
+        if self._render_cache is None:
+            self._render_cache = {}
+
+    def structural_key(self) -> tuple:
+        """
+        Get a hashable key identifying the member by value.
+
+        Two members with equal keys render identically in every context.
+        """
+        return (type(self),) + tuple(
+            _freeze(getattr(self, slot)) for slot in _structural_slots(type(self))
+        )
+
     def _get_qualified_name(self, qualification: str | None) -> str:
         name = self.name
         if self.specialization_args is not None:
@@ -84,3 +165,20 @@ class Member(ABC):
                 self.template_list.add(t)
         else:
             self.template_list.add(template)
+
+
+_STRUCTURAL_SLOTS: dict[type, tuple[str, ...]] = {}
+
+
+def _structural_slots(cls: type) -> tuple[str, ...]:
+    """Get the value-carrying slots of a member class, including inherited ones."""
+    slots = _STRUCTURAL_SLOTS.get(cls)
+    if slots is None:
+        slots = tuple(
+            slot
+            for klass in reversed(cls.__mro__)
+            for slot in klass.__dict__.get("__slots__", ())
+            if slot != "_render_cache"
+        )
+        _STRUCTURAL_SLOTS[cls] = slots
+    return slots
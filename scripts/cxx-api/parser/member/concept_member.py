@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 
 
 class ConceptMember(Member):
+    __slots__ = ("constraint",)
+
     def __init__(
         self,
         name: str,
@@ -9,6 +9,8 @@ from .base import Member, MemberKind, STORE_INITIALIZERS_IN_SNAPSHOT
 
 
 class EnumMember(Member):
+    __slots__ = ("value",)
+
     def __init__(self, name: str, value: str | None) -> None:
         super().__init__(name, "public")
         self.value: str | None = value
@@ -9,6 +9,8 @@ from .base import Member, MemberKind
 
 
 class FriendMember(Member):
+    __slots__ = ()
+
     def __init__(self, name: str, visibility: str = "public") -> None:
         super().__init__(name, visibility)
 
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import dataclasses
+import sys
 from typing import TYPE_CHECKING
 
 from ..utils import (
@@ -22,6 +24,17 @@ if TYPE_CHECKING:
 
 
 class FunctionMember(Member):
+    __slots__ = (
+        "type",
+        "is_virtual",
+        "is_static",
+        "is_constexpr",
+        "arguments",
+        "modifiers",
+        "is_const",
+        "is_override",
+    )
+
     def __init__(
         self,
         name: str,
@@ -37,7 +50,7 @@ class FunctionMember(Member):
         base_name, specialization_args = split_specialization(name)
         super().__init__(base_name, visibility)
         self.specialization_args: list[str] | None = specialization_args
-        self.type: str = type
+        self.type: str = sys.intern(type)
         self.is_virtual: bool = is_virtual
         self.is_static: bool = is_static
         self.is_constexpr: bool = is_constexpr
@@ -49,8 +62,9 @@ class FunctionMember(Member):
         # Doxygen signals pure-virtual via the virt attribute, but the arg string
         # may not contain "= 0" (e.g. trailing return type syntax), so the
         # modifiers parsed from the arg string may miss it. Propagate the flag.
-        if is_pure_virtual:
-            self.modifiers.is_pure_virtual = True
+        # The parsed modifiers are shared between functions, so derive a copy.
+        if is_pure_virtual and not self.modifiers.is_pure_virtual:
+            self.modifiers = dataclasses.replace(self.modifiers, is_pure_virtual=True)
 
         self.is_const = self.modifiers.is_const
         self.is_override = self.modifiers.is_override
@@ -62,7 +76,7 @@ class FunctionMember(Member):
         return MemberKind.FUNCTION
 
     def close(self, scope: Scope):
-        self.type = qualify_type_str(self.type, scope)
+        self.type = sys.intern(qualify_type_str(self.type, scope))
         self.arguments = qualify_arguments(self.arguments, scope)
         self._qualify_specialization_args(scope)
         self._qualify_conversion_operator_type(scope)
@@ -84,7 +98,7 @@ class FunctionMember(Member):
 
         qualified = qualify_type_str(type_part, scope)
         if qualified != type_part:
-            self.name = prefix + qualified
+            self.name = sys.intern(prefix + qualified)
 
     def to_string(
         self,
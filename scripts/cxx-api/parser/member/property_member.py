@@ -5,10 +5,14 @@
 
 from __future__ import annotations
 
-from .base import Member, MemberKind
+import sys
+
+from .base import intern_optional, Member, MemberKind
 
 
 class PropertyMember(Member):
+    __slots__ = ("type", "is_static", "accessor", "is_readable", "is_writable")
+
     def __init__(
         self,
         name: str,
@@ -20,9 +24,9 @@ class PropertyMember(Member):
         is_writable: bool,
     ) -> None:
         super().__init__(name, visibility)
-        self.type: str = type
+        self.type: str = sys.intern(type)
         self.is_static: bool = is_static
-        self.accessor: str | None = accessor
+        self.accessor: str | None = intern_optional(accessor)
         self.is_readable: bool = is_readable
         self.is_writable: bool = is_writable
 
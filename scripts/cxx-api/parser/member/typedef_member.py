@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from ..utils import (
@@ -16,29 +18,31 @@ from ..utils import (
     qualify_arguments,
     qualify_parsed_type,
 )
-from .base import is_function_pointer_argstring, Member, MemberKind
+from .base import intern_optional, is_function_pointer_argstring, Member, MemberKind
 
 if TYPE_CHECKING:
     from ..scope import Scope
 
 
 class TypedefMember(Member):
+    __slots__ = ("keyword", "argstring", "_fp_arguments", "_parsed_type", "type")
+
     def __init__(
         self, name: str, type: str, argstring: str | None, visibility: str, keyword: str
     ) -> None:
         super().__init__(name, visibility)
-        self.keyword: str = keyword
-        self.argstring: str | None = argstring
+        self.keyword: str = sys.intern(keyword)
+        self.argstring: str | None = intern_optional(argstring)
 
         # Parse function pointer argstrings (e.g. ")(int x, float y)")
-        self._fp_arguments: list[Argument] = (
-            parse_function_pointer_argstring(argstring) if argstring else []
+        self._fp_arguments: Sequence[Argument] = (
+            parse_function_pointer_argstring(argstring) if argstring else ()
         )
 
         # Parse inline function signatures in the type so that argument
         # lists are stored as structured data, not raw strings.
         self._parsed_type: list[str | list[Argument]] = parse_type_with_argstrings(type)
-        self.type: str = type
+        self.type: str = sys.intern(type)
 
     @property
     def member_kind(self) -> MemberKind:
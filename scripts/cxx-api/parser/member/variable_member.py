@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 from ..utils import (
@@ -18,6 +20,7 @@ from ..utils import (
     split_specialization,
 )
 from .base import (
+    intern_optional,
     is_function_pointer_argstring,
     Member,
     MemberKind,
@@ -29,6 +32,20 @@ if TYPE_CHECKING:
 
 
 class VariableMember(Member):
+    __slots__ = (
+        "type",
+        "value",
+        "is_const",
+        "is_static",
+        "is_constexpr",
+        "is_mutable",
+        "is_brace_initializer",
+        "definition",
+        "argstring",
+        "_fp_arguments",
+        "_parsed_type",
+    )
+
     def __init__(
         self,
         name: str,
@@ -46,7 +63,7 @@ class VariableMember(Member):
         base_name, specialization_args = split_specialization(name)
         super().__init__(base_name, visibility)
         self.specialization_args: list[str] | None = specialization_args
-        self.type: str = type
+        self.type: str = sys.intern(type)
         self.value: str | None = value
         self.is_const: bool = is_const
         self.is_static: bool = is_static
@@ -54,9 +71,9 @@ class VariableMember(Member):
         self.is_mutable: bool = is_mutable
         self.is_brace_initializer: bool = is_brace_initializer
         self.definition: str = definition
-        self.argstring: str | None = argstring
-        self._fp_arguments: list[Argument] = (
-            parse_function_pointer_argstring(argstring) if argstring else []
+        self.argstring: str | None = intern_optional(argstring)
+        self._fp_arguments: Sequence[Argument] = (
+            parse_function_pointer_argstring(argstring) if argstring else ()
         )
         self._parsed_type: list[str | list[Argument]] = parse_type_with_argstrings(type)
 
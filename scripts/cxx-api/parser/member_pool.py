@@ -0,0 +1,124 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Structural sharing of members across snapshots.
+
+The debug, release and newarch variants of a platform produce scope trees
+that are almost identical. A MemberPool hash-conses the members of finished
+snapshots so that each distinct declaration is stored, and rendered, once
+no matter how many variants contain it.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+from .member import Member
+from .scope import Scope
+from .snapshot import Snapshot
+from .utils import Argument
+
+# Member fields holding argument lists, either directly or nested in the
+# segments of a parsed type.
+_ARGUMENT_FIELDS = ("arguments", "_fp_arguments", "_parsed_type")
+
+
+@dataclass
+class MemberPoolStats:
+    members: int = 0
+    shared_members: int = 0
+    arguments: int = 0
+    shared_arguments: int = 0
+
+
+def _collect_arguments(value, arguments: dict[Argument, Argument]) -> None:
+    for item in value or ():
+        if isinstance(item, list):
+            _collect_arguments(item, arguments)
+        elif isinstance(item, tuple):
+            arguments[item] = item
+
+
+class MemberPool:
+    """
+    A pool of immutable members shared by several finished snapshots.
+
+    Members are compared by value (see Member.structural_key), so only
+    snapshots that have been finished may be shared: qualification mutates
+    members while the scope tree is being closed.
+    """
+
+    def __init__(self) -> None:
+        self._members: dict[tuple, Member] = {}
+        self._arguments: dict[Argument, Argument] = {}
+        self._lock = threading.Lock()
+        self.stats = MemberPoolStats()
+
+    def share(self, snapshot: Snapshot) -> None:
+        """
+        Replace every member of a finished snapshot with its pooled instance.
+        """
+        with self._lock:
+            self._share_scope(snapshot.root_scope)
+
+    def intern_member(self, member: Member) -> Member:
+        """Get the pooled member equal to *member*, adding it if needed."""
+        for field in _ARGUMENT_FIELDS:
+            value = getattr(member, field, None)
+            if value:
+                setattr(member, field, self._intern_arguments(value))
+
+        key = member.structural_key()
+        pooled = self._members.get(key)
+        self.stats.members += 1
+        if pooled is None:
+            member.freeze()
+            self._members[key] = member
+            return member
+
+        self.stats.shared_members += 1
+        return pooled
+
+    def retain(self, snapshot: Snapshot) -> None:
+        """
+        Drop the pooled members and arguments that a snapshot shared through
+        the pool doesn't use, e.g. the members of XML that was regenerated.
+        """
+        with self._lock:
+            members: dict[tuple, Member] = {}
+            arguments: dict[Argument, Argument] = {}
+            pending = [snapshot.root_scope]
+            while pending:
+                scope = pending.pop()
+                pending.extend(scope.inner_scopes.values())
+                for member in scope.get_members():
+                    members[member.structural_key()] = member
+                    for field in _ARGUMENT_FIELDS:
+                        _collect_arguments(getattr(member, field, None), arguments)
+            self._members = members
+            self._arguments = arguments
+
+    def _intern_arguments(self, value: list) -> list:
+        result = []
+        for item in value:
+            if isinstance(item, list):
+                result.append(self._intern_arguments(item))
+            elif isinstance(item, tuple):
+                self.stats.arguments += 1
+                pooled = self._arguments.setdefault(item, item)
+                if pooled is not item:
+                    self.stats.shared_arguments += 1
+                result.append(pooled)
+            else:
+                result.append(item)
+        return result
+
+    def _share_scope(self, scope: Scope) -> None:
+        members = scope.get_members()
+        members[:] = [self.intern_member(member) for member in members]
+        for inner_scope in scope.inner_scopes.values():
+            self._share_scope(inner_scope)
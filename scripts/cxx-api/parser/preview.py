@@ -0,0 +1,186 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Preview of the API of a single header.
+
+Doxygen runs with the config of a view over the header and the headers of
+the view it includes, directly or not, so that names declared in the
+included headers, codegen output included, are resolved as in a full run.
+The snapshot is then pruned
+to the scopes located in the header and to the namespace members it
+declares, after it was finished, so that names are qualified as in the
+snapshot of the whole view.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+
+from doxmlparser import compound, index
+
+from .config import ApiViewSnapshotConfig
+from .doxygen import run_doxygen
+from .doxygen_shards import list_input_files
+from .includes import IncludeGraph
+from .main import build_snapshot
+from .scope import NamespaceScopeKind, Scope
+from .snapshot import Snapshot
+
+
+def _read_header(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _namespace_members_in(
+    xml_dir: str, is_in_file: Callable[[str | None], bool]
+) -> set[tuple[str, str]]:
+    """
+    Get the qualified name of the namespace and the name of every namespace
+    member located in the file.
+    """
+    members = set()
+    root = index.parse(os.path.join(xml_dir, "index.xml"), silence=True)
+    for entry in root.compound:
+        if entry.kind != "namespace":
+            continue
+        detail_file = os.path.join(xml_dir, f"{entry.refid}.xml")
+        if not os.path.exists(detail_file):
+            continue
+        for compound_object in compound.parse(detail_file, silence=True).compounddef:
+            for section_def in compound_object.sectiondef:
+                for member_def in section_def.memberdef:
+                    location = member_def.location
+                    if is_in_file(location.file if location is not None else None):
+                        members.add((compound_object.compoundname, member_def.name))
+    return members
+
+
+def _prune(
+    snapshot: Snapshot,
+    scope_path: list[str],
+    scope: Scope,
+    is_in_file: Callable[[str | None], bool],
+    namespace_members: set[tuple[str, str]],
+) -> bool:
+    """
+    Remove what is not located in the file from the tree under *scope*, at
+    *scope_path* in *snapshot*, and return whether anything is left.
+    """
+    if not isinstance(scope.kind, NamespaceScopeKind):
+        return is_in_file(scope.location)
+
+    name = scope.get_qualified_name()
+    scope.retain_members(lambda member: (name, member.name) in namespace_members)
+    for key, inner_scope in list(scope.inner_scopes.items()):
+        inner_path = [*scope_path, key]
+        if not _prune(snapshot, inner_path, inner_scope, is_in_file, namespace_members):
+            snapshot.remove_scope(inner_path)
+    return bool(scope.get_members() or scope.inner_scopes)
+
+
+def prune_to_file(
+    snapshot: Snapshot, xml_dir: str, is_in_file: Callable[[str | None], bool]
+) -> None:
+    """
+    Remove the scopes and namespace members of a finished snapshot that are
+    not located in a file, given the Doxygen XML it was built from.
+    *is_in_file* tells whether a Doxygen location is the file.
+    """
+    _prune(
+        snapshot,
+        [],
+        snapshot.root_scope,
+        is_in_file,
+        _namespace_members_in(xml_dir, is_in_file),
+    )
+
+
+def find_views_of_header(
+    header: str,
+    snapshot_configs: list[ApiViewSnapshotConfig],
+    doxygen_config_template: str | None = None,
+) -> list[ApiViewSnapshotConfig]:
+    """Get the views whose inputs include *header*."""
+    header = os.path.abspath(header)
+    return [
+        config
+        for config in snapshot_configs
+        if header
+        in list_input_files(
+            config.inputs, config.exclude_patterns, doxygen_config_template
+        )
+    ]
+
+
+def preview_header(
+    header: str,
+    config: ApiViewSnapshotConfig,
+    react_native_dir: str,
+    work_dir: str,
+    codegen_dir: str | None = None,
+    input_filter: str | None = None,
+    verbose: bool = False,
+    run: Callable[..., None] = run_doxygen,
+) -> str:
+    """
+    Get the part of the snapshot of the view of *config* that *header*
+    declares.
+
+    Args:
+        header: Path of the header.
+        config: The config of a view whose inputs include the header.
+        react_native_dir: The directory Doxygen runs in.
+        work_dir: Directory to write the Doxygen XML to.
+        codegen_dir: The codegen output of the view, if any.
+        input_filter: The input filter command of the view, if any.
+        verbose: Print the progress of Doxygen.
+        run: Runs Doxygen, with the arguments of run_doxygen.
+    """
+    header = os.path.abspath(header)
+    include_directories = list(config.inputs)
+    if codegen_dir is not None:
+        include_directories.append(codegen_dir)
+    files = list_input_files(
+        include_directories,
+        config.exclude_patterns,
+        os.path.join(react_native_dir, ".doxygen.config.template"),
+    )
+    if header not in files:
+        raise RuntimeError(f"{header} is not an input of {config.snapshot_name}")
+
+    includes = IncludeGraph({path: _read_header(path) for path in files})
+    inputs = sorted(includes.dependencies([header]))
+    if verbose:
+        print(
+            f"[{config.snapshot_name}] Running Doxygen over "
+            f"{os.path.basename(header)} and the {len(inputs) - 1} headers it "
+            "includes"
+        )
+    run(
+        working_dir=react_native_dir,
+        include_directories=inputs,
+        exclude_patterns=config.exclude_patterns,
+        definitions=config.definitions,
+        input_filter=input_filter,
+        verbose=verbose,
+        output_dir=work_dir,
+        config_file=f".doxygen.config.{config.snapshot_name}.preview.generated",
+        label=config.snapshot_name,
+    )
+
+    def is_header(location: str | None) -> bool:
+        # Doxygen strips the directory it runs in from locations.
+        return (
+            location is not None
+            and os.path.normpath(os.path.join(react_native_dir, location)) == header
+        )
+
+    xml_dir = os.path.join(work_dir, "xml")
+    snapshot = build_snapshot(xml_dir, exclude_symbols=config.exclude_symbols)
+    prune_to_file(snapshot, xml_dir, is_header)
+    return snapshot.to_string()
@@ -0,0 +1,146 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Tracking of the Doxygen and codegen processes of a run.
+
+Every process is started through a ProcessGroup, which can stream its
+stderr with a per-view prefix, kill all of them at once when a run is
+cancelled, and tell each view the peak RSS of the processes it ran.
+"""
+
+from __future__ import annotations
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+from .profiling import max_rss_mib
+
+if TYPE_CHECKING:
+    from .profiling import PhaseRecord
+
+
+class ProcessCancelledError(RuntimeError):
+    """Raised for processes that were killed or not started by cancel()."""
+
+
+class ProcessGroup:
+    """
+    Runs subprocesses and keeps track of the ones still running, so that
+    cancel() can kill them. With *stream_stderr*, the stderr of every
+    process is printed line by line as it is produced, after a prefix.
+    """
+
+    def __init__(self, stream_stderr: bool = False) -> None:
+        self.stream_stderr = stream_stderr
+        self._lock = threading.Lock()
+        self._running: set[subprocess.Popen] = set()
+        self._cancelled = False
+        # Peak RSS of the processes run by each thread.
+        self._local = threading.local()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(
+        self,
+        cmd: list[str],
+        prefix: str = "",
+        phase: PhaseRecord | None = None,
+        cwd: str | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run *cmd* like subprocess.run with captured text output. When a
+        profiling phase is given, the resource usage of the process is
+        recorded in it.
+        """
+        with self._lock:
+            if self._cancelled:
+                raise ProcessCancelledError(f"{prefix}{cmd[0]} cancelled")
+            process = subprocess.Popen(
+                cmd,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                # Doxygen and node start processes of their own, which must
+                # be killed with them.
+                start_new_session=True,
+            )
+            self._running.add(process)
+
+        try:
+            stdout: list[str] = []
+            stderr: list[str] = []
+            readers = [
+                threading.Thread(target=lambda: stdout.append(process.stdout.read())),
+                threading.Thread(
+                    target=self._read_stderr, args=(process.stderr, prefix, stderr)
+                ),
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+
+            # Popen.wait() discards the resource usage of the child.
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            self._local.max_rss_mib = max(
+                getattr(self._local, "max_rss_mib", 0.0), max_rss_mib(usage)
+            )
+            if phase is not None:
+                phase.record_child_usage(usage)
+        finally:
+            with self._lock:
+                self._running.discard(process)
+            process.stdout.close()
+            process.stderr.close()
+
+        if process.returncode != 0 and self._cancelled:
+            raise ProcessCancelledError(f"{prefix}{cmd[0]} cancelled")
+        return subprocess.CompletedProcess(
+            cmd, process.returncode, "".join(stdout), "".join(stderr)
+        )
+
+    def take_max_rss_mib(self) -> float:
+        """
+        Return the peak RSS of the processes run by the calling thread since
+        the previous call, in MiB.
+        """
+        peak = getattr(self._local, "max_rss_mib", 0.0)
+        self._local.max_rss_mib = 0.0
+        return peak
+
+    def record_max_rss_mib(self, value: float) -> None:
+        """
+        Count *value* in the peak RSS of the calling thread, for processes it
+        ran through other threads.
+        """
+        self._local.max_rss_mib = max(getattr(self._local, "max_rss_mib", 0.0), value)
+
+    def _read_stderr(self, stream, prefix: str, lines: list[str]) -> None:
+        for line in stream:
+            lines.append(line)
+            if self.stream_stderr:
+                print(f"{prefix}{line}", end="", file=sys.stderr, flush=True)
+
+    def cancel(self) -> None:
+        """
+        Kill the running processes. Processes started afterwards fail
+        with ProcessCancelledError without running.
+        """
+        with self._lock:
+            self._cancelled = True
+            for process in self._running:
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
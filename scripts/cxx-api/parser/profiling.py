@@ -0,0 +1,313 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Per-phase profiling of snapshot generation.
+
+A Profiler records the wall time, CPU time and peak RSS of every phase of
+every view (codegen, Doxygen, XML parsing, finishing, rendering, ...) and
+writes them as a JSON summary and as a Chrome trace-event file, which can
+be opened in chrome://tracing or https://ui.perfetto.dev to see parallel
+views on a timeline.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import ContextManager
+
+# ru_maxrss is reported in bytes on macOS and in kilobytes on Linux.
+_MAXRSS_BYTES = 1 if sys.platform == "darwin" else 1024
+_MIB = 1024 * 1024
+
+PROFILE_SUMMARY_FILE = "profile.json"
+PROFILE_TRACE_FILE = "trace.json"
+
+
+def max_rss_mib(usage: resource.struct_rusage) -> float:
+    return usage.ru_maxrss * _MAXRSS_BYTES / _MIB
+
+
+@dataclass
+class PhaseRecord:
+    """
+    Measurements of one phase of one view.
+
+    cpu_s is the CPU time of the thread that ran the phase. Phases that run
+    a subprocess also record the CPU time and peak RSS of the children they
+    waited for. max_rss_mib is the peak RSS of the whole parser process when
+    the phase ended, since views share the process.
+    """
+
+    view: str
+    name: str
+    start_s: float = 0.0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    max_rss_mib: float = 0.0
+    child_cpu_s: float = 0.0
+    child_max_rss_mib: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+    thread_id: int = 0
+    runs: int = 1
+    _profiled: bool = True
+
+    def count(self, name: str, value: int) -> None:
+        """
+        Add *value* to the count named *name* of this phase.
+        """
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def run(self, cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+        """
+        Run *cmd* like subprocess.run, recording the resource usage of the
+        child process in this phase when profiling.
+        """
+        if not self._profiled:
+            return subprocess.run(cmd, **kwargs)
+
+        # Popen.wait() discards the resource usage of the child, so the child
+        # is reaped with os.wait4 once its output has been read.
+        capture_output = kwargs.pop("capture_output", False)
+        if capture_output:
+            kwargs["stdout"] = kwargs["stderr"] = subprocess.PIPE
+
+        with subprocess.Popen(cmd, **kwargs) as process:
+            outputs: dict[str, str | bytes] = {}
+            readers = [
+                threading.Thread(
+                    target=lambda name, stream: outputs.__setitem__(
+                        name, stream.read()
+                    ),
+                    args=(name, stream),
+                )
+                for name, stream in (
+                    ("stdout", process.stdout),
+                    ("stderr", process.stderr),
+                )
+                if stream is not None
+            ]
+            for reader in readers:
+                reader.start()
+            for reader in readers:
+                reader.join()
+
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+
+        self.record_child_usage(usage)
+        return subprocess.CompletedProcess(
+            cmd,
+            process.returncode,
+            outputs.get("stdout"),
+            outputs.get("stderr"),
+        )
+
+    def record_child_usage(self, usage: resource.struct_rusage) -> None:
+        """
+        Record the resource usage of a child process reaped with os.wait4.
+        """
+        self.child_cpu_s += usage.ru_utime + usage.ru_stime
+        self.child_max_rss_mib = max(self.child_max_rss_mib, max_rss_mib(usage))
+
+    def merged(self, other: PhaseRecord) -> PhaseRecord:
+        """
+        Get the measurements of this phase and of another run of it: the
+        times and counts add up, the peaks are the highest of the two.
+        """
+        return PhaseRecord(
+            view=self.view,
+            name=self.name,
+            start_s=min(self.start_s, other.start_s),
+            wall_s=self.wall_s + other.wall_s,
+            cpu_s=self.cpu_s + other.cpu_s,
+            max_rss_mib=max(self.max_rss_mib, other.max_rss_mib),
+            child_cpu_s=self.child_cpu_s + other.child_cpu_s,
+            child_max_rss_mib=max(self.child_max_rss_mib, other.child_max_rss_mib),
+            counts={
+                name: self.counts.get(name, 0) + other.counts.get(name, 0)
+                for name in {**self.counts, **other.counts}
+            },
+            thread_id=self.thread_id,
+            runs=self.runs + other.runs,
+        )
+
+    def to_dict(self) -> dict[str, object]:
+        result: dict[str, object] = {
+            "wall_s": round(self.wall_s, 6),
+            "cpu_s": round(self.cpu_s, 6),
+            "max_rss_mib": round(self.max_rss_mib, 1),
+        }
+        if self.child_cpu_s or self.child_max_rss_mib:
+            result["child_cpu_s"] = round(self.child_cpu_s, 6)
+            result["child_max_rss_mib"] = round(self.child_max_rss_mib, 1)
+        if self.counts:
+            result["counts"] = dict(self.counts)
+        if self.runs > 1:
+            result["runs"] = self.runs
+        return result
+
+
+class Profiler:
+    """
+    Collects the phases of all views of a run. Phases may be recorded
+    concurrently from several threads.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._records: list[PhaseRecord] = []
+        self._thread_ids: dict[str, int] = {}
+
+    def view(self, view: str) -> ViewProfile:
+        """
+        Return the profile that records the phases of *view*.
+        """
+        return ViewProfile(self, view)
+
+    @contextmanager
+    def phase(self, view: str, name: str) -> Iterator[PhaseRecord]:
+        """
+        Time the phase *name* of *view* for the duration of the context.
+        """
+        with self._lock:
+            # Each view gets its own row in the trace viewer.
+            thread_id = self._thread_ids.setdefault(view, len(self._thread_ids) + 1)
+
+        record = PhaseRecord(view=view, name=name, thread_id=thread_id)
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            record.start_s = start - self._origin
+            record.wall_s = time.perf_counter() - start
+            record.cpu_s = time.thread_time() - cpu_start
+            record.max_rss_mib = max_rss_mib(resource.getrusage(resource.RUSAGE_SELF))
+            with self._lock:
+                self._records.append(record)
+
+    @property
+    def records(self) -> list[PhaseRecord]:
+        with self._lock:
+            return sorted(self._records, key=lambda record: record.start_s)
+
+    def summary(self, cache_stats: dict[str, object] | None = None) -> dict:
+        """
+        Aggregate the recorded phases by view. The runs of a phase that ran
+        several times for a view, like the Doxygen runs of its shards, are
+        added up.
+        """
+        phases: dict[str, dict[str, PhaseRecord]] = {}
+        for record in self.records:
+            view_phases = phases.setdefault(record.view, {})
+            previous = view_phases.get(record.name)
+            view_phases[record.name] = (
+                record if previous is None else previous.merged(record)
+            )
+
+        views: dict[str, dict] = {}
+        for view_name, view_phases in phases.items():
+            view = views[view_name] = {"wall_s": 0.0, "phases": {}, "counts": {}}
+            for record in view_phases.values():
+                view["wall_s"] = round(view["wall_s"] + record.wall_s, 6)
+                view["phases"][record.name] = record.to_dict()
+                for name, value in record.counts.items():
+                    view["counts"][name] = view["counts"].get(name, 0) + value
+
+        summary = {
+            "wall_s": round(time.perf_counter() - self._origin, 6),
+            "max_rss_mib": round(
+                max_rss_mib(resource.getrusage(resource.RUSAGE_SELF)), 1
+            ),
+            "views": views,
+        }
+        if cache_stats is not None:
+            summary["caches"] = cache_stats
+        return summary
+
+    def trace_events(self) -> list[dict]:
+        """
+        Convert the recorded phases to Chrome trace events.
+        """
+        pid = os.getpid()
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread_id,
+                "args": {"name": view},
+            }
+            for view, thread_id in self._thread_ids.items()
+        ]
+        for record in self.records:
+            events.append(
+                {
+                    "name": record.name,
+                    "cat": record.view,
+                    "ph": "X",
+                    "ts": round(record.start_s * 1e6),
+                    "dur": round(record.wall_s * 1e6),
+                    "pid": pid,
+                    "tid": record.thread_id,
+                    "args": record.to_dict(),
+                }
+            )
+        return events
+
+    def write(
+        self, output_dir: str, cache_stats: dict[str, object] | None = None
+    ) -> tuple[str, str]:
+        """
+        Write the JSON summary and the Chrome trace to *output_dir* and
+        return their paths.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        summary_path = os.path.join(output_dir, PROFILE_SUMMARY_FILE)
+        trace_path = os.path.join(output_dir, PROFILE_TRACE_FILE)
+
+        with open(summary_path, "w") as f:
+            json.dump(self.summary(cache_stats), f, indent=2)
+            f.write("\n")
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": self.trace_events()}, f)
+
+        return summary_path, trace_path
+
+
+class ViewProfile:
+    """
+    The phases of a single view, as recorded by a Profiler.
+    """
+
+    def __init__(self, profiler: Profiler, view: str) -> None:
+        self.profiler = profiler
+        self.view = view
+
+    def phase(self, name: str) -> ContextManager[PhaseRecord]:
+        return self.profiler.phase(self.view, name)
+
+
+def profile_phase(
+    profile: ViewProfile | None, name: str
+) -> ContextManager[PhaseRecord]:
+    """
+    Time the phase *name* if *profile* is set. Otherwise the context yields
+    a record that is discarded and runs subprocesses directly.
+    """
+    if profile is None:
+        return nullcontext(PhaseRecord(view="", name=name, _profiled=False))
+    return profile.phase(name)
@@ -0,0 +1,77 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Measurements of previous runs, used to schedule the next ones.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+
+# Bump when the layout of the history changes in an incompatible way.
+HISTORY_FORMAT_VERSION = 1
+
+# Weight of the latest run in the moving average of a measurement.
+_SMOOTHING = 0.5
+
+
+def get_default_history_path() -> str:
+    return os.path.join(tempfile.gettempdir(), "cxx-api-run-history.json")
+
+
+class RunHistory:
+    """
+    Per-task measurements of previous runs, as exponential moving averages.
+    A missing or unreadable history file starts an empty history.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path
+        self.tasks: dict[str, dict[str, float]] = {}
+
+    @staticmethod
+    def load(path: str) -> RunHistory:
+        history = RunHistory(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return history
+        if data.get("format_version") == HISTORY_FORMAT_VERSION:
+            history.tasks = data.get("tasks", {})
+        return history
+
+    def get(self, task: str, measurement: str) -> float | None:
+        return self.tasks.get(task, {}).get(measurement)
+
+    def record(self, task: str, measurement: str, value: float) -> None:
+        measurements = self.tasks.setdefault(task, {})
+        previous = measurements.get(measurement)
+        measurements[measurement] = (
+            value
+            if previous is None
+            else _SMOOTHING * value + (1 - _SMOOTHING) * previous
+        )
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Write atomically, so that concurrent runs never read a partial file.
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".history-", dir=os.path.dirname(self.path) or "."
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {"format_version": HISTORY_FORMAT_VERSION, "tasks": self.tasks},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        os.replace(tmp_path, self.path)
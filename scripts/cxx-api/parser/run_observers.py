@@ -0,0 +1,41 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+What a run records about the views it builds, besides their snapshot files.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .block_store import BlockStore
+    from .profiling import Profiler, ViewProfile
+    from .symbol_db import SymbolDatabase
+    from .variant_matrix import VariantMatrix
+
+
+@dataclass(frozen=True)
+class RunObservers:
+    """
+    The observers of the views of a run. Each one is optional, and they are
+    shared by the views of the run, which may be built in parallel threads.
+
+    on_snapshot is called with the name of each view and its snapshot as
+    soon as the view is built.
+    """
+
+    profiler: Profiler | None = None
+    symbol_db: SymbolDatabase | None = None
+    variant_matrix: VariantMatrix | None = None
+    block_store: BlockStore | None = None
+    on_snapshot: Callable[[str, str], None] | None = None
+
+    def view_profile(self, view: str) -> ViewProfile | None:
+        """Get the profile of *view*, if the run is profiled."""
+        return self.profiler.view(view) if self.profiler is not None else None
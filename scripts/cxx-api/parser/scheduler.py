@@ -0,0 +1,257 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Dependency-graph scheduling of snapshot generation.
+
+Every codegen run and every view is a task. A task starts as soon as the
+tasks it depends on finished, so views that don't need codegen don't wait
+for it. Tasks of the same serial group never run at the same time. When
+more tasks are ready than there are workers, the ones on the longest path
+to the end of the run go first. With a memory budget, a task only starts
+while the estimated memory of the running tasks and its own fits in the
+budget. In fail-fast mode, the first failure cancels the tasks that have
+not started yet.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import heapq
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+class DependencyFailedError(RuntimeError):
+    """Raised for tasks that did not run because a dependency failed."""
+
+
+class TaskCancelledError(RuntimeError):
+    """Raised for tasks that did not run because another task failed."""
+
+
+@dataclass
+class Task:
+    """
+    A unit of work. *run* receives the results of the dependencies of the
+    task, by task name.
+    """
+
+    name: str
+    run: Callable[[dict[str, object]], object]
+    dependencies: tuple[str, ...] = ()
+    # Estimated duration of the task, in seconds.
+    cost: float = 1.0
+    serial_group: str | None = None
+    # Estimated peak memory of the task, in MiB.
+    memory_mib: float = 0.0
+    # Cost of the task and of the longest chain of tasks depending on it.
+    rank: float = field(default=0.0, init=False)
+
+
+@dataclass
+class TaskOutcome:
+    name: str
+    result: object = None
+    error: BaseException | None = None
+    start_s: float = 0.0
+    wall_s: float = 0.0
+
+
+class Scheduler:
+    """
+    Runs tasks in a pool of *max_workers* threads, respecting their
+    dependencies, serial groups and *memory_budget_mib*. A task estimated
+    to need more than the whole budget runs alone.
+    """
+
+    def __init__(
+        self, max_workers: int | None = None, memory_budget_mib: float | None = None
+    ) -> None:
+        # Same default as ThreadPoolExecutor.
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.memory_budget_mib = memory_budget_mib
+        self._tasks: dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[dict[str, object]], object],
+        dependencies: tuple[str, ...] = (),
+        cost: float = 1.0,
+        serial_group: str | None = None,
+        memory_mib: float = 0.0,
+    ) -> None:
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        self._tasks[name] = Task(
+            name=name,
+            run=run,
+            dependencies=dependencies,
+            cost=cost,
+            serial_group=serial_group,
+            memory_mib=memory_mib,
+        )
+
+    def _rank_tasks(self) -> dict[str, list[str]]:
+        """
+        Compute the rank of every task and return the dependents of each.
+        """
+        dependents: dict[str, list[str]] = {name: [] for name in self._tasks}
+        for task in self._tasks.values():
+            for dependency in task.dependencies:
+                if dependency not in self._tasks:
+                    raise ValueError(
+                        f"Task {task.name} depends on unknown task {dependency}"
+                    )
+                dependents[dependency].append(task.name)
+
+        ranked: set[str] = set()
+        visiting: set[str] = set()
+
+        def rank(name: str) -> float:
+            task = self._tasks[name]
+            if name in ranked:
+                return task.rank
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through task {name}")
+            visiting.add(name)
+            task.rank = task.cost + max(
+                (rank(dependent) for dependent in dependents[name]), default=0.0
+            )
+            visiting.discard(name)
+            ranked.add(name)
+            return task.rank
+
+        for name in self._tasks:
+            rank(name)
+        return dependents
+
+    def _fits(self, task: Task, reserved_mib: float, busy: bool) -> bool:
+        if self.memory_budget_mib is None or not busy:
+            return True
+        return reserved_mib + task.memory_mib <= self.memory_budget_mib
+
+    def run(
+        self,
+        fail_fast: bool = False,
+        cancel: Callable[[], None] | None = None,
+    ) -> dict[str, TaskOutcome]:
+        """
+        Run all tasks and return their outcomes. A task that raises does not
+        stop the others, but the tasks depending on it fail with
+        DependencyFailedError without running.
+
+        With *fail_fast*, the first task that raises also fails the tasks
+        that have not started yet with TaskCancelledError. *cancel* is
+        called to stop the running tasks when that happens, and when the
+        run itself is interrupted.
+        """
+        dependents = self._rank_tasks()
+        order = {name: i for i, name in enumerate(self._tasks)}
+        waiting = {name: len(task.dependencies) for name, task in self._tasks.items()}
+        outcomes: dict[str, TaskOutcome] = {}
+        # Highest rank first, then in the order tasks were added.
+        ready: list[tuple[float, int, str]] = []
+        busy_groups: set[str] = set()
+        reserved_mib = 0.0
+        failed = False
+        origin = time.perf_counter()
+
+        def make_ready(name: str) -> None:
+            heapq.heappush(ready, (-self._tasks[name].rank, order[name], name))
+
+        def finish(outcome: TaskOutcome) -> None:
+            outcomes[outcome.name] = outcome
+            for dependent in dependents[outcome.name]:
+                if outcome.error is not None:
+                    # Fail the whole subtree without running it.
+                    if dependent not in outcomes:
+                        error = (
+                            TaskCancelledError(f"{dependent} cancelled")
+                            if failed
+                            else DependencyFailedError(
+                                f"{dependent} skipped, {outcome.name} failed"
+                            )
+                        )
+                        finish(TaskOutcome(name=dependent, error=error))
+                    continue
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0 and dependent not in outcomes:
+                    make_ready(dependent)
+
+        def execute(task: Task) -> TaskOutcome:
+            start = time.perf_counter()
+            outcome = TaskOutcome(name=task.name, start_s=start - origin)
+            try:
+                outcome.result = task.run(
+                    {
+                        dependency: outcomes[dependency].result
+                        for dependency in task.dependencies
+                    }
+                )
+            except Exception as e:
+                outcome.error = e
+            outcome.wall_s = time.perf_counter() - start
+            return outcome
+
+        for name, count in waiting.items():
+            if count == 0:
+                make_ready(name)
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_workers) as executor:
+            running: dict[concurrent.futures.Future[TaskOutcome], Task] = {}
+            try:
+                while ready or running:
+                    while failed and ready:
+                        name = heapq.heappop(ready)[2]
+                        finish(
+                            TaskOutcome(
+                                name=name,
+                                error=TaskCancelledError(f"{name} cancelled"),
+                            )
+                        )
+
+                    deferred = []
+                    while ready and len(running) < self.max_workers:
+                        item = heapq.heappop(ready)
+                        task = self._tasks[item[2]]
+                        if task.serial_group in busy_groups or not self._fits(
+                            task, reserved_mib, bool(running)
+                        ):
+                            deferred.append(item)
+                            continue
+                        if task.serial_group is not None:
+                            busy_groups.add(task.serial_group)
+                        reserved_mib += task.memory_mib
+                        running[executor.submit(execute, task)] = task
+                    for item in deferred:
+                        heapq.heappush(ready, item)
+
+                    if not running:
+                        break
+                    done, _ = concurrent.futures.wait(
+                        running, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        task = running.pop(future)
+                        busy_groups.discard(task.serial_group)
+                        reserved_mib -= task.memory_mib
+                        outcome = future.result()
+                        finish(outcome)
+                        if fail_fast and outcome.error is not None and not failed:
+                            failed = True
+                            if cancel is not None:
+                                cancel()
+            except BaseException:
+                # The executor waits for the running tasks on exit, so they
+                # are stopped first, e.g. on KeyboardInterrupt.
+                if cancel is not None:
+                    cancel()
+                raise
+
+        return outcomes
@@ -32,7 +32,7 @@ class ScopeKind(ABC):
     def _format_scope_body(self, scope: Scope, member_suffix: str = "") -> str:
         """Format the members list inside a scope's braces."""
         stringified_members = [
-            member.to_string(2) + member_suffix for member in scope.get_members()
+            member.render(2) + member_suffix for member in scope.get_members()
         ]
 
         stringified_members = natsorted(stringified_members)
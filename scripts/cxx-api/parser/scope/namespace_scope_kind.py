@@ -28,7 +28,7 @@ class NamespaceScopeKind(ScopeKind):
 
         for member in scope.get_members():
             kind = member.member_kind
-            stringified = member.to_string(0, qualification, hide_visibility=True)
+            stringified = member.render(0, qualification, hide_visibility=True)
             groups[kind].append(stringified)
 
         # Sort within each group and combine in kind order
@@ -5,6 +5,8 @@
 
 from __future__ import annotations
 
+import sys
+from collections.abc import Callable
 from typing import Generic
 
 from natsort import natsorted
@@ -18,8 +20,20 @@ from .struct_like_scope_kind import StructLikeScopeKind
 
 
 class Scope(Generic[ScopeKindT]):
+    __slots__ = (
+        "name",
+        "kind",
+        "parent_scope",
+        "inner_scopes",
+        "location",
+        "_members",
+        "_private_typedefs",
+        "_qualifying_member",
+        "scopes_by_path",
+    )
+
     def __init__(self, kind: ScopeKindT, name: str | None = None) -> None:
-        self.name: str | None = name
+        self.name: str | None = sys.intern(name) if name is not None else None
         self.kind: ScopeKindT = kind
         self.parent_scope: Scope | None = None
         self.inner_scopes: dict[str, Scope] = {}
@@ -27,6 +41,9 @@ class Scope(Generic[ScopeKindT]):
         self._members: list[Member] = []
         self._private_typedefs: dict[str, TypedefMember] = {}
         self._qualifying_member: Member | None = None
+        # Set on the root scope of a snapshot: every scope of the snapshot by
+        # the path of its keys in the inner scopes of its ancestors.
+        self.scopes_by_path: dict[tuple[str, ...], Scope] | None = None
 
     def get_qualified_name(self) -> str:
         """
@@ -105,6 +122,13 @@ class Scope(Generic[ScopeKindT]):
         # name is the prefix that must precede the matched path segments.
         anchor_scope = current_scope
 
+        # Names found from the root of a snapshot are usually fully qualified,
+        # and resolve with a single lookup.
+        if anchor_scope.scopes_by_path is not None:
+            base_path = tuple(self._get_base_name(segment) for segment in path)
+            if base_path in anchor_scope.scopes_by_path:
+                return "::".join(path)
+
         # Walk down through the path, tracking matched segments with original template args
         matched_segments: list[str] = []
         for i, path_segment in enumerate(path):
@@ -179,6 +203,12 @@ class Scope(Generic[ScopeKindT]):
         """
         return self._members
 
+    def retain_members(self, predicate: Callable[[Member], bool]) -> None:
+        """
+        Remove the members of the scope for which *predicate* is false.
+        """
+        self._members = [member for member in self._members if predicate(member)]
+
     def close(self) -> None:
         """
         Close the scope by setting the kind of all temporary scopes.
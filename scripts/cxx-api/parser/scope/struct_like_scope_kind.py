@@ -64,25 +64,29 @@ class StructLikeScopeKind(ScopeKind, Extendable):
         if scope.parent_scope is None:
             return
 
-        for sibling in scope.parent_scope.inner_scopes.values():
-            if (
-                sibling is not scope
-                and sibling.name == scope.name
-                and isinstance(sibling.kind, StructLikeScopeKind)
-                and sibling.kind.specialization_args is None
-            ):
-                primary_base_counts: dict[str, int] = {}
-                for b in sibling.kind.base_classes:
-                    primary_base_counts[b.name] = primary_base_counts.get(b.name, 0) + 1
-
-                result = []
-                for b in self.base_classes:
-                    if primary_base_counts.get(b.name, 0) > 0:
-                        primary_base_counts[b.name] -= 1
-                    else:
-                        result.append(b)
-                self.base_classes = result
-                break
+        # Snapshot.create_struct_like registers primary templates under their
+        # base name and specializations under their full name, so the
+        # primary template is found without scanning the siblings.
+        primary = scope.parent_scope.inner_scopes.get(scope.name)
+        if (
+            primary is None
+            or primary is scope
+            or not isinstance(primary.kind, StructLikeScopeKind)
+            or primary.kind.specialization_args is not None
+        ):
+            return
+
+        primary_base_counts: dict[str, int] = {}
+        for b in primary.kind.base_classes:
+            primary_base_counts[b.name] = primary_base_counts.get(b.name, 0) + 1
+
+        result = []
+        for b in self.base_classes:
+            if primary_base_counts.get(b.name, 0) > 0:
+                primary_base_counts[b.name] -= 1
+            else:
+                result.append(b)
+        self.base_classes = result
 
     def to_string(self, scope: Scope) -> str:
         result = ""
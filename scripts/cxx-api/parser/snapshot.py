@@ -21,19 +21,48 @@ from .utils import parse_qualified_path, split_specialization
 class Snapshot:
     def __init__(self) -> None:
         self.root_scope: Scope = Scope(NamespaceScopeKind())
+        # Every scope of the snapshot by the path of its keys in the inner
+        # scopes of its ancestors, so that scopes are found without walking
+        # down from the root.
+        self._scopes_by_path: dict[tuple[str, ...], Scope] = {(): self.root_scope}
+        self.root_scope.scopes_by_path = self._scopes_by_path
 
     def ensure_scope(self, scope_path: list[str]) -> Scope:
         """
         Ensure that a scope exists in the snapshot, creating it if necessary.
         """
-        current_scope = self.root_scope
-        for name in scope_path:
-            if name not in current_scope.inner_scopes:
-                new_scope = Scope(TemporaryScopeKind(), name)
-                new_scope.parent_scope = current_scope
-                current_scope.inner_scopes[name] = new_scope
-            current_scope = current_scope.inner_scopes[name]
-        return current_scope
+        key = tuple(scope_path)
+        scope = self._scopes_by_path.get(key)
+        if scope is not None:
+            return scope
+
+        parent_scope = self.ensure_scope(scope_path[:-1])
+        name = scope_path[-1]
+        scope = Scope(TemporaryScopeKind(), name)
+        self._add_scope(scope_path[:-1], parent_scope, name, scope)
+        return scope
+
+    def _add_scope(
+        self, parent_path: list[str], parent_scope: Scope, key: str, scope: Scope
+    ) -> None:
+        scope.parent_scope = parent_scope
+        parent_scope.inner_scopes[key] = scope
+        self._scopes_by_path[(*parent_path, key)] = scope
+
+    def remove_scope(self, scope_path: list[str]) -> None:
+        """
+        Remove a scope and its inner scopes from the snapshot.
+        """
+        key = tuple(scope_path)
+        scope = self._scopes_by_path[key]
+        del scope.parent_scope.inner_scopes[key[-1]]
+
+        pending = [(key, scope)]
+        while pending:
+            path, scope = pending.pop()
+            del self._scopes_by_path[path]
+            for inner_key, inner_scope in scope.inner_scopes.items():
+                pending.append(((*path, inner_key), inner_scope))
 
     def create_struct_like(
         self, qualified_name: str, type: StructLikeScopeKind.Type
@@ -64,8 +93,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(StructLikeScopeKind(type, specialization_args), base_name)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[scope_key] = new_scope
+            self._add_scope(scope_path, current_scope, scope_key, new_scope)
             return new_scope
 
     def create_or_get_namespace(self, qualified_name: str) -> Scope[NamespaceScopeKind]:
@@ -90,8 +118,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(NamespaceScopeKind(), namespace_name)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[namespace_name] = new_scope
+            self._add_scope(scope_path, current_scope, namespace_name, new_scope)
             return new_scope
 
     def create_protocol(self, qualified_name: str) -> Scope[ProtocolScopeKind]:
@@ -118,8 +145,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(ProtocolScopeKind(), scope_name)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[scope_key] = new_scope
+            self._add_scope(scope_path, current_scope, scope_key, new_scope)
             return new_scope
 
     def create_interface(self, qualified_name: str) -> Scope[InterfaceScopeKind]:
@@ -142,8 +168,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(InterfaceScopeKind(), scope_name)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[scope_name] = new_scope
+            self._add_scope(scope_path, current_scope, scope_name, new_scope)
             return new_scope
 
     def create_category(
@@ -167,8 +192,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(CategoryScopeKind(class_name, category_name), scope_key)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[scope_key] = new_scope
+            self._add_scope([], current_scope, scope_key, new_scope)
             return new_scope
 
     def create_enum(self, qualified_name: str) -> Scope[EnumScopeKind]:
@@ -191,8 +215,7 @@ class Snapshot:
             return scope
         else:
             new_scope = Scope(EnumScopeKind(), enum_name)
-            new_scope.parent_scope = current_scope
-            current_scope.inner_scopes[enum_name] = new_scope
+            self._add_scope(scope_path, current_scope, enum_name, new_scope)
             return new_scope
 
     def _ensure_scope_is_defined(self, scope: Scope) -> None:
@@ -10,10 +10,16 @@ Utilities for comparing API snapshots.
 import difflib
 import os
 import sys
+import threading
+
+from .block_store import BlockStore, ManifestDiffer
 
 
 def validate_snapshots(
-    generated_dir: str, committed_dir: str, output_file: str | None = None
+    generated_dir: str,
+    committed_dir: str,
+    output_file: str | None = None,
+    blocks: BlockStore | None = None,
 ) -> bool:
     """Compare generated snapshots against committed ones.
 
@@ -22,68 +28,144 @@ def validate_snapshots(
 
     If output_file is provided, writes comparison results to that file
     instead of stdout.
+
+    If a block store is provided, differing snapshots are split into blocks
+    in it, and only the blocks that differ are diffed.
     """
     out = open(output_file, "w") if output_file else sys.stdout
     try:
-        return _check_snapshots_impl(generated_dir, committed_dir, out)
+        return _check_snapshots_impl(generated_dir, committed_dir, out, blocks)
     finally:
         if output_file:
             out.close()
 
 
-def _check_snapshots_impl(generated_dir: str, committed_dir: str, out) -> bool:
-    if not os.path.isdir(committed_dir):
-        print(f"No committed snapshots directory found at: {committed_dir}", file=out)
-        print("Skipping comparison (no baseline to compare against)", file=out)
-        return True
-
-    committed_files = sorted(f for f in os.listdir(committed_dir) if f.endswith(".api"))
-    generated_files = sorted(f for f in os.listdir(generated_dir) if f.endswith(".api"))
-
-    if not committed_files:
-        print("No committed snapshot files found", file=out)
-        print("Skipping comparison (no baseline to compare against)", file=out)
-        return True
+def _check_snapshots_impl(
+    generated_dir: str,
+    committed_dir: str,
+    out,
+    blocks: BlockStore | None = None,
+) -> bool:
+    validator = SnapshotValidator(committed_dir, out, blocks)
+    if validator.has_baseline:
+        for filename in sorted(os.listdir(generated_dir)):
+            if filename.endswith(".api"):
+                with open(os.path.join(generated_dir, filename)) as f:
+                    validator.check(filename, f.read())
+    return validator.finish()
 
-    committed_set = set(committed_files)
-    generated_set = set(generated_files)
-    all_passed = True
 
-    for filename in sorted(committed_set | generated_set):
-        committed_path = os.path.join(committed_dir, filename)
-        generated_path = os.path.join(generated_dir, filename)
+class SnapshotValidator:
+    """
+    Compares generated snapshots against the committed ones in
+    *committed_dir* one at a time, as they are generated, and reports each
+    comparison to *out* right away.
+
+    If a block store is provided, a generated snapshot that differs from
+    the committed one is split into blocks in it, and so is the committed
+    snapshot, and only the blocks that differ are diffed. The diff of the
+    same blocks is computed once for all the views that share it.
+    """
 
-        if filename not in generated_set:
+    def __init__(
+        self,
+        committed_dir: str,
+        out,
+        blocks: BlockStore | None = None,
+    ) -> None:
+        self.committed_dir = committed_dir
+        self._out = out
+        self._blocks = blocks
+        self._differ = (
+            ManifestDiffer(blocks.read_block, blocks.read_block)
+            if blocks is not None
+            else None
+        )
+        self._checked: set[str] = set()
+        self._all_passed = True
+        self._lock = threading.Lock()
+
+        self.has_baseline = False
+        self._committed_files: set[str] = set()
+        if not os.path.isdir(committed_dir):
             print(
-                f"FAIL: {filename} exists in committed snapshots but was not generated",
-                file=out,
+                f"No committed snapshots directory found at: {committed_dir}", file=out
             )
-            all_passed = False
-            continue
-
-        if filename not in committed_set:
-            print(f"OK: {filename} generated (no committed baseline)", file=out)
-            continue
-
-        with open(committed_path) as f:
+            print("Skipping comparison (no baseline to compare against)", file=out)
+            return
+        self._committed_files = {
+            f for f in os.listdir(committed_dir) if f.endswith(".api")
+        }
+        if not self._committed_files:
+            print("No committed snapshot files found", file=out)
+            print("Skipping comparison (no baseline to compare against)", file=out)
+            return
+        self.has_baseline = True
+
+    def _print(self, message: str) -> None:
+        print(message, file=self._out, flush=True)
+
+    def check(self, filename: str, content: str) -> None:
+        """Compare the generated snapshot file *filename* with its content."""
+        if not self.has_baseline:
+            return
+        with self._lock:
+            self._checked.add(filename)
+            if filename not in self._committed_files:
+                self._print(f"OK: {filename} generated (no committed baseline)")
+            else:
+                self._check_content(filename, content)
+
+    def unchanged(self, filename: str) -> None:
+        """Report a committed snapshot that was reused rather than generated."""
+        if not self.has_baseline:
+            return
+        with self._lock:
+            self._checked.add(filename)
+            self._print(f"OK: {filename} unchanged (API fingerprints match)")
+
+    def _check_content(self, filename: str, content: str) -> None:
+        with open(os.path.join(self.committed_dir, filename)) as f:
             committed_content = f.read()
-        with open(generated_path) as f:
-            generated_content = f.read()
 
-        if committed_content == generated_content:
-            print(f"OK: {filename} matches committed snapshot", file=out)
+        if committed_content == content:
+            self._print(f"OK: {filename} matches committed snapshot")
         else:
-            print(f"FAIL: {filename} differs from committed snapshot", file=out)
-            diff = "\n".join(
-                difflib.unified_diff(
-                    committed_content.splitlines(),
-                    generated_content.splitlines(),
-                    fromfile=f"committed/{filename}",
-                    tofile=f"generated/{filename}",
-                    lineterm="",
-                )
+            self._print(f"FAIL: {filename} differs from committed snapshot")
+            self._print("\n".join(self._diff(filename, committed_content, content)))
+            self._all_passed = False
+
+    def _diff(self, filename: str, committed_content: str, content: str) -> list[str]:
+        fromfile = f"committed/{filename}"
+        tofile = f"generated/{filename}"
+        if self._differ is not None:
+            return self._differ.diff(
+                self._blocks.add_blocks(committed_content),
+                self._blocks.add_blocks(content),
+                fromfile=fromfile,
+                tofile=tofile,
             )
-            print(diff, file=out)
-            all_passed = False
-
-    return all_passed
+        return list(
+            difflib.unified_diff(
+                committed_content.splitlines(),
+                content.splitlines(),
+                fromfile=fromfile,
+                tofile=tofile,
+                lineterm="",
+            )
+        )
+
+    def finish(self) -> bool:
+        """
+        Report the committed snapshots that were not generated, and return
+        whether validation passed (snapshots match or no committed
+        snapshots).
+        """
+        with self._lock:
+            for filename in sorted(self._committed_files - self._checked):
+                self._print(
+                    f"FAIL: {filename} exists in committed snapshots but was not "
+                    "generated"
+                )
+                self._all_passed = False
+            return self._all_passed
@@ -0,0 +1,43 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+The snapshot files of views, as committed.
+"""
+
+from __future__ import annotations
+
+import os
+
+from .block_store import BlockStore
+from .profiling import profile_phase, ViewProfile
+
+
+def snapshot_file_content(snapshot_string: str) -> str:
+    return "// @" + "generated by scripts/cxx-api\n\n" + snapshot_string
+
+
+def write_snapshot(
+    api_view: str,
+    snapshot_string: str,
+    output_dir: str | None,
+    profile: ViewProfile | None = None,
+    block_store: BlockStore | None = None,
+) -> str | None:
+    """
+    Write the snapshot file of *api_view* to *output_dir*, if any, and add
+    it to *block_store*, if any. Return the path of the file written.
+    """
+    content = snapshot_file_content(snapshot_string)
+    output_file = None
+    if output_dir is not None:
+        output_file = os.path.join(output_dir, f"{api_view}Cxx.api")
+        os.makedirs(output_dir, exist_ok=True)
+        with profile_phase(profile, "write"), open(output_file, "w") as f:
+            f.write(content)
+    if block_store is not None:
+        with profile_phase(profile, "block_store"):
+            block_store.add_view(api_view, content)
+    return output_file
@@ -0,0 +1,149 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+SQLite database of the symbols of every view.
+
+Each row is a scope or member of a snapshot: its view, qualified name,
+kind, rendered signature, source location and visibility. Rows are indexed
+by name and by view, so that questions like "which views expose
+facebook::react::ShadowNode::clone, and with which signature?" are indexed
+lookups rather than scans of the snapshots.
+
+Members record the file they are declared in, or else the location of
+their class, as enumerators have no location of their own.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+
+from .member import (
+    ConceptMember,
+    EnumMember,
+    FriendMember,
+    FunctionMember,
+    Member,
+    PropertyMember,
+    TypedefMember,
+    VariableMember,
+)
+from .scope import NamespaceScopeKind, Scope
+from .snapshot import Snapshot
+
+# (view, name, kind, signature, location, visibility)
+SymbolRow = tuple[str, str, str, str, str | None, str | None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS symbols (
+    view TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    location TEXT,
+    visibility TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_by_name ON symbols (name, view);
+CREATE INDEX IF NOT EXISTS symbols_by_view ON symbols (view, name);
+"""
+
+_MEMBER_KINDS: dict[type[Member], str] = {
+    ConceptMember: "concept",
+    EnumMember: "enumerator",
+    FriendMember: "friend",
+    FunctionMember: "function",
+    PropertyMember: "property",
+    TypedefMember: "typedef",
+    VariableMember: "variable",
+}
+
+
+def _one_line(text: str) -> str:
+    return " ".join(line.strip() for line in text.strip().split("\n"))
+
+
+def _scope_signature(scope: Scope) -> str:
+    # The declaration of the scope, without the body of its members.
+    return _one_line(scope.kind.to_string(scope).partition(" {\n")[0])
+
+
+def symbol_rows(view: str, snapshot: Snapshot) -> Iterator[SymbolRow]:
+    """Get a row for every scope and member of a finished snapshot."""
+    seen: set[SymbolRow] = set()
+
+    def walk(scope: Scope, location: str | None) -> Iterator[SymbolRow]:
+        is_namespace = isinstance(scope.kind, NamespaceScopeKind)
+        qualified_name = scope.get_qualified_name()
+        if not is_namespace:
+            location = scope.location
+            yield (
+                view,
+                qualified_name,
+                scope.kind.name,
+                _scope_signature(scope),
+                location,
+                None,
+            )
+
+        for member in scope.get_members():
+            signature = member.render(
+                0, qualified_name if is_namespace else None, hide_visibility=True
+            )
+            row = (
+                view,
+                f"{qualified_name}::{member.name}" if qualified_name else member.name,
+                _MEMBER_KINDS.get(type(member), "member"),
+                _one_line(signature),
+                member.location or location,
+                None if is_namespace else member.visibility,
+            )
+            # Members with identical signatures are rendered once.
+            if row not in seen:
+                seen.add(row)
+                yield row
+
+        for inner_scope in scope.inner_scopes.values():
+            if inner_scope.name is not None:
+                yield from walk(inner_scope, location)
+
+    return walk(snapshot.root_scope, None)
+
+
+class SymbolDatabase:
+    """
+    The symbols of the views of a run, collected while the views are built
+    and written to the database at the end of the run.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[str, list[SymbolRow]] = {}
+        self._lock = threading.Lock()
+
+    def add_view(self, view: str, snapshot: Snapshot) -> None:
+        rows = list(symbol_rows(view, snapshot))
+        with self._lock:
+            self._rows[view] = rows
+
+    def write(self, path: str) -> None:
+        """
+        Replace the rows of the views of the run in the database at *path*,
+        keeping the rows of the other views.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                connection.executescript(_SCHEMA)
+                for view, rows in sorted(self._rows.items()):
+                    connection.execute("DELETE FROM symbols WHERE view = ?", (view,))
+                    connection.executemany(
+                        "INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?)", rows
+                    )
+        finally:
+            connection.close()
@@ -4,6 +4,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import re
+import sys
 
 
 def _normalize_whitespace(text: str) -> str:
@@ -15,11 +16,16 @@ def _normalize_whitespace(text: str) -> str:
 
 
 class Template:
+    __slots__ = ("type", "name", "value")
+
     def __init__(self, type: str, name: str, value: str | None) -> None:
-        self.type: str = type
-        self.name: str = name
+        self.type: str = sys.intern(type)
+        self.name: str = sys.intern(name) if name else name
         self.value: str | None = _normalize_whitespace(value) if value else value
 
+    def structural_key(self) -> tuple[str, str | None, str | None]:
+        return (self.type, self.name, self.value)
+
     def to_string(self) -> str:
         # Handle unnamed template parameters (e.g., "typename = std::enable_if_t<...>")
         # When the name is empty or None, we just output "type = value" or "type"
@@ -36,11 +42,16 @@ class Template:
 
 
 class TemplateList:
+    __slots__ = ("templates",)
+
     def __init__(self) -> None:
         self.templates: [Template] = []
 
     def add(self, template: Template) -> None:
         self.templates.append(template)
 
+    def structural_key(self) -> tuple:
+        return tuple(template.structural_key() for template in self.templates)
+
     def to_string(self) -> str:
         return f"template <{', '.join([template.to_string() for template in self.templates])}>"
@@ -0,0 +1,8 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from .frontend import build_snapshot_from_headers, get_view_macros, parse_header
+
+__all__ = ["build_snapshot_from_headers", "get_view_macros", "parse_header"]
@@ -0,0 +1,67 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Report the parity of the tree-sitter frontend with the Doxygen snapshots of
+the snapshot tests.
+
+Usage:
+    python -m scripts.cxx-api.parser.tree_sitter_frontend --diff
+"""
+
+import argparse
+import collections
+import json
+import os
+import sys
+
+from .parity import check_parity, MISMATCH
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the tree-sitter frontend to the Doxygen snapshots"
+    )
+    parser.add_argument(
+        "--snapshots",
+        default=os.path.join(
+            os.path.dirname(__file__), "..", "..", "tests", "snapshots"
+        ),
+        help="Directory of the snapshot test cases",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Print the difference to the expected snapshot of mismatched cases",
+    )
+    parser.add_argument(
+        "--output", help="Write the per-case report as JSON to this file"
+    )
+    args = parser.parse_args()
+
+    results = check_parity(args.snapshots)
+    for result in results:
+        print(f"{result.status:<12} {result.case}")
+        if args.diff and result.status == MISMATCH:
+            for line in result.diff:
+                print(f"    {line}")
+
+    counts = collections.Counter(result.status for result in results)
+    compared = len(results) - counts["unsupported"]
+    print(
+        f"{counts['match']}/{compared} cases match, "
+        f"{counts['unsupported']} unsupported"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+            f.write("\n")
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,827 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Extraction of the declarations of a header from its tree-sitter syntax tree.
+
+The declarations are plain records, so that headers can be parsed in worker
+processes and the records sent back to build the snapshot. They follow what
+Doxygen reports for the same code: private members are left out, except
+typedefs, and types, argument strings and template parameters are split
+the way the Doxygen XML splits them.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+
+import tree_sitter_cpp
+from tree_sitter import Language, Node, Parser
+
+from ..utils import (
+    has_scope_resolution_outside_angles,
+    normalize_angle_brackets,
+    normalize_type_text,
+    parse_qualified_path,
+)
+
+_LANGUAGE = Language(tree_sitter_cpp.language())
+
+_CLASS_KINDS = {
+    "class_specifier": "class",
+    "struct_specifier": "struct",
+    "union_specifier": "union",
+}
+
+# Declarator nodes wrapping the name of a declaration.
+_WRAPPING_DECLARATORS = frozenset(
+    {
+        "attributed_declarator",
+        "init_declarator",
+        "parenthesized_declarator",
+        "pointer_declarator",
+        "reference_declarator",
+        "array_declarator",
+        "function_declarator",
+    }
+)
+
+# Specifiers of a declaration that are not part of its type.
+_IGNORED_SPECIFIERS = frozenset(
+    {
+        "attribute_declaration",
+        "attribute_specifier",
+        "explicit_function_specifier",
+        "ms_declspec_modifier",
+        "comment",
+    }
+)
+
+Template = tuple[str, "str | None", "str | None"]
+# The type, name, default value and array dimensions of a parameter.
+Parameter = tuple[str, "str | None", "str | None", "str | None"]
+
+
+@dataclass
+class ScopeDeclaration:
+    """A namespace, class, struct, union or enum."""
+
+    kind: str
+    name: str
+    location: str
+    bases: list[tuple[str, str, bool]] = field(default_factory=list)
+    template_params: list[Template] | None = None
+    enum_type: str | None = None
+    enumerators: list[tuple[str, str | None]] = field(default_factory=list)
+    # A forward declaration of a class template, which Doxygen only reports
+    # when the template is specialized.
+    is_forward_declaration: bool = False
+
+
+@dataclass
+class MemberDeclaration:
+    """
+    A member of a scope. *args* are the arguments of the constructor of the
+    member class of *kind*.
+    """
+
+    scope: str
+    kind: str
+    args: dict[str, object]
+    template_params: list[Template] | None = None
+    is_private_typedef: bool = False
+    is_override: bool = False
+    location: str | None = None
+
+
+Declaration = ScopeDeclaration | MemberDeclaration
+
+
+def _text(node: Node | None) -> str:
+    if node is None:
+        return ""
+    return re.sub(r"\s+", " ", node.text.decode("utf-8", errors="replace")).strip()
+
+
+def _qualify(scope: str, name: str) -> str:
+    return f"{scope}::{name}" if scope else name
+
+
+@dataclass
+class _Context:
+    scope: str
+    is_class: bool
+    visibility: str = "public"
+
+
+@dataclass
+class _Declarator:
+    name: str = ""
+    pointer: str = ""
+    suffix: str = ""
+    function: Node | None = None
+    function_pointer: Node | None = None
+    value: Node | None = None
+
+
+def _unwrap_declarator(node: Node) -> _Declarator:
+    """Split a declarator into the name it declares and what applies to it."""
+    result = _Declarator()
+    while node is not None and node.type in _WRAPPING_DECLARATORS:
+        if node.type == "init_declarator":
+            result.value = node.child_by_field_name("value")
+            node = node.child_by_field_name("declarator")
+        elif node.type == "pointer_declarator":
+            result.pointer += "*"
+            node = node.child_by_field_name("declarator")
+        elif node.type == "reference_declarator":
+            result.pointer += node.children[0].type
+            node = node.named_children[-1] if node.named_children else None
+        elif node.type == "array_declarator":
+            result.suffix = f"[{_text(node.child_by_field_name('size'))}]" + (
+                result.suffix
+            )
+            node = node.child_by_field_name("declarator")
+        elif node.type == "function_declarator":
+            inner = node.child_by_field_name("declarator")
+            if inner is not None and inner.type == "parenthesized_declarator":
+                result.function_pointer = node
+            elif result.function is None:
+                result.function = node
+            node = inner
+        else:
+            named = [child for child in node.named_children if child.type != "comment"]
+            node = named[0] if named else None
+    result.name = _text(node)
+    return result
+
+
+class _HeaderParser:
+    def __init__(self, path: str, source: bytes) -> None:
+        self.path = path
+        self.declarations: list[Declaration] = []
+        self.tree = Parser(_LANGUAGE).parse(source)
+
+    def parse(self) -> list[Declaration]:
+        self._visit_body(self.tree.root_node, _Context("", False))
+        return self.declarations
+
+    def _visit_body(self, body: Node, context: _Context) -> None:
+        for child in body.named_children:
+            if child.type == "access_specifier":
+                context.visibility = _text(child)
+            elif child.type == "ERROR":
+                # Salvage the declarations tree-sitter could still make out.
+                self._visit_body(child, context)
+            else:
+                self._visit(child, context, None)
+
+    def _visit(
+        self, node: Node, context: _Context, template_params: list[Template] | None
+    ) -> None:
+        kind = node.type
+        if kind == "namespace_definition":
+            self._visit_namespace(node, context)
+        elif kind == "linkage_specification":
+            body = node.child_by_field_name("body")
+            if body is not None and body.type == "declaration_list":
+                self._visit_body(body, context)
+            elif body is not None:
+                self._visit(body, context, template_params)
+        elif kind == "template_declaration":
+            params = self._template_params(node.child_by_field_name("parameters"))
+            for child in node.named_children[1:]:
+                self._visit(child, context, params)
+        elif kind in _CLASS_KINDS:
+            self._visit_class(node, context, template_params)
+        elif kind == "enum_specifier":
+            self._visit_enum(node, context)
+        elif kind in ("declaration", "field_declaration", "function_definition"):
+            self._visit_declaration(node, context, template_params)
+        elif kind == "type_definition":
+            self._visit_typedef(node, context)
+        elif kind == "alias_declaration":
+            self._visit_alias(node, context, template_params)
+        elif kind == "friend_declaration":
+            self._visit_friend(node, context)
+        elif kind == "using_declaration":
+            self._visit_using(node, context)
+        elif kind == "concept_definition":
+            self._visit_concept(node, context, template_params)
+
+    def _visit_namespace(self, node: Node, context: _Context) -> None:
+        name = node.child_by_field_name("name")
+        body = node.child_by_field_name("body")
+        # Anonymous namespaces have internal linkage.
+        if name is None or body is None:
+            return
+        # Nested namespace definitions, like "namespace a::b {", declare each
+        # of the namespaces.
+        qualified_name = context.scope
+        for part in _text(name).replace(" ", "").split("::"):
+            qualified_name = _qualify(qualified_name, part)
+            self.declarations.append(
+                ScopeDeclaration("namespace", qualified_name, self.path)
+            )
+        self._visit_body(body, _Context(qualified_name, False))
+
+    def _visit_class(
+        self, node: Node, context: _Context, template_params: list[Template] | None
+    ) -> None:
+        name = node.child_by_field_name("name")
+        body = node.child_by_field_name("body")
+        if context.is_class and context.visibility == "private":
+            return
+        if name is None:
+            if context.is_class and body is not None:
+                # The members of anonymous unions and structs are members of
+                # the enclosing class.
+                self._visit_body(body, _Context(context.scope, True, "public"))
+            return
+        qualified_name = _qualify(context.scope, normalize_angle_brackets(_text(name)))
+        kind = _CLASS_KINDS[node.type]
+        if body is None:
+            if template_params is not None and name.type == "type_identifier":
+                self.declarations.append(
+                    ScopeDeclaration(
+                        kind,
+                        qualified_name,
+                        self.path,
+                        template_params=template_params,
+                        is_forward_declaration=True,
+                    )
+                )
+            return
+
+        bases = []
+        for child in node.named_children:
+            if child.type == "base_class_clause":
+                bases = self._base_classes(child, kind)
+
+        self.declarations.append(
+            ScopeDeclaration(
+                kind, qualified_name, self.path, bases, template_params or []
+            )
+        )
+        self._visit_body(
+            body,
+            _Context(qualified_name, True, "private" if kind == "class" else "public"),
+        )
+
+    def _base_classes(self, clause: Node, kind: str) -> list[tuple[str, str, bool]]:
+        bases = []
+        protection = "private" if kind == "class" else "public"
+        is_virtual = False
+        for child in clause.children:
+            if child.type == "access_specifier":
+                protection = _text(child)
+            elif child.type == "virtual":
+                is_virtual = True
+            elif child.is_named and child.type != "comment":
+                if protection != "private":
+                    bases.append(
+                        (normalize_angle_brackets(_text(child)), protection, is_virtual)
+                    )
+                protection = "private" if kind == "class" else "public"
+                is_virtual = False
+        return bases
+
+    def _visit_enum(self, node: Node, context: _Context) -> None:
+        name = node.child_by_field_name("name")
+        body = node.child_by_field_name("body")
+        if name is None or body is None:
+            return
+        if context.is_class and context.visibility == "private":
+            return
+        enumerators = []
+        for enumerator in body.named_children:
+            if enumerator.type != "enumerator":
+                continue
+            value = enumerator.child_by_field_name("value")
+            enumerators.append(
+                (_text(enumerator.child_by_field_name("name")), _text(value) or None)
+            )
+        self.declarations.append(
+            ScopeDeclaration(
+                "enum",
+                _qualify(context.scope, _text(name)),
+                self.path,
+                enum_type=_text(node.child_by_field_name("base")) or None,
+                enumerators=enumerators,
+            )
+        )
+
+    def _specifiers(self, node: Node) -> tuple[str, set[str]]:
+        """
+        Get the type of a declaration, without the specifiers that Doxygen
+        reports as attributes, and those specifiers.
+        """
+        parts = []
+        flags = set()
+        for i, child in enumerate(node.children):
+            field_name = node.field_name_for_child(i)
+            if field_name in ("declarator", "default_value", "body"):
+                break
+            if field_name == "type":
+                parts.append(_text(child))
+            elif child.type == "storage_class_specifier":
+                flags.add(_text(child))
+            elif child.type == "type_qualifier":
+                qualifier = _text(child)
+                if qualifier in ("const", "volatile"):
+                    parts.append(qualifier)
+                else:
+                    flags.add(qualifier)
+            elif child.type == "virtual":
+                flags.add("virtual")
+            elif child.type in _IGNORED_SPECIFIERS or not child.is_named:
+                continue
+        return " ".join(parts), flags
+
+    def _visit_declaration(
+        self, node: Node, context: _Context, template_params: list[Template] | None
+    ) -> None:
+        type_node = node.child_by_field_name("type")
+        if type_node is not None and type_node.child_by_field_name("body"):
+            # A definition of a class or enum, possibly with variables.
+            if type_node.type in _CLASS_KINDS:
+                self._visit_class(type_node, context, template_params)
+            elif type_node.type == "enum_specifier":
+                self._visit_enum(type_node, context)
+            # Variables of anonymous types are not reported.
+            return
+
+        if context.is_class and context.visibility == "private":
+            return
+
+        type_text, flags = self._specifiers(node)
+        for declarator_node in node.children_by_field_name("declarator"):
+            if declarator_node.type == "operator_cast":
+                # Conversion operators have no return type, and the type
+                # they convert to is part of their name.
+                name = f"operator {_text(declarator_node.child_by_field_name('type'))}"
+                function = declarator_node.child_by_field_name("declarator")
+                while function.type in (
+                    "abstract_pointer_declarator",
+                    "abstract_reference_declarator",
+                ):
+                    name += f" {function.children[0].type}"
+                    function = function.named_children[-1]
+                self._add_function(
+                    node, context, template_params, name, "", flags, function
+                )
+                continue
+            declarator = _unwrap_declarator(declarator_node)
+            if not declarator.name:
+                continue
+            if declarator.function is not None and declarator.function_pointer is None:
+                self._add_function(
+                    node,
+                    context,
+                    template_params,
+                    declarator.name,
+                    _pointer_type(type_text, declarator.pointer),
+                    flags,
+                    declarator.function,
+                )
+            elif (
+                context.is_class
+                and declarator.value is not None
+                and declarator.value.type == "argument_list"
+            ):
+                # Members cannot be initialized with parentheses, so this is
+                # a function whose parameters tree-sitter took for arguments.
+                self._add_function(
+                    node,
+                    context,
+                    template_params,
+                    declarator.name,
+                    _pointer_type(type_text, declarator.pointer),
+                    flags,
+                    declarator.value,
+                )
+            else:
+                self._add_variable(
+                    node, context, template_params, type_text, flags, declarator
+                )
+
+    def _add_function(
+        self,
+        node: Node,
+        context: _Context,
+        template_params: list[Template] | None,
+        name: str,
+        function_type: str,
+        flags: set[str],
+        function: Node,
+    ) -> None:
+        # Out-of-class definitions and static functions of namespaces are not
+        # part of the API.
+        if has_scope_resolution_outside_angles(name) and not name.startswith(
+            "operator "
+        ):
+            return
+        if not context.is_class and "static" in flags:
+            return
+
+        parameters = function
+        if function.type == "argument_list":
+            doxygen_params = self._parameters(_reparse_as_parameters(function))
+        else:
+            parameters = function.child_by_field_name("parameters")
+            doxygen_params = self._parameters(parameters)
+
+        modifiers = []
+        for child in function.children:
+            if child.start_byte < parameters.end_byte or not child.is_named:
+                continue
+            if child.type == "trailing_return_type" and function_type == "auto":
+                # Doxygen reports the trailing return type as the type.
+                function_type = normalize_type_text(_text(child)[len("->") :].strip())
+            elif child.type == "trailing_return_type":
+                modifiers.insert(0, _text(child))
+            else:
+                modifiers.append(_text(child))
+
+        # Overriding functions are virtual if Doxygen finds the function they
+        # override.
+        is_override = any(
+            child.type == "virtual_specifier" for child in function.children
+        )
+
+        # "= 0", "= default" and "= delete" follow the declarator.
+        is_pure_virtual = False
+        for i, child in enumerate(node.children):
+            if child.start_byte < function.end_byte:
+                continue
+            if child.type == "default_method_clause":
+                modifiers.append("= default")
+            elif child.type == "delete_method_clause":
+                modifiers.append("= delete")
+            elif child.type == "pure_virtual_clause" or (
+                node.field_name_for_child(i) == "default_value" and _text(child) == "0"
+            ):
+                is_pure_virtual = True
+                modifiers.append("= 0")
+
+        arg_string = " ".join([_text(parameters), *modifiers])
+        if function_type.startswith("inline "):
+            function_type = function_type[len("inline ") :]
+
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "function",
+                {
+                    "name": name,
+                    "type": function_type,
+                    "visibility": context.visibility,
+                    "arg_string": arg_string,
+                    "is_virtual": "virtual" in flags or is_pure_virtual,
+                    "is_pure_virtual": is_pure_virtual,
+                    "is_static": "static" in flags and context.is_class,
+                    "is_constexpr": "constexpr" in flags,
+                    "doxygen_params": doxygen_params,
+                },
+                template_params,
+                is_override=is_override,
+                location=self.path,
+            )
+        )
+
+    def _parameters(self, parameters: Node) -> list[Parameter]:
+        """
+        Split the parameters of a function into their type, name, default
+        value and array dimensions, like the <param> elements of Doxygen.
+        """
+        result = []
+        for param in parameters.children:
+            if param.type == "...":
+                result.append(("...", None, None, None))
+                continue
+            if param.type not in (
+                "parameter_declaration",
+                "optional_parameter_declaration",
+                "variadic_parameter_declaration",
+            ):
+                continue
+            type_text, _ = self._specifiers(param)
+            default = param.child_by_field_name("default_value")
+            declarator = param.child_by_field_name("declarator")
+            if declarator is None:
+                result.append(
+                    (_declarator_type(type_text), None, _text(default) or None, None)
+                )
+                continue
+
+            array = ""
+            while declarator.type == "array_declarator":
+                array = f"[{_text(declarator.child_by_field_name('size'))}]" + array
+                declarator = declarator.child_by_field_name("declarator")
+            name_node = _find_name(declarator)
+            if name_node is None or _nesting(declarator, name_node) > 1:
+                # Doxygen leaves the name in the type of nested declarators.
+                name = None
+                declarator_text = _text(declarator)
+            else:
+                name = _text(name_node)
+                declarator_text = _text_without(declarator, name_node)
+            result.append(
+                (
+                    _declarator_type(f"{type_text} {declarator_text}"),
+                    name,
+                    _text(default) or None,
+                    array or None,
+                )
+            )
+        return result
+
+    def _add_variable(
+        self,
+        node: Node,
+        context: _Context,
+        template_params: list[Template] | None,
+        type_text: str,
+        flags: set[str],
+        declarator: _Declarator,
+    ) -> None:
+        name = declarator.name
+        if has_scope_resolution_outside_angles(name):
+            return
+
+        argstring = declarator.suffix or None
+        variable_type = type_text
+        if declarator.function_pointer is not None:
+            parameters = declarator.function_pointer.child_by_field_name("parameters")
+            variable_type = f"{type_text}{declarator.pointer[1:]}(*"
+            argstring = f"){_text(parameters)}"
+        elif declarator.pointer:
+            variable_type = f"{type_text} {declarator.pointer}"
+
+        value = declarator.value
+        if value is None:
+            value = node.child_by_field_name("default_value")
+        is_brace_initializer = value is not None and value.type == "initializer_list"
+        value_text = _text(value) or None
+        if is_brace_initializer and value_text:
+            value_text = value_text[1:-1].strip()
+
+        variable_type = normalize_type_text(variable_type)
+        is_const = variable_type.startswith("const ")
+        if is_const:
+            variable_type = variable_type[len("const ") :].strip()
+
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "variable",
+                {
+                    "name": name,
+                    "type": variable_type,
+                    "visibility": context.visibility,
+                    "is_const": is_const,
+                    "is_static": "static" in flags and context.is_class,
+                    "is_constexpr": "constexpr" in flags,
+                    "is_mutable": "mutable" in flags,
+                    "value": value_text,
+                    "definition": _text(node),
+                    "argstring": argstring,
+                    "is_brace_initializer": is_brace_initializer,
+                },
+                template_params,
+                location=self.path,
+            )
+        )
+
+    def _visit_typedef(self, node: Node, context: _Context) -> None:
+        type_text, _ = self._specifiers(node)
+        type_node = node.child_by_field_name("type")
+        type_name = None
+        if type_node is not None and type_node.child_by_field_name("body"):
+            # "typedef struct Foo { ... } Foo;" also defines the struct.
+            if type_node.type in _CLASS_KINDS:
+                self._visit_class(type_node, context, None)
+            elif type_node.type == "enum_specifier":
+                self._visit_enum(type_node, context)
+            type_name = _text(type_node.child_by_field_name("name")) or None
+            type_text = f"{type_node.children[0].type} {type_name}"
+        for declarator_node in node.children_by_field_name("declarator"):
+            declarator = _unwrap_declarator(declarator_node)
+            # Doxygen does not report typedefs naming the type they define.
+            if not declarator.name or declarator.name == type_name:
+                continue
+            argstring = declarator.suffix or None
+            typedef_type = type_text
+            if declarator.function_pointer is not None:
+                parameters = declarator.function_pointer.child_by_field_name(
+                    "parameters"
+                )
+                typedef_type = f"{type_text}{declarator.pointer[1:]}(*"
+                argstring = f"){_text(parameters)}"
+            elif declarator.pointer:
+                typedef_type = f"{type_text} {declarator.pointer}"
+            self._add_typedef(
+                context,
+                {
+                    "name": declarator.name,
+                    "type": normalize_type_text(typedef_type),
+                    "argstring": argstring,
+                    "visibility": context.visibility,
+                    "keyword": "typedef",
+                },
+                None,
+            )
+
+    def _visit_alias(
+        self, node: Node, context: _Context, template_params: list[Template] | None
+    ) -> None:
+        self._add_typedef(
+            context,
+            {
+                "name": _text(node.child_by_field_name("name")),
+                "type": _declarator_type(_text(node.child_by_field_name("type"))),
+                "argstring": None,
+                "visibility": context.visibility,
+                "keyword": "using",
+            },
+            template_params,
+        )
+
+    def _add_typedef(
+        self,
+        context: _Context,
+        args: dict[str, object],
+        template_params: list[Template] | None,
+    ) -> None:
+        is_private = context.is_class and context.visibility == "private"
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "typedef",
+                args,
+                template_params,
+                is_private_typedef=is_private,
+                location=self.path,
+            )
+        )
+
+    def _visit_friend(self, node: Node, context: _Context) -> None:
+        if context.visibility == "private":
+            return
+        # Doxygen only reports friend declarations of a type name, not of
+        # classes, structs or functions.
+        children = [child for child in node.children if child.type != "comment"]
+        if len(children) != 3 or children[1].type not in (
+            "type_identifier",
+            "qualified_identifier",
+            "template_type",
+        ):
+            return
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "friend",
+                {"name": _text(children[1]), "visibility": context.visibility},
+                location=self.path,
+            )
+        )
+
+    def _visit_using(self, node: Node, context: _Context) -> None:
+        # Only "using Base::Base;", which inherits the constructors of Base.
+        if not context.is_class or context.visibility == "private":
+            return
+        path = parse_qualified_path(_text(node.named_children[-1]))
+        # Like Doxygen, only when the base is named without template arguments.
+        if len(path) < 2 or path[-2] != path[-1]:
+            return
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "inherited_constructors",
+                {"base": "::".join(path[:-1]), "visibility": context.visibility},
+                location=self.path,
+            )
+        )
+
+    def _visit_concept(
+        self, node: Node, context: _Context, template_params: list[Template] | None
+    ) -> None:
+        name = node.child_by_field_name("name")
+        constraint = node.named_children[-1] if node.named_children else None
+        if name is None or constraint is None:
+            return
+        self.declarations.append(
+            MemberDeclaration(
+                context.scope,
+                "concept",
+                {"name": _text(name), "constraint": _text(constraint)},
+                template_params,
+                location=self.path,
+            )
+        )
+
+    def _template_params(self, node: Node | None) -> list[Template]:
+        params = []
+        if node is None:
+            return params
+        for param in node.named_children:
+            if param.type == "comment":
+                continue
+            default = None
+            for field_name in ("default_type", "default_value"):
+                value = param.child_by_field_name(field_name)
+                if value is not None:
+                    default = normalize_type_text(_text(value))
+            if param.type in (
+                "type_parameter_declaration",
+                "optional_type_parameter_declaration",
+                "variadic_type_parameter_declaration",
+            ):
+                keyword = _text(param.children[0])
+                if param.type == "variadic_type_parameter_declaration":
+                    keyword += "..."
+                name_node = param.child_by_field_name("name")
+                if name_node is None:
+                    names = [
+                        c for c in param.named_children if c.type == "type_identifier"
+                    ]
+                    name_node = names[0] if names else None
+                params.append((keyword, _text(name_node) or None, default))
+            elif param.type == "template_template_parameter_declaration":
+                text = _text(param)
+                head, _, name = text.rpartition(" ")
+                params.append((head, name or None, default))
+            else:
+                type_text, _ = self._specifiers(param)
+                declarator = param.child_by_field_name("declarator")
+                name = _unwrap_declarator(declarator).name if declarator else ""
+                if declarator is not None and declarator.type == "variadic_declarator":
+                    type_text += "..."
+                    name = _text(declarator).lstrip(".").strip()
+                params.append((normalize_type_text(type_text), name or None, default))
+        return params
+
+
+def _reparse_as_parameters(arguments: Node) -> Node:
+    """Parse the text of an argument list again as a parameter list."""
+    # The const qualifier leaves no other way to parse it than a function.
+    tree = Parser(_LANGUAGE).parse(b"void f" + arguments.text + b" const;")
+    declarator = tree.root_node.named_children[0].child_by_field_name("declarator")
+    return declarator.child_by_field_name("parameters")
+
+
+def _pointer_type(type_text: str, pointer: str) -> str:
+    if not type_text:
+        return ""
+    return normalize_type_text(f"{type_text} {pointer}" if pointer else type_text)
+
+
+def _declarator_type(text: str) -> str:
+    # Like Doxygen, no space before the parentheses and brackets of a
+    # declarator, as in "int(*)(int)" or "const char[]".
+    text = re.sub(r"\s+([(\[])", r"\1", text.strip())
+    text = normalize_type_text(re.sub(r"(\w)\s+\.\.\.", r"\1...", text))
+    # But a space before the ref-qualifier of a function type, as in
+    # "R(C::*)() const &".
+    return re.sub(r"(\)(?: const| volatile)*)(&{1,2})$", r"\1 \2", text)
+
+
+def _find_name(declarator: Node) -> Node | None:
+    """Find the identifier a declarator declares."""
+    if declarator.type in ("identifier", "field_identifier"):
+        return declarator
+    for child in declarator.children:
+        if child.type == "parameter_list":
+            continue
+        found = _find_name(child)
+        if found is not None:
+            return found
+    return None
+
+
+def _nesting(declarator: Node, name: Node) -> int:
+    """Count the parenthesized declarators around *name*."""
+    count = 0
+    node = name.parent
+    while node is not None and node != declarator.parent:
+        if node.type == "parenthesized_declarator":
+            count += 1
+        node = node.parent
+    return count
+
+
+def _text_without(node: Node, removed: Node) -> str:
+    """Get the text of *node* without the text of its descendant *removed*."""
+    source = node.text
+    start = removed.start_byte - node.start_byte
+    end = removed.end_byte - node.start_byte
+    text = (source[:start] + source[end:]).decode("utf-8", errors="replace")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def parse_declarations(path: str, source: str) -> list[Declaration]:
+    """Get the declarations of the preprocessed *source* of the header *path*."""
+    return _HeaderParser(path, source.encode("utf-8")).parse()
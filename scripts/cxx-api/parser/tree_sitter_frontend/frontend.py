@@ -0,0 +1,381 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Builds snapshots from headers parsed with tree-sitter instead of from the
+Doxygen XML.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import os
+from collections.abc import Callable
+from typing import TypeVar
+
+from ..builders import (
+    _member_types_reference_excluded_symbol,
+    _should_exclude_symbol,
+    compile_exclude_patterns,
+    make_doxygen_argument,
+)
+from ..main import finish_snapshot
+from ..member import (
+    ConceptMember,
+    EnumMember,
+    FriendMember,
+    FunctionMember,
+    TypedefMember,
+    VariableMember,
+)
+from ..member_pool import MemberPool
+from ..profiling import profile_phase, ViewProfile
+from ..scope import Scope, StructLikeScopeKind
+from ..snapshot import Snapshot
+from ..template import Template
+from ..utils import parse_qualified_path, split_specialization
+from .declarations import (
+    Declaration,
+    MemberDeclaration,
+    parse_declarations,
+    ScopeDeclaration,
+)
+from .preprocessor import (
+    definitions_to_macros,
+    get_defined_macros,
+    get_empty_expansions,
+    Macro,
+    parse_predefined,
+    preprocess,
+)
+
+_T = TypeVar("_T")
+
+_MEMBER_CLASSES = {
+    "function": FunctionMember,
+    "variable": VariableMember,
+    "typedef": TypedefMember,
+    "friend": FriendMember,
+    "concept": ConceptMember,
+}
+
+_STRUCT_LIKE_TYPES = {
+    "class": StructLikeScopeKind.Type.CLASS,
+    "struct": StructLikeScopeKind.Type.STRUCT,
+    "union": StructLikeScopeKind.Type.UNION,
+}
+
+
+def get_view_macros(
+    definitions: dict[str, str | int], doxygen_config_template: str | None = None
+) -> dict[str, Macro]:
+    """
+    Get the macros of a view: the PREDEFINED macros of the Doxygen config
+    template, if given, and the definitions of the view.
+    """
+    macros = {}
+    if doxygen_config_template is not None:
+        with open(doxygen_config_template) as f:
+            macros.update(parse_predefined(f.read()))
+    macros.update(definitions_to_macros(definitions))
+    return macros
+
+
+def _read_header(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def parse_header(
+    path: str,
+    macros: dict[str, Macro],
+    expanded_macros: dict[str, bool] | None = None,
+) -> list[Declaration]:
+    """
+    Preprocess and parse the header *path* and get its declarations.
+    *expanded_macros* are macros of other headers to expand to nothing, see
+    preprocess.
+    """
+    return parse_declarations(
+        path, preprocess(_read_header(path), macros, expanded_macros)
+    )
+
+
+def _get_header_macros(path: str, macros: dict[str, Macro]) -> dict[str, Macro]:
+    return get_defined_macros(_read_header(path), macros)
+
+
+def _map_headers(
+    function: Callable[..., _T], files: list[str], args: tuple, jobs: int | None
+) -> list[_T]:
+    """Call *function* with each of *files* and *args* in a process pool."""
+    if jobs == 1 or len(files) <= 1:
+        return [function(path, *args) for path in files]
+    jobs = jobs or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        return list(
+            executor.map(
+                function,
+                files,
+                *[[arg] * len(files) for arg in args],
+                chunksize=max(1, len(files) // (jobs * 4)),
+            )
+        )
+
+
+def get_expanded_macros(
+    files: list[str], macros: dict[str, Macro], jobs: int | None = None
+) -> dict[str, bool]:
+    """
+    Get the macros the headers define that expand to nothing, such as export
+    and attribute macros. Includes are not followed, so headers using the
+    macros of other headers need them.
+    """
+    defined: dict[str, Macro] = {}
+    for header_macros in _map_headers(_get_header_macros, files, (macros,), jobs):
+        for name, macro in header_macros.items():
+            defined.setdefault(name, macro)
+    return get_empty_expansions(defined, macros)
+
+
+class _SnapshotBuilder:
+    def __init__(self, snapshot: Snapshot, exclude_symbols: list) -> None:
+        self.snapshot = snapshot
+        self.exclude_symbols = exclude_symbols
+        # Scopes defined by the declarations, by qualified name. Members of
+        # other scopes, such as excluded ones, are dropped.
+        self.scopes: dict[str, Scope] = {"": snapshot.root_scope}
+        self.class_scopes: set[str] = set()
+        # Forward declarations of class templates, by qualified name.
+        self.forward_declarations: dict[str, ScopeDeclaration] = {}
+        # The constructors of each class, and the classes inheriting the
+        # constructors of their base with "using Base::Base;".
+        self.constructors: dict[str, list[MemberDeclaration]] = {}
+        self.inherited_constructors: list[MemberDeclaration] = []
+        # The bases and the names of the virtual functions of each class, and
+        # the overriding functions, to be marked virtual when they override a
+        # virtual function of a base.
+        self.bases: dict[str, list[str]] = {}
+        self.virtual_functions: dict[str, set[str]] = {}
+        self.overrides: list[tuple[str, FunctionMember]] = []
+
+    def add(self, declaration: Declaration) -> None:
+        if isinstance(declaration, ScopeDeclaration):
+            self._add_scope(declaration)
+        else:
+            self._add_member(declaration)
+
+    def _add_scope(self, declaration: ScopeDeclaration) -> None:
+        name = declaration.name
+        if declaration.is_forward_declaration:
+            self.forward_declarations.setdefault(name, declaration)
+            return
+        # The primary template of a specialization is reported even if it is
+        # only declared.
+        primary = split_specialization(name)[0]
+        if primary != name and primary not in self.scopes:
+            forward_declaration = self.forward_declarations.get(primary)
+            if forward_declaration is not None:
+                self._add_scope(
+                    dataclasses.replace(
+                        forward_declaration, is_forward_declaration=False
+                    )
+                )
+        parent = "::".join(parse_qualified_path(name)[:-1])
+        if parent not in self.scopes:
+            return
+        if _should_exclude_symbol(name, self.exclude_symbols):
+            return
+
+        if declaration.kind == "namespace":
+            scope = self.snapshot.create_or_get_namespace(name)
+        elif declaration.kind == "enum" and not parent:
+            # Like the members of the global namespace, see _add_member.
+            return
+        elif name in self.scopes:
+            # Defined by another header already.
+            return
+        elif declaration.kind == "enum":
+            scope = self.snapshot.create_enum(name)
+            scope.kind.type = declaration.enum_type
+            for enumerator, value in declaration.enumerators:
+                scope.add_member(EnumMember(enumerator, value))
+        else:
+            scope = self.snapshot.create_struct_like(
+                name, _STRUCT_LIKE_TYPES[declaration.kind]
+            )
+            scope.kind.add_base(
+                [
+                    StructLikeScopeKind.Base(base, protection, is_virtual, None)
+                    for base, protection, is_virtual in declaration.bases
+                ]
+            )
+            scope.kind.add_template(
+                [Template(*param) for param in declaration.template_params or []]
+            )
+            self.class_scopes.add(name)
+            self.bases[name] = [base for base, _, _ in declaration.bases]
+        scope.location = declaration.location
+        self.scopes[name] = scope
+
+    def _add_member(self, declaration: MemberDeclaration) -> None:
+        # Doxygen reports the members of the global namespace in the
+        # compounds of files, which are not part of snapshots.
+        if not declaration.scope:
+            return
+        scope = self.scopes.get(declaration.scope)
+        if scope is None:
+            return
+        args = declaration.args
+        if declaration.kind == "inherited_constructors":
+            self.inherited_constructors.append(declaration)
+            return
+        if (
+            declaration.kind == "function"
+            and declaration.scope in self.class_scopes
+            and args["name"] == _class_name(declaration.scope)
+        ):
+            self.constructors.setdefault(declaration.scope, []).append(declaration)
+        if declaration.is_private_typedef:
+            scope.add_private_typedef(TypedefMember(**args))
+            return
+
+        # Members of classes are matched by name, other members by their
+        # qualified name, like the members in the Doxygen XML.
+        name = args["name"]
+        if declaration.scope not in self.class_scopes:
+            name = f"{declaration.scope}::{name}"
+        if declaration.kind != "friend" and _should_exclude_symbol(
+            name, self.exclude_symbols
+        ):
+            return
+
+        if args.get("doxygen_params") is not None:
+            args = {
+                **args,
+                "doxygen_params": [
+                    make_doxygen_argument(*param) for param in args["doxygen_params"]
+                ],
+            }
+        member = _MEMBER_CLASSES[declaration.kind](**args)
+        member.location = declaration.location
+        if declaration.template_params is not None:
+            member.add_template(
+                [Template(*param) for param in declaration.template_params]
+            )
+        if _member_types_reference_excluded_symbol(member, self.exclude_symbols):
+            return
+        scope.add_member(member)
+        if declaration.kind == "function":
+            if member.is_virtual:
+                self.virtual_functions.setdefault(declaration.scope, set()).add(
+                    member.name
+                )
+            elif declaration.is_override:
+                self.overrides.append((declaration.scope, member))
+
+    def mark_overrides(self) -> None:
+        """
+        Mark the functions overriding a virtual function of a base as
+        virtual, like Doxygen does.
+        """
+        for scope_name, member in self.overrides:
+            if self._base_has_virtual_function(scope_name, member.name, set()):
+                member.is_virtual = True
+
+    def _base_has_virtual_function(
+        self, scope_name: str, name: str, visited: set[str]
+    ) -> bool:
+        visited.add(scope_name)
+        for base in self.bases.get(scope_name, []):
+            base_name = self.scopes[scope_name].qualify_name(base)
+            if base_name is None:
+                continue
+            base_name = _primary_name(base_name)
+            if base_name in visited or base_name not in self.scopes:
+                continue
+            if name in self.virtual_functions.get(base_name, ()):
+                return True
+            if self._base_has_virtual_function(base_name, name, visited):
+                return True
+        return False
+
+    def add_inherited_constructors(self) -> None:
+        """
+        Add the constructors inherited with "using Base::Base;", renamed after
+        the derived class, like Doxygen does.
+        """
+        for declaration in self.inherited_constructors:
+            base = self.scopes[declaration.scope].qualify_name(declaration.args["base"])
+            if base is None:
+                continue
+            name = _class_name(declaration.scope)
+            for constructor in self.constructors.get(_primary_name(base), []):
+                self._add_member(
+                    dataclasses.replace(
+                        constructor,
+                        scope=declaration.scope,
+                        args={**constructor.args, "name": name},
+                    )
+                )
+
+
+def _primary_name(name: str) -> str:
+    path = parse_qualified_path(name)
+    return "::".join([*path[:-1], split_specialization(path[-1])[0]])
+
+
+def _class_name(qualified_name: str) -> str:
+    """Get the name of the constructors of a class."""
+    return split_specialization(parse_qualified_path(qualified_name)[-1])[0]
+
+
+def build_snapshot_from_headers(
+    files: list[str],
+    macros: dict[str, Macro],
+    exclude_symbols: list[str] | None = None,
+    member_pool: MemberPool | None = None,
+    profile: ViewProfile | None = None,
+    jobs: int | None = None,
+) -> Snapshot:
+    """
+    Parse *files* with tree-sitter in a pool of *jobs* processes and build a
+    snapshot of their C++ API.
+
+    Args:
+        files: The headers of the view, in the order Doxygen reads them.
+        macros: The macros the conditions of the headers are evaluated
+            with, see get_view_macros.
+        exclude_symbols: Optional list of regex patterns of the symbols to
+            leave out, like for build_snapshot.
+        member_pool: Optional pool shared with the snapshots of other
+            variants, like for build_snapshot.
+        profile: Optional profile of the view.
+        jobs: Number of processes parsing the headers, all CPUs by default.
+    """
+    compiled_patterns = compile_exclude_patterns(exclude_symbols or [])
+
+    with profile_phase(profile, "collect_macros") as phase:
+        expanded_macros = get_expanded_macros(files, macros, jobs)
+        if profile is not None:
+            phase.count("macros", len(expanded_macros))
+
+    with profile_phase(profile, "parse_headers") as phase:
+        parsed = _map_headers(parse_header, files, (macros, expanded_macros), jobs)
+        if profile is not None:
+            phase.count("files", len(files))
+
+    with profile_phase(profile, "build_scopes"):
+        snapshot = Snapshot()
+        builder = _SnapshotBuilder(snapshot, compiled_patterns)
+        for declarations in parsed:
+            for declaration in declarations:
+                builder.add(declaration)
+        builder.add_inherited_constructors()
+        builder.mark_overrides()
+
+    finish_snapshot(snapshot, compiled_patterns, member_pool, profile)
+    return snapshot
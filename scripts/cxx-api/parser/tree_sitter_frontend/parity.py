@@ -0,0 +1,75 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Parity of the tree-sitter frontend with the snapshots that Doxygen produces
+for the cases of tests/snapshots.
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import re
+from dataclasses import dataclass
+
+from .frontend import build_snapshot_from_headers, get_view_macros
+
+MATCH = "match"
+MISMATCH = "mismatch"
+UNSUPPORTED = "unsupported"
+
+# tree-sitter-cpp does not parse Objective-C, so cases declaring interfaces,
+# protocols or categories are not compared.
+_OBJC_DECLARATION = re.compile(r"@(interface|protocol|implementation)\b")
+
+
+@dataclass
+class CaseParity:
+    case: str
+    status: str
+    diff: list[str]
+
+    def to_dict(self) -> dict[str, object]:
+        return {"case": self.case, "status": self.status, "diff": self.diff}
+
+
+def check_case(case_dir: str, macros: dict) -> CaseParity:
+    """Compare the snapshot of a case built by the frontend to the expected one."""
+    case = os.path.basename(case_dir)
+    header = os.path.join(case_dir, "test.h")
+    with open(header) as f:
+        if _OBJC_DECLARATION.search(f.read()):
+            return CaseParity(case, UNSUPPORTED, [])
+    with open(os.path.join(case_dir, "snapshot.api")) as f:
+        expected = f.read()
+
+    snapshot = build_snapshot_from_headers([header], macros, jobs=1)
+    actual = snapshot.to_string().rstrip() + "\n"
+    if actual == expected:
+        return CaseParity(case, MATCH, [])
+    diff = difflib.unified_diff(
+        expected.splitlines(),
+        actual.splitlines(),
+        "doxygen",
+        "tree-sitter",
+        lineterm="",
+    )
+    return CaseParity(case, MISMATCH, list(diff))
+
+
+def check_parity(snapshots_dir: str) -> list[CaseParity]:
+    """
+    Check the parity of every case of *snapshots_dir*, with the macros of the
+    Doxygen config template of the snapshot tests.
+    """
+    macros = get_view_macros(
+        {}, os.path.join(snapshots_dir, ".doxygen.config.template")
+    )
+    return [
+        check_case(os.path.join(snapshots_dir, case), macros)
+        for case in sorted(os.listdir(snapshots_dir))
+        if os.path.isfile(os.path.join(snapshots_dir, case, "snapshot.api"))
+    ]
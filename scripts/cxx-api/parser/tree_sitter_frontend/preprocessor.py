@@ -0,0 +1,369 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+A minimal preprocessor for the tree-sitter frontend.
+
+Like Doxygen with ENABLE_PREPROCESSING, it keeps the code of the active
+branches of #if/#ifdef/#ifndef/#elif/#else conditions, evaluated against the
+definitions of the view and the #defines of the header itself. Includes are
+not followed. Of the macros, only the ones that expand to nothing are
+expanded, which removes the attribute and export macros tree-sitter cannot
+parse.
+"""
+
+from __future__ import annotations
+
+import re
+
+_DIRECTIVE = re.compile(r"^\s*#\s*(\w+)\s*(.*)$", re.DOTALL)
+_DEFINE = re.compile(r"^([A-Za-z_]\w*)(\([^)]*\))?\s*(.*)$", re.DOTALL)
+_PREDEFINED = re.compile(r'^\s*([A-Za-z_]\w*)(\([^)]*\))?\s*=\s*(".*"|\S*)\s*$')
+_LINE_COMMENT = re.compile(r"//.*$")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_TOKEN = re.compile(
+    r"\s*(0[xX][0-9a-fA-F]+|\d+|[A-Za-z_]\w*|&&|\|\||==|!=|<=|>=|<<|>>"
+    r"|[!~()+\-*/%<>&|^?:,])[uUlL]*"
+)
+
+# Binary operators by precedence, lowest first.
+_BINARY_OPERATORS = [
+    {"||": lambda a, b: int(bool(a) or bool(b))},
+    {"&&": lambda a, b: int(bool(a) and bool(b))},
+    {"|": lambda a, b: a | b},
+    {"^": lambda a, b: a ^ b},
+    {"&": lambda a, b: a & b},
+    {"==": lambda a, b: int(a == b), "!=": lambda a, b: int(a != b)},
+    {
+        "<": lambda a, b: int(a < b),
+        ">": lambda a, b: int(a > b),
+        "<=": lambda a, b: int(a <= b),
+        ">=": lambda a, b: int(a >= b),
+    },
+    {"<<": lambda a, b: a << b, ">>": lambda a, b: a >> b},
+    {"+": lambda a, b: a + b, "-": lambda a, b: a - b},
+    {
+        "*": lambda a, b: a * b,
+        "/": lambda a, b: a // b if b else 0,
+        "%": lambda a, b: a % b if b else 0,
+    },
+]
+
+
+class Macro:
+    __slots__ = ("value", "is_function")
+
+    def __init__(self, value: str, is_function: bool = False) -> None:
+        self.value = value
+        self.is_function = is_function
+
+
+def parse_predefined(template: str) -> dict[str, Macro]:
+    """
+    Get the macros of the PREDEFINED tag of a Doxygen config template, such
+    as FOLLY_PACK_ATTR="" or __attribute__(x)="".
+    """
+    macros = {}
+    match = re.search(r"^PREDEFINED\s*=(.*?)(?<!\\)\n", template, re.M | re.S)
+    if match is None:
+        return macros
+    for line in match.group(1).split("\\\n"):
+        entry = _PREDEFINED.match(line)
+        if entry is None:
+            continue
+        name, params, value = entry.groups()
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        macros[name] = Macro(value, params is not None)
+    return macros
+
+
+def definitions_to_macros(definitions: dict[str, str | int]) -> dict[str, Macro]:
+    """Get the macros of the definitions of a view."""
+    return {name: Macro(str(value)) for name, value in definitions.items()}
+
+
+class _ConditionParser:
+    """Evaluates the expression of an #if or #elif directive."""
+
+    def __init__(self, expression: str, macros: dict[str, Macro]) -> None:
+        self.tokens = _TOKEN.findall(expression)
+        self.macros = macros
+        self.position = 0
+
+    def peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self) -> str | None:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def evaluate(self) -> int:
+        value = self.ternary()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected token {self.peek()}")
+        return value
+
+    def ternary(self) -> int:
+        condition = self.binary(0)
+        if self.peek() != "?":
+            return condition
+        self.take()
+        if_true = self.ternary()
+        if self.take() != ":":
+            raise ValueError("Expected :")
+        if_false = self.ternary()
+        return if_true if condition else if_false
+
+    def binary(self, level: int) -> int:
+        if level == len(_BINARY_OPERATORS):
+            return self.unary()
+        operators = _BINARY_OPERATORS[level]
+        value = self.binary(level + 1)
+        while self.peek() in operators:
+            operator = operators[self.take()]
+            value = operator(value, self.binary(level + 1))
+        return value
+
+    def unary(self) -> int:
+        token = self.take()
+        if token is None:
+            raise ValueError("Unexpected end of expression")
+        if token == "!":
+            return int(not self.unary())
+        if token == "-":
+            return -self.unary()
+        if token == "+":
+            return self.unary()
+        if token == "~":
+            return ~self.unary()
+        if token == "(":
+            value = self.ternary()
+            if self.take() != ")":
+                raise ValueError("Expected )")
+            return value
+        if token == "defined":
+            parenthesized = self.peek() == "("
+            if parenthesized:
+                self.take()
+            name = self.take()
+            if parenthesized and self.take() != ")":
+                raise ValueError("Expected )")
+            return int(name in self.macros)
+        if token[0].isdigit():
+            return int(token, 0)
+        if self.peek() == "(":
+            # Calls like __has_include(...) or __has_feature(...) are
+            # unknown, so false.
+            self._skip_parenthesized()
+            return 0
+        return self._macro_value(token, set())
+
+    def _skip_parenthesized(self) -> None:
+        depth = 0
+        while (token := self.take()) is not None:
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _macro_value(self, name: str, expanding: set[str]) -> int:
+        macro = self.macros.get(name)
+        if macro is None or macro.is_function or name in expanding:
+            return 0
+        if not macro.value.strip():
+            return 0
+        try:
+            return _ConditionParser(macro.value, self.macros).evaluate()
+        except ValueError:
+            return 0
+
+
+def evaluate_condition(expression: str, macros: dict[str, Macro]) -> bool:
+    """
+    Evaluate the expression of an #if directive. Undefined macros are 0, and
+    expressions that cannot be evaluated are false.
+    """
+    expression = _LINE_COMMENT.sub("", _BLOCK_COMMENT.sub(" ", expression))
+    try:
+        return bool(_ConditionParser(expression, macros).evaluate())
+    except (ValueError, ZeroDivisionError):
+        return False
+
+
+def _remove_empty_macros(line: str, empty_macros: dict[str, bool]) -> str:
+    """Remove the uses of macros that expand to nothing from *line*."""
+    if not empty_macros:
+        return line
+    result = []
+    position = 0
+    for match in re.finditer(r"[A-Za-z_]\w*", line):
+        name = match.group()
+        if name not in empty_macros or match.start() < position:
+            continue
+        result.append(line[position : match.start()])
+        position = match.end()
+        if empty_macros[name]:
+            # Skip the arguments of a function-like macro.
+            rest = line[position:]
+            stripped = rest.lstrip()
+            if stripped.startswith("("):
+                depth = 0
+                start = position + len(rest) - len(stripped)
+                for i in range(start, len(line)):
+                    if line[i] == "(":
+                        depth += 1
+                    elif line[i] == ")":
+                        depth -= 1
+                        if depth == 0:
+                            position = i + 1
+                            break
+                else:
+                    position = len(line)
+    result.append(line[position:])
+    return "".join(result)
+
+
+def _expands_to_nothing(macro: Macro, empty_macros: dict[str, bool]) -> bool:
+    return not _remove_empty_macros(macro.value, empty_macros).strip()
+
+
+def _preprocess(
+    source: str, macros: dict[str, Macro], expanded_macros: dict[str, bool]
+) -> tuple[str, dict[str, Macro]]:
+    macros = dict(macros)
+    # The macros that expand to nothing, and whether they are function-like.
+    empty_macros = dict(expanded_macros)
+    empty_macros.update(
+        (name, macro.is_function)
+        for name, macro in macros.items()
+        if not macro.value.strip()
+    )
+    lines = source.split("\n")
+    output: list[str] = []
+    # For each open condition: whether the enclosing code is active, whether
+    # a branch was taken, and whether the current branch is active.
+    stack: list[tuple[bool, bool, bool]] = []
+    active = True
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        directive = _DIRECTIVE.match(line)
+        if directive is None:
+            if active:
+                output.append(_remove_empty_macros(line, empty_macros))
+            else:
+                output.append("")
+            i += 1
+            continue
+
+        # Join continuation lines.
+        text = line
+        consumed = 1
+        while text.endswith("\\") and i + consumed < len(lines):
+            text = text[:-1] + lines[i + consumed]
+            consumed += 1
+        output.extend([""] * consumed)
+        i += consumed
+
+        name, argument = _DIRECTIVE.match(text).groups()
+        argument = _LINE_COMMENT.sub("", _BLOCK_COMMENT.sub(" ", argument)).strip()
+        if name in ("if", "ifdef", "ifndef"):
+            if name == "if":
+                taken = active and evaluate_condition(argument, macros)
+            elif name == "ifdef":
+                taken = active and argument.split()[0] in macros
+            else:
+                taken = active and argument.split()[0] not in macros
+            stack.append((active, taken, taken))
+            active = taken
+        elif name == "elif" and stack:
+            outer, was_taken, _ = stack[-1]
+            taken = outer and not was_taken and evaluate_condition(argument, macros)
+            stack[-1] = (outer, was_taken or taken, taken)
+            active = taken
+        elif name == "else" and stack:
+            outer, was_taken, _ = stack[-1]
+            taken = outer and not was_taken
+            stack[-1] = (outer, True, taken)
+            active = taken
+        elif name == "endif" and stack:
+            outer, _, _ = stack.pop()
+            active = outer
+        elif not active:
+            continue
+        elif name == "define":
+            definition = _DEFINE.match(argument)
+            if definition is not None:
+                macro_name, params, value = definition.groups()
+                macro = Macro(value.strip(), params is not None)
+                macros[macro_name] = macro
+                if _expands_to_nothing(macro, empty_macros):
+                    empty_macros[macro_name] = macro.is_function
+                else:
+                    empty_macros.pop(macro_name, None)
+        elif name == "undef":
+            macro_name = argument.split()[0] if argument else ""
+            macros.pop(macro_name, None)
+            empty_macros.pop(macro_name, None)
+    return "\n".join(output), macros
+
+
+def preprocess(
+    source: str,
+    macros: dict[str, Macro],
+    expanded_macros: dict[str, bool] | None = None,
+) -> str:
+    """
+    Remove the inactive branches of the conditions and the directives from
+    *source*, and expand the macros that expand to nothing. Removed lines
+    are left empty, so line numbers are unchanged.
+
+    *expanded_macros* are more macros to expand to nothing, by whether they
+    are function-like, that the conditions do not see as defined.
+    """
+    return _preprocess(source, macros, expanded_macros or {})[0]
+
+
+def get_defined_macros(source: str, macros: dict[str, Macro]) -> dict[str, Macro]:
+    """Get the macros that the active #defines of *source* define."""
+    defined = _preprocess(source, macros, {})[1]
+    return {
+        name: macro for name, macro in defined.items() if macros.get(name) is not macro
+    }
+
+
+def get_empty_expansions(
+    defined: dict[str, Macro], macros: dict[str, Macro]
+) -> dict[str, bool]:
+    """
+    Get the macros of *defined* that expand to nothing, like attribute and
+    export macros defined in terms of __attribute__, by whether they are
+    function-like. Macros defined as nothing, like include guards, are left
+    out.
+    """
+    empty_macros = {
+        name: macro.is_function
+        for name, macro in macros.items()
+        if not macro.value.strip()
+    }
+    candidates = {name: macro for name, macro in defined.items() if macro.value}
+    found: dict[str, bool] = {}
+    # Macros may be defined in terms of each other, in any order.
+    changed = True
+    while changed:
+        changed = False
+        for name, macro in candidates.items():
+            if name not in found and _expands_to_nothing(
+                macro, {**empty_macros, **found}
+            ):
+                found[name] = macro.is_function
+                changed = True
+    return found
@@ -10,32 +10,45 @@ from .argument_parsing import (
     format_parsed_type,
     FunctionModifiers,
     has_scope_resolution_outside_angles,
+    intern_argument,
     parse_arg_string,
     parse_function_pointer_argstring,
     parse_type_with_argstrings,
     split_specialization,
 )
+from .cache_stats import clear_caches, format_cache_stats, get_cache_stats
 from .qualified_path import parse_qualified_path
 from .text_resolution import (
+    build_refid_index,
     extract_namespace_from_refid,
     InitializerType,
     normalize_angle_brackets,
     normalize_pointer_spacing,
+    normalize_type_text,
+    RefidIndex,
+    RefidTarget,
     resolve_linked_text_name,
+    use_refid_index,
 )
 from .type_qualification import qualify_arguments, qualify_parsed_type, qualify_type_str
 
 __all__ = [
     "Argument",
+    "build_refid_index",
+    "clear_caches",
     "extract_namespace_from_refid",
     "extract_qualifiers",
     "format_arguments",
     "format_parsed_type",
+    "format_cache_stats",
     "FunctionModifiers",
+    "get_cache_stats",
     "has_scope_resolution_outside_angles",
     "InitializerType",
+    "intern_argument",
     "normalize_angle_brackets",
     "normalize_pointer_spacing",
+    "normalize_type_text",
     "parse_arg_string",
     "parse_function_pointer_argstring",
     "parse_qualified_path",
@@ -43,6 +56,9 @@ __all__ = [
     "qualify_arguments",
     "qualify_parsed_type",
     "qualify_type_str",
+    "RefidIndex",
+    "RefidTarget",
     "resolve_linked_text_name",
     "split_specialization",
+    "use_refid_index",
 ]
@@ -5,7 +5,10 @@
 
 from __future__ import annotations
 
+import functools
 import re
+import sys
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 # Type alias for a parsed argument tuple:
@@ -17,9 +20,24 @@ from dataclasses import dataclass
 Argument = tuple[str | None, str, str | None, str | None]
 
 
-@dataclass
+def intern_argument(argument: Argument) -> Argument:
+    """Intern every string of an argument tuple.
+
+    The same parameter types and names (``jsi::Runtime&``, ``rt``, ...) occur
+    thousands of times across a view, so sharing their storage noticeably
+    reduces the size of the scope tree.
+    """
+    return tuple(sys.intern(part) if part else part for part in argument)
+
+
+@dataclass(frozen=True)
 class FunctionModifiers:
-    """Parsed function modifiers that appear after the parameter list."""
+    """Parsed function modifiers that appear after the parameter list.
+
+    Instances are shared between all functions with the same argument
+    string, so they are immutable; use dataclasses.replace to derive
+    modified copies.
+    """
 
     is_const: bool = False
     is_override: bool = False
@@ -351,7 +369,7 @@ def _parse_modifiers(modifiers_str: str) -> FunctionModifiers:
 
     Handles: const, override, final, noexcept, noexcept(expr), = 0, = default, = delete
     """
-    result = FunctionModifiers()
+    flags: dict[str, bool | str] = {}
     s = modifiers_str.strip()
 
     # Handle = 0, = default, = delete
@@ -359,27 +377,29 @@ def _parse_modifiers(modifiers_str: str) -> FunctionModifiers:
     if eq_match:
         value = eq_match.group(1)
         if value == "0":
-            result.is_pure_virtual = True
+            flags["is_pure_virtual"] = True
         elif value == "default":
-            result.is_default = True
+            flags["is_default"] = True
         elif value == "delete":
-            result.is_delete = True
+            flags["is_delete"] = True
         s = s[: eq_match.start()].strip()
 
     # Handle noexcept with optional expression
     noexcept_match = re.search(r"\bnoexcept\b", s)
     if noexcept_match:
-        result.is_noexcept = True
+        flags["is_noexcept"] = True
+        noexcept_expr = None
         # Check for noexcept(expr)
         rest = s[noexcept_match.end() :]
         rest_stripped = rest.lstrip()
         if rest_stripped.startswith("("):
             paren_end = _find_matching_paren(rest_stripped, 0)
             if paren_end != -1:
-                result.noexcept_expr = rest_stripped[1:paren_end].strip()
+                noexcept_expr = rest_stripped[1:paren_end].strip()
+                flags["noexcept_expr"] = noexcept_expr
         # Remove noexcept and its expression from the string for further parsing
         s = s[: noexcept_match.start()] + s[noexcept_match.end() :]
-        if result.noexcept_expr:
+        if noexcept_expr:
             # Also remove the (expr) part
             s = re.sub(r"\([^)]*\)", "", s, count=1)
 
@@ -387,36 +407,40 @@ def _parse_modifiers(modifiers_str: str) -> FunctionModifiers:
     tokens = s.split()
     for token in tokens:
         if token == "const":
-            result.is_const = True
+            flags["is_const"] = True
         elif token == "override":
-            result.is_override = True
+            flags["is_override"] = True
         elif token == "final":
-            result.is_final = True
+            flags["is_final"] = True
 
-    return result
+    return FunctionModifiers(**flags)
 
 
+@functools.lru_cache(maxsize=8192)
 def parse_arg_string(
     arg_string: str,
-) -> tuple[list[Argument], FunctionModifiers]:
+) -> tuple[tuple[Argument, ...], FunctionModifiers]:
     """Parse a C++ function argument string.
 
+    The same argument strings recur across overloads and overrides, so
+    results are memoized. They are immutable and shared between callers.
+
     Args:
         arg_string: String in format "(type1 arg1, type2 arg2 = default) [modifiers]"
 
     Returns:
         Tuple of (arguments, modifiers) where:
-        - arguments: list of (qualifiers, type, name, default_value) tuples
+        - arguments: tuple of (qualifiers, type, name, default_value) tuples
         - modifiers: FunctionModifiers dataclass with parsed modifier flags
     """
     arg_string = arg_string.strip()
 
     if not arg_string.startswith("("):
-        return ([], FunctionModifiers())
+        return ((), FunctionModifiers())
 
     close_paren = _find_matching_paren(arg_string, 0)
     if close_paren == -1:
-        return ([], FunctionModifiers())
+        return ((), FunctionModifiers())
 
     args_content = arg_string[1:close_paren].strip()
     modifiers_str = arg_string[close_paren + 1 :]
@@ -426,18 +450,18 @@ def parse_arg_string(
         for arg in _split_arguments(args_content):
             parsed = _parse_single_argument(arg)
             if parsed[0] or parsed[1]:
-                arguments.append(parsed)
+                arguments.append(intern_argument(parsed))
 
     modifiers = _parse_modifiers(modifiers_str)
 
-    return (arguments, modifiers)
+    return (tuple(arguments), modifiers)
 
 
-def format_arguments(arguments: list[Argument]) -> str:
+def format_arguments(arguments: Sequence[Argument]) -> str:
     """Format a list of parsed arguments into a comma-separated string.
 
     Args:
-        arguments: list of (qualifiers, type, name, default_value) tuples as
+        arguments: sequence of (qualifiers, type, name, default_value) tuples as
             returned by parse_arg_string or _parse_single_argument.
 
     Returns:
@@ -457,9 +481,10 @@ def format_arguments(arguments: list[Argument]) -> str:
     return ", ".join(parts)
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_function_pointer_argstring(
     argstring: str,
-) -> list[Argument]:
+) -> tuple[Argument, ...]:
     """Parse a function pointer argstring of the form ')(args...)'.
 
     Doxygen represents function pointer arguments in the argstring field
@@ -470,10 +495,10 @@ def parse_function_pointer_argstring(
         argstring: Raw argstring from doxygen, e.g. ")(int x, float y)".
 
     Returns:
-        List of (qualifiers, type, name, default_value) tuples for each parameter.
+        Tuple of (qualifiers, type, name, default_value) tuples for each parameter.
     """
     if not argstring or not argstring.startswith(")("):
-        return []
+        return ()
     # Remove leading ')' to get '(args...)'
     inner = argstring[1:]
     arguments, _ = parse_arg_string(inner)
@@ -544,7 +569,7 @@ def parse_type_with_argstrings(
                 for arg in _split_arguments(stripped):
                     parsed = _parse_single_argument(arg)
                     if parsed[0] or parsed[1]:
-                        args.append(parsed)
+                        args.append(intern_argument(parsed))
 
             if args:
                 # Flush accumulated text as a plain segment
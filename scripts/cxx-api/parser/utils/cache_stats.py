@@ -0,0 +1,60 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Statistics of the memoized text parsing helpers.
+"""
+
+from __future__ import annotations
+
+from .argument_parsing import parse_arg_string, parse_function_pointer_argstring
+from .text_resolution import normalize_type_text
+
+_CACHED_FUNCTIONS = (
+    normalize_type_text,
+    parse_arg_string,
+    parse_function_pointer_argstring,
+)
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    """
+    Return the hits, misses and size of each parsing cache, keyed by the
+    name of the cached function. The caches are process-wide, so the stats
+    cover every view built so far.
+    """
+    stats = {}
+    for function in _CACHED_FUNCTIONS:
+        info = function.cache_info()
+        stats[function.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+        }
+    return stats
+
+
+def clear_caches() -> None:
+    """
+    Empty the parsing caches and reset their stats.
+    """
+    for function in _CACHED_FUNCTIONS:
+        function.cache_clear()
+
+
+def format_cache_stats() -> list[str]:
+    """
+    Format the cache stats as one human readable line per cache.
+    """
+    lines = []
+    for name, info in get_cache_stats().items():
+        lookups = info["hits"] + info["misses"]
+        hit_rate = info["hits"] / lookups if lookups else 0.0
+        lines.append(
+            f"{name}: {info['hits']} hits, {info['misses']} misses "
+            f"({hit_rate:.0%} hit rate), {info['size']}/{info['max_size']} entries"
+        )
+    return lines
@@ -9,11 +9,16 @@ Functions for resolving text content from Doxygen XML types.
 
 from __future__ import annotations
 
+import functools
 import re
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from enum import Enum
+from typing import NamedTuple
 
-from doxmlparser import compound
-
+from doxmlparser import compound, index
 
 # Doxygen's encoding for special characters in refids, ordered longest-first
 # to avoid partial matches during replacement.
@@ -30,6 +35,75 @@ _DOXYGEN_TEMPLATE_ENCODINGS = (
     ("_4", ">"),  # Template close
 )
 
+# Refid prefixes of the compounds whose names qualify the symbols they contain.
+_QUALIFYING_REFID_PREFIXES = ("namespace", "struct", "class", "union")
+
+
+class RefidTarget(NamedTuple):
+    """
+    The symbol a doxygen refid points to, as listed in index.xml.
+    """
+
+    qualified_name: str
+    kind: str
+    # Name of the compound that qualifies references to the symbol: the
+    # compound itself, or the compound that declares the member.
+    scope: str
+
+
+RefidIndex = dict[str, RefidTarget]
+
+_active_refid_index: ContextVar[RefidIndex | None] = ContextVar(
+    "active_refid_index", default=None
+)
+
+
+def build_refid_index(doxygen_index: index.DoxygenType) -> RefidIndex:
+    """
+    Build a refid -> RefidTarget mapping from a parsed index.xml.
+
+    Only namespaces, classes, structs and unions (and the members they
+    declare) are indexed, since these are the only compounds whose names
+    are used to qualify references. Members are only attributed to the
+    compound their refid is derived from, so members that index.xml also
+    lists under files, groups or outer classes resolve to their declaring
+    scope. A member refid is the refid of its compound and an anchor after
+    a final "_1", while the refid of a nested compound continues with
+    "_1_1", so only the part before the final "_1" is compared.
+    """
+    refid_index: RefidIndex = {}
+    for entry in doxygen_index.compound:
+        refid = entry.refid
+        if not refid.startswith(_QUALIFYING_REFID_PREFIXES):
+            continue
+
+        scope = sys.intern(entry.get_name())
+        refid_index[refid] = RefidTarget(scope, entry.kind, scope)
+
+        for member in entry.member:
+            if member.refid.rpartition("_1")[0] != refid:
+                continue
+            refid_index.setdefault(
+                member.refid,
+                RefidTarget(f"{scope}::{member.get_name()}", member.kind, scope),
+            )
+    return refid_index
+
+
+@contextmanager
+def use_refid_index(refid_index: RefidIndex) -> Iterator[None]:
+    """
+    Resolve refs through *refid_index* while the context is active.
+
+    The index is stored in a context variable, so snapshots built
+    concurrently in different threads each use their own index.
+    """
+    token = _active_refid_index.set(refid_index)
+    try:
+        yield
+    finally:
+        _active_refid_index.reset(token)
+
 
 def decode_doxygen_template_encoding(encoded: str) -> str:
     """Decode Doxygen's encoding for template specializations in refids.
@@ -137,6 +211,42 @@ def normalize_pointer_spacing(text: str) -> str:
     return text
 
 
+# Matches everything normalize_angle_brackets and normalize_nullability
+# rewrite. Both only remove whitespace next to angle brackets or replace
+# whole words, so they can be applied in a single pass, and neither
+# changes what normalize_pointer_spacing matches.
+_ANGLE_AND_NULLABILITY_PATTERN = re.compile(
+    r"(<)\s+|\s+(>)|(?:\b__|(?<!_)\b)(nonnull|nullable)\b"
+)
+
+_NULLABILITY_QUALIFIERS = {"nonnull": "_Nonnull", "nullable": "_Nullable"}
+
+
+def _replace_angle_or_nullability(match: re.Match) -> str:
+    qualifier = match.group(3)
+    if qualifier is not None:
+        return _NULLABILITY_QUALIFIERS[qualifier]
+    return match.group(1) or match.group(2)
+
+
+@functools.lru_cache(maxsize=16384)
+def normalize_type_text(text: str) -> str:
+    """Normalize a resolved type or initializer text.
+
+    Equivalent to applying normalize_angle_brackets, normalize_pointer_spacing
+    and normalize_nullability in turn, but rewrites the angle brackets and
+    nullability annotations in one pass, skips the rewrites that cannot
+    apply, and memoizes the result since the same texts recur across members.
+    """
+    if "<" in text or ">" in text or "null" in text:
+        text = _ANGLE_AND_NULLABILITY_PATTERN.sub(_replace_angle_or_nullability, text)
+    # The pointer spacing rules feed into each other, so they still run one
+    # after the other, but only when there is a pointer or reference.
+    if "*" in text or "&" in text:
+        text = normalize_pointer_spacing(text)
+    return sys.intern(text)
+
+
 class InitializerType(Enum):
     NONE = (0,)
     ASSIGNMENT = (1,)
@@ -155,10 +265,11 @@ def resolve_linked_text_name(
     in_string = False
 
     if hasattr(type_def, "content_") and type_def.content_:
+        parts = []
         for part in type_def.content_:
             if part.category == 1:  # MixedContainer.CategoryText
                 in_string = part.value.count('"') % 2 != in_string
-                name += part.value
+                parts.append(part.value)
             elif part.category == 3:  # MixedContainer.CategoryComplex (ref element)
                 # For ref elements, get the text content and fully qualify using refid
                 text = ""
@@ -175,7 +286,8 @@ def resolve_linked_text_name(
                 if refid and not in_string:
                     text = _qualify_text_with_refid(text, refid)
 
-                name += text
+                parts.append(text)
+        name = "".join(parts)
     elif type_def.ref:
         name = type_def.ref[0].get_valueOf_()
     else:
@@ -192,21 +304,38 @@ def resolve_linked_text_name(
             initialier_type = InitializerType.BRACE
             name = name[1:-1].strip()
 
-    return (
-        normalize_nullability(
-            normalize_pointer_spacing(normalize_angle_brackets(name.strip()))
-        ),
-        initialier_type,
-    )
+    return (normalize_type_text(name.strip()), initialier_type)
+
+
+def _resolve_refid_scope(refid: str) -> str:
+    """Return the name of the scope that qualifies references to *refid*.
+
+    Uses the active refid index when the refid is listed there, and falls
+    back to decoding the refid otherwise.
+    """
+    refid_index = _active_refid_index.get()
+    if refid_index is not None:
+        target = refid_index.get(refid)
+        if target is not None:
+            return target.scope
+    return extract_namespace_from_refid(refid)
 
 
 def _qualify_text_with_refid(text: str, refid: str) -> str:
-    """Qualify a text symbol using the namespace extracted from its doxygen refid.
+    """Qualify a text symbol using the namespace of its doxygen refid.
 
     For ref elements, doxygen provides a refid that encodes the fully qualified
-    path to the referenced symbol. This function extracts the namespace from
+    path to the referenced symbol. This function looks up the namespace of
     that refid and prepends it to the text, avoiding redundant qualification.
 
+    The namespace comes from the active refid index (see use_refid_index)
+    and is only decoded from the refid itself when the refid is not indexed.
+    Only the part of the namespace the text does not already spell out is
+    prepended, whichever way the namespace was found: the text of a ref to
+    a class is the name of the class, which is the last part of the scope
+    the index gives for it, and the text of a ref to a member may be
+    qualified by its class, e.g. "HighResDuration::zero".
+
     Args:
         text: The symbol text (e.g., "SyncCallback")
         refid: The doxygen refid (e.g., "classfacebook_1_1react_1_1SyncCallback...")
@@ -214,18 +343,18 @@ def _qualify_text_with_refid(text: str, refid: str) -> str:
     Returns:
         The qualified text (e.g., "facebook::react::SyncCallback")
     """
-    ns = extract_namespace_from_refid(refid)
+    ns = _resolve_refid_scope(refid)
 
     # Skip re-qualification if text is already globally qualified
     # (starts with "::") - it's already an absolute path
     if not ns or text.startswith(ns) or text.startswith("::"):
         return text
 
-    # The text may already start with a trailing portion of the namespace.
-    # For example ns="facebook::react::HighResDuration" and
-    # text="HighResDuration::zero". We need to find the longest suffix of ns
-    # that is a prefix of text (on a "::" boundary) and only prepend the
-    # missing part.
+    # The text may already start with a trailing portion of the namespace,
+    # also for indexed refids (see above). For example
+    # ns="facebook::react::HighResDuration" and text="HighResDuration::zero".
+    # We need to find the longest suffix of ns that is a prefix of text (on a
+    # "::" boundary) and only prepend the missing part.
     ns_parts = ns.split("::")
     prepend = ns
 
@@ -5,15 +5,21 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
-from .argument_parsing import _find_matching_angle, _split_arguments, Argument
+from .argument_parsing import (
+    _find_matching_angle,
+    _split_arguments,
+    Argument,
+    intern_argument,
+)
 
 if TYPE_CHECKING:
     from .scope import Scope
 
 
-def qualify_arguments(arguments: list[Argument], scope: Scope) -> list[Argument]:
+def qualify_arguments(arguments: Sequence[Argument], scope: Scope) -> list[Argument]:
     """Qualify type and default-value references in a list of arguments."""
     result: list[Argument] = []
     for qualifiers, arg_type, name, default in arguments:
@@ -22,7 +28,7 @@ def qualify_arguments(arguments: list[Argument], scope: Scope) -> list[Argument]
         if qualified_default is not None:
             default = qualified_default
 
-        result.append((qualifiers, qualified_type, name, default))
+        result.append(intern_argument((qualifiers, qualified_type, name, default)))
     return result
 
 
@@ -0,0 +1,135 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Report of the API differences between views.
+
+Every scope of a snapshot renders one block: the body of a class, enum,
+protocol, ... or the members of a namespace. Each view records the hash of
+the block of every scope, keyed by the qualified name of the scope. Scopes
+whose block has the same hash in every view are the same everywhere, and
+only the distinct blocks of the other scopes are split into lines and
+compared, so the report takes time in the number of distinct blocks rather
+than in the size of the snapshots.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections.abc import Iterator
+
+from .scope import NamespaceScopeKind, Scope
+from .snapshot import Snapshot
+
+
+def scope_blocks(snapshot: Snapshot) -> Iterator[tuple[str, str, str]]:
+    """
+    Get the qualified name, kind and rendered block of every scope of a
+    finished snapshot that renders anything.
+    """
+
+    def walk(scope: Scope) -> Iterator[tuple[str, str, str]]:
+        block = scope.kind.to_string(scope).strip("\n")
+        if block:
+            is_namespace = isinstance(scope.kind, NamespaceScopeKind)
+            yield (
+                scope.get_qualified_name() or "(global)",
+                "namespace members" if is_namespace else scope.kind.name,
+                block,
+            )
+        for inner_scope in scope.inner_scopes.values():
+            if inner_scope.name is not None:
+                yield from walk(inner_scope)
+
+    return walk(snapshot.root_scope)
+
+
+class VariantMatrix:
+    """
+    The block hashes of the scopes of the views of a run, collected while
+    the views are built.
+    """
+
+    def __init__(self) -> None:
+        # Qualified name -> view -> block hash.
+        self._hashes: dict[str, dict[str, str]] = {}
+        self._kinds: dict[str, str] = {}
+        self._blocks: dict[str, str] = {}
+        self._hash_of: dict[str, str] = {}
+        self._views: set[str] = set()
+        self._lock = threading.Lock()
+
+    def add_view(self, view: str, snapshot: Snapshot) -> None:
+        for name, kind, block in scope_blocks(snapshot):
+            with self._lock:
+                block_hash = self._hash_of.get(block)
+                if block_hash is None:
+                    block_hash = hashlib.sha256(block.encode()).hexdigest()
+                    self._hash_of[block] = block_hash
+                    self._blocks[block_hash] = block
+                self._hashes.setdefault(name, {})[view] = block_hash
+                self._kinds.setdefault(name, kind)
+        with self._lock:
+            self._views.add(view)
+
+    def report(self) -> str:
+        """
+        Get the scopes that differ between views: the views that contain
+        each of them, and the lines of their blocks that only some of these
+        views contain.
+        """
+        views = sorted(self._views)
+        lines_of: dict[str, set[str]] = {}
+        identical = 0
+        sections = []
+
+        for name in sorted(self._hashes):
+            hashes = self._hashes[name]
+            distinct = set(hashes.values())
+            if len(distinct) == 1 and len(hashes) == len(views):
+                identical += 1
+                continue
+
+            section = [f"{name} ({self._kinds[name]})"]
+            if len(hashes) < len(views):
+                section.append(f"  in: {', '.join(sorted(hashes))}")
+            if len(distinct) > 1:
+                views_of_block: dict[str, set[str]] = {}
+                for view, block_hash in hashes.items():
+                    views_of_block.setdefault(block_hash, set()).add(view)
+                # The views whose block contains each line.
+                views_of: dict[str, set[str]] = {}
+                for block_hash, block_views in views_of_block.items():
+                    if block_hash not in lines_of:
+                        lines_of[block_hash] = {
+                            line.strip()
+                            for line in self._blocks[block_hash].split("\n")
+                            if line.strip()
+                        }
+                    for line in lines_of[block_hash]:
+                        views_of.setdefault(line, set()).update(block_views)
+                by_views: dict[tuple[str, ...], list[str]] = {}
+                for line, line_views in views_of.items():
+                    if len(line_views) < len(hashes):
+                        by_views.setdefault(tuple(sorted(line_views)), []).append(line)
+                for line_views, differing in sorted(by_views.items()):
+                    section.append(f"  only in {', '.join(line_views)}:")
+                    section.extend(f"    {line}" for line in sorted(differing))
+            sections.append("\n".join(section))
+
+        header = (
+            f"{len(self._hashes)} scopes in {len(views)} views "
+            f"({', '.join(views)}), {identical} identical in all of them, "
+            f"{len(sections)} differing"
+        )
+        return "\n\n".join([header, *sections]) + "\n"
+
+    def write(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(self.report())
@@ -0,0 +1,347 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Watch mode: snapshots rebuilt from warm state as headers change.
+
+The parsed XML of every watched view and the members of its last snapshot,
+with their rendering, are kept in memory. Edits that leave the API
+fingerprint of a header unchanged don't run Doxygen at all. Other edits run
+Doxygen over the view again, like a normal run.
+
+With --doxygen-shards, the headers of the view are split into shards, and
+only the shards of the changed headers and of the headers that include
+them, directly or not, run Doxygen again. Such incremental snapshots may
+differ from the snapshot of a single run in the same ways as sharded
+snapshots do. The rebuild command runs Doxygen once over all the headers of
+each view from scratch, like a normal run, and reports any difference.
+"""
+
+from __future__ import annotations
+
+import difflib
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+from .config import ApiViewSnapshotConfig
+from .doxygen import run_doxygen
+from .doxygen_shards import list_input_files, run_doxygen_shards, split_into_shards
+from .fingerprints import api_fingerprint
+from .includes import IncludeGraph
+from .main import build_snapshot, ParsedXmlCache
+from .member_pool import MemberPool
+from .snapshot_file import write_snapshot
+
+# Lines of the snapshot diff printed when a rebuild differs.
+_MAX_DIFF_LINES = 200
+
+REBUILD_COMMAND = "r"
+QUIT_COMMAND = "q"
+
+
+def _read_header(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def _stat(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WatchedView:
+    """
+    The warm state of a watched view: the shards of its headers, their
+    parsed XML and the last snapshot.
+    """
+
+    def __init__(
+        self,
+        config: ApiViewSnapshotConfig,
+        react_native_dir: str,
+        output_dir: str,
+        work_dir: str,
+        shards: int,
+        codegen_dir: str | None = None,
+        input_filter: str | None = None,
+        run_shards: Callable[..., list[str]] = run_doxygen_shards,
+        run_unsharded: Callable[..., None] = run_doxygen,
+    ) -> None:
+        self.name = config.snapshot_name
+        self.config = config
+        self.react_native_dir = react_native_dir
+        self.output_dir = output_dir
+        self.work_dir = work_dir
+        self.shards = shards
+        self.include_directories = list(config.inputs)
+        if codegen_dir is not None:
+            self.include_directories.append(codegen_dir)
+        self.input_filter = input_filter
+        self._run_shards = run_shards
+        self._run_unsharded = run_unsharded
+
+        self.snapshot_string: str | None = None
+        self._shard_files: list[list[str]] = []
+        self._shard_of: dict[str, int] = {}
+        self._xml_dirs: list[str] = []
+        self._stats: dict[str, tuple[int, int] | None] = {}
+        self._sources: dict[str, str] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._includes: IncludeGraph | None = None
+        # Shards whose last run failed, run again with the next change.
+        self._failed_shards: set[int] = set()
+        self._xml_cache = ParsedXmlCache()
+        self._member_pool = MemberPool()
+
+    def log(self, message: str) -> None:
+        print(f"[{self.name}] {message}", flush=True)
+
+    def _run_doxygen_args(self) -> dict[str, object]:
+        return {
+            "working_dir": self.react_native_dir,
+            "exclude_patterns": self.config.exclude_patterns,
+            "definitions": self.config.definitions,
+            "input_filter": self.input_filter,
+            "verbose": False,
+            "label": self.name,
+        }
+
+    def _list_files(self) -> list[str]:
+        return list_input_files(
+            self.include_directories,
+            self.config.exclude_patterns,
+            os.path.join(self.react_native_dir, ".doxygen.config.template"),
+        )
+
+    def build(self) -> None:
+        """Split the headers of the view into shards and run all of them."""
+        start = time.monotonic()
+        files = self._list_files()
+        if not files:
+            raise RuntimeError(f"No input files found for {self.name}")
+        self._shard_files = split_into_shards(files, self.shards)
+        self._shard_of = {
+            path: i for i, shard in enumerate(self._shard_files) for path in shard
+        }
+        self._stats = {path: _stat(path) for path in files}
+        self._sources = {path: _read_header(path) for path in files}
+        self._fingerprints = {
+            path: api_fingerprint(source) for path, source in self._sources.items()
+        }
+        self._includes = IncludeGraph(self._sources)
+        self._failed_shards = set()
+        self._xml_cache = ParsedXmlCache()
+        self._member_pool = MemberPool()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+        self._run(range(len(self._shard_files)))
+        self.log(
+            f"Built from {len(files)} headers in {len(self._shard_files)} shards "
+            f"in {time.monotonic() - start:.1f}s"
+        )
+
+    def _run_single_shard(self) -> list[str]:
+        # The same Doxygen run as a normal run of the view.
+        output_dir = os.path.join(self.work_dir, "shard0")
+        shutil.rmtree(os.path.join(output_dir, "xml"), ignore_errors=True)
+        self._run_unsharded(
+            include_directories=self.include_directories,
+            output_dir=output_dir,
+            config_file=f".doxygen.config.{self.name}.generated",
+            **self._run_doxygen_args(),
+        )
+        return [os.path.join(output_dir, "xml")]
+
+    def _run(self, shards: Iterable[int]) -> None:
+        shards = set(shards) | self._failed_shards
+        try:
+            if len(self._shard_files) == 1:
+                self._xml_dirs = self._run_single_shard()
+            else:
+                self._xml_dirs = self._run_shards(
+                    shard_files=self._shard_files,
+                    output_dir=self.work_dir,
+                    shards_to_run=shards,
+                    **self._run_doxygen_args(),
+                )
+        except Exception:
+            self._failed_shards = shards
+            raise
+        self._failed_shards = set()
+        for i in shards:
+            self._xml_cache.invalidate(self._xml_dirs[i])
+
+        snapshot = build_snapshot(
+            self._xml_dirs,
+            exclude_symbols=self.config.exclude_symbols,
+            member_pool=self._member_pool,
+            xml_cache=self._xml_cache,
+        )
+        # Only the members of the last snapshot are reused.
+        self._member_pool.retain(snapshot)
+        self._write(snapshot.to_string())
+
+    def _write(self, snapshot_string: str) -> None:
+        if snapshot_string == self.snapshot_string:
+            self.log("Snapshot unchanged")
+            return
+        self.snapshot_string = snapshot_string
+        output_file = write_snapshot(self.name, snapshot_string, self.output_dir)
+        self.log(f"Wrote {output_file}")
+
+    def poll(self) -> list[str]:
+        """Get the headers that changed, were added or were removed."""
+        files = self._list_files()
+        changed = [path for path in files if _stat(path) != self._stats.get(path)]
+        changed.extend(sorted(set(self._stats).difference(files)))
+        return changed
+
+    def update(self, changed: list[str]) -> None:
+        """Rebuild the snapshot after *changed* headers changed."""
+        start = time.monotonic()
+        if any(
+            path not in self._stats
+            or self._stats[path] is None
+            or not os.path.exists(path)
+            for path in changed
+        ):
+            self.log("Headers were added or removed, rebuilding all shards")
+            self.build()
+            return
+
+        api_changed = []
+        for path in changed:
+            self._stats[path] = _stat(path)
+            source = _read_header(path)
+            fingerprint = api_fingerprint(source)
+            self._includes.update(path, source)
+            self._sources[path] = source
+            if fingerprint != self._fingerprints[path]:
+                self._fingerprints[path] = fingerprint
+                api_changed.append(path)
+
+        names = ", ".join(os.path.basename(path) for path in changed)
+        if not api_changed and not self._failed_shards:
+            self.log(f"No API changes in {names}")
+            return
+
+        shards = {
+            self._shard_of[path] for path in self._includes.dependents(api_changed)
+        }
+        self.log(
+            f"API of {names} changed, running {len(shards | self._failed_shards)} "
+            f"of {len(self._shard_files)} shards"
+        )
+        self._run(shards)
+        self.log(f"Updated in {time.monotonic() - start:.1f}s")
+
+    def rebuild(self) -> bool:
+        """
+        Build the snapshot from scratch with a single Doxygen run, like a
+        normal run, write it, and return whether it matches the incremental
+        snapshot.
+        """
+        start = time.monotonic()
+        output_dir = os.path.join(self.work_dir, "full")
+        shutil.rmtree(output_dir, ignore_errors=True)
+        self._run_unsharded(
+            include_directories=self.include_directories,
+            output_dir=output_dir,
+            config_file=f".doxygen.config.{self.name}.generated",
+            **self._run_doxygen_args(),
+        )
+        snapshot_string = build_snapshot(
+            os.path.join(output_dir, "xml"),
+            exclude_symbols=self.config.exclude_symbols,
+        ).to_string()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+        incremental = self.snapshot_string
+        self.log(f"Rebuilt from scratch in {time.monotonic() - start:.1f}s")
+        matches = incremental == snapshot_string
+        if matches:
+            self.log("The incremental snapshot matches the full rebuild")
+        else:
+            diff = list(
+                difflib.unified_diff(
+                    (incremental or "").splitlines(),
+                    snapshot_string.splitlines(),
+                    fromfile=f"{self.name} (incremental)",
+                    tofile=f"{self.name} (full rebuild)",
+                    lineterm="",
+                )
+            )
+            if len(diff) > _MAX_DIFF_LINES:
+                diff = diff[:_MAX_DIFF_LINES] + [
+                    f"... {len(diff) - _MAX_DIFF_LINES} more"
+                ]
+            self.log(
+                "The incremental snapshot differs from the full rebuild:\n"
+                + "\n".join(diff)
+            )
+        self._write(snapshot_string)
+        return matches
+
+
+def _read_commands(stream: TextIO, commands: queue.Queue[str]) -> None:
+    for line in stream:
+        commands.put(line.strip().lower())
+
+
+def watch(
+    views: list[WatchedView],
+    interval: float = 0.5,
+    stdin: TextIO | None = None,
+) -> None:
+    """
+    Build *views*, then rebuild them as their headers change until the quit
+    command is entered. Commands are read from *stdin*.
+    """
+    for view in views:
+        view.build()
+
+    commands: queue.Queue[str] = queue.Queue()
+    if stdin is not None:
+        threading.Thread(
+            target=_read_commands, args=(stdin, commands), daemon=True
+        ).start()
+    print(
+        f"Watching {len(views)} views. Enter '{REBUILD_COMMAND}' to rebuild "
+        f"from scratch and verify the incremental snapshots, '{QUIT_COMMAND}' "
+        "to quit.",
+        flush=True,
+    )
+
+    while True:
+        try:
+            command = commands.get(timeout=interval)
+        except queue.Empty:
+            command = None
+        if command == QUIT_COMMAND:
+            return
+
+        for view in views:
+            try:
+                if command == REBUILD_COMMAND:
+                    view.rebuild()
+                    continue
+                changed = view.poll()
+                if changed:
+                    view.update(changed)
+            except Exception as error:
+                # E.g. Doxygen failing on a header that is being edited. The
+                # failed shards run again with the next change.
+                view.log(
+                    "Error updating:\n" + "".join(traceback.format_exception(error))
+                )
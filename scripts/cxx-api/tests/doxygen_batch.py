@@ -0,0 +1,333 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Batched Doxygen runs for snapshot test cases.
+
+Starting Doxygen once per case dominates the run time of the snapshot
+tests. Instead, the headers of many cases are laid out side by side in one
+input tree, Doxygen runs once over all of them, and its XML is split back
+into one directory per case by the file each declaration is located in.
+
+Cases interfere when Doxygen merges their declarations, e.g. a class of the
+same name declared by two cases, or when it links a name in one case to a
+declaration of another. Such cases are reported as conflicts, to be
+generated in isolated runs instead.
+"""
+
+from __future__ import annotations
+
+import copy
+import shutil
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+# Compound kinds that only hold content of the compounds they contain, and
+# that Doxygen merges across all the files that contribute to them.
+_MERGED_KINDS = frozenset({"namespace"})
+
+# Compound kinds that describe the input tree rather than the API.
+_SKIPPED_KINDS = frozenset({"dir", "page"})
+
+ET.register_namespace("xsi", "http://www.w3.org/2001/XMLSchema-instance")
+
+# Location attributes naming a file a declaration comes from.
+_LOCATION_FILE_ATTRIBUTES = ("file", "declfile", "bodyfile")
+
+
+@dataclass
+class BatchSplit:
+    """The XML directory of every case, and why the other cases conflict."""
+
+    xml_dirs: dict[str, Path] = field(default_factory=dict)
+    conflicts: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _Compound:
+    refid: str
+    kind: str
+    name: str
+    tree: ET.ElementTree
+    # Cases of the compound itself, or of each member of merged compounds.
+    cases: set[str] = field(default_factory=set)
+    member_cases: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def compounddef(self) -> ET.Element:
+        return self.tree.getroot().find("compounddef")
+
+
+def lay_out_batch(case_dir_paths: list[Path], work_dir: Path) -> None:
+    """
+    Copy the headers of every case into its own directory under *work_dir*,
+    so that one Doxygen run over *work_dir* sees all of them.
+    """
+    for case_dir_path in case_dir_paths:
+        shutil.copytree(
+            case_dir_path,
+            work_dir / case_dir_path.name,
+            ignore=shutil.ignore_patterns("api", "snapshot.api"),
+        )
+
+
+def _case_of_file(path: str | None, case_names: frozenset[str]) -> str | None:
+    if not path:
+        return None
+    for part in reversed(PurePosixPath(path).parts[:-1]):
+        if part in case_names:
+            return part
+    return None
+
+
+def _cases_of_location(element: ET.Element, case_names: frozenset[str]) -> set[str]:
+    location = element.find("location")
+    if location is None:
+        return set()
+    cases = (
+        _case_of_file(location.get(attribute), case_names)
+        for attribute in _LOCATION_FILE_ATTRIBUTES
+    )
+    return {case for case in cases if case is not None}
+
+
+def _iter_memberdefs(compounddef: ET.Element):
+    for sectiondef in compounddef.iter("sectiondef"):
+        yield from sectiondef.findall("memberdef")
+
+
+class _BatchSplitter:
+    def __init__(self, xml_dir: Path, case_names: list[str]) -> None:
+        self.xml_dir = xml_dir
+        self.case_names = frozenset(case_names)
+        self.index = ET.parse(xml_dir / "index.xml")
+        self.compounds: dict[str, _Compound] = {}
+        self.conflicts: dict[str, str] = {}
+        # Refids of the compounds and members each case owns.
+        self.owned: dict[str, set[str]] = {case: set() for case in case_names}
+
+    def _conflict(self, cases: set[str], reason: str) -> None:
+        for case in sorted(cases):
+            self.conflicts.setdefault(case, reason)
+
+    def _load(self) -> None:
+        for entry in self.index.getroot().findall("compound"):
+            refid = entry.get("refid")
+            kind = entry.get("kind")
+            if kind in _SKIPPED_KINDS:
+                continue
+            path = self.xml_dir / f"{refid}.xml"
+            if not path.exists():
+                continue
+            self.compounds[refid] = _Compound(
+                refid=refid,
+                kind=kind,
+                name=entry.findtext("name", ""),
+                tree=ET.parse(path),
+            )
+
+    def _assign(self) -> None:
+        """Find the case of every compound, and of every namespace member."""
+        # Classes listed by the file compound of a case belong to that case,
+        # even when Doxygen merged them into a compound located elsewhere.
+        listed_by: dict[str, set[str]] = {}
+        for compound in self.compounds.values():
+            if compound.kind != "file":
+                continue
+            case = _case_of_file(
+                compound.compounddef.find("location").get("file"), self.case_names
+            )
+            if case is None:
+                continue
+            compound.cases.add(case)
+            for inner in compound.compounddef.findall("innerclass"):
+                listed_by.setdefault(inner.get("refid"), set()).add(case)
+
+        for compound in self.compounds.values():
+            compounddef = compound.compounddef
+            if compound.kind == "file":
+                pass
+            elif compound.kind in _MERGED_KINDS:
+                self._assign_members(compound)
+            else:
+                cases = _cases_of_location(compounddef, self.case_names)
+                cases |= listed_by.get(compound.refid, set())
+                for memberdef in _iter_memberdefs(compounddef):
+                    cases |= _cases_of_location(memberdef, self.case_names)
+                if len(cases) > 1:
+                    self._conflict(
+                        cases, f"{compound.name} is declared by several cases"
+                    )
+                compound.cases = cases
+
+            for case in compound.cases:
+                self.owned[case].add(compound.refid)
+
+    def _assign_members(self, compound: _Compound) -> None:
+        cases_by_name: dict[str, set[str]] = {}
+        for memberdef in _iter_memberdefs(compound.compounddef):
+            cases = _cases_of_location(memberdef, self.case_names)
+            name = memberdef.findtext("name", "")
+            if len(cases) > 1:
+                self._conflict(
+                    cases, f"{compound.name}::{name} is declared by several cases"
+                )
+            for case in cases:
+                ids = [memberdef.get("id")]
+                ids.extend(value.get("id") for value in memberdef.iter("enumvalue"))
+                for refid in ids:
+                    compound.member_cases[refid] = case
+                    self.owned[case].add(refid)
+                cases_by_name.setdefault(name, set()).add(case)
+
+        # Overloads and redeclarations across cases may have been merged or
+        # linked to each other.
+        for name, cases in cases_by_name.items():
+            if len(cases) > 1:
+                self._conflict(
+                    cases, f"{compound.name}::{name} is declared by several cases"
+                )
+
+    def _assign_namespaces(self) -> None:
+        """
+        A namespace is part of a case when the case declares anything in it,
+        directly or in a nested namespace, or its file compound lists it.
+        """
+        for compound in self.compounds.values():
+            if compound.kind == "file":
+                for case in compound.cases:
+                    for inner in compound.compounddef.findall("innernamespace"):
+                        self.owned[case].add(inner.get("refid"))
+
+        namespaces = [c for c in self.compounds.values() if c.kind in _MERGED_KINDS]
+        # Nested namespaces have longer names, so visiting them first
+        # propagates cases to every enclosing namespace.
+        for compound in sorted(namespaces, key=lambda c: -len(c.name)):
+            cases = set(compound.member_cases.values())
+            for inner in compound.compounddef.findall("innerclass") + (
+                compound.compounddef.findall("innernamespace")
+            ):
+                cases |= self._owners(inner.get("refid"))
+            for case in self.case_names:
+                if compound.refid in self.owned[case]:
+                    cases.add(case)
+            compound.cases = cases
+            for case in cases:
+                self.owned[case].add(compound.refid)
+
+    def _owners(self, refid: str) -> set[str]:
+        compound = self.compounds.get(refid)
+        return set(compound.cases) if compound is not None else set()
+
+    def _check_refs(self) -> None:
+        """Cases must only link to declarations of their own."""
+        member_owners: dict[str, str] = {}
+        for compound in self.compounds.values():
+            member_owners.update(compound.member_cases)
+
+        for compound in self.compounds.values():
+            if compound.kind == "file":
+                continue
+            if compound.kind in _MERGED_KINDS:
+                elements = [
+                    (compound.member_cases.get(memberdef.get("id")), memberdef)
+                    for memberdef in _iter_memberdefs(compound.compounddef)
+                ]
+            else:
+                elements = [(case, compound.compounddef) for case in compound.cases]
+
+            for case, element in elements:
+                if case is None or case in self.conflicts:
+                    continue
+                for ref in element.iter():
+                    refid = ref.get("refid")
+                    if refid is not None and not self._links_within(
+                        refid, case, member_owners
+                    ):
+                        self._conflict({case}, f"links to {refid} of another case")
+                        break
+
+    def _links_within(
+        self, refid: str, case: str, member_owners: dict[str, str]
+    ) -> bool:
+        if refid in member_owners:
+            return member_owners[refid] == case
+        if refid in self.compounds:
+            return refid in self.owned[case]
+        # Members of classes are not split, their refids start with the
+        # refid of their class.
+        compound_refid = refid.rsplit("_1", 1)[0]
+        if compound_refid in self.compounds:
+            return compound_refid in self.owned[case]
+        return True
+
+    def _write_case(self, case: str, output_dir: Path) -> None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        owned = self.owned[case]
+
+        index_root = copy.copy(self.index.getroot())
+        index_root[:] = []
+        for entry in self.index.getroot().findall("compound"):
+            compound = self.compounds.get(entry.get("refid"))
+            if compound is None or case not in compound.cases:
+                continue
+            entry = copy.deepcopy(entry)
+            if compound.kind in _MERGED_KINDS:
+                for member in entry.findall("member"):
+                    if member.get("refid") not in owned:
+                        entry.remove(member)
+            index_root.append(entry)
+            self._write_compound(compound, case, output_dir)
+
+        ET.ElementTree(index_root).write(
+            output_dir / "index.xml", encoding="UTF-8", xml_declaration=True
+        )
+
+    def _write_compound(self, compound: _Compound, case: str, output_dir: Path) -> None:
+        path = output_dir / f"{compound.refid}.xml"
+        if compound.kind not in _MERGED_KINDS:
+            shutil.copyfile(self.xml_dir / f"{compound.refid}.xml", path)
+            return
+
+        tree = copy.deepcopy(compound.tree)
+        compounddef = tree.getroot().find("compounddef")
+        owned = self.owned[case]
+        for inner in compounddef.findall("innerclass") + compounddef.findall(
+            "innernamespace"
+        ):
+            if inner.get("refid") not in owned:
+                compounddef.remove(inner)
+        for sectiondef in compounddef.findall("sectiondef"):
+            for memberdef in sectiondef.findall("memberdef"):
+                if compound.member_cases.get(memberdef.get("id")) != case:
+                    sectiondef.remove(memberdef)
+            if sectiondef.find("memberdef") is None:
+                compounddef.remove(sectiondef)
+        tree.write(path, encoding="UTF-8", xml_declaration=True)
+
+    def split(self, output_dir: Path) -> BatchSplit:
+        self._load()
+        self._assign()
+        self._assign_namespaces()
+        self._check_refs()
+
+        result = BatchSplit(conflicts=dict(self.conflicts))
+        for case in sorted(self.case_names - set(self.conflicts)):
+            case_output_dir = output_dir / case
+            self._write_case(case, case_output_dir)
+            result.xml_dirs[case] = case_output_dir
+        return result
+
+
+def split_batch_xml(
+    xml_dir: Path, case_names: list[str], output_dir: Path
+) -> BatchSplit:
+    """
+    Split the XML of a batched Doxygen run in *xml_dir* into one directory
+    per case under *output_dir*. Cases that interfere with another case of
+    the batch are reported as conflicts and get no directory.
+    """
+    return _BatchSplitter(xml_dir, case_names).split(output_dir)
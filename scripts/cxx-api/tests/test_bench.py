@@ -0,0 +1,128 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from ..bench import (
+    compare_to_baseline,
+    extract_fixture,
+    find_regressions,
+    read_manifest,
+    record_fixture,
+    run_benchmark,
+)
+from ..bench.runner import BenchmarkResult, STAGES, StageTiming
+from ..parser import build_snapshot
+
+_INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.16.1">
+  <compound refid="namespacefoo" kind="namespace"><name>foo</name></compound>
+</doxygenindex>
+"""
+
+_NAMESPACE_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygen version="1.16.1">
+  <compounddef id="namespacefoo" kind="namespace" language="C++">
+    <compoundname>foo</compoundname>
+    <sectiondef kind="func">
+      <memberdef kind="function" id="namespacefoo_1a0" prot="public"
+          static="no" const="no" explicit="no" inline="no" virt="non-virtual">
+        <type>int</type>
+        <definition>int foo::bar</definition>
+        <argsstring>(int x)</argsstring>
+        <name>bar</name>
+        <qualifiedname>foo::bar</qualifiedname>
+        <param><type>int</type><declname>x</declname></param>
+        <location file="foo.h" line="1"/>
+      </memberdef>
+    </sectiondef>
+    <location file="foo.h" line="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+def _timing(median_s: float) -> StageTiming:
+    return StageTiming(median_s=median_s, p95_s=median_s, min_s=median_s)
+
+
+def _result(**medians: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        fixture="fixture.tar.xz",
+        view="View",
+        xml_sha256="abc",
+        iterations=1,
+        warmup=0,
+        stages={stage: _timing(median) for stage, median in medians.items()},
+    )
+
+
+class TestBench(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.xml_dir = os.path.join(self._tmp.name, "xml")
+        os.makedirs(self.xml_dir)
+        for name, content in (
+            ("index.xml", _INDEX_XML),
+            ("namespacefoo.xml", _NAMESPACE_XML),
+        ):
+            with open(os.path.join(self.xml_dir, name), "w") as f:
+                f.write(content)
+        self.fixture = os.path.join(self._tmp.name, "fixture.tar.xz")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_fixture_round_trip(self):
+        record_fixture(self.xml_dir, self.fixture, "View", exclude_symbols=["Foo"])
+
+        manifest = read_manifest(self.fixture)
+        self.assertEqual(manifest.view, "View")
+        self.assertEqual(manifest.doxygen_version, "1.16.1")
+        self.assertEqual(manifest.exclude_symbols, ["Foo"])
+        self.assertEqual(manifest.files, 2)
+
+        extract_dir = os.path.join(self._tmp.name, "extracted")
+        _, xml_dir = extract_fixture(self.fixture, extract_dir)
+        self.assertEqual(
+            build_snapshot(xml_dir).to_string(),
+            build_snapshot(self.xml_dir).to_string(),
+        )
+
+    def test_run_times_every_stage(self):
+        record_fixture(self.xml_dir, self.fixture, "View")
+
+        result = run_benchmark(self.fixture, iterations=3, warmup=1)
+
+        self.assertEqual(tuple(result.stages), STAGES)
+        self.assertEqual(result.iterations, 3)
+        for timing in result.stages.values():
+            self.assertLessEqual(timing.min_s, timing.median_s)
+            self.assertLessEqual(timing.median_s, timing.p95_s)
+        self.assertEqual(BenchmarkResult.from_dict(result.to_dict()), result)
+
+    def test_regressions_need_ratio_and_absolute_delta(self):
+        baseline = _result(parse_xml=1.0, finish=0.5, exclusion_scan=0.00001)
+        current = _result(parse_xml=1.05, finish=0.7, exclusion_scan=0.00005)
+
+        regressions = find_regressions(
+            compare_to_baseline(current, baseline), threshold=0.1
+        )
+
+        self.assertEqual([r.stage for r in regressions], ["finish"])
+
+    def test_baseline_must_match_fixture(self):
+        baseline = _result(total=1.0)
+        baseline.xml_sha256 = "other"
+        with self.assertRaises(RuntimeError):
+            compare_to_baseline(_result(total=1.0), baseline)
+
+
+if __name__ == "__main__":
+    unittest.main()
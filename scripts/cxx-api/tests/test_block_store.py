@@ -0,0 +1,115 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.block_store import BlockStore
+from ..parser.snapshot_diff import _check_snapshots_impl
+from .utils import write_file
+
+
+class TestBlockStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.contents = {}
+        for units in (2, 3):
+            xml_dir = os.path.join(self.root, f"xml{units}")
+            generate(xml_dir, units=units, depth=1, overloads=2)
+            self.contents[f"Units{units}"] = (
+                "// @generated\n\n" + build_snapshot(xml_dir).to_string()
+            )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _store(self, name: str) -> BlockStore:
+        store = BlockStore(os.path.join(self.root, name))
+        for view, content in self.contents.items():
+            store.add_view(view, content)
+        return store
+
+    def _count_blocks(self, name: str) -> int:
+        blocks_dir = os.path.join(self.root, name, "blocks")
+        return sum(len(files) for _, _, files in os.walk(blocks_dir))
+
+    def test_views_round_trip_and_share_blocks(self):
+        self._store("store").write()
+
+        store = BlockStore(os.path.join(self.root, "store"))
+        for view, content in self.contents.items():
+            self.assertEqual(store.read_view(view), content)
+        manifests = [store.load_manifest(view) for view in self.contents]
+        self.assertEqual(
+            self._count_blocks("store"), len(set(manifests[0]) | set(manifests[1]))
+        )
+        self.assertLess(
+            self._count_blocks("store"), len(manifests[0]) + len(manifests[1])
+        )
+        self.assertIsNone(store.read_view("Missing"))
+
+    def test_unreferenced_blocks_are_removed(self):
+        self._store("store").write()
+        del self.contents["Units3"]
+        self.contents["Units2"] += "\n\nnamespace extra {\n}\n"
+        self._store("store").write()
+
+        store = BlockStore(os.path.join(self.root, "store"))
+        self.assertEqual(store.read_view("Units2"), self.contents["Units2"])
+        # Units3 keeps its manifest and blocks, the old blocks of Units2 go.
+        manifests = [store.load_manifest(view) for view in ("Units2", "Units3")]
+        self.assertEqual(
+            self._count_blocks("store"), len(set(manifests[0]) | set(manifests[1]))
+        )
+
+    def test_validation_diffs_the_blocks_of_the_committed_snapshots(self):
+        committed_dir = os.path.join(self.root, "committed")
+        generated_dir = os.path.join(self.root, "generated")
+        for view, content in self.contents.items():
+            write_file(os.path.join(committed_dir, f"{view}Cxx.api"), content)
+        # A committed store that is out of date is not what is validated.
+        self._store("store").write()
+
+        changed = {
+            view: content.replace("makeWidget0", "makeGadget0")
+            for view, content in self.contents.items()
+        }
+        generated = BlockStore(None)
+        for view, content in changed.items():
+            write_file(os.path.join(generated_dir, f"{view}Cxx.api"), content)
+            generated.add_view(view, content)
+
+        out = io.StringIO()
+        passed = _check_snapshots_impl(generated_dir, committed_dir, out, generated)
+
+        self.assertFalse(passed)
+        output = out.getvalue()
+        self.assertIn("FAIL: Units2Cxx.api differs from committed snapshot", output)
+        self.assertIn("FAIL: Units3Cxx.api differs from committed snapshot", output)
+        self.assertIn("@@@ block 8 -> block 8 @@@", output)
+        self.assertIn("+std::unique_ptr<facebook::react::Widget0> ", output)
+        self.assertIn("::makeGadget0(", output)
+        # Blocks that match are not diffed.
+        self.assertNotIn("makeWidget1(", output)
+
+        # The committed snapshots changed, but not the committed store.
+        for view, content in changed.items():
+            write_file(os.path.join(committed_dir, f"{view}Cxx.api"), content)
+        out = io.StringIO()
+        self.assertTrue(
+            _check_snapshots_impl(generated_dir, committed_dir, out, BlockStore(None))
+        )
+        self.assertIn("OK: Units2Cxx.api matches committed snapshot", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
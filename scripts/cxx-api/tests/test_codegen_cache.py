@@ -0,0 +1,115 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ..parser import codegen_cache
+from ..parser.codegen_cache import (
+    cached_codegen_output,
+    codegen_cache_key,
+    codegen_input_files,
+)
+from .utils import write_file
+
+
+class TestCodegenCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.package_dir = os.path.join(self.root, "react-native")
+        write_file(
+            os.path.join(self.package_dir, "package.json"),
+            json.dumps({"codegenConfig": {"libraries": [{"jsSrcsDir": "src"}]}}),
+        )
+        write_file(os.path.join(self.package_dir, "src", "NativeFoo.js"), "spec")
+        write_file(os.path.join(self.package_dir, "src", "Foo.js"), "not a spec")
+        write_file(
+            os.path.join(self.package_dir, "src", "__tests__", "NativeFoo-test.js"),
+            "test",
+        )
+        write_file(
+            os.path.join(self.package_dir, "scripts", "generate-codegen-artifacts.js"),
+            "script",
+        )
+        write_file(
+            os.path.join(self.package_dir, "scripts", "codegen", "executor.js"), "exec"
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_input_files(self):
+        files = [
+            os.path.relpath(path, self.package_dir)
+            for path in codegen_input_files(self.package_dir)
+        ]
+        self.assertEqual(
+            files,
+            [
+                "package.json",
+                os.path.join("src", "NativeFoo.js"),
+                os.path.join("scripts", "generate-codegen-artifacts.js"),
+                os.path.join("scripts", "codegen", "executor.js"),
+            ],
+        )
+
+    def test_key_depends_on_specs_scripts_and_platform(self):
+        key = codegen_cache_key(self.package_dir, "ios")
+        self.assertNotEqual(key, codegen_cache_key(self.package_dir, "android"))
+
+        write_file(os.path.join(self.package_dir, "src", "Foo.js"), "changed")
+        self.assertEqual(key, codegen_cache_key(self.package_dir, "ios"))
+
+        write_file(os.path.join(self.package_dir, "src", "NativeFoo.js"), "changed")
+        spec_key = codegen_cache_key(self.package_dir, "ios")
+        self.assertNotEqual(key, spec_key)
+
+        write_file(
+            os.path.join(self.package_dir, "scripts", "codegen", "executor.js"),
+            "changed",
+        )
+        self.assertNotEqual(spec_key, codegen_cache_key(self.package_dir, "ios"))
+
+    def test_cached_output_is_generated_once(self):
+        cache_dir = os.path.join(self.root, "cache")
+        generate = mock.Mock(
+            side_effect=lambda output: write_file(os.path.join(output, "Spec.h"), "h")
+        )
+
+        first, first_cached = cached_codegen_output(cache_dir, "key", generate)
+        second, second_cached = cached_codegen_output(cache_dir, "key", generate)
+
+        self.assertEqual((first_cached, second_cached), (False, True))
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 1)
+        self.assertTrue(os.path.exists(os.path.join(first, "Spec.h")))
+        self.assertEqual(os.listdir(cache_dir), ["key"])
+
+    def test_failed_generation_is_not_cached(self):
+        cache_dir = os.path.join(self.root, "cache")
+        generate = mock.Mock(side_effect=RuntimeError("Codegen failed"))
+
+        with self.assertRaises(RuntimeError):
+            cached_codegen_output(cache_dir, "key", generate)
+        self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_old_entries_are_pruned(self):
+        cache_dir = os.path.join(self.root, "cache")
+        with mock.patch.object(codegen_cache, "MAX_CACHE_ENTRIES", 3):
+            for i in range(5):
+                cached_codegen_output(cache_dir, f"key{i}", lambda output: None)
+                # Make the modification times of the entries distinct.
+                os.utime(os.path.join(cache_dir, f"key{i}"), (i, i))
+        self.assertEqual(sorted(os.listdir(cache_dir)), ["key2", "key3", "key4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
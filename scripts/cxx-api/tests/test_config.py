@@ -74,6 +74,31 @@ class TestParseConfig(unittest.TestCase):
         release = next(r for r in result if r.snapshot_name == "ReactCommonRelease")
         self.assertEqual(release.definitions, {"NDEBUG": 1})
 
+    def test_variants_record_their_view_name(self):
+        """Every variant remembers the view it was expanded from"""
+        config = {
+            "platforms": {
+                "ReactCommon": {
+                    "inputs": [],
+                    "variants": {
+                        "debug": {"definitions": {"DEBUG": 1}},
+                        "release": {"definitions": {"NDEBUG": 1}},
+                    },
+                },
+                "ReactAndroid": {"inputs": []},
+            }
+        }
+        result = parse_config(config, "/base/dir")
+
+        self.assertEqual(
+            {r.snapshot_name: r.view_name for r in result},
+            {
+                "ReactCommonDebug": "ReactCommon",
+                "ReactCommonRelease": "ReactCommon",
+                "ReactAndroid": "ReactAndroid",
+            },
+        )
+
     # =========================================================================
     # Definition merging
     # =========================================================================
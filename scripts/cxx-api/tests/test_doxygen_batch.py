@@ -0,0 +1,231 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..parser import build_snapshot
+from .doxygen_batch import lay_out_batch, split_batch_xml
+
+_HEADER = "<?xml version='1.0' encoding='UTF-8' standalone='no'?>\n"
+
+
+def _struct(refid: str, name: str, case: str, members: str = "") -> str:
+    sections = (
+        f'<sectiondef kind="public-attrib">{members}</sectiondef>' if members else ""
+    )
+    return f"""{_HEADER}<doxygen version="1.16.1">
+  <compounddef id="{refid}" kind="struct" language="C++" prot="public">
+    <compoundname>{name}</compoundname>
+    {sections}
+    <location file="{case}/test.h" line="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+def _field(refid: str, name: str, case: str) -> str:
+    return f"""
+      <memberdef kind="variable" id="{refid}" prot="public" static="no"
+          mutable="no">
+        <type>int</type>
+        <definition>int {name}</definition>
+        <argsstring></argsstring>
+        <name>{name}</name>
+        <location file="{case}/test.h" line="2"/>
+      </memberdef>"""
+
+
+def _function(refid: str, name: str, case: str, param_type: str) -> str:
+    return f"""
+      <memberdef kind="function" id="{refid}" prot="public" static="no"
+          const="no" explicit="no" inline="no" virt="non-virtual">
+        <type>void</type>
+        <definition>void facebook::react::{name}</definition>
+        <argsstring>({param_type} value)</argsstring>
+        <name>{name}</name>
+        <param><type>{param_type}</type><declname>value</declname></param>
+        <location file="{case}/test.h" line="3"/>
+      </memberdef>"""
+
+
+def _ref(refid: str, name: str) -> str:
+    return f'<ref refid="{refid}" kindref="compound">{name}</ref>'
+
+
+def _file(refid: str, case: str, innerclasses: list[str]) -> str:
+    inner = "".join(
+        f'<innerclass refid="{refid}" prot="public">x</innerclass>'
+        for refid in innerclasses
+    )
+    return f"""{_HEADER}<doxygen version="1.16.1">
+  <compounddef id="{refid}" kind="file" language="C++">
+    <compoundname>test.h</compoundname>
+    {inner}
+    <innernamespace refid="namespacefacebook">facebook</innernamespace>
+    <innernamespace refid="namespacefacebook_1_1react">facebook::react</innernamespace>
+    <location file="{case}/test.h"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+def _namespace(refid: str, name: str, members: str, inner: str = "") -> str:
+    sections = f'<sectiondef kind="func">{members}</sectiondef>' if members else ""
+    return f"""{_HEADER}<doxygen version="1.16.1">
+  <compounddef id="{refid}" kind="namespace" language="C++">
+    <compoundname>{name}</compoundname>
+    {inner}
+    {sections}
+    <location file="case_a/test.h" line="1"/>
+  </compounddef>
+</doxygen>
+"""
+
+
+def _write_batch(xml_dir: Path, files: dict[str, str], index: str) -> None:
+    xml_dir.mkdir(parents=True)
+    (xml_dir / "index.xml").write_text(
+        f'{_HEADER}<doxygenindex version="1.16.1">{index}</doxygenindex>\n'
+    )
+    for name, content in files.items():
+        (xml_dir / f"{name}.xml").write_text(content)
+
+
+class TestDoxygenBatch(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.xml_dir = self.root / "api" / "xml"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _split(self, case_names: list[str]):
+        return split_batch_xml(self.xml_dir, case_names, self.root / "cases")
+
+    def test_split_builds_each_case_separately(self):
+        foo = "structfacebook_1_1react_1_1Foo"
+        bar = "structfacebook_1_1react_1_1Bar"
+        react = "namespacefacebook_1_1react"
+        _write_batch(
+            self.xml_dir,
+            {
+                foo: _struct(
+                    foo,
+                    "facebook::react::Foo",
+                    "case_a",
+                    _field(f"{foo}_1a0", "x", "case_a"),
+                ),
+                bar: _struct(bar, "facebook::react::Bar", "case_b"),
+                "case__a_2test_8h": _file("case__a_2test_8h", "case_a", [foo]),
+                "case__b_2test_8h": _file("case__b_2test_8h", "case_b", [bar]),
+                "namespacefacebook": _namespace(
+                    "namespacefacebook",
+                    "facebook",
+                    "",
+                    f'<innernamespace refid="{react}">facebook::react</innernamespace>',
+                ),
+                react: _namespace(
+                    react,
+                    "facebook::react",
+                    _function(f"{react}_1a1", "useFoo", "case_a", _ref(foo, "Foo"))
+                    + _function(f"{react}_1a2", "useInt", "case_b", "int"),
+                    f'<innerclass refid="{foo}" prot="public">facebook::react::Foo</innerclass>'
+                    f'<innerclass refid="{bar}" prot="public">facebook::react::Bar</innerclass>',
+                ),
+            },
+            f"""
+  <compound refid="{foo}" kind="struct"><name>facebook::react::Foo</name>
+    <member refid="{foo}_1a0" kind="variable"><name>x</name></member></compound>
+  <compound refid="{bar}" kind="struct"><name>facebook::react::Bar</name></compound>
+  <compound refid="case__a_2test_8h" kind="file"><name>test.h</name></compound>
+  <compound refid="case__b_2test_8h" kind="file"><name>test.h</name></compound>
+  <compound refid="namespacefacebook" kind="namespace"><name>facebook</name></compound>
+  <compound refid="{react}" kind="namespace"><name>facebook::react</name>
+    <member refid="{react}_1a1" kind="function"><name>useFoo</name></member>
+    <member refid="{react}_1a2" kind="function"><name>useInt</name></member></compound>
+  <compound refid="dir_1" kind="dir"><name>case_a</name></compound>
+""",
+        )
+
+        split = self._split(["case_a", "case_b"])
+
+        self.assertEqual(split.conflicts, {})
+        self.assertEqual(
+            build_snapshot(str(split.xml_dirs["case_a"])).to_string(),
+            "void facebook::react::useFoo(facebook::react::Foo value);\n\n"
+            "struct facebook::react::Foo {\n  public int x;\n}",
+        )
+        self.assertEqual(
+            build_snapshot(str(split.xml_dirs["case_b"])).to_string(),
+            "void facebook::react::useInt(int value);\n\n"
+            "struct facebook::react::Bar {\n}",
+        )
+
+    def test_same_class_in_two_cases_conflicts(self):
+        dup = "structDup"
+        _write_batch(
+            self.xml_dir,
+            {
+                dup: _struct(dup, "Dup", "case_a", _field(f"{dup}_1a0", "y", "case_b")),
+                "case__c_2test_8h": _file("case__c_2test_8h", "case_c", []),
+            },
+            f"""
+  <compound refid="{dup}" kind="struct"><name>Dup</name></compound>
+  <compound refid="case__c_2test_8h" kind="file"><name>test.h</name></compound>
+""",
+        )
+
+        split = self._split(["case_a", "case_b", "case_c"])
+
+        self.assertEqual(sorted(split.conflicts), ["case_a", "case_b"])
+        self.assertEqual(list(split.xml_dirs), ["case_c"])
+
+    def test_link_to_another_case_conflicts(self):
+        foo = "structFoo"
+        react = "namespacefacebook_1_1react"
+        _write_batch(
+            self.xml_dir,
+            {
+                foo: _struct(foo, "Foo", "case_a"),
+                react: _namespace(
+                    react,
+                    "facebook::react",
+                    _function(f"{react}_1a1", "useFoo", "case_b", _ref(foo, "Foo")),
+                ),
+            },
+            f"""
+  <compound refid="{foo}" kind="struct"><name>Foo</name></compound>
+  <compound refid="{react}" kind="namespace"><name>facebook::react</name>
+    <member refid="{react}_1a1" kind="function"><name>useFoo</name></member></compound>
+""",
+        )
+
+        split = self._split(["case_a", "case_b"])
+
+        self.assertEqual(list(split.conflicts), ["case_b"])
+        self.assertIn(foo, split.conflicts["case_b"])
+        self.assertEqual(list(split.xml_dirs), ["case_a"])
+
+    def test_lay_out_batch_copies_headers_only(self):
+        case_dir = self.root / "snapshots" / "case_a"
+        (case_dir / "api" / "xml").mkdir(parents=True)
+        (case_dir / "test.h").write_text("struct A {};\n")
+        (case_dir / "snapshot.api").write_text("struct A {\n}\n")
+
+        work_dir = self.root / "batch"
+        lay_out_batch([case_dir], work_dir)
+
+        self.assertEqual(
+            sorted(p.name for p in (work_dir / "case_a").iterdir()), ["test.h"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
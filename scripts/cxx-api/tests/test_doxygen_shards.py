@@ -0,0 +1,213 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.doxygen import get_doxygen_bin, run_doxygen
+from ..parser.doxygen_shards import (
+    check_shard_equivalence,
+    get_default_doxygen_config_template,
+    list_input_files,
+    run_doxygen_shards,
+    ShardMismatchError,
+    split_into_shards,
+)
+from .utils import write_file
+
+_MACROS = """#pragma once
+
+#define RN_GETTER(name) \\
+  int name() const;
+
+namespace facebook::react {
+using Tag = int;
+} // namespace facebook::react
+"""
+
+_USER = """#pragma once
+
+#include <a/Macros.h>
+
+namespace facebook::react {
+class User {
+ public:
+  RN_GETTER(count)
+  Tag tag;
+};
+} // namespace facebook::react
+"""
+
+
+def _write_cross_shard_headers(root: str) -> list[list[str]]:
+    macros = os.path.join(root, "src", "a", "Macros.h")
+    user = os.path.join(root, "src", "b", "User.h")
+    write_file(macros, _MACROS)
+    write_file(user, _USER)
+    return [[macros], [user]]
+
+
+class TestDoxygenShards(unittest.TestCase):
+    def test_input_files_apply_patterns(self):
+        with tempfile.TemporaryDirectory() as root:
+            for path in (
+                "react/renderer/core/ShadowNode.h",
+                "react/renderer/core/ShadowNode.cpp",
+                "react/renderer/core/tests/ShadowNodeTest.h",
+                "react/renderer/platform/ios/Platform.h",
+                "jsi/jsi.h",
+            ):
+                write_file(os.path.join(root, path))
+
+            files = list_input_files(
+                [os.path.join(root, "react"), os.path.join(root, "jsi", "jsi.h")],
+                ["*/platform/ios/*"],
+            )
+
+            self.assertEqual(
+                [os.path.relpath(path, root) for path in files],
+                [
+                    os.path.join("react", "renderer", "core", "ShadowNode.h"),
+                    os.path.join("jsi", "jsi.h"),
+                ],
+            )
+
+    def test_input_files_follow_the_template(self):
+        with tempfile.TemporaryDirectory() as root:
+            for path in ("a/A.h", "a/A.hpp", "a/gen/B.h", "a/samples/C.hpp"):
+                write_file(os.path.join(root, path))
+            template = os.path.join(root, ".doxygen.config.template")
+            with open(template, "w") as f:
+                f.write(
+                    "FILE_PATTERNS          = *.h \\\n"
+                    "                         *.hpp\n"
+                    "EXCLUDE_PATTERNS       = */gen/* \\ ${EXCLUDE_PATTERNS}\n"
+                )
+
+            files = list_input_files([os.path.join(root, "a")], [], template)
+
+            self.assertEqual(
+                [os.path.relpath(path, root) for path in files],
+                [
+                    os.path.join("a", "A.h"),
+                    os.path.join("a", "A.hpp"),
+                    os.path.join("a", "samples", "C.hpp"),
+                ],
+            )
+
+    def test_shards_keep_directories_together(self):
+        with tempfile.TemporaryDirectory() as root:
+            files = []
+            for directory, sizes in (
+                ("core", [500, 400]),
+                ("graphics", [600]),
+                ("mounting", [200, 100]),
+                ("jsi", [250]),
+            ):
+                for i, size in enumerate(sizes):
+                    path = os.path.join(root, directory, f"Header{i}.h")
+                    write_file(path, "x" * size)
+                    files.append(path)
+
+            shards = split_into_shards(files, 2)
+            directories = [
+                sorted({os.path.basename(os.path.dirname(path)) for path in shard})
+                for shard in shards
+            ]
+
+            self.assertEqual(directories, [["core", "jsi"], ["graphics", "mounting"]])
+            self.assertEqual(len(split_into_shards(files, 10)), 4)
+
+    def test_build_snapshot_merges_shards(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # The XML of the smaller run is a subset of the larger one, like
+            # the namespaces and members Doxygen may emit in several shards.
+            small, large = os.path.join(tmp, "small"), os.path.join(tmp, "large")
+            generate(small, units=2, depth=1, overloads=2)
+            generate(large, units=4, depth=1, overloads=2)
+
+            self.assertEqual(
+                build_snapshot([small, large]).to_string(),
+                build_snapshot(large).to_string(),
+            )
+
+    def test_shards_get_the_include_path_of_other_shards(self):
+        with tempfile.TemporaryDirectory() as root:
+            shard_files = _write_cross_shard_headers(root)
+            settings = {}
+
+            def run(include_directories, extra_settings, **kwargs):
+                settings.setdefault(tuple(include_directories), []).append(
+                    extra_settings
+                )
+
+            run_doxygen_shards(
+                root,
+                shard_files,
+                [],
+                {},
+                verbose=False,
+                output_dir=os.path.join(root, "api"),
+                run=run,
+            )
+
+            macros, user = (tuple(files) for files in shard_files)
+            include_path = '"{}"'.format(os.path.join(root, "src"))
+            self.assertEqual(
+                [s.get("INCLUDE_PATH") for s in settings[user]],
+                [include_path, include_path],
+            )
+            self.assertEqual(
+                [s.get("INCLUDE_PATH") for s in settings[macros]], [None, None]
+            )
+
+    @unittest.skipUnless(shutil.which(get_doxygen_bin()), "Doxygen is not installed")
+    def test_cross_shard_macros_and_typedefs_are_expanded(self):
+        with tempfile.TemporaryDirectory() as root:
+            shard_files = _write_cross_shard_headers(root)
+            shutil.copy(
+                get_default_doxygen_config_template(),
+                os.path.join(root, ".doxygen.config.template"),
+            )
+
+            run_doxygen(
+                root,
+                [os.path.join(root, "src")],
+                [],
+                {},
+                verbose=False,
+                output_dir=os.path.join(root, "unsharded"),
+            )
+            xml_dirs = run_doxygen_shards(
+                root,
+                shard_files,
+                [],
+                {},
+                verbose=False,
+                output_dir=os.path.join(root, "sharded"),
+            )
+
+            unsharded = build_snapshot(os.path.join(root, "unsharded", "xml"))
+            sharded = build_snapshot(xml_dirs)
+            self.assertIn("count", unsharded.to_string())
+            check_shard_equivalence(
+                unsharded.to_string(), sharded.to_string(), "CrossShard"
+            )
+
+    def test_equivalence_check_reports_diff(self):
+        check_shard_equivalence("a\nb", "a\nb", "ReactCommonDebug")
+        with self.assertRaises(ShardMismatchError) as context:
+            check_shard_equivalence("a\nb", "a\nc", "ReactCommonDebug")
+        self.assertIn("-b\n+c", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
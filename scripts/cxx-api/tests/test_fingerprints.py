@@ -0,0 +1,182 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import unittest
+
+from ..parser.config import ApiViewSnapshotConfig
+from ..parser.fingerprints import (
+    api_fingerprint,
+    FingerprintCache,
+    get_frontend_sources,
+    load_fingerprints,
+    view_fingerprints,
+    with_snapshot_hashes,
+    write_fingerprints,
+)
+from .utils import write_file
+
+_HEADER = """
+#pragma once
+
+namespace facebook::react {
+
+/** Docs */
+class Foo : public Bar {
+ public:
+  Foo(int x) : x_(x) { init(); }
+  int get() const { return x_; } // comment
+  static constexpr auto kName = "foo";
+  std::function<void()> callback = []() { return; };
+
+ private:
+  int x_;
+  void helper() {}
+  using Alias = int;
+};
+
+} // namespace facebook::react
+"""
+
+
+class TestApiFingerprint(unittest.TestCase):
+    def assertSameApi(self, old: str, new: str) -> None:
+        self.assertEqual(
+            api_fingerprint(_HEADER), api_fingerprint(_HEADER.replace(old, new))
+        )
+
+    def assertDifferentApi(self, old: str, new: str) -> None:
+        self.assertNotEqual(
+            api_fingerprint(_HEADER), api_fingerprint(_HEADER.replace(old, new))
+        )
+
+    def test_edits_outside_the_api_keep_the_fingerprint(self) -> None:
+        self.assertSameApi("/** Docs */", "/** Other docs */")
+        self.assertSameApi("// comment", "")
+        self.assertSameApi("return x_;", "return x_ + 1;")
+        self.assertSameApi("init();", "init(); more();")
+        self.assertSameApi("int x_;", "int x_; int y_;")
+        self.assertSameApi("void helper() {}", "void helper(int) {}")
+
+    def test_edits_of_the_api_change_the_fingerprint(self) -> None:
+        self.assertDifferentApi("int get() const", "long get() const")
+        self.assertDifferentApi('"foo"', '"bar"')
+        self.assertDifferentApi("{ return; }", "{ return 1; }")
+        # Doxygen reports private typedefs.
+        self.assertDifferentApi("using Alias = int;", "using Alias = long;")
+        # Doxygen commands in comments change what Doxygen extracts.
+        self.assertDifferentApi("/** Docs */", "/** @cond */")
+        self.assertDifferentApi("#pragma once", "#ifdef DEBUG")
+
+    def test_access_specifiers_after_directives_and_macros(self) -> None:
+        for separator in ("#pragma mark -\n", "MACRO(Foo)\n"):
+            source = (
+                "class Foo {\n int x_;\n"
+                + separator
+                + " public:\n  void start();\n  void finish(int a);\n};\n"
+            )
+            self.assertNotEqual(
+                api_fingerprint(source),
+                api_fingerprint(source.replace("int a", "int a, int b")),
+                separator,
+            )
+
+    def test_unbalanced_headers_are_hashed_whole(self) -> None:
+        source = "#ifdef A\nnamespace a {\n#else\nnamespace b {\n#endif\n"
+        source += "inline int f() { return %d; }\n}\n"
+
+        self.assertNotEqual(api_fingerprint(source % 1), api_fingerprint(source % 2))
+
+
+class TestViewFingerprints(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.header = os.path.join(self.root, "src", "Foo.h")
+        os.makedirs(os.path.dirname(self.header))
+        with open(self.header, "w") as f:
+            f.write(_HEADER)
+        self.config = ApiViewSnapshotConfig(
+            snapshot_name="TestDebug",
+            inputs=[os.path.join(self.root, "src")],
+            exclude_patterns=[],
+            definitions={"DEBUG": 1},
+        )
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_fingerprints_are_stored_next_to_the_snapshots(self) -> None:
+        cache_path = os.path.join(self.root, "cache.json")
+        cache = FingerprintCache(cache_path)
+        fingerprints = view_fingerprints(self.config, self.root, "env", cache)
+        cache.save()
+
+        self.assertEqual(
+            fingerprints["headers"], {"src/Foo.h": api_fingerprint(_HEADER)}
+        )
+        self.assertEqual(
+            FingerprintCache(cache_path).entries,
+            {self.header: cache.entries[self.header]},
+        )
+
+        snapshot_dir = os.path.join(self.root, "snapshots")
+        os.makedirs(snapshot_dir)
+        with open(os.path.join(snapshot_dir, "TestDebugCxx.api"), "w") as f:
+            f.write("class Foo {\n}\n")
+        stored = with_snapshot_hashes(
+            {"TestDebug": fingerprints, "TestRelease": fingerprints}, snapshot_dir
+        )
+        self.assertEqual(
+            stored["TestDebug"]["snapshot"],
+            hashlib.sha256(b"class Foo {\n}\n").hexdigest(),
+        )
+        self.assertIsNone(stored["TestRelease"]["snapshot"])
+
+        write_fingerprints(snapshot_dir, {"TestDebug": stored["TestDebug"]})
+        write_fingerprints(snapshot_dir, {"TestRelease": stored["TestRelease"]})
+        self.assertEqual(load_fingerprints(snapshot_dir), stored)
+        self.assertTrue(
+            os.path.exists(os.path.join(snapshot_dir, ".fingerprints.json"))
+        )
+
+    def test_environment_and_config_change_the_fingerprints(self) -> None:
+        cache = FingerprintCache()
+        fingerprints = view_fingerprints(self.config, self.root, "env", cache)
+        self.config.definitions["DEBUG"] = 0
+
+        self.assertNotEqual(
+            view_fingerprints(self.config, self.root, "env", cache)["environment"],
+            fingerprints["environment"],
+        )
+        self.assertNotEqual(
+            view_fingerprints(self.config, self.root, "other", cache)["environment"],
+            view_fingerprints(self.config, self.root, "env", cache)["environment"],
+        )
+
+    def test_frontend_sources(self) -> None:
+        parser_dir = os.path.join(self.root, "parser")
+        for path in ("main.py", "tree_sitter_frontend/frontend.py", "README.md"):
+            write_file(os.path.join(parser_dir, path))
+
+        self.assertEqual(
+            get_frontend_sources(parser_dir, "doxygen"),
+            [os.path.join(parser_dir, "main.py")],
+        )
+        self.assertEqual(
+            get_frontend_sources(parser_dir, "tree-sitter"),
+            [
+                os.path.join(parser_dir, "main.py"),
+                os.path.join(parser_dir, "tree_sitter_frontend", "frontend.py"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import unittest
+
+from ..parser.includes import IncludeGraph
+
+
+class TestIncludeGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = IncludeGraph(
+            {
+                "/src/a/A.h": "",
+                "/src/b/B.h": '#include "a/A.h"\n',
+                "/src/c/C.h": "#include <b/B.h>\n",
+                "/src/d/D.h": '#include "other/A.h"\n',
+            }
+        )
+
+    def test_dependents_include_indirect_includers(self):
+        self.assertEqual(
+            self.graph.dependents(["/src/a/A.h"]),
+            {"/src/a/A.h", "/src/b/B.h", "/src/c/C.h"},
+        )
+
+        self.graph.update("/src/c/C.h", "")
+        self.assertEqual(self.graph.dependents(["/src/b/B.h"]), {"/src/b/B.h"})
+
+    def test_dependencies_include_indirect_includes(self):
+        self.assertEqual(
+            self.graph.dependencies(["/src/c/C.h"]),
+            {"/src/a/A.h", "/src/b/B.h", "/src/c/C.h"},
+        )
+        self.assertEqual(self.graph.dependencies(["/src/d/D.h"]), {"/src/d/D.h"})
+
+    def test_include_path_covers_other_headers(self):
+        self.assertEqual(self.graph.include_path(["/src/c/C.h"]), {"/src"})
+        self.assertEqual(
+            self.graph.include_path(["/src/a/A.h", "/src/b/B.h", "/src/c/C.h"]),
+            set(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import unittest
+
+from ..parser.member import FrozenMemberError, FunctionMember, VariableMember
+from ..parser.member_pool import MemberPool
+from ..parser.scope import StructLikeScopeKind
+from ..parser.snapshot import Snapshot
+
+
+def _make_variant(extra_member: bool = False) -> Snapshot:
+    snapshot = Snapshot()
+    snapshot.create_or_get_namespace("facebook")
+    snapshot.create_or_get_namespace("facebook::react")
+    scope = snapshot.create_struct_like(
+        "facebook::react::Foo", StructLikeScopeKind.Type.CLASS
+    )
+    scope.add_member(
+        FunctionMember(
+            name="doStuff",
+            type="int",
+            visibility="public",
+            arg_string="(const Foo &other, int count) const",
+            is_virtual=False,
+            is_pure_virtual=False,
+            is_static=False,
+        )
+    )
+    if extra_member:
+        scope.add_member(
+            VariableMember(
+                name="debugOnly",
+                type="bool",
+                visibility="public",
+                is_const=False,
+                is_static=False,
+                is_constexpr=False,
+                is_mutable=False,
+                value=None,
+                definition="bool debugOnly",
+            )
+        )
+    snapshot.finish()
+    return snapshot
+
+
+def _members(snapshot: Snapshot) -> list:
+    foo = snapshot.root_scope.inner_scopes["facebook"].inner_scopes["react"]
+    return foo.inner_scopes["Foo"].get_members()
+
+
+class TestMemberPool(unittest.TestCase):
+    def test_identical_members_are_shared(self) -> None:
+        pool = MemberPool()
+        debug = _make_variant(extra_member=True)
+        release = _make_variant()
+        pool.share(debug)
+        pool.share(release)
+
+        self.assertIs(_members(debug)[0], _members(release)[0])
+        self.assertEqual(pool.stats.members, 3)
+        self.assertEqual(pool.stats.shared_members, 1)
+
+    def test_sharing_preserves_rendering(self) -> None:
+        expected = _make_variant(extra_member=True).to_string()
+
+        pool = MemberPool()
+        pool.share(_make_variant())
+        shared = _make_variant(extra_member=True)
+        pool.share(shared)
+
+        self.assertEqual(shared.to_string(), expected)
+
+    def test_differing_members_are_kept_apart(self) -> None:
+        pool = MemberPool()
+        debug = _make_variant()
+        release = _make_variant()
+        _members(release)[0].is_static = True
+        pool.share(debug)
+        pool.share(release)
+
+        self.assertIsNot(_members(debug)[0], _members(release)[0])
+        self.assertIn("static", release.to_string())
+        self.assertNotIn("static", debug.to_string())
+
+    def test_retain_drops_the_members_of_other_snapshots(self) -> None:
+        pool = MemberPool()
+        debug = _make_variant(extra_member=True)
+        pool.share(debug)
+        release = _make_variant()
+        pool.share(release)
+
+        pool.retain(release)
+        again = _make_variant(extra_member=True)
+        pool.share(again)
+
+        members = {member.name: member for member in _members(again)}
+        self.assertIs(members["doStuff"], _members(release)[0])
+        debug_members = {member.name: member for member in _members(debug)}
+        self.assertIsNot(members["debugOnly"], debug_members["debugOnly"])
+
+    def test_pooled_members_cannot_be_modified(self) -> None:
+        pool = MemberPool()
+        snapshot = _make_variant()
+        pool.share(snapshot)
+
+        member = _members(snapshot)[0]
+        with self.assertRaises(FrozenMemberError):
+            member.is_static = True
+        self.assertFalse(member.is_static)
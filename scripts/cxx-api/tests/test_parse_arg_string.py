@@ -5,8 +5,10 @@
 
 """Unit tests for parse_arg_string()"""
 
+import dataclasses
 import unittest
 
+from ..parser.member import FunctionMember
 from ..parser.utils.argument_parsing import parse_arg_string
 
 
@@ -20,22 +22,22 @@ class TestParseArgString(unittest.TestCase):
     def test_empty_args(self):
         """Empty parentheses"""
         args, mods = parse_arg_string("()")
-        self.assertEqual(args, [])
+        self.assertEqual(args, ())
 
     def test_single_simple_arg(self):
         """Single argument: int x"""
         args, mods = parse_arg_string("(int x)")
-        self.assertEqual(args, [(None, "int", "x", None)])
+        self.assertEqual(args, ((None, "int", "x", None),))
 
     def test_multiple_simple_args(self):
         """Multiple arguments: int x, float y"""
         args, mods = parse_arg_string("(int x, float y)")
-        self.assertEqual(args, [(None, "int", "x", None), (None, "float", "y", None)])
+        self.assertEqual(args, ((None, "int", "x", None), (None, "float", "y", None)))
 
     def test_void_arg(self):
         """void with no name"""
         args, mods = parse_arg_string("(void)")
-        self.assertEqual(args, [(None, "void", None, None)])
+        self.assertEqual(args, ((None, "void", None, None),))
 
     # =========================================================================
     # Modifiers: const, override, final
@@ -155,20 +157,20 @@ class TestParseArgString(unittest.TestCase):
     def test_std_map(self):
         """std::map<K, V> with comma inside template"""
         args, mods = parse_arg_string("(std::map<std::string, int> m)")
-        self.assertEqual(args, [(None, "std::map<std::string, int>", "m", None)])
+        self.assertEqual(args, ((None, "std::map<std::string, int>", "m", None),))
 
     def test_std_unordered_map_nested(self):
         """std::unordered_map<K, std::vector<V>>"""
         args, mods = parse_arg_string("(std::unordered_map<K, std::vector<V>> m)")
         self.assertEqual(
-            args, [(None, "std::unordered_map<K, std::vector<V>>", "m", None)]
+            args, ((None, "std::unordered_map<K, std::vector<V>>", "m", None),)
         )
 
     def test_std_tuple(self):
         """std::tuple<int, float, std::string>"""
         args, mods = parse_arg_string("(std::tuple<int, float, std::string> t)")
         self.assertEqual(
-            args, [(None, "std::tuple<int, float, std::string>", "t", None)]
+            args, ((None, "std::tuple<int, float, std::string>", "t", None),)
         )
 
     def test_deeply_nested_templates(self):
@@ -178,7 +180,7 @@ class TestParseArgString(unittest.TestCase):
         )
         self.assertEqual(
             args,
-            [(None, "std::vector<std::vector<std::pair<int, int>>>", "v", None)],
+            ((None, "std::vector<std::vector<std::pair<int, int>>>", "v", None),),
         )
 
     # =========================================================================
@@ -188,12 +190,12 @@ class TestParseArgString(unittest.TestCase):
     def test_std_function_simple(self):
         """std::function<void()>"""
         args, mods = parse_arg_string("(std::function<void()> f)")
-        self.assertEqual(args, [(None, "std::function<void()>", "f", None)])
+        self.assertEqual(args, ((None, "std::function<void()>", "f", None),))
 
     def test_std_function_with_args(self):
         """std::function<int(int, int)>"""
         args, mods = parse_arg_string("(std::function<int(int, int)> f)")
-        self.assertEqual(args, [(None, "std::function<int(int, int)>", "f", None)])
+        self.assertEqual(args, ((None, "std::function<int(int, int)>", "f", None),))
 
     def test_std_function_complex(self):
         """std::function<void(const std::string&, size_t)>"""
@@ -202,14 +204,14 @@ class TestParseArgString(unittest.TestCase):
         )
         self.assertEqual(
             args,
-            [
+            (
                 (
                     None,
                     "std::function<void(const std::string&, size_t)>",
                     "callback",
                     None,
-                )
-            ],
+                ),
+            ),
         )
 
     def test_multiple_std_function_args(self):
@@ -219,17 +221,17 @@ class TestParseArgString(unittest.TestCase):
         )
         self.assertEqual(
             args,
-            [
+            (
                 (None, "std::function<int(int)>", "f", None),
                 (None, "std::function<void(A, B)>", "g", None),
-            ],
+            ),
         )
 
     def test_map_with_function_value(self):
         """std::map<K, std::function<void(A, B)>>"""
         args, mods = parse_arg_string("(std::map<K, std::function<void(A, B)>> m)")
         self.assertEqual(
-            args, [(None, "std::map<K, std::function<void(A, B)>>", "m", None)]
+            args, ((None, "std::map<K, std::function<void(A, B)>>", "m", None),)
         )
 
     # =========================================================================
@@ -239,19 +241,19 @@ class TestParseArgString(unittest.TestCase):
     def test_function_pointer_simple(self):
         """int (*callback)(int, int)"""
         args, mods = parse_arg_string("(int (*callback)(int, int))")
-        self.assertEqual(args, [(None, "int (*)(int, int)", "callback", None)])
+        self.assertEqual(args, ((None, "int (*)(int, int)", "callback", None),))
 
     def test_function_pointer_void(self):
         """void (*handler)(const char*, size_t)"""
         args, mods = parse_arg_string("(void (*handler)(const char*, size_t))")
         self.assertEqual(
-            args, [(None, "void (*)(const char*, size_t)", "handler", None)]
+            args, ((None, "void (*)(const char*, size_t)", "handler", None),)
         )
 
     def test_function_pointer_no_args(self):
         """void (*fn)()"""
         args, mods = parse_arg_string("(void (*fn)())")
-        self.assertEqual(args, [(None, "void (*)()", "fn", None)])
+        self.assertEqual(args, ((None, "void (*)()", "fn", None),))
 
     # =========================================================================
     # Pointer to member function
@@ -260,13 +262,13 @@ class TestParseArgString(unittest.TestCase):
     def test_pointer_to_member(self):
         """void (Class::*method)(int, int)"""
         args, mods = parse_arg_string("(void (Class::*method)(int, int))")
-        self.assertEqual(args, [(None, "void (Class::*)(int, int)", "method", None)])
+        self.assertEqual(args, ((None, "void (Class::*)(int, int)", "method", None),))
 
     def test_pointer_to_member_const(self):
         """int (Foo::*getter)() const - note: const after () is part of member fn signature"""
         args, mods = parse_arg_string("(int (Foo::*getter)() const)")
         # The "const" here is part of the argument type, not a method modifier
-        self.assertEqual(args, [(None, "int (Foo::*)() const", "getter", None)])
+        self.assertEqual(args, ((None, "int (Foo::*)() const", "getter", None),))
 
     # =========================================================================
     # Reference to array / pointer to array
@@ -275,12 +277,12 @@ class TestParseArgString(unittest.TestCase):
     def test_reference_to_array(self):
         """int (&arr)[10]"""
         args, mods = parse_arg_string("(int (&arr)[10])")
-        self.assertEqual(args, [(None, "int (&)[10]", "arr", None)])
+        self.assertEqual(args, ((None, "int (&)[10]", "arr", None),))
 
     def test_pointer_to_array(self):
         """int (*arr)[10]"""
         args, mods = parse_arg_string("(int (*arr)[10])")
-        self.assertEqual(args, [(None, "int (*)[10]", "arr", None)])
+        self.assertEqual(args, ((None, "int (*)[10]", "arr", None),))
 
     # =========================================================================
     # Default arguments
@@ -289,35 +291,35 @@ class TestParseArgString(unittest.TestCase):
     def test_default_int(self):
         """int x = 5"""
         args, mods = parse_arg_string("(int x = 5)")
-        self.assertEqual(args, [(None, "int", "x", "5")])
+        self.assertEqual(args, ((None, "int", "x", "5"),))
 
     def test_default_string(self):
         """std::string s = "default\" """
         args, mods = parse_arg_string('(std::string s = "default")')
-        self.assertEqual(args, [(None, "std::string", "s", '"default"')])
+        self.assertEqual(args, ((None, "std::string", "s", '"default"'),))
 
     def test_default_nullptr(self):
         """std::function<void()> f = nullptr"""
         args, mods = parse_arg_string("(std::function<void()> f = nullptr)")
-        self.assertEqual(args, [(None, "std::function<void()>", "f", "nullptr")])
+        self.assertEqual(args, ((None, "std::function<void()>", "f", "nullptr"),))
 
     def test_default_brace_initializer(self):
         """std::vector<int> v = {1, 2, 3}"""
         args, mods = parse_arg_string("(std::vector<int> v = {1, 2, 3})")
-        self.assertEqual(args, [(None, "std::vector<int>", "v", "{1, 2, 3}")])
+        self.assertEqual(args, ((None, "std::vector<int>", "v", "{1, 2, 3}"),))
 
     def test_multiple_defaults(self):
         """int x = 5, std::string s = "test\" """
         args, mods = parse_arg_string('(int x = 5, std::string s = "test")')
         self.assertEqual(
             args,
-            [(None, "int", "x", "5"), (None, "std::string", "s", '"test"')],
+            ((None, "int", "x", "5"), (None, "std::string", "s", '"test"')),
         )
 
     def test_default_template_with_comma(self):
         """std::map<int, int> m = {}"""
         args, mods = parse_arg_string("(std::map<int, int> m = {})")
-        self.assertEqual(args, [(None, "std::map<int, int>", "m", "{}")])
+        self.assertEqual(args, ((None, "std::map<int, int>", "m", "{}"),))
 
     # =========================================================================
     # Complex CV-qualifiers
@@ -326,17 +328,17 @@ class TestParseArgString(unittest.TestCase):
     def test_const_ref(self):
         """const std::string& s"""
         args, mods = parse_arg_string("(const std::string& s)")
-        self.assertEqual(args, [("const", "std::string&", "s", None)])
+        self.assertEqual(args, (("const", "std::string&", "s", None),))
 
     def test_const_ptr_const_ref(self):
         """const int* const& ptr"""
         args, mods = parse_arg_string("(const int* const& ptr)")
-        self.assertEqual(args, [("const", "int* const&", "ptr", None)])
+        self.assertEqual(args, (("const", "int* const&", "ptr", None),))
 
     def test_shared_ptr_const(self):
         """const std::shared_ptr<const Foo>& p"""
         args, mods = parse_arg_string("(const std::shared_ptr<const Foo>& p)")
-        self.assertEqual(args, [("const", "std::shared_ptr<const Foo>&", "p", None)])
+        self.assertEqual(args, (("const", "std::shared_ptr<const Foo>&", "p", None),))
 
     # =========================================================================
     # Mixed complex cases
@@ -349,10 +351,10 @@ class TestParseArgString(unittest.TestCase):
         )
         self.assertEqual(
             args,
-            [
+            (
                 (None, "std::map<K, V>", "m", None),
                 (None, "std::function<void(A, B)>", "f", None),
-            ],
+            ),
         )
         self.assertTrue(mods.is_const)
         self.assertTrue(mods.is_override)
@@ -365,10 +367,10 @@ class TestParseArgString(unittest.TestCase):
         )
         self.assertEqual(
             args,
-            [
+            (
                 ("const", "std::vector<int>&", "v", None),
                 (None, "std::function<int(int, int)>", "f", "nullptr"),
-            ],
+            ),
         )
         self.assertTrue(mods.is_const)
         self.assertTrue(mods.is_noexcept)
@@ -389,17 +391,44 @@ class TestParseArgString(unittest.TestCase):
         args, mods = parse_arg_string(
             "(bool facebook::react::PerformanceTracer::isTracing)"
         )
-        self.assertEqual(args, [(None, "bool", "isTracing", None)])
+        self.assertEqual(args, ((None, "bool", "isTracing", None),))
 
     def test_qualified_parameter_name_simple(self):
         """Simple qualified parameter name: test::Foo::value"""
         args, mods = parse_arg_string("(int test::Foo::value)")
-        self.assertEqual(args, [(None, "int", "value", None)])
+        self.assertEqual(args, ((None, "int", "value", None),))
 
     def test_unqualified_parameter_name_unchanged(self):
         """Regular parameter names without '::' should not be affected."""
         args, mods = parse_arg_string("(bool isActive)")
-        self.assertEqual(args, [(None, "bool", "isActive", None)])
+        self.assertEqual(args, ((None, "bool", "isActive", None),))
+
+    # =========================================================================
+    # Memoization
+    # =========================================================================
+
+    def test_results_are_shared(self):
+        """Repeated argument strings return the same immutable result"""
+        first = parse_arg_string("(jsi::Runtime& rt) const")
+        second = parse_arg_string("(jsi::Runtime& rt) const")
+        self.assertIs(first, second)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            first[1].is_const = False
+
+    def test_pure_virtual_does_not_change_shared_modifiers(self):
+        """Functions marked pure virtual by doxygen copy the shared modifiers"""
+        function = FunctionMember(
+            name="run",
+            type="void",
+            visibility="public",
+            arg_string="() const",
+            is_virtual=True,
+            is_pure_virtual=True,
+            is_static=False,
+        )
+        self.assertTrue(function.modifiers.is_pure_virtual)
+        self.assertTrue(function.modifiers.is_const)
+        self.assertFalse(parse_arg_string("() const")[1].is_pure_virtual)
 
 
 if __name__ == "__main__":
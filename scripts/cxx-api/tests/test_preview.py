@@ -0,0 +1,97 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.config import ApiViewSnapshotConfig
+from ..parser.preview import find_views_of_header, preview_header, prune_to_file
+from .utils import write_file
+
+_UNIT_HEADER = "/synthetic/ReactCommon/react/unit0/Unit{}.h"
+
+
+class TestPreview(unittest.TestCase):
+    def test_prune_keeps_the_declarations_of_the_file(self):
+        with tempfile.TemporaryDirectory() as xml_dir:
+            generate(xml_dir, units=4, depth=1, overloads=1)
+            full = build_snapshot(xml_dir).to_string()
+            snapshot = build_snapshot(xml_dir)
+
+            prune_to_file(
+                snapshot, xml_dir, lambda file: file == _UNIT_HEADER.format(2)
+            )
+
+        lines = snapshot.to_string().split("\n")
+        self.assertIn(
+            "class facebook::react::Widget2 : public facebook::react::WidgetBase2 {",
+            lines,
+        )
+        self.assertIn(
+            "std::unique_ptr<facebook::react::Widget2> facebook::react::makeWidget2("
+            "const facebook::react::Widget2& other, facebook::react::Mode2 mode);",
+            lines,
+        )
+        self.assertFalse(any("Widget0" in line or "Widget1" in line for line in lines))
+        # Pruned lines render as in the snapshot of all the files.
+        self.assertTrue(set(lines).issubset(full.split("\n")))
+
+    def test_doxygen_runs_over_the_header_and_its_includes(self):
+        with tempfile.TemporaryDirectory() as root:
+            headers = {
+                name: os.path.join(root, "src", name.lower(), f"{name}.h")
+                for name in ("A", "B", "C")
+            }
+            codegen_header = os.path.join(root, "codegen", "gen", "Props.h")
+            write_file(headers["A"], "")
+            write_file(headers["B"], '#include "a/A.h"\n#include <gen/Props.h>\n')
+            write_file(headers["C"], "")
+            write_file(codegen_header, "")
+            write_file(
+                os.path.join(root, ".doxygen.config.template"),
+                "FILE_PATTERNS = *.h\n",
+            )
+            config = ApiViewSnapshotConfig(
+                snapshot_name="TestDebug",
+                inputs=[os.path.join(root, "src")],
+                exclude_patterns=[],
+                definitions={"DEBUG": 1},
+            )
+            inputs = []
+
+            def run(include_directories, output_dir, definitions, **kwargs):
+                inputs.extend(include_directories)
+                self.assertEqual(definitions, {"DEBUG": 1})
+                generate(os.path.join(output_dir, "xml"), units=1, depth=1)
+
+            self.assertEqual(
+                find_views_of_header(
+                    headers["B"],
+                    [config],
+                    os.path.join(root, ".doxygen.config.template"),
+                ),
+                [config],
+            )
+            preview = preview_header(
+                headers["B"],
+                config,
+                react_native_dir=root,
+                work_dir=os.path.join(root, "work"),
+                codegen_dir=os.path.join(root, "codegen"),
+                run=run,
+            )
+
+        self.assertEqual(inputs, [codegen_header, headers["A"], headers["B"]])
+        # None of the generated declarations are located in B.h.
+        self.assertEqual(preview, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+import threading
+import time
+import unittest
+
+from ..parser.processes import ProcessCancelledError, ProcessGroup
+from ..parser.profiling import Profiler
+
+
+class TestProcessGroup(unittest.TestCase):
+    def test_streams_prefixed_stderr(self):
+        processes = ProcessGroup(stream_stderr=True)
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            result = processes.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import sys; print('out'); print('a\\nb', file=sys.stderr)",
+                ],
+                prefix="[ReactCommonDebug] ",
+            )
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, "out\n")
+        self.assertEqual(result.stderr, "a\nb\n")
+        self.assertEqual(
+            stderr.getvalue(), "[ReactCommonDebug] a\n[ReactCommonDebug] b\n"
+        )
+
+    def test_records_child_usage_in_phase(self):
+        with Profiler().phase("View", "doxygen") as phase:
+            result = ProcessGroup().run([sys.executable, "-c", "pass"], phase=phase)
+        self.assertEqual(result.returncode, 0)
+        self.assertGreater(phase.child_max_rss_mib, 0)
+
+    def test_takes_peak_rss_per_thread(self):
+        processes = ProcessGroup()
+        processes.run([sys.executable, "-c", "b = b'x' * 64 * 1024 * 1024"])
+        other_thread = []
+        thread = threading.Thread(
+            target=lambda: other_thread.append(processes.take_max_rss_mib())
+        )
+        thread.start()
+        thread.join()
+
+        self.assertEqual(other_thread, [0.0])
+        self.assertGreater(processes.take_max_rss_mib(), 64)
+        self.assertEqual(processes.take_max_rss_mib(), 0.0)
+
+    def test_cancel_kills_running_processes(self):
+        processes = ProcessGroup()
+        errors = []
+
+        def run():
+            try:
+                processes.run([sys.executable, "-c", "import time; time.sleep(30)"])
+            except ProcessCancelledError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        start = time.monotonic()
+        thread.start()
+        while not processes._running:
+            time.sleep(0.01)
+        processes.cancel()
+        thread.join(10)
+
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(len(errors), 1)
+        with self.assertRaises(ProcessCancelledError):
+            processes.run([sys.executable, "-c", "pass"])
+
+
+if __name__ == "__main__":
+    unittest.main()
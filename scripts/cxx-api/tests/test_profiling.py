@@ -0,0 +1,113 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from ..parser.profiling import (
+    profile_phase,
+    PROFILE_SUMMARY_FILE,
+    PROFILE_TRACE_FILE,
+    Profiler,
+)
+
+
+class TestProfiler(unittest.TestCase):
+    def test_summary_groups_phases_by_view(self):
+        profiler = Profiler()
+        with profiler.phase("ViewA", "parse_xml") as phase:
+            phase.count("compounds", 3)
+        with profiler.phase("ViewA", "finish") as phase:
+            phase.count("members", 7)
+        with profiler.phase("ViewB", "parse_xml"):
+            pass
+
+        summary = profiler.summary(cache_stats={"cache": {"hits": 1}})
+
+        self.assertEqual(set(summary["views"]), {"ViewA", "ViewB"})
+        view = summary["views"]["ViewA"]
+        self.assertEqual(list(view["phases"]), ["parse_xml", "finish"])
+        self.assertEqual(view["counts"], {"compounds": 3, "members": 7})
+        self.assertGreater(view["phases"]["finish"]["max_rss_mib"], 0)
+        self.assertEqual(summary["caches"], {"cache": {"hits": 1}})
+
+    def test_summary_adds_up_repeated_phases(self):
+        profiler = Profiler()
+        for files in (2, 3):
+            with profiler.phase("ViewA", "doxygen") as phase:
+                phase.count("files", files)
+
+        summary = profiler.summary()
+
+        view = summary["views"]["ViewA"]
+        doxygen = view["phases"]["doxygen"]
+        self.assertEqual(doxygen["runs"], 2)
+        self.assertEqual(doxygen["counts"], {"files": 5})
+        self.assertEqual(view["counts"], {"files": 5})
+        self.assertEqual(view["wall_s"], doxygen["wall_s"])
+        self.assertGreater(doxygen["wall_s"], 0)
+
+    def test_views_get_their_own_trace_rows(self):
+        profiler = Profiler()
+        with profiler.phase("ViewA", "doxygen"):
+            pass
+        with profiler.phase("ViewB", "doxygen"):
+            pass
+        with profiler.phase("ViewA", "to_string"):
+            pass
+
+        events = profiler.trace_events()
+        names = {e["tid"]: e["args"]["name"] for e in events if e["ph"] == "M"}
+        self.assertEqual(sorted(names.values()), ["ViewA", "ViewB"])
+        complete = [e for e in events if e["ph"] == "X"]
+        self.assertEqual(
+            [(names[e["tid"]], e["name"]) for e in complete],
+            [("ViewA", "doxygen"), ("ViewB", "doxygen"), ("ViewA", "to_string")],
+        )
+
+    def test_phase_runs_and_measures_subprocesses(self):
+        profiler = Profiler()
+        with profiler.phase("View", "doxygen") as phase:
+            result = phase.run(
+                [sys.executable, "-c", "import sys; print('out'); sys.exit(3)"],
+                capture_output=True,
+                text=True,
+            )
+
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stdout, "out\n")
+        self.assertEqual(result.stderr, "")
+        self.assertGreater(phase.child_max_rss_mib, 0)
+        self.assertIn("child_cpu_s", phase.to_dict())
+
+    def test_unprofiled_phase_still_runs_subprocesses(self):
+        with profile_phase(None, "doxygen") as phase:
+            phase.count("files", 1)
+            result = phase.run([sys.executable, "-c", "pass"])
+        self.assertEqual(result.returncode, 0)
+
+    def test_write_emits_summary_and_trace(self):
+        profiler = Profiler()
+        with profiler.view("View").phase("write"):
+            pass
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler.write(output_dir)
+            with open(os.path.join(output_dir, PROFILE_SUMMARY_FILE)) as f:
+                summary = json.load(f)
+            with open(os.path.join(output_dir, PROFILE_TRACE_FILE)) as f:
+                trace = json.load(f)
+
+        self.assertIn("write", summary["views"]["View"]["phases"])
+        self.assertEqual(len(trace["traceEvents"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import unittest
+
+from doxmlparser import index
+
+from ..parser.utils import build_refid_index, RefidTarget, use_refid_index
+from ..parser.utils.text_resolution import _qualify_text_with_refid
+
+_INDEX_XML = """<?xml version='1.0' encoding='UTF-8' standalone='no'?>
+<doxygenindex version="1.16.1">
+  <compound refid="namespacefacebook_1_1react" kind="namespace">
+    <name>facebook::react</name>
+    <member refid="namespacefacebook_1_1react_1a0123" kind="function">
+      <name>makeFoo</name>
+    </member>
+  </compound>
+  <compound refid="classfacebook_1_1react_1_1_sync_callback" kind="class">
+    <name>facebook::react::SyncCallback</name>
+    <member refid="classfacebook_1_1react_1_1_sync_callback_1a4567" kind="typedef">
+      <name>Result</name>
+    </member>
+  </compound>
+  <compound refid="classfacebook_1_1react_1_1_outer" kind="class">
+    <name>facebook::react::Outer</name>
+    <member refid="classfacebook_1_1react_1_1_outer_1_1_inner_1acdef" kind="function">
+      <name>run</name>
+    </member>
+  </compound>
+  <compound refid="classfacebook_1_1react_1_1_outer_1_1_inner" kind="class">
+    <name>facebook::react::Outer::Inner</name>
+    <member refid="classfacebook_1_1react_1_1_outer_1_1_inner_1acdef" kind="function">
+      <name>run</name>
+    </member>
+  </compound>
+  <compound refid="test_8h" kind="file">
+    <name>test.h</name>
+    <member refid="namespacefacebook_1_1react_1a0123" kind="function">
+      <name>makeFoo</name>
+    </member>
+    <member refid="test_8h_1a89ab" kind="function">
+      <name>globalFunction</name>
+    </member>
+  </compound>
+</doxygenindex>
+"""
+
+
+def _parse_index():
+    return index.parseString(_INDEX_XML.encode(), silence=True)
+
+
+class TestRefidIndex(unittest.TestCase):
+    def test_indexes_compounds_and_their_members(self):
+        refid_index = build_refid_index(_parse_index())
+
+        self.assertEqual(
+            refid_index["classfacebook_1_1react_1_1_sync_callback"],
+            RefidTarget(
+                "facebook::react::SyncCallback",
+                "class",
+                "facebook::react::SyncCallback",
+            ),
+        )
+        self.assertEqual(
+            refid_index["namespacefacebook_1_1react_1a0123"],
+            RefidTarget("facebook::react::makeFoo", "function", "facebook::react"),
+        )
+
+    def test_members_of_nested_classes_resolve_to_the_nested_class(self):
+        refid_index = build_refid_index(_parse_index())
+
+        self.assertEqual(
+            refid_index["classfacebook_1_1react_1_1_outer_1_1_inner_1acdef"],
+            RefidTarget(
+                "facebook::react::Outer::Inner::run",
+                "function",
+                "facebook::react::Outer::Inner",
+            ),
+        )
+
+    def test_skips_files_and_their_members(self):
+        refid_index = build_refid_index(_parse_index())
+
+        self.assertNotIn("test_8h", refid_index)
+        self.assertNotIn("test_8h_1a89ab", refid_index)
+
+    def test_qualifies_refs_through_the_active_index(self):
+        # The refid encodes upper case letters the way doxygen does on
+        # case-insensitive file systems, which decoding cannot undo.
+        refid = "classfacebook_1_1react_1_1_sync_callback_1a4567"
+        self.assertEqual(
+            _qualify_text_with_refid("Result", refid),
+            "facebook::react::_sync_callback::Result",
+        )
+
+        with use_refid_index(build_refid_index(_parse_index())):
+            self.assertEqual(
+                _qualify_text_with_refid("Result", refid),
+                "facebook::react::SyncCallback::Result",
+            )
+            self.assertEqual(
+                _qualify_text_with_refid("SyncCallback::Result", refid),
+                "facebook::react::SyncCallback::Result",
+            )
+            # The scope of a class is the class itself, which the text of
+            # refs to it already names.
+            self.assertEqual(
+                _qualify_text_with_refid(
+                    "SyncCallback", "classfacebook_1_1react_1_1_sync_callback"
+                ),
+                "facebook::react::SyncCallback",
+            )
+
+    def test_falls_back_to_decoding_unindexed_refids(self):
+        with use_refid_index({}):
+            self.assertEqual(
+                _qualify_text_with_refid(
+                    "Bar", "structfacebook_1_1yoga_1_1detail_1_1Bar"
+                ),
+                "facebook::yoga::detail::Bar",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from ..parser.run_history import RunHistory
+from ..parser.scheduler import DependencyFailedError, Scheduler, TaskCancelledError
+
+
+class TestScheduler(unittest.TestCase):
+    def test_tasks_receive_dependency_results(self):
+        scheduler = Scheduler()
+        scheduler.add("codegen", lambda results: "codegen-dir")
+        scheduler.add(
+            "view",
+            lambda results: f"view using {results['codegen']}",
+            dependencies=("codegen",),
+        )
+
+        outcomes = scheduler.run()
+
+        self.assertEqual(outcomes["view"].result, "view using codegen-dir")
+
+    def test_independent_tasks_do_not_wait_for_dependencies(self):
+        codegen_started = threading.Event()
+        release_codegen = threading.Event()
+        order = []
+
+        def codegen(results):
+            codegen_started.set()
+            release_codegen.wait(5)
+            order.append("codegen")
+
+        def common(results):
+            codegen_started.wait(5)
+            order.append("common")
+            release_codegen.set()
+
+        scheduler = Scheduler(max_workers=2)
+        scheduler.add("codegen", codegen)
+        scheduler.add("apple", lambda results: order.append("apple"), ("codegen",))
+        scheduler.add("common", common)
+
+        scheduler.run()
+
+        self.assertEqual(order, ["common", "codegen", "apple"])
+
+    def test_serial_group_never_overlaps(self):
+        lock = threading.Lock()
+        overlaps = []
+
+        def codegen(results):
+            if not lock.acquire(blocking=False):
+                overlaps.append(True)
+                return
+            time.sleep(0.01)
+            lock.release()
+
+        scheduler = Scheduler(max_workers=4)
+        for platform in ("android", "ios", "cxx"):
+            scheduler.add(platform, codegen, serial_group="codegen")
+
+        outcomes = scheduler.run()
+
+        self.assertEqual(overlaps, [])
+        self.assertEqual(len(outcomes), 3)
+
+    def test_memory_budget_limits_concurrency(self):
+        lock = threading.Lock()
+        active = []
+        peak = []
+
+        def view(results):
+            with lock:
+                active.append(True)
+                peak.append(len(active))
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+
+        scheduler = Scheduler(max_workers=4, memory_budget_mib=1000)
+        for name in ("debug", "release", "newarch"):
+            scheduler.add(name, view, memory_mib=600)
+        # Larger than the whole budget, so it runs alone.
+        scheduler.add("huge", view, memory_mib=5000)
+        scheduler.add("small", view, memory_mib=100)
+
+        outcomes = scheduler.run()
+
+        self.assertTrue(all(outcome.error is None for outcome in outcomes.values()))
+        self.assertEqual(max(peak), 2)
+
+    def test_longest_path_runs_first(self):
+        order = []
+        scheduler = Scheduler(max_workers=1)
+        scheduler.add("common", lambda results: order.append("common"), cost=1.0)
+        scheduler.add("codegen", lambda results: order.append("codegen"), cost=1.0)
+        scheduler.add(
+            "apple",
+            lambda results: order.append("apple"),
+            dependencies=("codegen",),
+            cost=10.0,
+        )
+
+        scheduler.run()
+
+        self.assertEqual(order, ["codegen", "apple", "common"])
+
+    def test_failure_skips_dependents_only(self):
+        def fail(results):
+            raise RuntimeError("Codegen failed")
+
+        scheduler = Scheduler()
+        scheduler.add("codegen", fail)
+        scheduler.add("apple", lambda results: "apple", ("codegen",))
+        scheduler.add("common", lambda results: "common")
+
+        outcomes = scheduler.run()
+
+        self.assertIsInstance(outcomes["codegen"].error, RuntimeError)
+        self.assertIsInstance(outcomes["apple"].error, DependencyFailedError)
+        self.assertEqual(outcomes["common"].result, "common")
+
+    def test_fail_fast_cancels_pending_tasks(self):
+        release = threading.Event()
+
+        def fail(results):
+            raise RuntimeError("Doxygen failed")
+
+        def running(results):
+            # Stopped by cancel, like a killed Doxygen process.
+            release.wait(5)
+            return "running"
+
+        scheduler = Scheduler(max_workers=2)
+        scheduler.add("failing", fail, cost=10.0)
+        scheduler.add("running", running, cost=5.0)
+        scheduler.add("pending", lambda results: "pending")
+
+        outcomes = scheduler.run(fail_fast=True, cancel=release.set)
+
+        self.assertTrue(release.is_set())
+        self.assertEqual(outcomes["running"].result, "running")
+        self.assertIsInstance(outcomes["pending"].error, TaskCancelledError)
+
+    def test_invalid_graphs(self):
+        scheduler = Scheduler()
+        scheduler.add("a", lambda results: None, ("b",))
+        scheduler.add("b", lambda results: None, ("a",))
+        with self.assertRaises(ValueError):
+            scheduler.run()
+
+        scheduler = Scheduler()
+        scheduler.add("a", lambda results: None, ("missing",))
+        with self.assertRaises(ValueError):
+            scheduler.run()
+
+
+class TestRunHistory(unittest.TestCase):
+    def test_round_trip_and_smoothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.json")
+            history = RunHistory.load(path)
+            self.assertIsNone(history.get("ReactAppleDebug", "wall_s"))
+
+            history.record("ReactAppleDebug", "wall_s", 10.0)
+            history.record("ReactAppleDebug", "wall_s", 20.0)
+            history.save()
+
+            loaded = RunHistory.load(path)
+            self.assertEqual(loaded.get("ReactAppleDebug", "wall_s"), 15.0)
+
+    def test_unreadable_history_is_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "history.json")
+            with open(path, "w") as f:
+                f.write("{")
+            self.assertEqual(RunHistory.load(path).tasks, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from .test_snapshots import _cached_xml_dir, _case_cache_key
+
+
+class TestSnapshotXmlCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.case_dir = self.root / "case"
+        self.case_dir.mkdir()
+        (self.case_dir / "test.h").write_text("struct A {};\n")
+        self.config = self.root / ".doxygen.config.template"
+        self.config.write_text("GENERATE_XML = YES\n")
+        self.filter = self.root / "main.py"
+        self.filter.write_text("print()\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _key(self, doxygen_version: str = "1.16.1") -> str:
+        return _case_cache_key(
+            self.case_dir, self.config, [self.filter], doxygen_version
+        )
+
+    def test_key_depends_on_doxygen_inputs(self):
+        key = self._key()
+        self.assertEqual(key, self._key())
+        self.assertNotEqual(key, self._key("1.17.0"))
+
+        for path in (self.case_dir / "test.h", self.config, self.filter):
+            original = path.read_text()
+            path.write_text(original + "\n")
+            self.assertNotEqual(key, self._key(), path.name)
+            path.write_text(original)
+
+    def test_cached_xml_is_generated_once(self):
+        calls = []
+
+        def generate() -> Path:
+            calls.append(1)
+            xml_dir = self.case_dir / "api" / "xml"
+            xml_dir.mkdir(parents=True, exist_ok=True)
+            (xml_dir / "index.xml").write_text("<doxygenindex/>\n")
+            return xml_dir
+
+        cache_dir = self.root / "cache"
+        first = _cached_xml_dir(cache_dir, self._key(), generate)
+        second = _cached_xml_dir(cache_dir, self._key(), generate)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((first / "index.xml").read_text(), "<doxygenindex/>\n")
+        # No scratch directories are left behind.
+        self.assertEqual([p.name for p in cache_dir.iterdir()], [self._key()])
+
+
+if __name__ == "__main__":
+    unittest.main()
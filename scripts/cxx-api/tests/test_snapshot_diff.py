@@ -0,0 +1,91 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import io
+import os
+import tempfile
+import unittest
+
+from ..parser.block_store import BlockStore
+from ..parser.snapshot_diff import SnapshotValidator
+
+
+class TestSnapshotValidator(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.committed_dir = self._tmp.name
+        for view in ("A", "B", "C"):
+            with open(os.path.join(self.committed_dir, f"{view}Cxx.api"), "w") as f:
+                f.write(f"class {view} {{\n}}\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_views_are_reported_as_they_are_checked(self):
+        out = io.StringIO()
+        validator = SnapshotValidator(self.committed_dir, out)
+
+        validator.check("BCxx.api", "class B {\n}\n")
+        self.assertEqual(out.getvalue(), "OK: BCxx.api matches committed snapshot\n")
+
+        validator.check("ACxx.api", "class A {\n  public int x;\n}\n")
+        self.assertIn("FAIL: ACxx.api differs from committed snapshot", out.getvalue())
+        self.assertIn("+  public int x;", out.getvalue())
+
+        validator.check("DCxx.api", "class D {\n}\n")
+        self.assertTrue(
+            out.getvalue().endswith("OK: DCxx.api generated (no committed baseline)\n")
+        )
+
+        self.assertFalse(validator.finish())
+        self.assertTrue(
+            out.getvalue().endswith(
+                "FAIL: CCxx.api exists in committed snapshots but was not generated\n"
+            )
+        )
+
+    def test_unchanged_views_pass(self):
+        out = io.StringIO()
+        validator = SnapshotValidator(self.committed_dir, out)
+
+        for view in ("A", "B"):
+            validator.check(f"{view}Cxx.api", f"class {view} {{\n}}\n")
+        validator.unchanged("CCxx.api")
+
+        self.assertTrue(validator.finish())
+        self.assertIn("OK: CCxx.api unchanged (API fingerprints match)", out.getvalue())
+
+    def test_blocks_are_diffed_against_the_committed_snapshot(self):
+        with open(os.path.join(self.committed_dir, "ACxx.api"), "w") as f:
+            f.write("class A {\n}\n\nclass B {\n}\n")
+        blocks = BlockStore(None)
+        generated = "class A {\n  public int x;\n}\n\nclass B {\n}\n"
+        # The manifest of the generated snapshot is not what is validated.
+        blocks.add_view("A", generated)
+        out = io.StringIO()
+        validator = SnapshotValidator(self.committed_dir, out, blocks)
+
+        validator.check("ACxx.api", generated)
+
+        self.assertIn("FAIL: ACxx.api differs from committed snapshot", out.getvalue())
+        self.assertIn("@@@ block 1 -> block 1 @@@", out.getvalue())
+        self.assertIn("+  public int x;", out.getvalue())
+        self.assertNotIn("class B", out.getvalue())
+
+    def test_no_baseline(self):
+        out = io.StringIO()
+        validator = SnapshotValidator(os.path.join(self.committed_dir, "none"), out)
+
+        validator.check("ACxx.api", "anything")
+
+        self.assertTrue(validator.finish())
+        self.assertIn("Skipping comparison", out.getvalue())
+        self.assertNotIn("ACxx.api", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
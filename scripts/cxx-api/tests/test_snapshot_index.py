@@ -0,0 +1,72 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import unittest
+
+from ..parser.scope import StructLikeScopeKind
+from ..parser.snapshot import Snapshot
+
+
+class TestSnapshotIndex(unittest.TestCase):
+    def test_scopes_are_indexed_by_path(self) -> None:
+        snapshot = Snapshot()
+        # The class is created before its namespaces, like Doxygen may.
+        foo = snapshot.create_struct_like(
+            "facebook::react::Foo", StructLikeScopeKind.Type.CLASS
+        )
+        react = snapshot.create_or_get_namespace("facebook::react")
+        spec = snapshot.create_struct_like(
+            "facebook::react::Foo<int>", StructLikeScopeKind.Type.CLASS
+        )
+
+        self.assertIs(foo.parent_scope, react)
+        self.assertIs(snapshot.ensure_scope(["facebook", "react", "Foo"]), foo)
+        self.assertIs(snapshot.ensure_scope(["facebook", "react", "Foo<int>"]), spec)
+        self.assertEqual(react.kind.name, "namespace")
+        self.assertIs(
+            snapshot.root_scope.inner_scopes["facebook"].inner_scopes["react"], react
+        )
+
+    def test_qualify_name_resolves_from_the_root(self) -> None:
+        snapshot = Snapshot()
+        snapshot.create_or_get_namespace("facebook")
+        snapshot.create_or_get_namespace("facebook::react")
+        snapshot.create_struct_like(
+            "facebook::react::Foo", StructLikeScopeKind.Type.CLASS
+        )
+        bar = snapshot.create_struct_like(
+            "facebook::react::detail::Bar", StructLikeScopeKind.Type.STRUCT
+        )
+        snapshot.create_or_get_namespace("facebook::react::detail")
+
+        self.assertEqual(
+            bar.qualify_name("facebook::react::Foo<int>"),
+            "facebook::react::Foo<int>",
+        )
+        self.assertEqual(bar.qualify_name("Foo"), "facebook::react::Foo")
+        self.assertIsNone(bar.qualify_name("facebook::react::Missing"))
+
+    def test_removed_scopes_are_removed_from_the_index(self) -> None:
+        snapshot = Snapshot()
+        snapshot.create_or_get_namespace("facebook")
+        snapshot.create_or_get_namespace("facebook::react")
+        foo = snapshot.create_struct_like(
+            "facebook::react::Foo", StructLikeScopeKind.Type.CLASS
+        )
+        bar = snapshot.create_struct_like(
+            "facebook::react::Bar", StructLikeScopeKind.Type.CLASS
+        )
+
+        snapshot.remove_scope(["facebook", "react"])
+
+        self.assertEqual(snapshot.root_scope.inner_scopes["facebook"].inner_scopes, {})
+        self.assertIsNone(bar.qualify_name("facebook::react::Foo"))
+        self.assertIsNot(snapshot.ensure_scope(["facebook", "react", "Foo"]), foo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,16 +5,23 @@
 
 from __future__ import annotations
 
+import contextlib
 import difflib
+import functools
+import hashlib
 import importlib.resources as ir
 import os
+import shutil
 import subprocess
+import tempfile
 import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
 from importlib.resources.abc import Traversable
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Iterable
 
 from ..parser import build_snapshot, get_repo_root
+from .doxygen_batch import BatchSplit, lay_out_batch, split_batch_xml
 
 
 def _resource_root() -> Traversable:
@@ -69,6 +76,220 @@ def _generate_doxygen_api(
         raise RuntimeError(f"Doxygen failed: {result.stderr}")
 
 
+@functools.cache
+def _doxygen_version(doxygen_bin: str) -> str:
+    result = subprocess.run(
+        [doxygen_bin, "--version"], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def _case_cache_key(
+    case_dir_path: Path,
+    doxygen_config_path: Path,
+    filter_sources: Iterable[Traversable],
+    doxygen_version: str,
+) -> str:
+    """Hash everything the Doxygen XML of a case depends on.
+
+    That is the case's header, the Doxygen config, the input filter sources
+    and the Doxygen version, but not the parser, so parser changes reuse the
+    cached XML.
+    """
+    digest = hashlib.sha256()
+    for source in [case_dir_path / "test.h", doxygen_config_path, *filter_sources]:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    digest.update(doxygen_version.encode())
+    return digest.hexdigest()
+
+
+def _get_cache_dir() -> Path | None:
+    """Get the directory caching the Doxygen XML of each case.
+
+    Set SNAPSHOT_XML_CACHE_DIR to choose the directory, or to an empty
+    string to always run Doxygen.
+    """
+    cache_dir = os.environ.get(
+        "SNAPSHOT_XML_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "cxx-api-snapshot-xml"),
+    )
+    return Path(cache_dir) if cache_dir else None
+
+
+def _cached_xml_dir(cache_dir: Path, key: str, generate: Callable[[], Path]) -> Path:
+    """Return the cached XML directory for *key*, calling *generate* to
+    produce it first on a cache miss.
+    """
+    cached = cache_dir / key
+    if cached.is_dir():
+        return cached
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Copy to a scratch directory and rename it into place, so that a
+    # concurrent or interrupted run never sees a partially written entry.
+    scratch = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir))
+    try:
+        shutil.copytree(generate(), scratch / "xml")
+        try:
+            (scratch / "xml").rename(cached)
+        except OSError:
+            # Another run cached the same XML first.
+            if not cached.is_dir():
+                raise
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return cached
+
+
+def _chain(source: Future[Path], target: Future[Path]) -> None:
+    """Complete *target* with the outcome of *source*."""
+
+    def _done(future: Future[Path]) -> None:
+        if future.cancelled():
+            target.cancel()
+        elif future.exception() is not None:
+            target.set_exception(future.exception())
+        else:
+            target.set_result(future.result())
+
+    source.add_done_callback(_done)
+
+
+class _CaseXmlGenerator:
+    """Generates the Doxygen XML of test cases in a pool of workers.
+
+    Each case runs Doxygen in its own directory, so cases are independent
+    and run concurrently. Set SNAPSHOT_JOBS to limit the number of
+    concurrent Doxygen processes.
+
+    Set SNAPSHOT_BATCHES to a number of batches to instead run Doxygen once
+    per batch over all the uncached cases of the batch, and split its XML
+    per case (see doxygen_batch). Cases that interfere with another case of
+    their batch run in isolation. The XML of batched runs is not cached.
+    """
+
+    def __init__(
+        self,
+        tests_root_path: Path,
+        filter_script_path: Path | None,
+        filter_sources: list[Traversable],
+        cache_dir: Path | None,
+    ) -> None:
+        self.tests_root_path = tests_root_path
+        self.doxygen_config_path = tests_root_path / ".doxygen.config.template"
+        self.filter_script_path = filter_script_path
+        self.filter_sources = filter_sources
+        self.cache_dir = cache_dir
+        jobs = int(os.environ.get("SNAPSHOT_JOBS", "0")) or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="doxygen"
+        )
+        self._futures: dict[str, Future[Path]] = {}
+        self.batches = int(os.environ.get("SNAPSHOT_BATCHES", "0"))
+        self._batch_dir = (
+            Path(tempfile.mkdtemp(prefix="cxx-api-snapshot-batches-"))
+            if self.batches
+            else None
+        )
+
+    def prefetch(self, case_names: Iterable[str]) -> None:
+        pending = [name for name in case_names if name not in self._futures]
+        if self.batches and len(pending) > 1:
+            for i in range(min(self.batches, len(pending))):
+                batch = {name: Future() for name in pending[i :: self.batches]}
+                self._futures.update(batch)
+                self._executor.submit(self._generate_batch, batch)
+
+        for case_name in pending:
+            if case_name not in self._futures:
+                self._futures[case_name] = self._executor.submit(
+                    self._generate, case_name
+                )
+
+    def xml_dir(self, case_name: str) -> Path:
+        """Wait for the XML of a case, generating it if it was not prefetched."""
+        self.prefetch([case_name])
+        return self._futures[case_name].result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+        if self._batch_dir is not None:
+            shutil.rmtree(self._batch_dir, ignore_errors=True)
+
+    def _run_doxygen(self, case_dir_path: Path) -> Path:
+        _generate_doxygen_api(
+            str(case_dir_path),
+            str(self.doxygen_config_path),
+            str(self.filter_script_path) if self.filter_script_path else None,
+        )
+        return case_dir_path / "api" / "xml"
+
+    def _cache_key(self, case_dir_path: Path) -> str:
+        return _case_cache_key(
+            case_dir_path,
+            self.doxygen_config_path,
+            self.filter_sources,
+            _doxygen_version(os.environ.get("DOXYGEN_BIN", "doxygen")),
+        )
+
+    def _generate(self, case_name: str) -> Path:
+        case_dir_path = self.tests_root_path / case_name
+        if self.cache_dir is None:
+            return self._run_doxygen(case_dir_path)
+
+        key = self._cache_key(case_dir_path)
+        xml_dir = _cached_xml_dir(
+            self.cache_dir, key, lambda: self._run_doxygen(case_dir_path)
+        )
+        # The XML was copied to the cache, don't leave it in the case directory.
+        shutil.rmtree(case_dir_path / "api", ignore_errors=True)
+        return xml_dir
+
+    def _generate_batch(self, batch: dict[str, Future[Path]]) -> None:
+        try:
+            self._generate_batch_cases(batch)
+        except BaseException as e:
+            # The tests wait for these futures, which nothing else completes.
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+    def _generate_batch_cases(self, batch: dict[str, Future[Path]]) -> None:
+        pending = {}
+        for case_name, future in batch.items():
+            cached = None
+            if self.cache_dir is not None:
+                cached = self.cache_dir / self._cache_key(
+                    self.tests_root_path / case_name
+                )
+            if cached is not None and cached.is_dir():
+                future.set_result(cached)
+            else:
+                pending[case_name] = future
+
+        if len(pending) > 1:
+            try:
+                split = self._run_batch(list(pending))
+            except Exception:
+                # Isolated runs of the cases report the actual failure.
+                pass
+            else:
+                for case_name, xml_dir in split.xml_dirs.items():
+                    pending.pop(case_name).set_result(xml_dir)
+
+        for case_name, future in pending.items():
+            _chain(self._executor.submit(self._generate, case_name), future)
+
+    def _run_batch(self, case_names: list[str]) -> BatchSplit:
+        assert self._batch_dir is not None
+        work_dir = Path(tempfile.mkdtemp(prefix="batch-", dir=self._batch_dir))
+        lay_out_batch([self.tests_root_path / name for name in case_names], work_dir)
+        self._run_doxygen(work_dir)
+        return split_batch_xml(work_dir / "api" / "xml", case_names, work_dir / "cases")
+
+
 def _get_source_snapshots_dir() -> Path:
     """Get the actual source directory for snapshots (for writing snapshots).
 
@@ -82,7 +303,7 @@ def _get_source_snapshots_dir() -> Path:
     return Path(get_repo_root()) / source_tests_path
 
 
-def _make_case_test(case_dir: Traversable, tests_root: Traversable):
+def _make_case_test(case_dir: Traversable):
     """Create a test method for a specific test case directory.
 
     Snapshot update workflow:
@@ -93,83 +314,117 @@ def _make_case_test(case_dir: Traversable, tests_root: Traversable):
 
       When a test case directory has no snapshot.api in the source tree
       the snapshot is generated automatically on the first run.
+
+    Doxygen XML cache:
+      The XML of each case is cached under SNAPSHOT_XML_CACHE_DIR (a
+      directory in the system temp dir by default), keyed by its inputs,
+      so runs after parser-only changes skip Doxygen entirely.
     """
 
-    def _test(self: unittest.TestCase) -> None:
+    def _test(self: TestApiSnapshots) -> None:
         update = os.environ.get("UPDATE_SNAPSHOT") == "1"
 
-        # Use as_file() on the entire tests directory to get real filesystem paths
-        # This ensures the doxygen config and case directories are accessible
-        with ir.as_file(tests_root) as tests_root_path:
-            case_dir_path = tests_root_path / case_dir.name
-            doxygen_config_path = tests_root_path / ".doxygen.config.template"
-
-            # Find the filter script in the package resources
-            pkg_root = ir.files(__package__ if __package__ else "__main__")
-            filter_script = pkg_root.parent / "parser" / "input_filters" / "main.py"
-
-            # Get real filesystem path for filter script if it exists
-            # IMPORTANT: Keep the context manager active while Doxygen runs,
-            # otherwise the extracted file may be cleaned up before use
-            if filter_script.is_file():
-                with ir.as_file(filter_script) as fs_path:
-                    _generate_doxygen_api(
-                        str(case_dir_path), str(doxygen_config_path), str(fs_path)
-                    )
-            else:
-                # No filter script available - run without filter
-                _generate_doxygen_api(str(case_dir_path), str(doxygen_config_path))
-
-            # Parse the generated XML
-            xml_dir = case_dir_path / "api" / "xml"
-            snapshot = build_snapshot(str(xml_dir))
-            got_snapshot = snapshot.to_string().rstrip() + "\n"
-
-            # Resolve the source-tree snapshot path (for writing)
-            try:
-                source_snapshots_dir = _get_source_snapshots_dir()
-                source_snapshot_path = (
-                    source_snapshots_dir / case_dir.name / "snapshot.api"
-                )
-            except RuntimeError:
-                source_snapshot_path = None
-
-            # Update mode: write the snapshot and pass unconditionally
-            if update:
-                if source_snapshot_path is not None:
-                    source_snapshot_path.parent.mkdir(parents=True, exist_ok=True)
-                    source_snapshot_path.write_text(got_snapshot)
-                    print(f"Updated snapshot: {source_snapshot_path}")
-                return
-
-            # Auto-generate when no snapshot exists in the source tree yet
-            if source_snapshot_path is not None and not source_snapshot_path.exists():
+        generator = self._generator
+        case_dir_path = generator.tests_root_path / case_dir.name
+        xml_dir = generator.xml_dir(case_dir.name)
+
+        # Parse the generated XML
+        snapshot = build_snapshot(str(xml_dir))
+        got_snapshot = snapshot.to_string().rstrip() + "\n"
+
+        # Resolve the source-tree snapshot path (for writing)
+        try:
+            source_snapshots_dir = _get_source_snapshots_dir()
+            source_snapshot_path = source_snapshots_dir / case_dir.name / "snapshot.api"
+        except RuntimeError:
+            source_snapshot_path = None
+
+        # Update mode: write the snapshot and pass unconditionally
+        if update:
+            if source_snapshot_path is not None:
+                source_snapshot_path.parent.mkdir(parents=True, exist_ok=True)
                 source_snapshot_path.write_text(got_snapshot)
-                print(f"Created snapshot: {source_snapshot_path}")
-                return
-
-            # Normal mode: compare against the packaged snapshot
-            expected_snapshot_path = case_dir_path / "snapshot.api"
-            if not expected_snapshot_path.exists():
-                self.fail(
-                    f"{case_dir.name}: no snapshot.api found; "
-                    f"run with --test-env UPDATE_SNAPSHOT=1 to generate"
-                )
-
-            expected_snapshot = expected_snapshot_path.read_text()
-            _assert_text_equal_with_diff(
-                self, expected_snapshot, got_snapshot, case=case_dir.name
+                print(f"Updated snapshot: {source_snapshot_path}")
+            return
+
+        # Auto-generate when no snapshot exists in the source tree yet
+        if source_snapshot_path is not None and not source_snapshot_path.exists():
+            source_snapshot_path.write_text(got_snapshot)
+            print(f"Created snapshot: {source_snapshot_path}")
+            return
+
+        # Normal mode: compare against the packaged snapshot
+        expected_snapshot_path = case_dir_path / "snapshot.api"
+        if not expected_snapshot_path.exists():
+            self.fail(
+                f"{case_dir.name}: no snapshot.api found; "
+                f"run with --test-env UPDATE_SNAPSHOT=1 to generate"
             )
 
+        expected_snapshot = expected_snapshot_path.read_text()
+        _assert_text_equal_with_diff(
+            self, expected_snapshot, got_snapshot, case=case_dir.name
+        )
+
     return _test
 
 
 class TestApiSnapshots(unittest.TestCase):
-    pass
+    _resources: contextlib.ExitStack
+    _generator: _CaseXmlGenerator
+    # The cases of the tests selected to run. Test loaders create the
+    # tests they selected (e.g. with -k or a test id) before the class is
+    # set up.
+    _selected_cases: set[str] = set()
+
+    def __init__(self, methodName: str = "runTest") -> None:
+        super().__init__(methodName)
+        if methodName.startswith("test_"):
+            TestApiSnapshots._selected_cases.add(methodName[len("test_") :])
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._resources = contextlib.ExitStack()
+        # Use as_file() on the entire tests directory to get real filesystem
+        # paths, so the doxygen config and case directories are accessible.
+        # IMPORTANT: Keep the context managers active until all cases ran,
+        # otherwise the extracted files may be cleaned up while Doxygen runs.
+        tests_root_path = cls._resources.enter_context(ir.as_file(_root))
+
+        # Find the filter script in the package resources
+        pkg_root = ir.files(__package__ if __package__ else "__main__")
+        filter_script = pkg_root.parent / "parser" / "input_filters" / "main.py"
+        if filter_script.is_file():
+            filter_script_path = cls._resources.enter_context(ir.as_file(filter_script))
+            filter_sources = sorted(
+                (p for p in filter_script.parent.iterdir() if p.name.endswith(".py")),
+                key=lambda p: p.name,
+            )
+        else:
+            # No filter script available - run without filter
+            filter_script_path = None
+            filter_sources = []
+
+        cls._generator = _CaseXmlGenerator(
+            tests_root_path, filter_script_path, filter_sources, _get_cache_dir()
+        )
+        # Start generating the selected cases up front, so the tests only
+        # wait for Doxygen runs that are still in flight. Cases of tests
+        # created later are generated when their test runs.
+        cls._generator.prefetch(
+            case_dir.name
+            for case_dir in _iter_case_dirs(_root)
+            if case_dir.name in cls._selected_cases
+        )
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._generator.shutdown()
+        cls._resources.close()
 
 
 # Dynamically generate test methods for each case directory
 _root = _resource_root()
 for _case_dir in _iter_case_dirs(_root):
     _test_name = f"test_{_case_dir.name}"
-    setattr(TestApiSnapshots, _test_name, _make_case_test(_case_dir, _root))
+    setattr(TestApiSnapshots, _test_name, _make_case_test(_case_dir))
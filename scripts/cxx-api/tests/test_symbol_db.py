@@ -0,0 +1,91 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.symbol_db import symbol_rows, SymbolDatabase
+
+
+class TestSymbolDatabase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        xml_dir = os.path.join(self.root, "xml")
+        generate(xml_dir, units=2, depth=1, overloads=2)
+        self.snapshot = build_snapshot(xml_dir)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_rows_of_scopes_and_members(self):
+        rows = {
+            (name, kind): (signature, location, visibility)
+            for _, name, kind, signature, location, visibility in symbol_rows(
+                "TestDebug", self.snapshot
+            )
+        }
+        file = "/synthetic/ReactCommon/react/unit0/Unit0.h"
+
+        self.assertEqual(
+            rows[("facebook::react::Widget0", "class")],
+            (
+                "class facebook::react::Widget0 : public facebook::react::WidgetBase0",
+                file,
+                None,
+            ),
+        )
+        self.assertEqual(
+            rows[("facebook::react::Widget0::Node", "struct")][0],
+            "template <typename T, int Depth = 0> struct facebook::react::Widget0::Node",
+        )
+        self.assertEqual(
+            rows[("facebook::react::Widget0::children", "variable")][1:],
+            (file, "public"),
+        )
+        self.assertEqual(
+            rows[("facebook::react::makeWidget0", "function")],
+            (
+                "std::unique_ptr<facebook::react::Widget0> facebook::react::makeWidget0("
+                "const facebook::react::Widget0& other, facebook::react::Mode0 mode);",
+                file,
+                None,
+            ),
+        )
+
+    def test_write_replaces_the_rows_of_the_views(self):
+        path = os.path.join(self.root, "symbols.db")
+        for views in (["TestDebug", "TestRelease"], ["TestDebug"]):
+            symbol_db = SymbolDatabase()
+            for view in views:
+                symbol_db.add_view(view, self.snapshot)
+            symbol_db.write(path)
+
+        connection = sqlite3.connect(path)
+        try:
+            counts = dict(
+                connection.execute(
+                    "SELECT view, COUNT(*) FROM symbols GROUP BY view"
+                ).fetchall()
+            )
+            signatures = connection.execute(
+                "SELECT signature FROM symbols WHERE name = ? AND view = ?",
+                ("facebook::react::Widget0::convert", "TestRelease"),
+            ).fetchall()
+        finally:
+            connection.close()
+
+        self.assertEqual(counts["TestDebug"], counts["TestRelease"])
+        self.assertEqual(len(signatures), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
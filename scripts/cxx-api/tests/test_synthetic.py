@@ -0,0 +1,87 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..bench.scaling import growth_exponent, growth_exponents, ScaleMeasurement
+from ..parser import build_snapshot
+
+
+def _measurement(members: int, **stages: float) -> ScaleMeasurement:
+    return ScaleMeasurement(
+        scale=members,
+        units=members,
+        compounds=members,
+        members=members,
+        api_bytes=0,
+        max_rss_mib=10.0,
+        stages=stages,
+    )
+
+
+class TestSyntheticGenerator(unittest.TestCase):
+    def test_generated_xml_covers_all_scope_kinds(self):
+        with tempfile.TemporaryDirectory() as xml_dir:
+            stats = generate(xml_dir, units=2, depth=1, overloads=2)
+            self.assertEqual(len(os.listdir(xml_dir)), stats.files)
+            api = build_snapshot(xml_dir).to_string()
+
+        self.assertIn("category RCTWidget0(Extras) {", api)
+        self.assertIn(
+            "interface RCTWidget0 : public UIView <RCTWidget0Delegate> {", api
+        )
+        self.assertIn("protocol RCTWidget0Delegate {", api)
+        self.assertIn("struct facebook::react::Widget0::Node {", api)
+        self.assertIn("class facebook::react::detail0::Box1<T *>", api)
+        self.assertIn("convert(jsi::Runtime& rt, int value1) const;", api)
+        self.assertNotIn("int value2", api)
+
+    def test_specializations_keep_primary_bases(self):
+        with tempfile.TemporaryDirectory() as xml_dir:
+            generate(xml_dir, units=1, depth=0, overloads=1, specializations=3)
+            api = build_snapshot(xml_dir).to_string()
+
+        self.assertIn(
+            "class facebook::react::Box0 : public facebook::react::WidgetBase0 {", api
+        )
+        for args in ("T *", "std::array<T, 1>", "std::array<T, 2>"):
+            self.assertIn(f"class facebook::react::Box0<{args}>", api)
+
+    def test_generation_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            generate(first, units=3)
+            generate(second, units=3)
+            for name in sorted(os.listdir(first)):
+                with open(os.path.join(first, name)) as a, open(
+                    os.path.join(second, name)
+                ) as b:
+                    self.assertEqual(a.read(), b.read(), name)
+
+
+class TestGrowthExponents(unittest.TestCase):
+    def test_growth_exponent(self):
+        self.assertAlmostEqual(growth_exponent(10, 1.0, 100, 10.0), 1.0)
+        self.assertAlmostEqual(growth_exponent(10, 1.0, 100, 100.0), 2.0)
+        self.assertIsNone(growth_exponent(10, 0.0, 100, 1.0))
+
+    def test_fast_stages_have_no_exponent(self):
+        [row] = growth_exponents(
+            [
+                _measurement(100, parse_xml=1.0, exclusion_scan=0.0001),
+                _measurement(1000, parse_xml=100.0, exclusion_scan=0.01),
+            ]
+        )
+        self.assertAlmostEqual(row["parse_xml"], 2.0)
+        self.assertIsNone(row["exclusion_scan"])
+        self.assertAlmostEqual(row["max_rss"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
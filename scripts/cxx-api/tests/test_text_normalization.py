@@ -0,0 +1,126 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import unittest
+import xml.etree.ElementTree as ET
+
+from ..parser import build_snapshot
+from ..parser.utils import (
+    normalize_angle_brackets,
+    normalize_pointer_spacing,
+    normalize_type_text,
+)
+from ..parser.utils.text_resolution import normalize_nullability
+
+_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The Doxygen XML of the should_normalize_nullability snapshot case.
+_XML_FIXTURE_CASE = "should_normalize_nullability"
+_XML_FIXTURE_DIR = os.path.join(_TESTS_DIR, "xml", _XML_FIXTURE_CASE)
+
+# Directory with the Doxygen XML output of a real view, e.g. the
+# api/xml directory of a ReactCommon build. When set, every text node
+# found there is also checked.
+_XML_DIR_ENV = "CXX_API_XML_DIR"
+
+# Elements whose concatenated text is resolved by resolve_linked_text_name.
+_LINKED_TEXT_TAGS = frozenset({"type", "defval", "initializer", "argsstring"})
+
+_SAMPLES = [
+    "",
+    "int",
+    "NSArray< id< RCTBridgeMethod > > *",
+    "std::vector< std::shared_ptr< const Foo > > &",
+    "std::map< K, V > &&",
+    "const char *name",
+    "NSString *__nonnull",
+    "nonnull NSString *",
+    "NSString *_Nonnull",
+    "id< Foo > __nullable delegate",
+    "nullable id< Foo >",
+    "_Nullable id",
+    "nonnull_ptr< T >",
+    "my_nonnull",
+    "___nonnull",
+    "void(*)(int *, char **)",
+    "void(*callback)(const T &value, U &&other)",
+    "T &&...args",
+    "a *b *)",
+    "Foo< Bar > **",
+    "int & &",
+    "std::function< void(const std::string &) >",
+    "< >",
+    "a<  >b",
+    "x > *",
+    '"a < b" nonnull',
+    "= nullptr",
+    "{ 1, 2 }",
+    "unsigned long long int * const *",
+    "A &operator=(const A &)",
+]
+
+
+def _normalize_by_chain(text: str) -> str:
+    return normalize_nullability(
+        normalize_pointer_spacing(normalize_angle_brackets(text))
+    )
+
+
+def _collect_xml_texts(xml_dir: str) -> set[str]:
+    texts = set()
+    for file_name in os.listdir(xml_dir):
+        if not file_name.endswith(".xml"):
+            continue
+        for element in ET.parse(os.path.join(xml_dir, file_name)).iter():
+            for text in (element.text, element.tail):
+                if text and text.strip():
+                    texts.add(text.strip())
+            if element.tag in _LINKED_TEXT_TAGS:
+                texts.add("".join(element.itertext()).strip())
+    return texts
+
+
+class TestNormalizeTypeText(unittest.TestCase):
+    def _assert_matches_chain(self, texts):
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(normalize_type_text(text), _normalize_by_chain(text))
+
+    def test_matches_normalizer_chain(self):
+        self._assert_matches_chain(_SAMPLES)
+
+    def test_memoized_result_is_stable(self):
+        first = normalize_type_text("NSArray< id< Foo > > *__nonnull")
+        second = normalize_type_text("NSArray< id< Foo > > *__nonnull")
+        self.assertEqual(first, "NSArray<id<Foo>>* _Nonnull")
+        self.assertIs(first, second)
+
+    def test_matches_normalizer_chain_on_fixture_xml(self):
+        texts = _collect_xml_texts(_XML_FIXTURE_DIR)
+        self.assertIn("NSString *__nonnull", texts)
+        self._assert_matches_chain(sorted(texts))
+
+    def test_fixture_xml_builds_the_case_snapshot(self):
+        snapshot_path = os.path.join(
+            _TESTS_DIR, "snapshots", _XML_FIXTURE_CASE, "snapshot.api"
+        )
+        with open(snapshot_path) as f:
+            expected = f.read()
+        self.assertEqual(
+            build_snapshot(_XML_FIXTURE_DIR).to_string().rstrip() + "\n", expected
+        )
+
+    @unittest.skipUnless(os.environ.get(_XML_DIR_ENV), f"{_XML_DIR_ENV} is not set")
+    def test_matches_normalizer_chain_on_view_xml(self):
+        texts = _collect_xml_texts(os.environ[_XML_DIR_ENV])
+        self.assertTrue(texts)
+        self._assert_matches_chain(sorted(texts))
+
+
+if __name__ == "__main__":
+    unittest.main()
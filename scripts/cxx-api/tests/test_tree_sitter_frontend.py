@@ -0,0 +1,160 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from ..parser.tree_sitter_frontend.preprocessor import (
+    definitions_to_macros,
+    evaluate_condition,
+    get_defined_macros,
+    get_empty_expansions,
+    Macro,
+    parse_predefined,
+    preprocess,
+)
+
+_HAS_TREE_SITTER = (
+    importlib.util.find_spec("tree_sitter") is not None
+    and importlib.util.find_spec("tree_sitter_cpp") is not None
+)
+
+
+class TestPreprocessor(unittest.TestCase):
+    def test_conditions_follow_the_definitions(self) -> None:
+        macros = definitions_to_macros({"DEBUG": 1, "RN_VERSION": 80})
+        source = "\n".join(
+            [
+                "#if DEBUG && RN_VERSION >= 80",
+                "int debug;",
+                "#elif defined(NDEBUG)",
+                "int release;",
+                "#else",
+                "int other;",
+                "#endif",
+                "#ifndef NDEBUG",
+                "int notRelease;",
+                "#endif",
+            ]
+        )
+
+        lines = preprocess(source, macros).split("\n")
+
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(
+            [line for line in lines if line],
+            ["int debug;", "int notRelease;"],
+        )
+        self.assertFalse(evaluate_condition("__has_include(<foo.h>)", macros))
+        self.assertTrue(evaluate_condition("RN_VERSION > 7 ? 1 : 0", macros))
+
+    def test_macros_expanding_to_nothing_are_removed(self) -> None:
+        macros = parse_predefined(
+            'PREDEFINED = FOLLY_EXPORT="" \\\n __attribute__(x)="" \\\n FOO=1\n'
+        )
+        source = "\n".join(
+            [
+                "#define LOCAL_API",
+                "FOLLY_EXPORT LOCAL_API void f() __attribute__((pure));",
+            ]
+        )
+
+        self.assertEqual(macros["FOO"].value, "1")
+        self.assertTrue(macros["__attribute__"].is_function)
+        self.assertEqual(
+            preprocess(source, macros).split("\n")[1].split(), ["void", "f()", ";"]
+        )
+
+    def test_empty_expansions_of_other_headers(self) -> None:
+        macros = {"__attribute__": Macro("", is_function=True)}
+        defined = get_defined_macros(
+            "\n".join(
+                [
+                    "#ifndef MACROS_H",
+                    "#define MACROS_H",
+                    '#define EXPORT __attribute__((visibility("default")))',
+                    "#define VALUE 1",
+                    "#endif",
+                ]
+            ),
+            macros,
+        )
+        expanded = get_empty_expansions(defined, macros)
+
+        self.assertEqual(set(defined), {"MACROS_H", "EXPORT", "VALUE"})
+        # The include guard is left out, so it does not hide other headers.
+        self.assertEqual(expanded, {"EXPORT": False})
+        self.assertEqual(
+            preprocess("EXPORT void f();", {}, expanded).split(), ["void", "f();"]
+        )
+
+
+@unittest.skipUnless(_HAS_TREE_SITTER, "tree-sitter is not installed")
+class TestTreeSitterFrontend(unittest.TestCase):
+    def test_build_snapshot_from_headers(self) -> None:
+        from ..parser.symbol_db import symbol_rows
+        from ..parser.tree_sitter_frontend import build_snapshot_from_headers
+
+        source = """
+namespace test::detail {
+
+class Base {
+ public:
+  virtual ~Base() = default;
+  virtual int size() const = 0;
+};
+
+#ifdef DEBUG
+struct DebugOnly {};
+#endif
+
+class Derived : public Base {
+ public:
+  int size() const override;
+  template <typename T>
+  void add(const T &value, int (*callback)(int) = nullptr);
+
+ private:
+  int size_;
+};
+
+} // namespace test::detail
+"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            header = os.path.join(tmpdir, "test.h")
+            with open(header, "w") as f:
+                f.write(source)
+            snapshot = build_snapshot_from_headers(
+                [header], definitions_to_macros({"NDEBUG": 1}), jobs=1
+            )
+
+        self.assertEqual(
+            snapshot.to_string().strip().split("\n"),
+            [
+                "class test::detail::Base {",
+                "  public virtual int size() const = 0;",
+                "  public virtual ~Base() = default;",
+                "}",
+                "",
+                "class test::detail::Derived : public test::detail::Base {",
+                "  public virtual int size() const override;",
+                "  template <typename T>",
+                "  public void add(const T& value, int(*)(int) callback = nullptr);",
+                "}",
+            ],
+        )
+        locations = {
+            name: location
+            for _, name, _, _, location, _ in symbol_rows("Test", snapshot)
+        }
+        self.assertEqual(locations["test::detail::Derived::add"], header)
+
+
+if __name__ == "__main__":
+    unittest.main()
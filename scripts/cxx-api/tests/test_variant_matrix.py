@@ -0,0 +1,64 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.variant_matrix import VariantMatrix
+
+
+class TestVariantMatrix(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _snapshot(self, units: int, overloads: int = 2):
+        xml_dir = os.path.join(self.root, f"xml{units}-{overloads}")
+        generate(xml_dir, units=units, depth=1, overloads=overloads)
+        return build_snapshot(xml_dir)
+
+    def test_identical_views_have_no_differences(self):
+        matrix = VariantMatrix()
+        matrix.add_view("TestDebug", self._snapshot(2))
+        matrix.add_view("TestRelease", self._snapshot(2))
+
+        report = matrix.report()
+
+        self.assertRegex(report, r"^\d+ scopes in 2 views .* 0 differing\n$")
+
+    def test_scopes_and_lines_in_some_views(self):
+        matrix = VariantMatrix()
+        matrix.add_view("TestDebug", self._snapshot(3))
+        matrix.add_view("TestRelease", self._snapshot(2))
+        matrix.add_view("OtherDebug", self._snapshot(2))
+
+        sections = {
+            section.split("\n")[0]: section
+            for section in matrix.report().split("\n\n")[1:]
+        }
+
+        self.assertEqual(
+            sections["facebook::react::Widget2 (class)"],
+            "facebook::react::Widget2 (class)\n  in: TestDebug",
+        )
+        members = sections["facebook::react (namespace members)"]
+        self.assertTrue(members.startswith("facebook::react (namespace members)\n"))
+        self.assertIn("  only in TestDebug:\n", members)
+        self.assertIn("facebook::react::makeWidget2(", members)
+        # Lines in every view are not reported.
+        self.assertNotIn("makeWidget0", members)
+        self.assertNotIn("facebook::react::Widget0 (class)", sections)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from ..bench import generate
+from ..parser import build_snapshot
+from ..parser.config import ApiViewSnapshotConfig
+from ..parser.main import ParsedXmlCache
+from ..parser.watch import WatchedView
+from .utils import write_file
+
+
+class TestWatchedView(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.headers = {
+            name: os.path.join(self.root, "src", name.lower(), f"{name}.h")
+            for name in ("A", "B", "C")
+        }
+        write_file(self.headers["A"], "API\n")
+        write_file(self.headers["B"], '#include "a/A.h"\nAPI\n')
+        write_file(self.headers["C"], "API\n")
+        write_file(
+            os.path.join(self.root, ".doxygen.config.template"), "FILE_PATTERNS = *.h\n"
+        )
+        self.runs: list[list[str]] = []
+        self.view = WatchedView(
+            ApiViewSnapshotConfig(
+                snapshot_name="TestDebug",
+                inputs=[os.path.join(self.root, "src")],
+                exclude_patterns=[],
+                definitions={},
+            ),
+            react_native_dir=self.root,
+            output_dir=os.path.join(self.root, "output"),
+            work_dir=os.path.join(self.root, "work"),
+            shards=3,
+            run_shards=self._run_shards,
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run_shards(self, shard_files, output_dir, shards_to_run, **kwargs):
+        # Each "API" of the headers of a shard adds a unit to its XML.
+        ran = []
+        for i in sorted(shards_to_run):
+            units = 0
+            for path in shard_files[i]:
+                with open(path) as f:
+                    units += f.read().count("API")
+                ran.append(os.path.basename(path))
+            generate(
+                os.path.join(output_dir, f"shard{i}", "xml"),
+                units=units,
+                depth=1,
+                overloads=1,
+            )
+        self.runs.append(sorted(ran))
+        return [
+            os.path.join(output_dir, f"shard{i}", "xml")
+            for i in range(len(shard_files))
+        ]
+
+    def _edit(self, name: str, content: str) -> None:
+        with open(self.headers[name], "a") as f:
+            f.write(content)
+        changed = self.view.poll()
+        self.assertEqual(changed, [self.headers[name]])
+        self.view.update(changed)
+
+    def test_only_shards_of_changed_apis_run(self):
+        self.view.build()
+        initial = self.view.snapshot_string
+        self.assertEqual(self.runs, [["A.h", "B.h", "C.h"]])
+        self.assertEqual(self.view.poll(), [])
+
+        self._edit("C", "// A comment\n")
+        self.assertEqual(len(self.runs), 1)
+
+        # B includes A, so both run again.
+        self._edit("A", "API API API\n")
+        self.assertEqual(self.runs[1:], [["A.h", "B.h"]])
+        self.assertNotEqual(self.view.snapshot_string, initial)
+        with open(os.path.join(self.root, "output", "TestDebugCxx.api")) as f:
+            self.assertTrue(f.read().endswith(self.view.snapshot_string))
+
+    def test_members_after_directives_are_api(self):
+        write_file(
+            self.headers["C"],
+            "class Foo {\n int x_;\n#pragma mark -\n public:\n"
+            "  void start();\n  void finish(int a);\n};\nAPI\n",
+        )
+        self.view.build()
+
+        with open(self.headers["C"]) as f:
+            source = f.read()
+        write_file(self.headers["C"], source.replace("int a", "int a, int b"))
+        self.view.update(self.view.poll())
+
+        self.assertEqual(self.runs[1:], [["C.h"]])
+
+    def test_added_headers_rebuild_all_shards(self):
+        self.view.build()
+        write_file(os.path.join(self.root, "src", "d", "D.h"), "API\n")
+
+        changed = self.view.poll()
+        self.view.update(changed)
+
+        self.assertEqual(self.runs[1:], [["A.h", "B.h", "C.h", "D.h"]])
+
+    def test_single_shard_runs_like_a_normal_run(self):
+        runs = []
+
+        def run_unsharded(include_directories, output_dir, **kwargs):
+            runs.append(include_directories)
+            generate(os.path.join(output_dir, "xml"), units=1, depth=1)
+
+        view = WatchedView(
+            self.view.config,
+            react_native_dir=self.root,
+            output_dir=os.path.join(self.root, "output"),
+            work_dir=os.path.join(self.root, "work"),
+            shards=1,
+            run_shards=self._run_shards,
+            run_unsharded=run_unsharded,
+        )
+        view.build()
+        write_file(self.headers["A"], "API API\n")
+        view.update(view.poll())
+
+        self.assertEqual(runs, [[os.path.join(self.root, "src")]] * 2)
+        self.assertEqual(self.runs, [])
+
+
+class TestParsedXmlCache(unittest.TestCase):
+    def test_cached_builds_match_uncached_ones(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            small, large = os.path.join(tmp, "small"), os.path.join(tmp, "large")
+            generate(small, units=2, depth=1, overloads=2)
+            generate(large, units=4, depth=1, overloads=2)
+            expected = build_snapshot([small, large]).to_string()
+            cache = ParsedXmlCache()
+
+            # Namespaces split between the runs must not be filtered in the
+            # cached XML.
+            for _ in range(2):
+                self.assertEqual(
+                    build_snapshot([small, large], xml_cache=cache).to_string(),
+                    expected,
+                )
+            cache.invalidate(small)
+            self.assertEqual(
+                build_snapshot([large, small], xml_cache=cache).to_string(),
+                build_snapshot([large, small]).to_string(),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
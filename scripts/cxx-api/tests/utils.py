@@ -0,0 +1,19 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Helpers shared by the tests.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+def write_file(path: str, content: str = "x") -> None:
+    """Write *content* to *path*, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)